@@ -12,6 +12,9 @@ from .asset_importer import AssetImporter
 from .asset_processor import AssetProcessor
 from .asset_optimizer import AssetOptimizer
 from .asset_cache import AssetCache
+from .mesh_loader import MeshData, SubMesh, load_mesh_file
+from .nxmesh import CompiledMesh, read_nxmesh, write_nxmesh, load_or_compile
+from .mesh_simplifier import generate_lods
 
 __all__ = [
     'AssetPipeline',
@@ -23,5 +26,13 @@ __all__ = [
     'AssetImporter',
     'AssetProcessor',
     'AssetOptimizer',
-    'AssetCache'
+    'AssetCache',
+    'MeshData',
+    'SubMesh',
+    'load_mesh_file',
+    'CompiledMesh',
+    'read_nxmesh',
+    'write_nxmesh',
+    'load_or_compile',
+    'generate_lods'
 ]
\ No newline at end of file
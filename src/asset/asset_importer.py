@@ -12,6 +12,8 @@ from pathlib import Path
 import mimetypes
 
 from .asset_pipeline import AssetInfo, AssetType
+from .mesh_loader import MESH_EXTENSIONS
+from .nxmesh import CompiledMesh, load_or_compile
 from ..utils.logger import get_logger
 
 
@@ -560,14 +562,18 @@ class AssetImporter:
             True if converted successfully, False otherwise
         """
         try:
-            # TODO: Implement actual mesh conversion
-            # This would involve:
-            # - Converting to engine mesh format
-            # - Optimizing vertex data
-            # - Generating normals if missing
-            
-            # For now, just mark as converted
             asset_info.metadata = asset_info.metadata or {}
+            
+            if Path(asset_info.file_path).suffix.lower() in MESH_EXTENSIONS:
+                # Compile to the binary .nxmesh format next to the source
+                compiled = load_or_compile(asset_info.file_path)
+                if compiled.path:
+                    asset_info.metadata['nxmesh'] = compiled.path
+                asset_info.metadata['source_hash'] = compiled.source_hash
+                
+                # Bake the collision BVH now so levels only have to load it
+                self._bake_collision_bvh(asset_info, compiled)
+            
             asset_info.metadata['converted'] = True
             
             self.conversion_count += 1
@@ -577,6 +583,21 @@ class AssetImporter:
             self.logger.error(f"Error converting mesh {asset_info.name}: {e}")
             return False
     
+    def _bake_collision_bvh(self, asset_info: AssetInfo, compiled: CompiledMesh):
+        """Build the triangle BVH of a mesh and cache it next to the asset.
+        
+        Args:
+            asset_info: Mesh asset information
+            compiled: Compiled mesh of the asset
+        """
+        from ..physics.mesh_collider import TriangleMeshBVH
+        
+        mesh = compiled.mesh
+        TriangleMeshBVH.load_or_build(asset_info.file_path, mesh.positions, mesh.indices,
+                                      compiled.source_hash)
+        asset_info.metadata['collision_bvh'] = TriangleMeshBVH.cache_path(asset_info.file_path)
+        asset_info.metadata['collision_triangles'] = mesh.index_count // 3
+    
     def _update_asset_metadata(self, asset_info: AssetInfo):
         """Update asset metadata with import information.
         
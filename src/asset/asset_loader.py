@@ -12,6 +12,8 @@ from pathlib import Path
 import time
 
 from .asset_pipeline import AssetInfo, AssetType
+from .mesh_loader import load_mesh_file
+from .nxmesh import load_or_compile
 from ..utils.logger import get_logger
 
 
@@ -185,26 +187,22 @@ class AssetLoader:
             Loaded mesh data or None if failed
         """
         try:
-            # TODO: Implement actual mesh loading
-            # This would involve:
-            # - Loading with assimp or similar library
-            # - Extracting vertices, normals, UVs, indices
-            # - Converting to engine format
-            
-            # For now, return a placeholder
-            mesh_data = {
-                'vertices': [],
-                'normals': [],
-                'uvs': [],
-                'indices': [],
-                'materials': []
-            }
+            # Prefer the compiled form written by the pipeline's process stage
+            asset_info.metadata = asset_info.metadata or {}
+            nxmesh_path = asset_info.metadata.get('nxmesh')
+            if nxmesh_path:
+                compiled = load_or_compile(asset_info.file_path, nxmesh_path)
+                mesh_data = compiled.mesh
+                bounds_min, bounds_max = compiled.bounds
+            else:
+                mesh_data = load_mesh_file(asset_info.file_path)
+                bounds_min, bounds_max = mesh_data.get_bounds()
             
             # Update metadata
-            asset_info.metadata = asset_info.metadata or {}
-            asset_info.metadata['vertex_count'] = 0
-            asset_info.metadata['face_count'] = 0
-            asset_info.metadata['material_count'] = 0
+            asset_info.metadata['vertex_count'] = mesh_data.vertex_count
+            asset_info.metadata['face_count'] = mesh_data.index_count // 3
+            asset_info.metadata['material_count'] = len(mesh_data.submeshes)
+            asset_info.metadata['bounds'] = [bounds_min.tolist(), bounds_max.tolist()]
             
             return mesh_data
             
@@ -13,6 +13,11 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
+from .nxmesh import compile_mesh, hash_source, is_nxmesh_current, nxmesh_path, read_nxmesh, write_nxmesh
+from .mesh_loader import MeshData
+from .mesh_simplifier import generate_lods, DEFAULT_LOD_RATIOS
 from ..utils.logger import get_logger
 
 
@@ -96,6 +101,10 @@ class AssetPipeline:
         self.enable_caching = True
         self.enable_ai_optimization = True
         
+        # Mesh detail levels generated in the optimization stage
+        self.lod_ratios = DEFAULT_LOD_RATIOS
+        self.lod_min_triangles = 256
+        
         # Performance tracking
         self.assets_processed = 0
         self.processing_time = 0.0
@@ -564,14 +573,16 @@ class AssetPipeline:
             True if processing successful, False otherwise
         """
         try:
-            # TODO: Implement actual mesh processing
-            # This would involve:
-            # - Calculating normals
-            # - Generating tangents
-            # - Optimizing vertex order
-            # - Creating LODs
+            # Compile next to the source (the cache the importer and renderer use)
+            # unless it already matches the source
+            source_hash = hash_source(asset_info.file_path)
+            compiled_path = nxmesh_path(asset_info.file_path)
+            if not is_nxmesh_current(compiled_path, source_hash):
+                compile_mesh(asset_info.file_path, compiled_path, source_hash)
             
-            # For now, just mark as processed
+            # Update metadata
+            asset_info.metadata['nxmesh'] = compiled_path
+            asset_info.metadata['source_hash'] = source_hash
             asset_info.metadata['processed'] = True
             
             return True
@@ -899,16 +910,27 @@ class AssetPipeline:
             True if optimization successful, False otherwise
         """
         try:
-            # TODO: Implement actual mesh optimization
-            # This would involve:
-            # - Vertex optimization
-            # - Triangle reduction
-            # - UV optimization
-            # - Normal recalculation
+            # Generate detail levels into the compiled mesh unless it already has them
+            compiled_path = asset_info.metadata.get('nxmesh')
+            if compiled_path and os.path.exists(compiled_path):
+                compiled = read_nxmesh(compiled_path)
+                if compiled.lod_count == 1 and compiled.mesh.index_count // 3 >= self.lod_min_triangles:
+                    # Copy out of the mapping before the file is replaced
+                    source = compiled.mesh
+                    mesh = MeshData(np.array(source.vertices), np.array(source.indices),
+                                    list(source.submeshes), list(source.layout))
+                    del compiled, source
+            
+                    lods = generate_lods(mesh, self.lod_ratios)
+                    write_nxmesh(compiled_path, mesh, asset_info.metadata.get('source_hash', ""), lods)
+                    asset_info.metadata['lod_count'] = len(lods) + 1
+                    asset_info.metadata['lod_triangles'] = [mesh.index_count // 3] + \
+                        [lod.index_count // 3 for lod, _ in lods]
+                else:
+                    asset_info.metadata['lod_count'] = compiled.lod_count
             
-            # For now, just mark as optimized
             asset_info.optimized = True
-            asset_info.metadata['optimization_applied'] = 'placeholder'
+            asset_info.metadata['optimization_applied'] = 'lod_generation'
             
             return True
             
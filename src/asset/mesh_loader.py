@@ -0,0 +1,626 @@
+"""
+Mesh Loader for Nexlify Engine.
+
+This module parses Wavefront OBJ and glTF 2.0 (.gltf/.glb) files into
+interleaved NumPy vertex and index buffers. Parsing works on whole
+files at once: OBJ numbers are converted in bulk with NumPy and glTF
+accessors are viewed in place over the binary buffers, so there are no
+per-vertex Python objects even for million-triangle models.
+"""
+
+import base64
+import json
+import logging
+import re
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+try:
+    import pygltflib
+    PYGLTFLIB_AVAILABLE = True
+except ImportError:
+    PYGLTFLIB_AVAILABLE = False
+
+
+logger = get_logger(__name__)
+
+# Interleaved vertex layout produced by every loader: position, normal, uv
+VERTEX_LAYOUT: List[Tuple[str, int]] = [("position", 3), ("normal", 3), ("uv", 2)]
+VERTEX_STRIDE = sum(components for _, components in VERTEX_LAYOUT)
+
+MESH_EXTENSIONS = ('.obj', '.gltf', '.glb')
+
+
+@dataclass
+class SubMesh:
+    """Range of the index buffer drawn with one material."""
+    first_index: int
+    index_count: int
+    material: str = ""
+
+
+@dataclass
+class MeshData:
+    """CPU-side mesh with interleaved vertices and a flat index buffer."""
+    vertices: np.ndarray  # (vertex_count, VERTEX_STRIDE) float32
+    indices: np.ndarray  # (index_count,) uint32
+    submeshes: List[SubMesh] = field(default_factory=list)
+    layout: List[Tuple[str, int]] = field(default_factory=lambda: list(VERTEX_LAYOUT))
+    
+    @property
+    def vertex_count(self) -> int:
+        """Number of vertices."""
+        return len(self.vertices)
+    
+    @property
+    def index_count(self) -> int:
+        """Number of indices."""
+        return len(self.indices)
+    
+    @property
+    def stride(self) -> int:
+        """Vertex size in bytes."""
+        return self.vertices.shape[1] * self.vertices.itemsize
+    
+    @property
+    def positions(self) -> np.ndarray:
+        """Vertex positions (a view into the interleaved buffer)."""
+        return self.vertices[:, 0:3]
+    
+    @property
+    def normals(self) -> np.ndarray:
+        """Vertex normals (a view into the interleaved buffer)."""
+        return self.vertices[:, 3:6]
+    
+    @property
+    def uvs(self) -> np.ndarray:
+        """Vertex texture coordinates (a view into the interleaved buffer)."""
+        return self.vertices[:, 6:8]
+    
+    def get_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the axis-aligned bounds of the vertex positions.
+        
+        Returns:
+            (min corner, max corner)
+        """
+        if self.vertex_count == 0:
+            return np.zeros(3, dtype=np.float32), np.zeros(3, dtype=np.float32)
+        positions = self.positions
+        return positions.min(axis=0), positions.max(axis=0)
+
+
+def load_mesh_file(path: str) -> MeshData:
+    """Load a mesh file, choosing the parser by extension.
+    
+    Args:
+        path: Path to an .obj, .gltf, .glb or compiled .nxmesh file
+    
+    Returns:
+        Parsed mesh (memory-mapped for .nxmesh)
+    
+    Raises:
+        ValueError: If the format is not supported or the file is malformed
+    """
+    extension = Path(path).suffix.lower()
+    if extension == '.obj':
+        return load_obj(path)
+    if extension in ('.gltf', '.glb'):
+        return load_gltf(path)
+    if extension == '.nxmesh':
+        from .nxmesh import read_nxmesh
+        return read_nxmesh(path).mesh
+    raise ValueError(f"Unsupported mesh format: {extension}")
+
+
+def interleave(positions: np.ndarray, normals: Optional[np.ndarray],
+               uvs: Optional[np.ndarray], indices: np.ndarray) -> np.ndarray:
+    """Pack vertex attributes into the engine's interleaved layout.
+    
+    Missing normals are generated as area-weighted smooth normals.
+    
+    Args:
+        positions: (n, 3) positions
+        normals: (n, 3) normals or None
+        uvs: (n, 2) texture coordinates or None
+        indices: Flat triangle indices, used to generate normals
+    
+    Returns:
+        (n, VERTEX_STRIDE) float32 array
+    """
+    vertices = np.zeros((len(positions), VERTEX_STRIDE), dtype=np.float32)
+    vertices[:, 0:3] = positions
+    vertices[:, 3:6] = normals if normals is not None else compute_normals(positions, indices)
+    if uvs is not None:
+        vertices[:, 6:8] = uvs
+    return vertices
+
+
+def compute_normals(positions: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Compute smooth vertex normals by summing area-weighted face normals.
+    
+    Args:
+        positions: (n, 3) positions
+        indices: Flat triangle indices
+    
+    Returns:
+        (n, 3) unit normals (zero for unreferenced vertices)
+    """
+    triangles = indices.reshape(-1, 3)
+    corners = positions[triangles].astype(np.float64)
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    
+    normals = np.zeros((len(positions), 3), dtype=np.float64)
+    for corner in range(3):
+        np.add.at(normals, triangles[:, corner], face_normals)
+    
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0.0)
+    return normals
+
+
+# -- Wavefront OBJ --------------------------------------------------------------
+
+_OBJ_USEMTL = re.compile(rb'^usemtl[ \t]+([^\r\n]*)', re.M)
+_OBJ_VERTEX_LINES = {
+    b'v': re.compile(rb'^v[ \t]+([^\r\n#]*)', re.M),
+    b'vt': re.compile(rb'^vt[ \t]+([^\r\n#]*)', re.M),
+    b'vn': re.compile(rb'^vn[ \t]+([^\r\n#]*)', re.M),
+}
+_OBJ_FACE_LINES = re.compile(rb'^f[ \t]+([^\r\n#]*)', re.M)
+
+
+def load_obj(path: str) -> MeshData:
+    """Load a Wavefront OBJ file.
+    
+    Polygons are fan-triangulated, corners sharing the same position,
+    uv and normal indices become one vertex, and each ``usemtl`` run
+    becomes a submesh.
+    
+    Args:
+        path: Path to the .obj file
+    
+    Returns:
+        Parsed mesh
+    """
+    with open(path, 'rb') as f:
+        text = f.read()
+    
+    positions = _obj_attribute(text, b'v', 3)
+    uvs = _obj_attribute(text, b'vt', 2)
+    normals = _obj_attribute(text, b'vn', 3)
+    if len(positions) == 0:
+        raise ValueError(f"OBJ file has no vertices: {path}")
+    
+    # Split the file at usemtl statements; chunk i uses material i-1
+    materials = [""]
+    chunks = []
+    chunk_starts = [0]
+    start = 0
+    for match in _OBJ_USEMTL.finditer(text):
+        chunks.append(text[start:match.start()])
+        materials.append(match.group(1).strip().decode('utf-8', 'replace'))
+        start = match.end()
+        chunk_starts.append(start)
+    chunks.append(text[start:])
+    
+    corner_blocks = []
+    submeshes = []
+    index_count = 0
+    counts = (len(positions), len(uvs), len(normals))
+    attribute_offsets = None
+    for chunk, chunk_start, material in zip(chunks, chunk_starts, materials):
+        faces = _OBJ_FACE_LINES.findall(chunk)
+        if not faces:
+            continue
+        faces = b'\n'.join(faces)
+        
+        # Negative indices are relative to the attributes defined above each face line
+        defined = None
+        if b'-' in faces:
+            if attribute_offsets is None:
+                attribute_offsets = [np.array([match.start() for match in _OBJ_VERTEX_LINES[keyword].finditer(text)],
+                                              dtype=np.int64) for keyword in (b'v', b'vt', b'vn')]
+            face_starts = np.array([chunk_start + match.start() for match in _OBJ_FACE_LINES.finditer(chunk)],
+                                   dtype=np.int64)
+            defined = np.stack([np.searchsorted(offsets, face_starts) for offsets in attribute_offsets], axis=1)
+        
+        corners = _obj_triangle_corners(faces, counts, defined)
+        corner_blocks.append(corners)
+        submeshes.append(SubMesh(index_count, len(corners), material))
+        index_count += len(corners)
+    
+    if not corner_blocks:
+        raise ValueError(f"OBJ file has no faces: {path}")
+    
+    # Corners are (position, uv, normal) index triples; -1 marks a missing attribute
+    corners = np.concatenate(corner_blocks)
+    unique_corners, indices = _weld_corners(corners, counts)
+    
+    vertex_positions = positions[unique_corners[:, 0]]
+    vertex_uvs = uvs[unique_corners[:, 1]] if len(uvs) and (unique_corners[:, 1] >= 0).all() else None
+    vertex_normals = normals[unique_corners[:, 2]] if len(normals) and (unique_corners[:, 2] >= 0).all() else None
+    
+    vertices = interleave(vertex_positions, vertex_normals, vertex_uvs, indices)
+    return MeshData(vertices=vertices, indices=indices, submeshes=submeshes)
+
+
+def _weld_corners(corners: np.ndarray, counts: Tuple[int, int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge corners with identical attribute indices into shared vertices.
+    
+    Args:
+        corners: (n, 3) position, uv and normal indices (-1 if missing)
+        counts: Number of positions, uvs and normals
+    
+    Returns:
+        (unique corners, uint32 index of each corner's vertex)
+    """
+    # Position-only meshes use the position list as the vertex list
+    if (corners[:, 1:] < 0).all():
+        unique_corners = np.full((counts[0], 3), -1, dtype=np.int64)
+        unique_corners[:, 0] = np.arange(counts[0])
+        return unique_corners, corners[:, 0].astype(np.uint32)
+    
+    # Pack each triple into one integer key; sorting integers is much faster than rows
+    uv_range = counts[1] + 1
+    normal_range = counts[2] + 1
+    if counts[0] * uv_range * normal_range < 2 ** 62:
+        keys = (corners[:, 0] * uv_range + corners[:, 1] + 1) * normal_range + corners[:, 2] + 1
+        unique_keys, indices = np.unique(keys, return_inverse=True)
+        unique_corners = np.stack((
+            unique_keys // normal_range // uv_range,
+            unique_keys // normal_range % uv_range - 1,
+            unique_keys % normal_range - 1
+        ), axis=1)
+    else:
+        unique_corners, indices = np.unique(corners, axis=0, return_inverse=True)
+    
+    return unique_corners, indices.reshape(-1).astype(np.uint32)
+
+
+def _obj_attribute(text: bytes, keyword: bytes, components: int) -> np.ndarray:
+    """Parse all lines of one vertex attribute (v, vt or vn) in bulk.
+    
+    Args:
+        text: OBJ file contents
+        keyword: Line keyword
+        components: Components to keep per line
+    
+    Returns:
+        (count, components) float32 array
+    """
+    lines = _OBJ_VERTEX_LINES[keyword].findall(text)
+    if not lines:
+        return np.zeros((0, components), dtype=np.float32)
+    
+    values = np.fromstring(b'\n'.join(lines), dtype=np.float32, sep=' ')
+    per_line = len(values) // len(lines)
+    if per_line * len(lines) == len(values) and per_line >= components:
+        return values.reshape(-1, per_line)[:, :components]
+    
+    # Lines of different lengths (optional w or vertex colors): parse line by line
+    result = np.zeros((len(lines), components), dtype=np.float32)
+    for i, line in enumerate(lines):
+        line_values = np.fromstring(line, dtype=np.float32, sep=' ')[:components]
+        result[i, :len(line_values)] = line_values
+    return result
+
+
+def _obj_triangle_corners(faces: bytes, counts: Tuple[int, int, int],
+                          defined: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert newline-separated face statements into triangle corners.
+    
+    Args:
+        faces: Face statements without the leading "f"
+        counts: Number of positions, uvs and normals
+        defined: (faces, 3) number of positions, uvs and normals defined
+            before each face statement, which negative indices count back
+            from; only needed if the faces use negative indices
+    
+    Returns:
+        (triangles * 3, 3) int64 array of zero-based (position, uv, normal) indices
+    """
+    # Corners per face, from the starts of whitespace separated tokens
+    buffer = np.frombuffer(faces, dtype=np.uint8)
+    is_space = (buffer == ord(' ')) | (buffer == ord('\t')) | (buffer == ord('\n'))
+    token_starts = ~is_space & np.concatenate(([True], is_space[:-1]))
+    line_starts = np.concatenate(([0], np.flatnonzero(buffer == ord('\n')) + 1))
+    corners_per_face = np.add.reduceat(token_starts.astype(np.int64), line_starts)
+    
+    # Corner format from the first corner: v, v/vt, v//vn or v/vt/vn
+    first = faces.split(None, 1)[0]
+    has_uv = first.count(b'/') >= 1 and b'//' not in first
+    has_normal = first.count(b'/') == 2
+    components = 1 + has_uv + has_normal
+    
+    values = np.fromstring(faces.replace(b'//', b' ').replace(b'/', b' '), dtype=np.int64, sep=' ')
+    if len(values) != corners_per_face.sum() * components:
+        raise ValueError("OBJ faces mix corner formats")
+    values = values.reshape(-1, components)
+    
+    # One-based indices; negative ones count back from the last attribute defined before the face
+    corners = np.full((len(values), 3), -1, dtype=np.int64)
+    columns = [0] + [1] * has_uv + [2] * has_normal
+    for component, column in enumerate(columns):
+        attribute = values[:, component]
+        if defined is not None:
+            relative_to = np.repeat(defined[:, column], corners_per_face)
+        else:
+            relative_to = counts[column]
+        corners[:, column] = np.where(attribute > 0, attribute - 1, attribute + relative_to)
+        if corners[:, column].min() < 0 or corners[:, column].max() >= counts[column]:
+            raise ValueError("OBJ face references a missing vertex attribute")
+    
+    # Fan-triangulate: face with n corners gives (0, i, i + 1) for i in 1..n-2
+    triangles_per_face = np.maximum(corners_per_face - 2, 0)
+    face_offsets = np.concatenate(([0], np.cumsum(corners_per_face)[:-1]))
+    face_of_triangle = np.repeat(np.arange(len(corners_per_face)), triangles_per_face)
+    first_triangle = np.concatenate(([0], np.cumsum(triangles_per_face)[:-1]))
+    fan = np.arange(len(face_of_triangle)) - first_triangle[face_of_triangle] + 1
+    
+    base = face_offsets[face_of_triangle]
+    triangle_corners = np.stack((base, base + fan, base + fan + 1), axis=1).reshape(-1)
+    return corners[triangle_corners]
+
+
+# -- glTF 2.0 -------------------------------------------------------------------
+
+_GLB_MAGIC = 0x46546C67
+_GLB_JSON_CHUNK = 0x4E4F534A
+_GLB_BIN_CHUNK = 0x004E4942
+
+_COMPONENT_TYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+_TYPE_COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+_TRIANGLES = 4
+
+
+def load_gltf(path: str) -> MeshData:
+    """Load the triangle primitives of a glTF 2.0 file (.gltf or .glb).
+    
+    Node transforms of the default scene are applied, and each primitive
+    becomes a submesh named after its material. Accessors are read as
+    views over the binary buffers.
+    
+    Args:
+        path: Path to the .gltf or .glb file
+    
+    Returns:
+        Parsed mesh
+    """
+    document, buffers = _read_gltf_document(path)
+    
+    position_blocks, normal_blocks, uv_blocks, index_blocks = [], [], [], []
+    submeshes = []
+    vertex_count = 0
+    index_count = 0
+    missing_normals = False
+    missing_uvs = False
+    
+    materials = document.get("materials", [])
+    for mesh_index, matrix in _gltf_mesh_instances(document):
+        for primitive in document["meshes"][mesh_index].get("primitives", []):
+            if primitive.get("mode", _TRIANGLES) != _TRIANGLES:
+                logger.warning(f"Skipping non-triangle glTF primitive in {path}")
+                continue
+            
+            attributes = primitive["attributes"]
+            positions = _gltf_accessor(document, buffers, attributes["POSITION"])
+            count = len(positions)
+            
+            if "indices" in primitive:
+                indices = _gltf_accessor(document, buffers, primitive["indices"]).reshape(-1)
+            else:
+                indices = np.arange(count, dtype=np.uint32)
+            
+            # Transform into the mesh's space (copies only for non-identity nodes)
+            positions = _transform_points(positions, matrix)
+            normals = None
+            if "NORMAL" in attributes:
+                normals = _transform_normals(_gltf_accessor(document, buffers, attributes["NORMAL"]), matrix)
+            uvs = None
+            if "TEXCOORD_0" in attributes:
+                uvs = _gltf_accessor(document, buffers, attributes["TEXCOORD_0"])
+            
+            missing_normals |= normals is None
+            missing_uvs |= uvs is None
+            position_blocks.append(positions)
+            normal_blocks.append(normals)
+            uv_blocks.append(uvs)
+            index_blocks.append(indices.astype(np.uint32) + np.uint32(vertex_count))
+            
+            material = ""
+            if "material" in primitive:
+                material = materials[primitive["material"]].get("name", f"material_{primitive['material']}")
+            submeshes.append(SubMesh(index_count, len(indices), material))
+            
+            vertex_count += count
+            index_count += len(indices)
+    
+    if not position_blocks:
+        raise ValueError(f"glTF file has no triangle meshes: {path}")
+    
+    positions = np.concatenate(position_blocks)
+    indices = np.concatenate(index_blocks)
+    
+    # Per-primitive attributes are merged only if every primitive has them
+    normals = None if missing_normals else np.concatenate(normal_blocks)
+    uvs = None if missing_uvs else np.concatenate(uv_blocks)
+    vertices = interleave(positions, normals, uvs, indices)
+    return MeshData(vertices=vertices, indices=indices, submeshes=submeshes)
+
+
+def _read_gltf_document(path: str) -> Tuple[Dict[str, Any], List[memoryview]]:
+    """Read the JSON document and binary buffers of a glTF file.
+    
+    Args:
+        path: Path to the .gltf or .glb file
+    
+    Returns:
+        (document, buffers) where each buffer is a memoryview
+    """
+    if PYGLTFLIB_AVAILABLE:
+        gltf = pygltflib.GLTF2().load(path)
+        document = json.loads(gltf.to_json())
+        blob = gltf.binary_blob()
+        buffers = []
+        for buffer in gltf.buffers:
+            if buffer.uri is None:
+                buffers.append(memoryview(blob or b""))
+            elif buffer.uri.startswith("data:"):
+                buffers.append(memoryview(gltf.decode_data_uri(buffer.uri)))
+            else:
+                buffers.append(_read_file_buffer(Path(path).parent / buffer.uri))
+        return document, buffers
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    view = memoryview(data)
+    binary_chunk = memoryview(b"")
+    if len(data) >= 12 and struct.unpack_from('<I', data, 0)[0] == _GLB_MAGIC:
+        # GLB: 12 byte header, then length/type prefixed chunks
+        offset = 12
+        document = None
+        while offset + 8 <= len(data):
+            chunk_length, chunk_type = struct.unpack_from('<II', data, offset)
+            chunk = view[offset + 8:offset + 8 + chunk_length]
+            if chunk_type == _GLB_JSON_CHUNK:
+                document = json.loads(bytes(chunk))
+            elif chunk_type == _GLB_BIN_CHUNK:
+                binary_chunk = chunk
+            offset += 8 + chunk_length
+        if document is None:
+            raise ValueError(f"GLB file has no JSON chunk: {path}")
+    else:
+        document = json.loads(data)
+    
+    buffers = []
+    for buffer in document.get("buffers", []):
+        uri = buffer.get("uri")
+        if uri is None:
+            buffers.append(binary_chunk)
+        elif uri.startswith("data:"):
+            buffers.append(memoryview(base64.b64decode(uri.split(",", 1)[1])))
+        else:
+            buffers.append(_read_file_buffer(Path(path).parent / uri))
+    return document, buffers
+
+
+def _read_file_buffer(path: Path) -> memoryview:
+    """Map an external glTF buffer file read-only."""
+    return memoryview(np.memmap(path, dtype=np.uint8, mode='r'))
+
+
+def _gltf_accessor(document: Dict[str, Any], buffers: List[memoryview], accessor_index: int) -> np.ndarray:
+    """View an accessor's data without copying.
+    
+    Args:
+        document: glTF document
+        buffers: Binary buffers
+        accessor_index: Accessor index
+    
+    Returns:
+        (count, components) array (normalized integer data is converted to float)
+    """
+    accessor = document["accessors"][accessor_index]
+    if "sparse" in accessor:
+        raise ValueError("Sparse glTF accessors are not supported")
+    
+    dtype = np.dtype(_COMPONENT_TYPES[accessor["componentType"]])
+    components = _TYPE_COMPONENTS[accessor["type"]]
+    count = accessor["count"]
+    
+    if "bufferView" not in accessor:
+        return np.zeros((count, components), dtype=dtype)
+    
+    buffer_view = document["bufferViews"][accessor["bufferView"]]
+    buffer = buffers[buffer_view["buffer"]]
+    offset = buffer_view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    element_size = dtype.itemsize * components
+    stride = buffer_view.get("byteStride") or element_size
+    
+    if stride == element_size:
+        array = np.frombuffer(buffer, dtype=dtype, count=count * components, offset=offset)
+        array = array.reshape(count, components)
+    else:
+        # Interleaved buffer view: a strided view over the same bytes
+        array = np.ndarray((count, components), dtype=dtype, buffer=buffer,
+                           offset=offset, strides=(stride, dtype.itemsize))
+    
+    if accessor.get("normalized") and dtype.kind in "iu":
+        array = np.maximum(array / np.iinfo(dtype).max, -1.0).astype(np.float32)
+    return array
+
+
+def _gltf_mesh_instances(document: Dict[str, Any]) -> List[Tuple[int, np.ndarray]]:
+    """List the meshes placed by the default scene with their world matrices.
+    
+    Files without scenes place every mesh once at the origin.
+    
+    Args:
+        document: glTF document
+    
+    Returns:
+        (mesh index, 4x4 matrix) pairs
+    """
+    nodes = document.get("nodes", [])
+    scenes = document.get("scenes", [])
+    if not scenes:
+        return [(index, np.eye(4)) for index in range(len(document.get("meshes", [])))]
+    
+    scene = scenes[document.get("scene", 0)]
+    instances = []
+    stack = [(node, np.eye(4)) for node in scene.get("nodes", [])]
+    while stack:
+        node_index, parent = stack.pop()
+        node = nodes[node_index]
+        matrix = parent @ _gltf_node_matrix(node)
+        if "mesh" in node:
+            instances.append((node["mesh"], matrix))
+        stack.extend((child, matrix) for child in node.get("children", []))
+    return instances
+
+
+def _gltf_node_matrix(node: Dict[str, Any]) -> np.ndarray:
+    """Get a node's local transform as a 4x4 matrix."""
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T  # Column-major
+    
+    x, y, z, w = node.get("rotation", [0.0, 0.0, 0.0, 1.0])
+    rotation = np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation * np.array(node.get("scale", [1.0, 1.0, 1.0]))
+    matrix[:3, 3] = node.get("translation", [0.0, 0.0, 0.0])
+    return matrix
+
+
+def _transform_points(points: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Apply a 4x4 affine matrix to (n, 3) points."""
+    if np.array_equal(matrix, np.eye(4)):
+        return points
+    return (points @ matrix[:3, :3].T + matrix[:3, 3]).astype(np.float32)
+
+
+def _transform_normals(normals: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Apply the inverse transpose of a 4x4 matrix to (n, 3) normals."""
+    if np.array_equal(matrix, np.eye(4)):
+        return normals
+    transformed = normals @ np.linalg.inv(matrix[:3, :3])
+    lengths = np.linalg.norm(transformed, axis=1, keepdims=True)
+    return (transformed / np.where(lengths > 0.0, lengths, 1.0)).astype(np.float32)
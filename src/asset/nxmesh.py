@@ -0,0 +1,406 @@
+"""
+Compiled Mesh Format for Nexlify Engine.
+
+This module reads and writes .nxmesh files, the binary form meshes are
+compiled to by the asset pipeline. A file holds a fixed header, a vertex
+layout descriptor, submesh and LOD tables, and 64-byte aligned vertex and
+index blocks that are stored exactly as they are uploaded to the GPU.
+Loading memory-maps the file and views the blocks in place, so nothing
+is parsed and pages are only read when they are touched.
+
+Every file records the hash of the source it was compiled from; a cache
+whose hash no longer matches its source is recompiled.
+"""
+
+import hashlib
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Sequence
+
+import numpy as np
+
+from .mesh_loader import MeshData, SubMesh, load_mesh_file
+from ..utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+NXMESH_MAGIC = b"NXMESH01"
+NXMESH_VERSION = 1
+NXMESH_EXTENSION = ".nxmesh"
+
+# Blocks start on cache-line boundaries
+BLOCK_ALIGNMENT = 64
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('header_size', '<u4'),
+    ('source_hash', 'S32'),
+    ('vertex_stride', '<u4'),
+    ('attribute_count', '<u4'),
+    ('submesh_count', '<u4'),
+    ('lod_count', '<u4'),
+    ('bounds_min', '<f4', (3,)),
+    ('bounds_max', '<f4', (3,)),
+    ('attribute_offset', '<u8'),
+    ('submesh_offset', '<u8'),
+    ('lod_offset', '<u8'),
+    ('file_size', '<u8'),
+])
+
+ATTRIBUTE_DTYPE = np.dtype([
+    ('name', 'S16'),
+    ('format', 'S4'),
+    ('components', '<u4'),
+    ('offset', '<u4'),
+])
+
+SUBMESH_DTYPE = np.dtype([
+    ('first_index', '<u4'),
+    ('index_count', '<u4'),
+    ('material', 'S64'),
+])
+
+LOD_DTYPE = np.dtype([
+    ('vertex_offset', '<u8'),
+    ('vertex_count', '<u8'),
+    ('index_offset', '<u8'),
+    ('index_count', '<u8'),
+    ('error', '<f4'),
+    ('first_submesh', '<u4'),
+    ('submesh_count', '<u4'),
+    ('reserved', '<u4'),
+])
+
+
+@dataclass
+class CompiledMesh:
+    """Mesh read from an .nxmesh file; LOD 0 is the full-detail mesh."""
+    lods: List[MeshData]
+    lod_errors: List[float]
+    bounds: Tuple[np.ndarray, np.ndarray]
+    source_hash: str = ""
+    path: str = ""
+    
+    @property
+    def mesh(self) -> MeshData:
+        """Full-detail mesh."""
+        return self.lods[0]
+    
+    @property
+    def lod_count(self) -> int:
+        """Number of detail levels."""
+        return len(self.lods)
+
+
+def nxmesh_path(source_path: str) -> str:
+    """Get the default compiled cache path for a source mesh.
+    
+    Args:
+        source_path: Path to the source mesh
+    
+    Returns:
+        Path of the .nxmesh file next to the source
+    """
+    return source_path + NXMESH_EXTENSION
+
+
+def hash_source(path: str) -> str:
+    """Hash the content of a source file.
+    
+    Args:
+        path: File path
+    
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the block alignment."""
+    return (offset + BLOCK_ALIGNMENT - 1) // BLOCK_ALIGNMENT * BLOCK_ALIGNMENT
+
+
+def write_nxmesh(path: str, mesh: MeshData, source_hash: str = "",
+                 lods: Sequence[Tuple[MeshData, float]] = ()) -> int:
+    """Write a mesh and its detail levels to an .nxmesh file.
+    
+    The file is written next to its destination and moved into place, so
+    readers never see a partially written cache.
+    
+    Args:
+        path: Output path
+        mesh: Full-detail mesh (LOD 0)
+        source_hash: Hash of the source the mesh was compiled from
+        lods: Coarser (mesh, error) levels, finest first; all must share
+            the layout of mesh
+    
+    Returns:
+        Number of bytes written
+    """
+    levels = [(mesh, 0.0)] + list(lods)
+    stride = mesh.stride
+    for level, _ in levels:
+        if level.layout != mesh.layout or level.stride != stride:
+            raise ValueError("All LODs must share the vertex layout of LOD 0")
+    
+    # Layout descriptor
+    attributes = np.zeros(len(mesh.layout), dtype=ATTRIBUTE_DTYPE)
+    attribute_offset = 0
+    for entry, (name, components) in zip(attributes, mesh.layout):
+        entry['name'] = name.encode()
+        entry['format'] = mesh.vertices.dtype.newbyteorder('<').str.encode()
+        entry['components'] = components
+        entry['offset'] = attribute_offset
+        attribute_offset += components * mesh.vertices.itemsize
+    
+    # Submeshes of every level, in level order
+    submeshes = np.zeros(sum(len(level.submeshes) for level, _ in levels), dtype=SUBMESH_DTYPE)
+    lod_table = np.zeros(len(levels), dtype=LOD_DTYPE)
+    first_submesh = 0
+    for entry, (level, error) in zip(lod_table, levels):
+        for i, submesh in enumerate(level.submeshes):
+            submeshes[first_submesh + i] = (submesh.first_index, submesh.index_count,
+                                            submesh.material.encode()[:64])
+        entry['vertex_count'] = level.vertex_count
+        entry['index_count'] = level.index_count
+        entry['error'] = error
+        entry['first_submesh'] = first_submesh
+        entry['submesh_count'] = len(level.submeshes)
+        first_submesh += len(level.submeshes)
+    
+    # Place the tables after the header and the blocks after the tables
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    offset = header.nbytes
+    header['attribute_offset'] = offset = _align(offset)
+    header['submesh_offset'] = offset = _align(offset + attributes.nbytes)
+    header['lod_offset'] = offset = _align(offset + submeshes.nbytes)
+    offset += lod_table.nbytes
+    blocks = []
+    for entry, (level, _) in zip(lod_table, levels):
+        vertices = np.ascontiguousarray(level.vertices, dtype=mesh.vertices.dtype.newbyteorder('<'))
+        indices = np.ascontiguousarray(level.indices, dtype='<u4')
+        entry['vertex_offset'] = offset = _align(offset)
+        offset += vertices.nbytes
+        entry['index_offset'] = offset = _align(offset)
+        offset += indices.nbytes
+        blocks.extend(((int(entry['vertex_offset']), vertices), (int(entry['index_offset']), indices)))
+    
+    bounds_min, bounds_max = mesh.get_bounds()
+    header['magic'] = NXMESH_MAGIC
+    header['version'] = NXMESH_VERSION
+    header['header_size'] = HEADER_DTYPE.itemsize
+    header['source_hash'] = source_hash.encode()
+    header['vertex_stride'] = stride
+    header['attribute_count'] = len(attributes)
+    header['submesh_count'] = len(submeshes)
+    header['lod_count'] = len(lod_table)
+    header['bounds_min'] = bounds_min
+    header['bounds_max'] = bounds_max
+    header['file_size'] = offset
+    
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            sections = [(0, header), (int(header['attribute_offset'][0]), attributes),
+                        (int(header['submesh_offset'][0]), submeshes),
+                        (int(header['lod_offset'][0]), lod_table)] + blocks
+            for position, array in sections:
+                f.write(b"\0" * (position - f.tell()))
+                f.write(memoryview(array).cast('B'))
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    return offset
+
+
+def read_nxmesh_header(path: str) -> Optional[np.void]:
+    """Read the header of an .nxmesh file without mapping the rest.
+    
+    Args:
+        path: File path
+    
+    Returns:
+        Header record, or None if the file is not a current-version .nxmesh
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(HEADER_DTYPE.itemsize)
+    except OSError:
+        return None
+    
+    if len(data) < HEADER_DTYPE.itemsize:
+        return None
+    header = np.frombuffer(data, dtype=HEADER_DTYPE)[0]
+    if header['magic'] != NXMESH_MAGIC or header['version'] != NXMESH_VERSION:
+        return None
+    return header
+
+
+def is_nxmesh_current(path: str, source_hash: str) -> bool:
+    """Check whether a compiled mesh was built from the given source content.
+    
+    Args:
+        path: .nxmesh file path
+        source_hash: Hash of the current source
+    
+    Returns:
+        True if the file exists and matches the hash, False otherwise
+    """
+    header = read_nxmesh_header(path)
+    return header is not None and header['source_hash'].decode() == source_hash
+
+
+def read_nxmesh(path: str) -> CompiledMesh:
+    """Memory-map an .nxmesh file.
+    
+    The returned vertex and index arrays are read-only views into the
+    mapping; no data is copied or converted.
+    
+    Args:
+        path: File path
+    
+    Returns:
+        Compiled mesh
+    
+    Raises:
+        ValueError: If the file is not a valid current-version .nxmesh
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    if len(data) < HEADER_DTYPE.itemsize:
+        raise ValueError(f"Truncated .nxmesh header: {path}")
+    
+    header = data[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+    if header['magic'] != NXMESH_MAGIC:
+        raise ValueError(f"Not an .nxmesh file: {path}")
+    if header['version'] != NXMESH_VERSION:
+        raise ValueError(f"Unsupported .nxmesh version {header['version']}: {path}")
+    if header['file_size'] != len(data):
+        raise ValueError(f"Truncated .nxmesh file: {path}")
+    
+    def table(offset, count, dtype):
+        start = int(offset)
+        return data[start:start + int(count) * dtype.itemsize].view(dtype)
+    
+    attributes = table(header['attribute_offset'], header['attribute_count'], ATTRIBUTE_DTYPE)
+    submeshes = table(header['submesh_offset'], header['submesh_count'], SUBMESH_DTYPE)
+    lod_table = table(header['lod_offset'], header['lod_count'], LOD_DTYPE)
+    
+    layout = [(entry['name'].decode(), int(entry['components'])) for entry in attributes]
+    component_format = np.dtype(attributes[0]['format'].decode()) if len(attributes) else np.dtype('<f4')
+    stride = int(header['vertex_stride'])
+    components = stride // component_format.itemsize
+    if sum(count for _, count in layout) != components:
+        raise ValueError(f"Vertex layout does not match the stride: {path}")
+    
+    lods = []
+    for entry in lod_table:
+        vertex_count = int(entry['vertex_count'])
+        vertices = table(entry['vertex_offset'], vertex_count * components, component_format)
+        indices = table(entry['index_offset'], entry['index_count'], np.dtype('<u4'))
+        first = int(entry['first_submesh'])
+        lods.append(MeshData(
+            vertices=vertices.reshape(vertex_count, components),
+            indices=indices,
+            submeshes=[
+                SubMesh(int(s['first_index']), int(s['index_count']), s['material'].decode())
+                for s in submeshes[first:first + int(entry['submesh_count'])]
+            ],
+            layout=list(layout)
+        ))
+    
+    return CompiledMesh(
+        lods=lods,
+        lod_errors=[float(entry['error']) for entry in lod_table],
+        bounds=(np.array(header['bounds_min']), np.array(header['bounds_max'])),
+        source_hash=header['source_hash'].decode(),
+        path=path
+    )
+
+
+def compile_mesh(source_path: str, output_path: Optional[str] = None,
+                 source_hash: Optional[str] = None) -> str:
+    """Parse a source mesh and write it as an .nxmesh file.
+    
+    Args:
+        source_path: Path to an .obj, .gltf or .glb file
+        output_path: Destination (defaults to nxmesh_path(source_path))
+        source_hash: Precomputed hash of the source content
+    
+    Returns:
+        Path of the written file
+    """
+    output_path = output_path or nxmesh_path(source_path)
+    if source_hash is None:
+        source_hash = hash_source(source_path)
+    
+    mesh = load_mesh_file(source_path)
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    size = write_nxmesh(output_path, mesh, source_hash)
+    logger.info(f"Compiled mesh {source_path} -> {output_path} ({size} bytes)")
+    return output_path
+
+
+def load_or_compile(source_path: str, cache_path: Optional[str] = None) -> CompiledMesh:
+    """Load a compiled mesh, recompiling it if its source has changed.
+    
+    A cache without its source (as in a shipped build) is trusted as is.
+    If the cache cannot be written, the parsed source is returned instead.
+    
+    Args:
+        source_path: Path to the source mesh
+        cache_path: Compiled file path (defaults to nxmesh_path(source_path))
+    
+    Returns:
+        Compiled mesh
+    """
+    cache_path = cache_path or nxmesh_path(source_path)
+    if not os.path.exists(source_path):
+        return read_nxmesh(cache_path)
+    
+    source_hash = hash_source(source_path)
+    if is_nxmesh_current(cache_path, source_hash):
+        return read_nxmesh(cache_path)
+    
+    try:
+        compile_mesh(source_path, cache_path, source_hash)
+        return read_nxmesh(cache_path)
+    
+    except OSError as e:
+        logger.warning(f"Could not write mesh cache {cache_path}: {e}")
+        mesh = load_mesh_file(source_path)
+        return CompiledMesh(lods=[mesh], lod_errors=[0.0], bounds=mesh.get_bounds(),
+                            source_hash=source_hash)
+
+
+def get_nxmesh_info(path: str) -> Dict[str, Any]:
+    """Describe an .nxmesh file from its header.
+    
+    Args:
+        path: File path
+    
+    Returns:
+        Dictionary of header fields (empty if the file is not valid)
+    """
+    header = read_nxmesh_header(path)
+    if header is None:
+        return {}
+    return {
+        "version": int(header['version']),
+        "source_hash": header['source_hash'].decode(),
+        "vertex_stride": int(header['vertex_stride']),
+        "submesh_count": int(header['submesh_count']),
+        "lod_count": int(header['lod_count']),
+        "bounds": [header['bounds_min'].tolist(), header['bounds_max'].tolist()],
+        "file_size": int(header['file_size'])
+    }
@@ -59,7 +59,10 @@ class Component(ABC):
     def set_enabled(self, enabled: bool):
         """Enable or disable this component."""
         if self.enabled != enabled:
+            from .game_object import GameObject
+            
             self.enabled = enabled
+            GameObject.structure_version += 1
             self._on_enabled_changed(enabled)
     
     def is_enabled(self) -> bool:
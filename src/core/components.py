@@ -8,13 +8,34 @@ This module provides essential components that can be attached to GameObjects:
 - Collider: Basic collision detection
 """
 
+import math
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
+
+import numpy as np
+
 from .component import Component
 
 if TYPE_CHECKING:
     from .game_object import GameObject
 
-class MeshRenderer(Component):
+class _RevisionedComponent(Component):
+    """Component that counts changes to its attributes.
+    
+    Renderers compare revisions to re-extract only what changed. In-place
+    edits of list attributes (light.color[0] = r) are not seen; assign a
+    new list or use the setters.
+    """
+    
+    # Changes made to any revisioned component (read it through any subclass)
+    changes = 0
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self.__dict__['revision'] = self.__dict__.get('revision', 0) + 1
+        _RevisionedComponent.changes += 1
+
+
+class MeshRenderer(_RevisionedComponent):
     """Component for rendering 3D meshes."""
     
     def __init__(self, mesh_path: str = "", material_path: str = ""):
@@ -85,7 +106,7 @@ class MeshRenderer(Component):
         self.sorting_order = data.get('sorting_order', 0)
 
 
-class Light(Component):
+class Light(_RevisionedComponent):
     """Component for lighting in the scene."""
     
     def __init__(self, light_type: str = "Point", color: List[float] = None, intensity: float = 1.0):
@@ -213,19 +234,34 @@ class Camera(Component):
         self.depth = depth
 
     def get_view_matrix(self) -> List[List[float]]:
-        """Get the view matrix for this camera."""
+        """Get the view matrix for this camera.
+        
+        The view matrix is the inverse of the camera's world matrix, so the
+        camera sits at the origin looking down -Z with +Y up.
+        """
         if not self.game_object:
             return [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
         
-        # In a real engine, this would calculate the proper view matrix
-        # based on the camera's position and rotation
-        return self.game_object.transform.get_matrix()
+        return np.linalg.inv(self.game_object.get_world_matrix()).tolist()
 
     def get_projection_matrix(self) -> List[List[float]]:
-        """Get the projection matrix for this camera."""
-        # In a real engine, this would calculate the proper projection matrix
-        # based on FOV, aspect ratio, and clip planes
-        return [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+        """Get the perspective projection matrix for this camera.
+        
+        Uses the vertical field of view and maps view depth between the
+        clip planes to normalized device depth in [-1, 1].
+        """
+        f = 1.0 / math.tan(math.radians(self.fov) * 0.5)
+        near, far = self.near_clip, self.far_clip
+        return [
+            [f / self.aspect_ratio, 0.0, 0.0, 0.0],
+            [0.0, f, 0.0, 0.0],
+            [0.0, 0.0, (far + near) / (near - far), 2.0 * far * near / (near - far)],
+            [0.0, 0.0, -1.0, 0.0]
+        ]
+
+    def get_view_projection_matrix(self) -> np.ndarray:
+        """Get projection * view as a 4x4 array."""
+        return np.array(self.get_projection_matrix()) @ np.array(self.get_view_matrix())
 
     def serialize(self) -> Dict[str, Any]:
         """Serialize the camera."""
@@ -264,6 +300,8 @@ class Collider(Component):
         self.material = material
         self.enabled = True
         self.contact_callbacks = []
+        self.collision_category = 0x00000001
+        self.collision_mask = 0xFFFFFFFF
 
     def _on_initialize(self) -> None:
         """Initialize the collider."""
@@ -285,6 +323,27 @@ class Collider(Component):
         """Set the physics material."""
         self.material = material
 
+    def set_collision_filter(self, category: int, mask: int) -> None:
+        """Set the 32-bit collision category and mask bits."""
+        self.collision_category = category & 0xFFFFFFFF
+        self.collision_mask = mask & 0xFFFFFFFF
+
+    def get_layer(self) -> int:
+        """Get the collision layer, which is the GameObject's layer."""
+        return self.game_object.layer if self.game_object else 0
+
+    def apply_filter(self, body) -> None:
+        """Copy the layer, filter bits and trigger flag to a physics body.
+
+        The body also keeps a reference to this collider, so the physics
+        trigger and collision events call its on_trigger_* and
+        on_collision_* methods.
+        """
+        body.set_layer(self.get_layer())
+        body.set_collision_filter(self.collision_category, self.collision_mask)
+        body.set_trigger(self.is_trigger)
+        body.collider = self
+
     def add_contact_callback(self, callback) -> None:
         """Add a contact callback function."""
         if callback not in self.contact_callbacks:
@@ -299,6 +358,10 @@ class Collider(Component):
         """Called when another collider enters this trigger."""
         pass
 
+    def on_trigger_stay(self, other: 'Collider') -> None:
+        """Called every step another collider stays inside this trigger."""
+        pass
+
     def on_trigger_exit(self, other: 'Collider') -> None:
         """Called when another collider exits this trigger."""
         pass
@@ -316,7 +379,9 @@ class Collider(Component):
         data = super().serialize()
         data.update({
             'is_trigger': self.is_trigger,
-            'material': self.material
+            'material': self.material,
+            'collision_category': self.collision_category,
+            'collision_mask': self.collision_mask
         })
         return data
 
@@ -325,3 +390,5 @@ class Collider(Component):
         super().deserialize(data)
         self.is_trigger = data.get('is_trigger', False)
         self.material = data.get('material', "")
+        self.collision_category = data.get('collision_category', 0x00000001)
+        self.collision_mask = data.get('collision_mask', 0xFFFFFFFF)
@@ -8,10 +8,12 @@ This module implements a Unity-like GameObject system with:
 - Scene management integration
 """
 
-from typing import List, Optional, Dict, Any, Type, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, Type, ClassVar, TYPE_CHECKING
 from dataclasses import dataclass, field
 import uuid
 
+import numpy as np
+
 if TYPE_CHECKING:
     from .component import Component
 
@@ -21,6 +23,28 @@ class Transform:
     position: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
     rotation: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
     scale: List[float] = field(default_factory=lambda: [1.0, 1.0, 1.0])
+    # Set whenever the transform is moved; cleared once physics has picked it up.
+    # In-place element writes (transform.position[0] = x) must call mark_dirty().
+    dirty: bool = field(default=False, repr=False, compare=False)
+    # Bumped on every change; world matrix caches compare against it
+    version: int = field(default=0, repr=False, compare=False)
+    # Changes made to any transform, so consumers can skip frames where nothing moved
+    changes: ClassVar[int] = 0
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in ('position', 'rotation', 'scale'):
+            self._changed()
+
+    def _changed(self) -> None:
+        """Record a change to the transform."""
+        super().__setattr__('dirty', True)
+        super().__setattr__('version', self.__dict__.get('version', 0) + 1)
+        Transform.changes += 1
+
+    def mark_dirty(self) -> None:
+        """Flag the transform as moved so physics and rendering pick up the change."""
+        self._changed()
 
     def set_position(self, x: float, y: float, z: float) -> None:
         """Set the position of the transform."""
@@ -39,28 +63,42 @@ class Transform:
         self.position[0] += x
         self.position[1] += y
         self.position[2] += z
+        self._changed()
 
     def rotate(self, x: float, y: float, z: float) -> None:
         """Rotate the transform by the given angles."""
         self.rotation[0] += x
         self.rotation[1] += y
         self.rotation[2] += z
+        self._changed()
 
     def scale_by(self, x: float, y: float, z: float) -> None:
         """Scale the transform by the given factors."""
         self.scale[0] *= x
         self.scale[1] *= y
         self.scale[2] *= z
+        self._changed()
 
     def get_matrix(self) -> List[List[float]]:
-        """Get the transformation matrix (simplified 4x4 matrix)."""
-        # This is a simplified matrix - in a real engine you'd use proper math libraries
-        return [
-            [self.scale[0], 0, 0, self.position[0]],
-            [0, self.scale[1], 0, self.position[1]],
-            [0, 0, self.scale[2], self.position[2]],
-            [0, 0, 0, 1]
-        ]
+        """Get the local transformation matrix as nested lists."""
+        return self.get_local_matrix().tolist()
+
+    def get_local_matrix(self) -> np.ndarray:
+        """Get the local 4x4 matrix, translation * rotation * scale.
+
+        Rotation is XYZ Euler in degrees applied as Rz * Ry * Rx, the same
+        order the physics engine uses. Points are column vectors.
+        """
+        cx, cy, cz = np.cos(np.radians(self.rotation))
+        sx, sy, sz = np.sin(np.radians(self.rotation))
+        matrix = np.array([
+            [cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz, self.position[0]],
+            [cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz, self.position[1]],
+            [-sy, sx * cy, cx * cy, self.position[2]],
+            [0.0, 0.0, 0.0, 1.0]
+        ])
+        matrix[:3, :3] *= self.scale
+        return matrix
 
     def serialize(self) -> Dict[str, Any]:
         """Serialize the transform to a dictionary."""
@@ -80,6 +118,11 @@ class Transform:
 class GameObject:
     """Represents a game object in the scene with components and hierarchy."""
     
+    # Bumped whenever components, children or active state change anywhere
+    structure_version = 0
+    # Bumped whenever any object's layer changes
+    layer_changes = 0
+    
     def __init__(self, name: str = "GameObject"):
         self.id = str(uuid.uuid4())
         self.name = name
@@ -90,6 +133,12 @@ class GameObject:
         self.active = True
         self.tag = ""
         self.layer = 0
+        self.is_static = False  # Never moves; renderers may bake it into static batches
+
+        # Cached world matrix and the versions it was built from
+        self.world_version = 0
+        self._world_matrix: Optional[np.ndarray] = None
+        self._world_key: tuple = ()
 
     def add_component(self, component: 'Component') -> 'Component':
         """Add a component to this GameObject."""
@@ -99,6 +148,7 @@ class GameObject:
         component.game_object = self
         self.components.append(component)
         component._on_initialize()
+        GameObject.structure_version += 1
         return component
 
     def remove_component(self, component: 'Component') -> bool:
@@ -107,6 +157,7 @@ class GameObject:
             component._on_destroy()
             component.game_object = None
             self.components.remove(component)
+            GameObject.structure_version += 1
             return True
         return False
 
@@ -132,12 +183,14 @@ class GameObject:
         
         child.parent = self
         self.children.append(child)
+        GameObject.structure_version += 1
 
     def remove_child(self, child: 'GameObject') -> bool:
         """Remove a child GameObject from this GameObject."""
         if child in self.children:
             child.parent = None
             self.children.remove(child)
+            GameObject.structure_version += 1
             return True
         return False
 
@@ -176,9 +229,31 @@ class GameObject:
             current = current.parent
         return depth
 
+    def get_world_matrix(self) -> np.ndarray:
+        """Get the 4x4 world matrix, parent world * local.
+
+        The result is cached and rebuilt only when this transform or an
+        ancestor's has changed; world_version is bumped on every rebuild.
+        The returned array must not be modified.
+        """
+        if self.parent is not None:
+            parent_matrix = self.parent.get_world_matrix()
+            key = (self.transform.version, id(self.parent), self.parent.world_version)
+        else:
+            parent_matrix = None
+            key = (self.transform.version,)
+        
+        if key != self._world_key:
+            local = self.transform.get_local_matrix()
+            self._world_matrix = local if parent_matrix is None else parent_matrix @ local
+            self._world_key = key
+            self.world_version += 1
+        return self._world_matrix
+
     def set_active(self, active: bool) -> None:
         """Set whether this GameObject is active."""
         self.active = active
+        GameObject.structure_version += 1
 
     def is_active(self) -> bool:
         """Check if this GameObject is active."""
@@ -194,12 +269,18 @@ class GameObject:
 
     def set_layer(self, layer: int) -> None:
         """Set the layer of this GameObject."""
-        self.layer = layer
+        if layer != self.layer:
+            self.layer = layer
+            GameObject.layer_changes += 1
 
     def get_layer(self) -> int:
         """Get the layer of this GameObject."""
         return self.layer
 
+    def set_static(self, is_static: bool) -> None:
+        """Mark this GameObject as static (it will not move at runtime)."""
+        self.is_static = is_static
+
     def update(self, delta_time: float) -> None:
         """Update this GameObject and all its components."""
         if not self.is_active():
@@ -278,7 +359,8 @@ class GameObject:
             'children': [child.serialize() for child in self.children],
             'active': self.active,
             'tag': self.tag,
-            'layer': self.layer
+            'layer': self.layer,
+            'is_static': self.is_static
         }
 
     def deserialize(self, data: Dict[str, Any]) -> None:
@@ -288,6 +370,7 @@ class GameObject:
         self.active = data.get('active', True)
         self.tag = data.get('tag', "")
         self.layer = data.get('layer', 0)
+        self.is_static = data.get('is_static', False)
         
         if 'transform' in data:
             self.transform.deserialize(data['transform'])
@@ -31,6 +31,9 @@ class Scene:
         self.total_play_time = 0.0
         self.logger = get_logger(__name__)
 
+        # Bumped when objects are added or removed
+        self.version = 0
+
     def add_game_object(self, game_object: 'GameObject', parent: Optional['GameObject'] = None) -> 'GameObject':
         """Add a GameObject to the scene."""
         if game_object.id in self.all_objects:
@@ -48,6 +51,7 @@ class Scene:
             self.root_objects.append(game_object)
             game_object.parent = None
         
+        self.version += 1
         self.logger.info(f"Added GameObject '{game_object.name}' to scene '{self.name}'")
         return game_object
 
@@ -70,6 +74,7 @@ class Scene:
         
         # Remove from all objects
         del self.all_objects[game_object.id]
+        self.version += 1
         
         # Destroy the GameObject
         game_object.destroy()
@@ -245,6 +250,7 @@ class Scene:
         self.root_objects.clear()
         self.all_objects.clear()
         self.selected_objects.clear()
+        self.version += 1
         
         # Reset scene state
         self.is_playing = False
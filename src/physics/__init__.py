@@ -9,20 +9,47 @@ This package provides comprehensive physics simulation including:
 - Cloth simulation
 """
 
-from .config import PhysicsConfig, PhysicsStats, PhysicsStepMode
+from .config import PhysicsConfig, PhysicsStats, PhysicsStepMode, TimeDebtPolicy
 from .physics_engine import PhysicsEngine
 from .rigid_body import RigidBody
 from .collision_detector import CollisionDetector
 from .collision_resolver import CollisionResolver
-from .world import PhysicsWorld
+from .world import PhysicsWorld, Constraint
+from .constraint_solver import ConstraintSolver, ConstraintType
+from .island import Island, IslandBuilder
+from .collision_layers import LayerCollisionMatrix
+from .mesh_collider import TriangleMeshBVH
+from .body_state import BodyState
+from .snapshot import SnapshotRing
+from .trigger_system import TriggerSystem
+from .transform_sync import TransformSync
+from .profiler import PhysicsProfiler, StepSample
+from .simulation_farm import SimulationFarm, SimulationJob, SimulationResult
 
 __all__ = [
     'PhysicsConfig',
     'PhysicsStats', 
     'PhysicsStepMode',
+    'TimeDebtPolicy',
     'PhysicsEngine',
     'RigidBody',
     'CollisionDetector', 
     'CollisionResolver',
-    'PhysicsWorld'
+    'PhysicsWorld',
+    'Constraint',
+    'ConstraintSolver',
+    'ConstraintType',
+    'Island',
+    'IslandBuilder',
+    'LayerCollisionMatrix',
+    'TriangleMeshBVH',
+    'BodyState',
+    'SnapshotRing',
+    'TriggerSystem',
+    'TransformSync',
+    'PhysicsProfiler',
+    'StepSample',
+    'SimulationFarm',
+    'SimulationJob',
+    'SimulationResult'
 ]
\ No newline at end of file
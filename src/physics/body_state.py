@@ -0,0 +1,99 @@
+"""
+Body State Arrays for Nexlify Physics Engine.
+
+This module stores rigid body state as float64 structure-of-arrays in
+one contiguous buffer. The buffer can live in shared memory, which lets
+worker processes export simulation results without pickling bodies,
+and it can be hashed to check that two runs match bit for bit.
+"""
+
+import hashlib
+from typing import List, Optional
+
+import numpy as np
+
+from .rigid_body import RigidBody
+
+
+# Order of the per-body vectors in the buffer
+STATE_FIELDS = ("position", "rotation", "linear_velocity", "angular_velocity")
+
+
+class BodyState:
+    """Float64 SoA snapshot of rigid body positions, rotations and velocities."""
+    
+    def __init__(self, capacity: int, buffer: Optional[memoryview] = None, offset: int = 0):
+        """Create body state arrays.
+        
+        Args:
+            capacity: Number of bodies the arrays can hold
+            buffer: Optional external buffer (e.g. shared memory) to use as storage
+            offset: Byte offset of the state inside the buffer
+        """
+        shape = (len(STATE_FIELDS), capacity, 3)
+        if buffer is None:
+            self.data = np.zeros(shape, dtype=np.float64)
+        else:
+            self.data = np.ndarray(shape, dtype=np.float64, buffer=buffer, offset=offset)
+        
+        self.capacity = capacity
+        self.count = 0
+        
+        # One (capacity, 3) array per field
+        self.position, self.rotation, self.linear_velocity, self.angular_velocity = self.data
+    
+    @staticmethod
+    def nbytes(capacity: int) -> int:
+        """Get the buffer size needed for a number of bodies.
+        
+        Args:
+            capacity: Number of bodies
+        
+        Returns:
+            Size in bytes
+        """
+        return len(STATE_FIELDS) * capacity * 3 * np.dtype(np.float64).itemsize
+    
+    def capture(self, bodies: List[RigidBody]):
+        """Copy the state of rigid bodies into the arrays.
+        
+        Args:
+            bodies: Rigid bodies in a stable order
+        """
+        if len(bodies) > self.capacity:
+            raise ValueError(f"{len(bodies)} bodies exceed state capacity {self.capacity}")
+        
+        self.count = len(bodies)
+        for field_index, name in enumerate(STATE_FIELDS):
+            if bodies:
+                self.data[field_index, :self.count] = [getattr(body, name) for body in bodies]
+    
+    def apply(self, bodies: List[RigidBody]):
+        """Write the arrays back to rigid bodies.
+        
+        Args:
+            bodies: Rigid bodies in the order they were captured
+        """
+        for field_index, name in enumerate(STATE_FIELDS):
+            values = self.data[field_index, :len(bodies)].tolist()
+            for body, value in zip(bodies, values):
+                setattr(body, name, value)
+    
+    def copy(self) -> 'BodyState':
+        """Copy the captured bodies into a new, privately owned state.
+        
+        Returns:
+            Body state with its own storage
+        """
+        state = BodyState(self.count)
+        state.data[:] = self.data[:, :self.count]
+        state.count = self.count
+        return state
+    
+    def checksum(self) -> str:
+        """Hash the captured state bit for bit.
+        
+        Returns:
+            Hex digest of the captured arrays
+        """
+        return hashlib.sha256(np.ascontiguousarray(self.data[:, :self.count]).tobytes()).hexdigest()
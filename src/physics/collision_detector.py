@@ -7,10 +7,12 @@ including broad phase and narrow phase collision detection.
 
 import logging
 import math
+import time
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
 from .rigid_body import RigidBody
+from .collision_layers import LayerCollisionMatrix
 from ..utils.logger import get_logger
 
 
@@ -44,15 +46,26 @@ class CollisionDetector:
         self.broad_phase_enabled = True
         self.narrow_phase_enabled = True
         self.contact_generation_enabled = True
+        self.deterministic = False
+        self.ccd_mesh_overlap = 0.005  # Depth swept bodies are left inside a mesh surface
+        
+        # Project-wide layer collision matrix (set by the physics engine)
+        self.layer_matrix = LayerCollisionMatrix()
         
         # Spatial partitioning (placeholder)
         self.spatial_grid_size = 10.0
         self.spatial_grid: Dict[Tuple[int, int, int], List[RigidBody]] = {}
+        self.mesh_bodies: List[RigidBody] = []
         
         # Performance tracking
         self.broad_phase_pairs = 0
         self.narrow_phase_pairs = 0
+        self.filtered_pairs = 0
         self.contact_points_generated = 0
+        self.ccd_bodies = 0
+        self.ccd_hits = 0
+        self.broad_phase_ns = 0
+        self.narrow_phase_ns = 0
         
     def initialize(self) -> bool:
         """Initialize the collision detector.
@@ -88,6 +101,7 @@ class CollisionDetector:
         
         try:
             collision_pairs = []
+            start_ns = time.perf_counter_ns()
             
             # Broad phase collision detection
             if self.broad_phase_enabled:
@@ -97,18 +111,20 @@ class CollisionDetector:
                 potential_pairs = []
                 for i in range(len(bodies)):
                     for j in range(i + 1, len(bodies)):
-                        potential_pairs.append((bodies[i], bodies[j]))
+                        if self.should_collide(bodies[i], bodies[j]):
+                            potential_pairs.append((bodies[i], bodies[j]))
             
             self.broad_phase_pairs = len(potential_pairs)
+            broad_phase_end_ns = time.perf_counter_ns()
             
             # Narrow phase collision detection
             if self.narrow_phase_enabled:
                 for body_a, body_b in potential_pairs:
-                    collision_pair = self._narrow_phase_detection(body_a, body_b)
-                    if collision_pair:
-                        collision_pairs.append(collision_pair)
+                    collision_pairs.extend(self._detect_pair(body_a, body_b))
             
             self.narrow_phase_pairs = len(collision_pairs)
+            self.broad_phase_ns = broad_phase_end_ns - start_ns
+            self.narrow_phase_ns = time.perf_counter_ns() - broad_phase_end_ns
             
             return collision_pairs
             
@@ -130,12 +146,18 @@ class CollisionDetector:
             
             # Clear spatial grid
             self.spatial_grid.clear()
+            self.mesh_bodies = []
             
             # Insert bodies into spatial grid
             for body in bodies:
                 if not body.collision_enabled:
                     continue
                 
+                # Level meshes are large; test them against moving bodies directly
+                if body.mesh_collider is not None:
+                    self.mesh_bodies.append(body)
+                    continue
+                
                 # Get AABB bounds
                 half_size = [s * 0.5 for s in body.scale]
                 min_bounds = [body.position[i] - half_size[i] for i in range(3)]
@@ -155,6 +177,8 @@ class CollisionDetector:
                             self.spatial_grid[cell].append(body)
             
             # Find potential pairs within each cell
+            seen_pairs = set()
+            self.filtered_pairs = 0
             for cell_bodies in self.spatial_grid.values():
                 if len(cell_bodies) < 2:
                     continue
@@ -164,22 +188,274 @@ class CollisionDetector:
                     for j in range(i + 1, len(cell_bodies)):
                         body_a, body_b = cell_bodies[i], cell_bodies[j]
                         
-                        # Skip if both bodies are static
-                        if body_a.is_static_body() and body_b.is_static_body():
+                        # Skip if neither body can move (static or sleeping)
+                        if (body_a.is_static_body() or body_a.is_sleeping()) and \
+                           (body_b.is_static_body() or body_b.is_sleeping()):
+                            continue
+                        
+                        # Order by body id so a pair keeps the same orientation across frames
+                        if body_b.body_id < body_a.body_id:
+                            body_a, body_b = body_b, body_a
+                        
+                        # Bodies spanning several cells would otherwise be paired once per cell
+                        pair_key = (body_a.body_id, body_b.body_id)
+                        if pair_key in seen_pairs:
                             continue
+                        seen_pairs.add(pair_key)
                         
-                        # Skip if both bodies are sleeping
-                        if body_a.is_sleeping() and body_b.is_sleeping():
+                        # Category/mask bits and the layer matrix
+                        if not self.should_collide(body_a, body_b):
+                            self.filtered_pairs += 1
                             continue
                         
                         potential_pairs.append((body_a, body_b))
             
+            # Moving bodies against static meshes
+            for mesh_body in self.mesh_bodies:
+                mesh_min, mesh_max = mesh_body.get_aabb()
+                for body in bodies:
+                    if body.is_static_body() or body.is_sleeping() or not body.collision_enabled:
+                        continue
+                    if body.mesh_collider is not None or not self.should_collide(body, mesh_body):
+                        continue
+                    
+                    body_min, body_max = body.get_aabb()
+                    if any(body_max[i] < mesh_min[i] or body_min[i] > mesh_max[i] for i in range(3)):
+                        continue
+                    
+                    if body.body_id < mesh_body.body_id:
+                        potential_pairs.append((body, mesh_body))
+                    else:
+                        potential_pairs.append((mesh_body, body))
+            
+            # Grid cells are visited in insertion order; sort so the order only depends on the bodies
+            if self.deterministic:
+                potential_pairs.sort(key=lambda pair: (pair[0].body_id, pair[1].body_id))
+            
             return potential_pairs
             
         except Exception as e:
             self.logger.error(f"Error in broad phase detection: {e}")
             return []
     
+    def should_collide(self, body_a: RigidBody, body_b: RigidBody) -> bool:
+        """Check the collision filter of two bodies.
+        
+        Args:
+            body_a: First rigid body
+            body_b: Second rigid body
+            
+        Returns:
+            True if the categories, masks and layers allow a collision
+        """
+        return bool(
+            body_a.collision_category & body_b.collision_mask
+            and body_b.collision_category & body_a.collision_mask
+            and self.layer_matrix.can_layers_collide(body_a.layer, body_b.layer)
+        )
+    
+    def detect_continuous_collisions(self, start_positions: Dict[RigidBody, List[float]],
+                                     collision_pairs: List[CollisionPair]) -> List[CollisionPair]:
+        """Sweep fast bodies over the step to catch tunnelling.
+        
+        Must run after detect_collisions, whose spatial grid supplies the
+        candidates. Bodies that hit something are moved back to their
+        earliest time of impact and get a touching contact, so the resolver
+        removes the approaching velocity.
+        
+        Args:
+            start_positions: Positions of the swept bodies before integration
+            collision_pairs: Collision pairs from discrete detection
+            
+        Returns:
+            Collision pairs with swept contacts added
+        """
+        if not self.is_initialized or not start_positions:
+            return collision_pairs
+        
+        try:
+            self.ccd_bodies = len(start_positions)
+            
+            # Find the earliest impact of every swept body against the state at the end of the step
+            hits: Dict[RigidBody, Tuple[float, int, RigidBody]] = {}
+            for body, start in start_positions.items():
+                hit = self._sweep_body(body, start, start_positions)
+                if hit:
+                    hits[body] = hit
+            
+            self.ccd_hits = len(hits)
+            if not hits:
+                return collision_pairs
+            
+            # Move bodies back to their time of impact
+            for body, (toi, axis, other) in hits.items():
+                start = start_positions[body]
+                body.position = [start[i] + (body.position[i] - start[i]) * toi for i in range(3)]
+            
+            # Pairs found at the end positions of moved bodies are stale
+            result = []
+            pair_keys = set()
+            for pair in collision_pairs:
+                key = (pair.body_a.body_id, pair.body_b.body_id)
+                if pair.body_a in hits or pair.body_b in hits:
+                    if key not in pair_keys:
+                        result.extend(self._detect_pair(pair.body_a, pair.body_b))
+                else:
+                    result.append(pair)
+                pair_keys.add(key)
+            
+            # Add a touching contact at each impact
+            for body, (toi, axis, other) in hits.items():
+                body_a, body_b = (body, other) if body.body_id < other.body_id else (other, body)
+                if (body_a.body_id, body_b.body_id) in pair_keys:
+                    continue
+                
+                # Mesh impacts stop just inside the surface, so the mesh test finds them
+                if axis < 0:
+                    result.extend(self._detect_pair(body_a, body_b))
+                    pair_keys.add((body_a.body_id, body_b.body_id))
+                    continue
+                
+                # Normal points from B towards A, against A's motion relative to B
+                start_a = start_positions.get(body_a, body_a.position)
+                start_b = start_positions.get(body_b, body_b.position)
+                relative_motion = (body_a.position[axis] - start_a[axis]) - (body_b.position[axis] - start_b[axis])
+                normal = [0.0, 0.0, 0.0]
+                normal[axis] = -1.0 if relative_motion > 0 else 1.0
+                
+                half_size_a = [s * 0.5 for s in body_a.scale]
+                half_size_b = [s * 0.5 for s in body_b.scale]
+                min_a = [body_a.position[i] - half_size_a[i] for i in range(3)]
+                max_a = [body_a.position[i] + half_size_a[i] for i in range(3)]
+                min_b = [body_b.position[i] - half_size_b[i] for i in range(3)]
+                max_b = [body_b.position[i] + half_size_b[i] for i in range(3)]
+                
+                contact_points = self._generate_contact_points(
+                    body_a, body_b, min_a, max_a, min_b, max_b, normal, 0.0
+                )
+                if contact_points:
+                    result.append(CollisionPair(
+                        body_a=body_a,
+                        body_b=body_b,
+                        contact_points=contact_points,
+                        normal=normal,
+                        penetration=0.0
+                    ))
+                    pair_keys.add((body_a.body_id, body_b.body_id))
+            
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Error in continuous collision detection: {e}")
+            return collision_pairs
+    
+    def _sweep_body(self, body: RigidBody, start: List[float],
+                    start_positions: Dict[RigidBody, List[float]]) -> Optional[Tuple[float, int, RigidBody]]:
+        """Find the earliest impact of a swept body.
+        
+        Args:
+            body: Swept rigid body
+            start: Position of the body before integration
+            start_positions: Start positions of all swept bodies
+            
+        Returns:
+            (time of impact in [0, 1), entry axis, other body) or None
+        """
+        half_size = [s * 0.5 for s in body.scale]
+        motion = [body.position[i] - start[i] for i in range(3)]
+        
+        # Candidates come from the grid cells covered by the swept AABB
+        swept_min = [min(start[i], body.position[i]) - half_size[i] for i in range(3)]
+        swept_max = [max(start[i], body.position[i]) + half_size[i] for i in range(3)]
+        min_cell = self._world_to_grid(swept_min)
+        max_cell = self._world_to_grid(swept_max)
+        
+        earliest = None
+        tested = {body.body_id}
+        for x in range(min_cell[0], max_cell[0] + 1):
+            for y in range(min_cell[1], max_cell[1] + 1):
+                for z in range(min_cell[2], max_cell[2] + 1):
+                    for other in self.spatial_grid.get((x, y, z), ()):
+                        if other.body_id in tested or other.is_trigger():
+                            continue
+                        tested.add(other.body_id)
+                        if not self.should_collide(body, other):
+                            continue
+                        
+                        # Sweep in the other body's frame against the Minkowski sum of both boxes
+                        other_start = start_positions.get(other, other.position)
+                        origin = [start[i] - other_start[i] for i in range(3)]
+                        relative_motion = [motion[i] - (other.position[i] - other_start[i]) for i in range(3)]
+                        extents = [half_size[i] + other.scale[i] * 0.5 for i in range(3)]
+                        
+                        hit = self._sweep_aabb(origin, relative_motion, extents)
+                        if hit and (earliest is None or hit[0] < earliest[0]):
+                            earliest = (hit[0], hit[1], other)
+        
+        # Static meshes: cast the center and back off by the box's reach along the face normal
+        for mesh_body in self.mesh_bodies:
+            if not self.should_collide(body, mesh_body):
+                continue
+            
+            local_start = [start[i] - mesh_body.position[i] for i in range(3)]
+            hit = mesh_body.mesh_collider.raycast(local_start, motion, 1.0)
+            if not hit or not hit["front_face"]:
+                continue
+            
+            normal = hit["normal"]
+            approach = -sum(motion[i] * normal[i] for i in range(3))
+            if approach <= 1e-9:
+                continue
+            
+            reach = sum(abs(normal[i]) * half_size[i] for i in range(3))
+            toi = (hit["distance"] * approach - reach + self.ccd_mesh_overlap) / approach
+            if 0.0 < toi < 1.0 and (earliest is None or toi < earliest[0]):
+                earliest = (toi, -1, mesh_body)
+        
+        return earliest
+    
+    def _sweep_aabb(self, origin: List[float], motion: List[float],
+                    extents: List[float]) -> Optional[Tuple[float, int]]:
+        """Sweep a point against a box centered on the origin.
+        
+        Args:
+            origin: Start point relative to the box center
+            motion: Displacement over the step
+            extents: Half extents of the box
+            
+        Returns:
+            (time of impact, entry axis) or None if the point does not enter
+            the box during the step or already starts inside it
+        """
+        t_enter = -float('inf')
+        t_exit = float('inf')
+        entry_axis = -1
+        
+        for i in range(3):
+            if abs(motion[i]) < 1e-9:
+                # Moving parallel to the slab
+                if origin[i] < -extents[i] or origin[i] > extents[i]:
+                    return None
+            else:
+                t1 = (-extents[i] - origin[i]) / motion[i]
+                t2 = (extents[i] - origin[i]) / motion[i]
+                
+                if t1 > t2:
+                    t1, t2 = t2, t1
+                
+                if t1 > t_enter:
+                    t_enter = t1
+                    entry_axis = i
+                t_exit = min(t_exit, t2)
+                
+                if t_enter > t_exit:
+                    return None
+        
+        if entry_axis < 0 or t_enter <= 0.0 or t_enter >= 1.0:
+            return None
+        
+        return t_enter, entry_axis
+    
     def _world_to_grid(self, position: List[float]) -> Tuple[int, int, int]:
         """Convert world position to grid coordinates.
         
@@ -195,6 +471,67 @@ class CollisionDetector:
             int(position[2] // self.spatial_grid_size)
         )
     
+    def _detect_pair(self, body_a: RigidBody, body_b: RigidBody) -> List[CollisionPair]:
+        """Run the narrow phase test that matches the bodies' colliders.
+        
+        Args:
+            body_a: First rigid body
+            body_b: Second rigid body
+        
+        Returns:
+            Collision pairs (a mesh contact can yield one per face normal)
+        """
+        if body_a.mesh_collider is not None or body_b.mesh_collider is not None:
+            return self._mesh_narrow_phase(body_a, body_b)
+        
+        collision_pair = self._narrow_phase_detection(body_a, body_b)
+        return [collision_pair] if collision_pair else []
+    
+    def _mesh_narrow_phase(self, body_a: RigidBody, body_b: RigidBody) -> List[CollisionPair]:
+        """Box versus static triangle mesh.
+        
+        Args:
+            body_a: First rigid body
+            body_b: Second rigid body
+        
+        Returns:
+            One collision pair per group of contacts sharing a face normal
+        """
+        try:
+            if body_a.mesh_collider is not None and body_b.mesh_collider is not None:
+                return []
+            
+            # Normals point from B towards A; mesh normals point out of the mesh
+            if body_b.mesh_collider is not None:
+                mesh_body, box_body, sign = body_b, body_a, 1.0
+            else:
+                mesh_body, box_body, sign = body_a, body_b, -1.0
+            
+            center = [box_body.position[i] - mesh_body.position[i] for i in range(3)]
+            half_size = [s * 0.5 for s in box_body.scale]
+            
+            collision_pairs = []
+            for normal, contact_points, penetration in mesh_body.mesh_collider.box_contacts(center, half_size):
+                normal = [n * sign for n in normal]
+                for contact in contact_points:
+                    contact["position"] = [contact["position"][i] + mesh_body.position[i] for i in range(3)]
+                    contact["normal"] = normal.copy()
+                
+                collision_pairs.append(CollisionPair(
+                    body_a=body_a,
+                    body_b=body_b,
+                    contact_points=contact_points,
+                    normal=normal,
+                    penetration=penetration
+                ))
+                self.contact_points_generated += len(contact_points)
+            
+            return collision_pairs
+        
+        except Exception as e:
+            self.logger.error(f"Error in mesh narrow phase: {e}")
+            return []
+    
     def _narrow_phase_detection(self, body_a: RigidBody, body_b: RigidBody) -> Optional[CollisionPair]:
         """Narrow phase collision detection between two bodies.
         
@@ -229,17 +566,19 @@ class CollisionDetector:
             if not overlap:
                 return None
             
-            # Calculate collision information
-            contact_points = self._generate_contact_points(body_a, body_b, min_a, max_a, min_b, max_b)
-            
-            if not contact_points:
-                return None
-            
             # Calculate collision normal and penetration
             normal, penetration = self._calculate_collision_normal_and_penetration(
                 body_a, body_b, min_a, max_a, min_b, max_b
             )
             
+            # Calculate collision information
+            contact_points = self._generate_contact_points(
+                body_a, body_b, min_a, max_a, min_b, max_b, normal, penetration
+            )
+            
+            if not contact_points:
+                return None
+            
             collision_pair = CollisionPair(
                 body_a=body_a,
                 body_b=body_b,
@@ -258,9 +597,13 @@ class CollisionDetector:
     
     def _generate_contact_points(self, body_a: RigidBody, body_b: RigidBody,
                                min_a: List[float], max_a: List[float],
-                               min_b: List[float], max_b: List[float]) -> List[Dict[str, Any]]:
+                               min_b: List[float], max_b: List[float],
+                               normal: List[float], penetration: float) -> List[Dict[str, Any]]:
         """Generate contact points between two AABBs.
         
+        Each contact point carries a feature "id" that stays the same while
+        the bodies keep touching, so the resolver can warm start it.
+        
         Args:
             body_a: First rigid body
             body_b: Second rigid body
@@ -268,6 +611,8 @@ class CollisionDetector:
             max_a: Maximum bounds of body A
             min_b: Minimum bounds of body B
             max_b: Maximum bounds of body B
+            normal: Collision normal (from B towards A)
+            penetration: Penetration depth
             
         Returns:
             List of contact points
@@ -275,45 +620,47 @@ class CollisionDetector:
         try:
             contact_points = []
             
+            # Find the overlapping region
+            overlap_min = [max(min_a[i], min_b[i]) for i in range(3)]
+            overlap_max = [min(max_a[i], max_b[i]) for i in range(3)]
+            
             if not self.contact_generation_enabled:
                 # Return a single contact point at the center of overlap
-                overlap_center = [
-                    (min(max_a[i], max_b[i]) + max(min_a[i], min_b[i])) * 0.5
-                    for i in range(3)
-                ]
+                overlap_center = [(overlap_min[i] + overlap_max[i]) * 0.5 for i in range(3)]
                 
                 contact_point = {
+                    "id": 0,
                     "position": overlap_center,
-                    "normal": [0.0, 1.0, 0.0],  # Placeholder normal
-                    "penetration": 0.0,  # Will be calculated separately
+                    "normal": normal.copy(),
+                    "penetration": penetration,
                     "separation_velocity": 0.0
                 }
                 contact_points.append(contact_point)
             else:
-                # Generate multiple contact points for AABB-AABB collision
-                # This is a simplified implementation
-                
-                # Find the overlapping region
-                overlap_min = [max(min_a[i], min_b[i]) for i in range(3)]
-                overlap_max = [min(max_a[i], max_b[i]) for i in range(3)]
+                # Generate the four corners of the overlap face perpendicular to the normal,
+                # placed halfway through the penetration
+                axis = max(range(3), key=lambda i: abs(normal[i]))
+                u_axis, v_axis = [i for i in range(3) if i != axis]
+                depth = (overlap_min[axis] + overlap_max[axis]) * 0.5
                 
-                # Generate contact points at corners of overlap region
-                corners = [
-                    [overlap_min[0], overlap_min[1], overlap_min[2]],
-                    [overlap_max[0], overlap_min[1], overlap_min[2]],
-                    [overlap_min[0], overlap_max[1], overlap_min[2]],
-                    [overlap_max[0], overlap_max[1], overlap_min[2]],
-                    [overlap_min[0], overlap_min[1], overlap_max[2]],
-                    [overlap_max[0], overlap_min[1], overlap_max[2]],
-                    [overlap_min[0], overlap_max[1], overlap_max[2]],
-                    [overlap_max[0], overlap_max[1], overlap_max[2]]
+                face_corners = [
+                    (overlap_min[u_axis], overlap_min[v_axis]),
+                    (overlap_max[u_axis], overlap_min[v_axis]),
+                    (overlap_max[u_axis], overlap_max[v_axis]),
+                    (overlap_min[u_axis], overlap_max[v_axis])
                 ]
                 
-                for corner in corners:
+                for feature_id, (u, v) in enumerate(face_corners):
+                    position = [0.0, 0.0, 0.0]
+                    position[axis] = depth
+                    position[u_axis] = u
+                    position[v_axis] = v
+                    
                     contact_point = {
-                        "position": corner,
-                        "normal": [0.0, 1.0, 0.0],  # Placeholder normal
-                        "penetration": 0.0,  # Will be calculated separately
+                        "id": feature_id,
+                        "position": position,
+                        "normal": normal.copy(),
+                        "penetration": penetration,
                         "separation_velocity": 0.0
                     }
                     contact_points.append(contact_point)
@@ -394,6 +741,20 @@ class CollisionDetector:
                 if not body.collision_enabled:
                     continue
                 
+                # Triangle meshes report the exact face hit
+                if body.mesh_collider is not None:
+                    local_origin = [origin[i] - body.position[i] for i in range(3)]
+                    hit = body.mesh_collider.raycast(local_origin, direction, closest_distance)
+                    if hit:
+                        closest_distance = hit["distance"]
+                        closest_hit = {
+                            "body": body,
+                            "distance": hit["distance"],
+                            "point": [origin[i] + direction[i] * hit["distance"] for i in range(3)],
+                            "normal": hit["normal"]
+                        }
+                    continue
+                
                 # Simple AABB raycast
                 hit_distance = self._raycast_aabb(origin, direction, body)
                 
@@ -458,6 +819,14 @@ class CollisionDetector:
             self.logger.error(f"Error in AABB raycast: {e}")
             return None
     
+    def get_grid_occupancy(self) -> Dict[Tuple[int, int, int], int]:
+        """Get the number of bodies in each occupied grid cell.
+        
+        Returns:
+            Body count keyed by grid cell, as of the last broad phase
+        """
+        return {cell: len(cell_bodies) for cell, cell_bodies in self.spatial_grid.items()}
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get collision detector statistics.
         
@@ -467,8 +836,13 @@ class CollisionDetector:
         return {
             "broad_phase_pairs": self.broad_phase_pairs,
             "narrow_phase_pairs": self.narrow_phase_pairs,
+            "filtered_pairs": self.filtered_pairs,
             "contact_points_generated": self.contact_points_generated,
-            "spatial_grid_cells": len(self.spatial_grid)
+            "ccd_bodies": self.ccd_bodies,
+            "ccd_hits": self.ccd_hits,
+            "spatial_grid_cells": len(self.spatial_grid),
+            "broad_phase_ns": self.broad_phase_ns,
+            "narrow_phase_ns": self.narrow_phase_ns
         }
     
     def shutdown(self):
@@ -0,0 +1,111 @@
+"""
+Collision Layers for Nexlify Physics Engine.
+
+This module provides the project-wide layer collision matrix. Every body
+sits on one of 32 layers (its GameObject's layer) and the matrix decides
+which layer pairs may collide. Bodies can further narrow this with their
+own 32-bit category and mask bits.
+"""
+
+from typing import Dict, Any, List, Optional
+
+
+MAX_LAYERS = 32
+ALL_LAYERS = (1 << MAX_LAYERS) - 1
+
+
+class LayerCollisionMatrix:
+    """Symmetric 32x32 matrix of layers that may collide, stored as bitmasks."""
+    
+    def __init__(self):
+        # Row i has bit j set if layer i collides with layer j
+        self._masks: List[int] = [ALL_LAYERS] * MAX_LAYERS
+        self.layer_names: Dict[int, str] = {0: "Default"}
+    
+    def set_layer_collision(self, layer_a: int, layer_b: int, enabled: bool):
+        """Enable or disable collisions between two layers.
+        
+        Args:
+            layer_a: First layer (0-31)
+            layer_b: Second layer (0-31)
+            enabled: Whether bodies on these layers collide
+        """
+        self._check_layer(layer_a)
+        self._check_layer(layer_b)
+        
+        if enabled:
+            self._masks[layer_a] |= 1 << layer_b
+            self._masks[layer_b] |= 1 << layer_a
+        else:
+            self._masks[layer_a] &= ~(1 << layer_b)
+            self._masks[layer_b] &= ~(1 << layer_a)
+    
+    def can_layers_collide(self, layer_a: int, layer_b: int) -> bool:
+        """Check if two layers collide.
+        
+        Args:
+            layer_a: First layer
+            layer_b: Second layer
+        
+        Returns:
+            True if bodies on these layers collide, False otherwise
+        """
+        return bool(self._masks[layer_a] >> layer_b & 1)
+    
+    def get_layer_mask(self, layer: int) -> int:
+        """Get the bitmask of layers a layer collides with.
+        
+        Args:
+            layer: Layer (0-31)
+        
+        Returns:
+            32-bit layer mask
+        """
+        return self._masks[layer]
+    
+    def set_layer_name(self, layer: int, name: str):
+        """Name a layer for editors and serialization.
+        
+        Args:
+            layer: Layer (0-31)
+            name: Display name
+        """
+        self._check_layer(layer)
+        self.layer_names[layer] = name
+    
+    def get_layer_by_name(self, name: str) -> Optional[int]:
+        """Find a layer by name.
+        
+        Args:
+            name: Layer name
+        
+        Returns:
+            Layer index or None if no layer has that name
+        """
+        for layer, layer_name in self.layer_names.items():
+            if layer_name == name:
+                return layer
+        return None
+    
+    def reset(self):
+        """Let every layer collide with every other layer."""
+        self._masks = [ALL_LAYERS] * MAX_LAYERS
+    
+    def _check_layer(self, layer: int):
+        """Validate a layer index."""
+        if not 0 <= layer < MAX_LAYERS:
+            raise ValueError(f"Layer must be between 0 and {MAX_LAYERS - 1}, got {layer}")
+    
+    def serialize(self) -> Dict[str, Any]:
+        """Serialize the matrix."""
+        return {
+            'masks': list(self._masks),
+            'layer_names': {str(layer): name for layer, name in self.layer_names.items()}
+        }
+    
+    def deserialize(self, data: Dict[str, Any]) -> None:
+        """Deserialize the matrix."""
+        masks = data.get('masks', [])
+        self._masks = [int(mask) & ALL_LAYERS for mask in masks[:MAX_LAYERS]]
+        self._masks.extend([ALL_LAYERS] * (MAX_LAYERS - len(self._masks)))
+        self.layer_names = {int(layer): name for layer, name in data.get('layer_names', {}).items()}
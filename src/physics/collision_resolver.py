@@ -1,20 +1,39 @@
 """
 Collision Resolver for Nexlify Physics Engine.
 
-This module provides collision response and resolution including
-impulse-based collision response and constraint solving.
+This module provides collision response and resolution using a
+sequential-impulse solver with persistent contacts and warm starting.
 """
 
 import logging
 import math
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field
 
 from .collision_detector import CollisionPair
+from .constraint_solver import ConstraintSolver, ConstraintBatch
 from .rigid_body import RigidBody
 from ..utils.logger import get_logger
 
 
+# Persistent contact key: (body_a id, body_b id, contact feature id)
+ContactKey = Tuple[int, int, int]
+
+
+@dataclass
+class ContactConstraint:
+    """Solver state for a single contact point."""
+    key: ContactKey
+    r_a: List[float]
+    r_b: List[float]
+    tangents: List[List[float]]
+    normal_mass: float
+    tangent_mass: List[float]
+    velocity_bias: float = 0.0
+    normal_impulse: float = 0.0
+    tangent_impulse: List[float] = field(default_factory=lambda: [0.0, 0.0])
+
+
 @dataclass
 class ContactManifold:
     """Contact manifold for collision resolution."""
@@ -25,6 +44,24 @@ class ContactManifold:
     penetration: float
     restitution: float
     friction: float
+    contacts: List[ContactConstraint] = field(default_factory=list)
+    correction: float = 0.0  # Penetration already removed by the position solver
+
+
+@dataclass
+class IslandSolution:
+    """Impulses and counters from solving one island.
+    
+    Islands may be solved on worker threads, so nothing is written to the
+    resolver while solving; the solutions are merged once all islands of
+    a step are done.
+    """
+    impulses: Dict[ContactKey, Tuple[float, float, float]] = field(default_factory=dict)
+    collisions_resolved: int = 0
+    impulses_applied: int = 0
+    warm_started_contacts: int = 0
+    iterations_used: int = 0
+    residual: float = 0.0  # Largest impulse change in the final velocity iteration
 
 
 class CollisionResolver:
@@ -36,14 +73,27 @@ class CollisionResolver:
         
         # Resolution settings
         self.position_iterations = 4
-        self.velocity_iterations = 8
+        self.velocity_iterations = 4  # Warm starting converges in far fewer iterations
+        self.velocity_tolerance = 1e-3  # Impulse change that ends the velocity iterations early
         self.bias_factor = 0.2
         self.max_penetration = 0.01
+        self.restitution_threshold = 1.0  # Approach speed below which bounces are ignored
+        self.warm_starting = True
+        
+        # Persistent contacts: accumulated (normal, tangent1, tangent2) impulses keyed by contact id
+        self.contact_cache: Dict[ContactKey, Tuple[float, float, float]] = {}
+        self._touched_keys: set = set()
+        
+        # Joint constraints solved in the same velocity iterations as contacts
+        self.constraint_solver: Optional[ConstraintSolver] = None
         
         # Performance tracking
         self.collisions_resolved = 0
         self.impulses_applied = 0
-        
+        self.warm_started_contacts = 0
+        self.last_residual = 0.0  # Largest impulse change in the final velocity iteration
+        self.iterations_used = 0  # Solver iterations run this step, summed over islands
+    
     def initialize(self) -> bool:
         """Initialize the collision resolver.
         
@@ -53,23 +103,59 @@ class CollisionResolver:
         try:
             self.logger.info("Initializing collision resolver...")
             
+            self.contact_cache.clear()
+            self._touched_keys.clear()
+            
             self.is_initialized = True
             self.logger.info("✅ Collision resolver initialized successfully")
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to initialize collision resolver: {e}")
             return False
     
-    def resolve_collisions(self, collision_pairs: List[CollisionPair], delta_time: float):
+    def begin_step(self):
+        """Begin a physics step (resets per-step contact bookkeeping)."""
+        self._touched_keys = set()
+        self.last_residual = 0.0
+        self.iterations_used = 0
+    
+    def end_step(self):
+        """End a physics step and drop cached contacts that were not touched."""
+        stale_keys = [key for key in self.contact_cache if key not in self._touched_keys]
+        for key in stale_keys:
+            del self.contact_cache[key]
+    
+    def resolve_collisions(self, collision_pairs: List[CollisionPair], delta_time: float,
+                           constraints: Optional[List[Any]] = None):
         """Resolve collisions between rigid bodies.
         
         Args:
             collision_pairs: List of collision pairs to resolve
             delta_time: Time step
+            constraints: Joint constraints to solve alongside the contacts
+        """
+        self.merge_solution(self.solve_island(collision_pairs, delta_time, constraints))
+    
+    def solve_island(self, collision_pairs: List[CollisionPair], delta_time: float,
+                     constraints: Optional[List[Any]] = None) -> IslandSolution:
+        """Solve the contacts and joints of one island.
+        
+        Only the island's bodies are written, so islands that share no
+        dynamic bodies can be solved concurrently. The result must be
+        passed to merge_solution afterwards.
+        
+        Args:
+            collision_pairs: Collision pairs of the island
+            delta_time: Time step
+            constraints: Joint constraints to solve alongside the contacts
+        
+        Returns:
+            Accumulated impulses and counters of the island
         """
+        solution = IslandSolution()
         if not self.is_initialized:
-            return
+            return solution
         
         try:
             # Convert collision pairs to contact manifolds
@@ -80,25 +166,54 @@ class CollisionResolver:
                     contact_manifolds.append(manifold)
             
             # Resolve positions (penetration correction)
-            self._resolve_positions(contact_manifolds, delta_time)
+            position_iterations = self._resolve_positions(contact_manifolds, delta_time)
+            
+            # Gather joint rows for this set of bodies
+            batch = None
+            if constraints and self.constraint_solver:
+                batch = self.constraint_solver.create_batch(constraints, delta_time)
             
-            # Resolve velocities (impulse response)
-            self._resolve_velocities(contact_manifolds, delta_time)
+            # Resolve velocities (sequential impulses)
+            velocity_iterations = self._resolve_velocities(contact_manifolds, delta_time, batch, solution)
             
-            self.collisions_resolved += len(contact_manifolds)
+            # Keep accumulated impulses for warm starting the next step
+            self._store_impulses(contact_manifolds, solution)
             
+            solution.collisions_resolved = len(contact_manifolds)
+            solution.iterations_used = position_iterations + velocity_iterations
+        
         except Exception as e:
             self.logger.error(f"Error resolving collisions: {e}")
+        
+        return solution
+    
+    def merge_solution(self, solution: IslandSolution):
+        """Fold an island's impulses and counters into the resolver.
+        
+        Args:
+            solution: Result of solve_island
+        """
+        self.contact_cache.update(solution.impulses)
+        self._touched_keys.update(solution.impulses)
+        self.collisions_resolved += solution.collisions_resolved
+        self.impulses_applied += solution.impulses_applied
+        self.warm_started_contacts += solution.warm_started_contacts
+        self.iterations_used += solution.iterations_used
+        self.last_residual = max(self.last_residual, solution.residual)
     
     def _create_contact_manifold(self, pair: CollisionPair) -> Optional[ContactManifold]:
         """Create a contact manifold from a collision pair.
         
         Args:
             pair: Collision pair
-            
+        
         Returns:
             Contact manifold or None if invalid
         """
+        # Triggers only report overlaps, they never push bodies apart
+        if pair.body_a.trigger or pair.body_b.trigger:
+            return None
+        
         try:
             # Calculate combined material properties
             material_a = pair.body_a.get_material()
@@ -120,33 +235,129 @@ class CollisionResolver:
                 friction=friction
             )
             
-            return manifold
+            self._prepare_contacts(manifold)
             
+            return manifold
+        
         except Exception as e:
             self.logger.error(f"Error creating contact manifold: {e}")
             return None
     
-    def _resolve_positions(self, manifolds: List[ContactManifold], delta_time: float):
+    def _prepare_contacts(self, manifold: ContactManifold):
+        """Build solver contacts and precompute their effective masses.
+        
+        Args:
+            manifold: Contact manifold
+        """
+        body_a = manifold.body_a
+        body_b = manifold.body_b
+        normal = manifold.normal
+        tangents = self._tangent_basis(normal)
+        inv_mass_sum = body_a.inverse_mass + body_b.inverse_mass
+        
+        for index, point in enumerate(manifold.contact_points):
+            position = point["position"]
+            r_a = [position[i] - body_a.position[i] for i in range(3)]
+            r_b = [position[i] - body_b.position[i] for i in range(3)]
+            
+            normal_mass = self._effective_mass(body_a, body_b, r_a, r_b, normal, inv_mass_sum)
+            tangent_mass = [
+                self._effective_mass(body_a, body_b, r_a, r_b, tangent, inv_mass_sum)
+                for tangent in tangents
+            ]
+            
+            # Restitution target from the approach speed before solving
+            relative_velocity = self._calculate_relative_velocity(body_a, body_b, r_a, r_b)
+            approach_speed = self._dot(relative_velocity, normal)
+            velocity_bias = 0.0
+            if approach_speed < -self.restitution_threshold:
+                velocity_bias = -manifold.restitution * approach_speed
+            
+            contact = ContactConstraint(
+                key=(body_a.body_id, body_b.body_id, point.get("id", index)),
+                r_a=r_a,
+                r_b=r_b,
+                tangents=tangents,
+                normal_mass=normal_mass,
+                tangent_mass=tangent_mass,
+                velocity_bias=velocity_bias
+            )
+            
+            # Warm start from the impulses this contact accumulated last step
+            cached = self.contact_cache.get(contact.key) if self.warm_starting else None
+            if cached:
+                contact.normal_impulse = cached[0]
+                contact.tangent_impulse = [cached[1], cached[2]]
+            
+            manifold.contacts.append(contact)
+    
+    def _effective_mass(self, body_a: RigidBody, body_b: RigidBody,
+                        r_a: List[float], r_b: List[float], direction: List[float],
+                        inv_mass_sum: float) -> float:
+        """Calculate the effective mass of a contact along a direction.
+        
+        Args:
+            body_a: First rigid body
+            body_b: Second rigid body
+            r_a: Contact offset from body A's center
+            r_b: Contact offset from body B's center
+            direction: Constraint direction
+            inv_mass_sum: Sum of inverse masses
+        
+        Returns:
+            Effective mass (0 if both bodies are immovable)
+        """
+        rn_a = self._cross(r_a, direction)
+        rn_b = self._cross(r_b, direction)
+        
+        k = inv_mass_sum
+        for body, rn in ((body_a, rn_a), (body_b, rn_b)):
+            if body.is_static_body():
+                continue
+            for i in range(3):
+                k += rn[i] * rn[i] * body.inverse_inertia_tensor[i][i]
+        
+        return 1.0 / k if k > 0.0 else 0.0
+    
+    def _resolve_positions(self, manifolds: List[ContactManifold], delta_time: float) -> int:
         """Resolve position penetrations.
         
         Args:
             manifolds: List of contact manifolds
             delta_time: Time step
+        
+        Returns:
+            Number of iterations run
         """
+        iterations = 0
+        if not manifolds:
+            return iterations
+        
         try:
             for iteration in range(self.position_iterations):
+                iterations += 1
+                corrected = False
                 for manifold in manifolds:
-                    self._resolve_position_manifold(manifold, delta_time)
-                    
+                    corrected = self._resolve_position_manifold(manifold, delta_time) or corrected
+                
+                # Every manifold is within the allowed slop
+                if not corrected:
+                    break
+        
         except Exception as e:
             self.logger.error(f"Error resolving positions: {e}")
     
-    def _resolve_position_manifold(self, manifold: ContactManifold, delta_time: float):
+        return iterations
+    
+    def _resolve_position_manifold(self, manifold: ContactManifold, delta_time: float) -> bool:
         """Resolve position penetration for a single manifold.
         
         Args:
             manifold: Contact manifold
             delta_time: Time step
+        
+        Returns:
+            True if the bodies were moved
         """
         try:
             body_a = manifold.body_a
@@ -154,12 +365,12 @@ class CollisionResolver:
             
             # Skip if both bodies are static
             if body_a.is_static_body() and body_b.is_static_body():
-                return
+                return False
             
-            # Calculate separation impulse
-            separation = manifold.penetration - self.max_penetration
+            # Remaining penetration beyond the allowed slop
+            separation = manifold.penetration - manifold.correction - self.max_penetration
             if separation <= 0:
-                return
+                return False
             
             # Calculate effective mass
             inv_mass_a = body_a.inverse_mass
@@ -167,46 +378,123 @@ class CollisionResolver:
             total_inv_mass = inv_mass_a + inv_mass_b
             
             if total_inv_mass <= 0:
-                return
+                return False
             
-            # Calculate separation impulse
-            impulse_magnitude = separation / total_inv_mass * self.bias_factor / delta_time
-            
-            # Apply separation impulse
-            impulse = [manifold.normal[i] * impulse_magnitude for i in range(3)]
+            # Remove a fraction of the remaining penetration, split by inverse mass
+            correction = separation * self.bias_factor
+            manifold.correction += correction
+            correction_per_mass = correction / total_inv_mass
             
             if not body_a.is_static_body():
                 for i in range(3):
-                    body_a.position[i] += impulse[i] * inv_mass_a
+                    body_a.position[i] += manifold.normal[i] * correction_per_mass * inv_mass_a
             
             if not body_b.is_static_body():
                 for i in range(3):
-                    body_b.position[i] -= impulse[i] * inv_mass_b
-            
+                    body_b.position[i] -= manifold.normal[i] * correction_per_mass * inv_mass_b
+        
+            return True
+        
         except Exception as e:
             self.logger.error(f"Error resolving position manifold: {e}")
+            return False
     
-    def _resolve_velocities(self, manifolds: List[ContactManifold], delta_time: float):
+    def _resolve_velocities(self, manifolds: List[ContactManifold], delta_time: float,
+                            batch: Optional[ConstraintBatch], solution: IslandSolution) -> int:
         """Resolve velocity impulses.
         
+        Contacts stop iterating once no impulse changes by more than
+        velocity_tolerance; joint rows have no residual and always run
+        every iteration.
+        
         Args:
             manifolds: List of contact manifolds
             delta_time: Time step
+            batch: Joint constraint rows sharing the iteration loop
+            solution: Island counters to update
+        
+        Returns:
+            Number of iterations run
         """
+        iterations = 0
+        if not manifolds and not batch:
+            return iterations
+        
         try:
+            # Joint rows work on gathered arrays; they only need syncing with the
+            # bodies when contacts are solved in between
+            sync = batch is not None and bool(manifolds)
+            
+            # Re-apply last step's impulses so the solver starts near the solution
+            if self.warm_starting:
+                for manifold in manifolds:
+                    self._warm_start_manifold(manifold, solution)
+                if batch:
+                    if sync:
+                        batch.gather_velocities()
+                    batch.warm_start()
+                    if sync:
+                        batch.scatter_velocities()
+            
+            # Stays zero if no velocity iterations are configured
+            residual = 0.0
             for iteration in range(self.velocity_iterations):
+                iterations += 1
+                residual = 0.0
                 for manifold in manifolds:
-                    self._resolve_velocity_manifold(manifold, delta_time)
-                    
+                    residual = max(residual, self._resolve_velocity_manifold(manifold, delta_time, solution))
+                
+                if batch:
+                    if sync:
+                        batch.gather_velocities()
+                    batch.solve_velocities()
+                    if sync:
+                        batch.scatter_velocities()
+                elif residual <= self.velocity_tolerance:
+                    break
+            
+            if batch:
+                batch.finish()
+            
+            if manifolds:
+                solution.residual = max(solution.residual, residual)
+        
         except Exception as e:
             self.logger.error(f"Error resolving velocities: {e}")
+        
+        return iterations
     
-    def _resolve_velocity_manifold(self, manifold: ContactManifold, delta_time: float):
+    def _warm_start_manifold(self, manifold: ContactManifold, solution: IslandSolution):
+        """Apply cached accumulated impulses for a manifold.
+        
+        Args:
+            manifold: Contact manifold
+            solution: Island counters to update
+        """
+        for contact in manifold.contacts:
+            if contact.normal_impulse == 0.0 and contact.tangent_impulse == [0.0, 0.0]:
+                continue
+            
+            impulse = [
+                manifold.normal[i] * contact.normal_impulse
+                + contact.tangents[0][i] * contact.tangent_impulse[0]
+                + contact.tangents[1][i] * contact.tangent_impulse[1]
+                for i in range(3)
+            ]
+            self._apply_impulse_pair(manifold.body_a, manifold.body_b, contact, impulse)
+            solution.warm_started_contacts += 1
+    
+    def _resolve_velocity_manifold(self, manifold: ContactManifold, delta_time: float,
+                                   solution: IslandSolution) -> float:
         """Resolve velocity impulses for a single manifold.
         
         Args:
             manifold: Contact manifold
             delta_time: Time step
+            solution: Island counters to update
+        
+        Returns:
+            Largest absolute impulse change applied
         """
         try:
             body_a = manifold.body_a
@@ -214,137 +502,178 @@ class CollisionResolver:
             
             # Skip if both bodies are static
             if body_a.is_static_body() and body_b.is_static_body():
-                return
-            
-            # Calculate relative velocity
-            relative_velocity = self._calculate_relative_velocity(body_a, body_b, manifold.normal)
-            
-            # Calculate separation velocity
-            separation_velocity = sum(relative_velocity[i] * manifold.normal[i] for i in range(3))
-            
-            # Don't resolve if objects are separating
-            if separation_velocity > 0:
-                return
-            
-            # Calculate effective mass
-            inv_mass_a = body_a.inverse_mass
-            inv_mass_b = body_b.inverse_mass
-            total_inv_mass = inv_mass_a + inv_mass_b
-            
-            if total_inv_mass <= 0:
-                return
-            
-            # Calculate impulse magnitude
-            impulse_magnitude = -(1 + manifold.restitution) * separation_velocity / total_inv_mass
-            
-            # Apply normal impulse
-            normal_impulse = [manifold.normal[i] * impulse_magnitude for i in range(3)]
-            
-            if not body_a.is_static_body():
-                for i in range(3):
-                    body_a.linear_velocity[i] += normal_impulse[i] * inv_mass_a
-            
-            if not body_b.is_static_body():
-                for i in range(3):
-                    body_b.linear_velocity[i] -= normal_impulse[i] * inv_mass_b
-            
-            # Apply friction impulse
-            self._apply_friction_impulse(manifold, normal_impulse, delta_time)
-            
-            self.impulses_applied += 1
-            
+                return 0.0
+            
+            residual = 0.0
+            normal = manifold.normal
+            
+            for contact in manifold.contacts:
+                # Friction first so the normal constraint has the final word
+                residual = max(residual, self._apply_friction_impulse(manifold, contact, delta_time))
+                
+                # Normal impulse with accumulated clamping
+                relative_velocity = self._calculate_relative_velocity(body_a, body_b, contact.r_a, contact.r_b)
+                normal_velocity = self._dot(relative_velocity, normal)
+                
+                delta = contact.normal_mass * (contact.velocity_bias - normal_velocity)
+                old_impulse = contact.normal_impulse
+                contact.normal_impulse = max(old_impulse + delta, 0.0)
+                delta = contact.normal_impulse - old_impulse
+                
+                if delta != 0.0:
+                    impulse = [normal[i] * delta for i in range(3)]
+                    self._apply_impulse_pair(body_a, body_b, contact, impulse)
+                    solution.impulses_applied += 1
+                
+                residual = max(residual, abs(delta))
+            
+            return residual
+        
         except Exception as e:
             self.logger.error(f"Error resolving velocity manifold: {e}")
+            return 0.0
     
-    def _calculate_relative_velocity(self, body_a: RigidBody, body_b: RigidBody, 
-                                   normal: List[float]) -> List[float]:
-        """Calculate relative velocity between two bodies.
+    def _calculate_relative_velocity(self, body_a: RigidBody, body_b: RigidBody,
+                                   r_a: List[float], r_b: List[float]) -> List[float]:
+        """Calculate relative velocity between two bodies at a contact point.
         
         Args:
             body_a: First rigid body
             body_b: Second rigid body
-            normal: Contact normal
-            
+            r_a: Contact offset from body A's center
+            r_b: Contact offset from body B's center
+        
         Returns:
-            Relative velocity vector
+            Relative velocity vector (A relative to B)
         """
         try:
-            # Simple relative velocity calculation
-            # In a real physics engine, this would account for angular velocity
-            # and contact point positions
+            # v + w x r for each body
+            angular_a = self._cross(body_a.angular_velocity, r_a)
+            angular_b = self._cross(body_b.angular_velocity, r_b)
             
             relative_velocity = [
-                body_a.linear_velocity[i] - body_b.linear_velocity[i]
+                (body_a.linear_velocity[i] + angular_a[i]) - (body_b.linear_velocity[i] + angular_b[i])
                 for i in range(3)
             ]
             
             return relative_velocity
-            
+        
         except Exception as e:
             self.logger.error(f"Error calculating relative velocity: {e}")
             return [0.0, 0.0, 0.0]
     
-    def _apply_friction_impulse(self, manifold: ContactManifold, normal_impulse: List[float], 
-                              delta_time: float):
-        """Apply friction impulse.
+    def _apply_friction_impulse(self, manifold: ContactManifold, contact: ContactConstraint,
+                              delta_time: float) -> float:
+        """Apply friction impulse along both contact tangents.
         
         Args:
             manifold: Contact manifold
-            normal_impulse: Normal impulse vector
+            contact: Contact being solved
             delta_time: Time step
+        
+        Returns:
+            Largest absolute impulse change applied
         """
         try:
             body_a = manifold.body_a
             body_b = manifold.body_b
             
-            # Skip if both bodies are static
-            if body_a.is_static_body() and body_b.is_static_body():
-                return
-            
-            # Calculate tangent velocity
-            relative_velocity = self._calculate_relative_velocity(body_a, body_b, manifold.normal)
-            
-            # Project relative velocity onto tangent plane
-            tangent_velocity = [
-                relative_velocity[i] - sum(relative_velocity[j] * manifold.normal[j] for j in range(3)) * manifold.normal[i]
-                for i in range(3)
-            ]
-            
-            # Calculate tangent velocity magnitude
-            tangent_magnitude = math.sqrt(sum(v * v for v in tangent_velocity))
-            
-            if tangent_magnitude < 1e-6:
-                return
-            
-            # Normalize tangent velocity
-            tangent_direction = [v / tangent_magnitude for v in tangent_velocity]
-            
-            # Calculate friction impulse magnitude
-            normal_impulse_magnitude = math.sqrt(sum(i * i for i in normal_impulse))
-            friction_impulse_magnitude = manifold.friction * normal_impulse_magnitude
-            
-            # Clamp friction impulse
-            inv_mass_a = body_a.inverse_mass
-            inv_mass_b = body_b.inverse_mass
-            total_inv_mass = inv_mass_a + inv_mass_b
-            
-            if total_inv_mass > 0:
-                max_friction_impulse = tangent_magnitude / total_inv_mass
-                friction_impulse_magnitude = min(friction_impulse_magnitude, max_friction_impulse)
-            
-            # Apply friction impulse
-            friction_impulse = [tangent_direction[i] * friction_impulse_magnitude for i in range(3)]
-            
-            if not body_a.is_static_body():
-                for i in range(3):
-                    body_a.linear_velocity[i] += friction_impulse[i] * inv_mass_a
-            
-            if not body_b.is_static_body():
-                for i in range(3):
-                    body_b.linear_velocity[i] -= friction_impulse[i] * inv_mass_b
-            
+            # Friction is bounded by the normal impulse (Coulomb cone, per axis)
+            max_friction = manifold.friction * contact.normal_impulse
+            residual = 0.0
+            
+            for axis, tangent in enumerate(contact.tangents):
+                relative_velocity = self._calculate_relative_velocity(body_a, body_b, contact.r_a, contact.r_b)
+                tangent_velocity = self._dot(relative_velocity, tangent)
+                
+                delta = -contact.tangent_mass[axis] * tangent_velocity
+                old_impulse = contact.tangent_impulse[axis]
+                contact.tangent_impulse[axis] = max(-max_friction, min(old_impulse + delta, max_friction))
+                delta = contact.tangent_impulse[axis] - old_impulse
+                
+                if delta != 0.0:
+                    impulse = [tangent[i] * delta for i in range(3)]
+                    self._apply_impulse_pair(body_a, body_b, contact, impulse)
+                
+                residual = max(residual, abs(delta))
+            
+            return residual
+        
         except Exception as e:
             self.logger.error(f"Error applying friction impulse: {e}")
+            return 0.0
+    
+    def _apply_impulse_pair(self, body_a: RigidBody, body_b: RigidBody,
+                            contact: ContactConstraint, impulse: List[float]):
+        """Apply an impulse to body A and its opposite to body B at a contact.
+        
+        Args:
+            body_a: First rigid body
+            body_b: Second rigid body
+            contact: Contact the impulse acts on
+            impulse: Impulse vector applied to body A
+        """
+        if not body_a.is_static_body():
+            angular_a = self._cross(contact.r_a, impulse)
+            for i in range(3):
+                body_a.linear_velocity[i] += impulse[i] * body_a.inverse_mass
+                body_a.angular_velocity[i] += angular_a[i] * body_a.inverse_inertia_tensor[i][i]
+        
+        if not body_b.is_static_body():
+            angular_b = self._cross(contact.r_b, impulse)
+            for i in range(3):
+                body_b.linear_velocity[i] -= impulse[i] * body_b.inverse_mass
+                body_b.angular_velocity[i] -= angular_b[i] * body_b.inverse_inertia_tensor[i][i]
+    
+    def _store_impulses(self, manifolds: List[ContactManifold], solution: IslandSolution):
+        """Keep accumulated impulses for warm starting.
+        
+        Args:
+            manifolds: Solved contact manifolds
+            solution: Island solution receiving the impulses
+        """
+        for manifold in manifolds:
+            for contact in manifold.contacts:
+                solution.impulses[contact.key] = (
+                    contact.normal_impulse,
+                    contact.tangent_impulse[0],
+                    contact.tangent_impulse[1]
+                )
+    
+    def _tangent_basis(self, normal: List[float]) -> List[List[float]]:
+        """Build a stable orthonormal tangent basis for a normal.
+        
+        Args:
+            normal: Unit contact normal
+        
+        Returns:
+            Two unit tangent vectors
+        """
+        # Pick the helper axis least aligned with the normal so the basis is
+        # identical from frame to frame for the same normal
+        if abs(normal[0]) < 0.57735:
+            helper = [1.0, 0.0, 0.0]
+        else:
+            helper = [0.0, 1.0, 0.0]
+        
+        tangent_1 = self._cross(normal, helper)
+        length = math.sqrt(self._dot(tangent_1, tangent_1))
+        tangent_1 = [v / length for v in tangent_1]
+        tangent_2 = self._cross(normal, tangent_1)
+        
+        return [tangent_1, tangent_2]
+    
+    def _cross(self, a: List[float], b: List[float]) -> List[float]:
+        """Calculate cross product of two 3D vectors."""
+        return [
+            a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0]
+        ]
+    
+    def _dot(self, a: List[float], b: List[float]) -> float:
+        """Calculate dot product of two 3D vectors."""
+        return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get collision resolver statistics.
@@ -355,8 +684,14 @@ class CollisionResolver:
         return {
             "collisions_resolved": self.collisions_resolved,
             "impulses_applied": self.impulses_applied,
+            "warm_started_contacts": self.warm_started_contacts,
+            "cached_contacts": len(self.contact_cache),
+            "constraints": self.constraint_solver.count if self.constraint_solver else 0,
+            "last_residual": self.last_residual,
+            "iterations_used": self.iterations_used,
             "position_iterations": self.position_iterations,
-            "velocity_iterations": self.velocity_iterations
+            "velocity_iterations": self.velocity_iterations,
+            "velocity_tolerance": self.velocity_tolerance
         }
     
     def shutdown(self):
@@ -364,5 +699,8 @@ class CollisionResolver:
         if self.is_initialized:
             self.logger.info("Shutting down collision resolver...")
             
+            self.contact_cache.clear()
+            self._touched_keys.clear()
+            
             self.is_initialized = False
             self.logger.info("✅ Collision resolver shutdown complete")
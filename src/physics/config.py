@@ -5,10 +5,12 @@ This module provides configuration classes for the physics system
 to avoid circular import issues.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import List
 
+from .collision_layers import LayerCollisionMatrix
+
 
 class PhysicsStepMode(Enum):
     """Physics step modes."""
@@ -17,6 +19,12 @@ class PhysicsStepMode(Enum):
     ADAPTIVE = "adaptive"  # Adaptive timestep
 
 
+class TimeDebtPolicy(Enum):
+    """What to do with frame time left over after the substep cap."""
+    DROP = "drop"  # Discard it, the simulation runs slower than real time
+    CARRY = "carry"  # Catch up on later frames, bounded to one frame of substeps
+
+
 @dataclass
 class PhysicsConfig:
     """Physics engine configuration."""
@@ -24,11 +32,26 @@ class PhysicsConfig:
     fixed_timestep: float = 1.0 / 60.0  # 60 FPS
     max_timestep: float = 1.0 / 30.0  # 30 FPS minimum
     step_mode: PhysicsStepMode = PhysicsStepMode.FIXED
+    max_substeps: int = 8  # Physics steps allowed per frame
+    time_debt_policy: TimeDebtPolicy = TimeDebtPolicy.DROP
+    adaptive_max_travel: float = 0.5  # Largest move per substep, as a fraction of a body's smallest half extent
+    adaptive_penetration_limit: float = 0.05  # Penetration that triggers extra substeps
+    adaptive_residual_limit: float = 0.1  # Solver residual that triggers extra substeps
     iterations: int = 10
     tolerance: float = 0.001
     enable_sleeping: bool = True
     sleep_threshold: float = 0.1
+    time_to_sleep: float = 2.0  # Seconds an island must rest before sleeping
+    solver_workers: int = 0  # Threads for solving islands (0 = solve inline)
+    deterministic: bool = False  # Fixed dt and stable ordering for bit-reproducible runs
     enable_ccd: bool = False  # Continuous collision detection
+    layer_collision_matrix: LayerCollisionMatrix = field(default_factory=LayerCollisionMatrix)
+    snapshot_capacity: int = 0  # Frames kept for rollback and replay (0 = disabled)
+    snapshot_max_bodies: int = 1024  # Bodies each snapshot can hold
+    ccd_velocity_threshold: float = 10.0  # Speed above which bodies are swept
+    interpolate_transforms: bool = True  # Blend synced transforms between fixed steps
+    profile_steps: bool = False  # Record per-step counters, phase times and grid occupancy
+    profile_history: int = 600  # Steps kept by the profiler
 
 
 @dataclass
@@ -41,3 +64,7 @@ class PhysicsStats:
     sleeping_bodies: int = 0
     collision_pairs: int = 0
     constraints: int = 0
+    islands: int = 0
+    sleeping_islands: int = 0
+    substeps: int = 0
+    time_debt: float = 0.0
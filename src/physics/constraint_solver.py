@@ -0,0 +1,570 @@
+"""
+Constraint Solver for Nexlify Physics Engine.
+
+This module provides a batched joint solver for distance, hinge and
+ball-socket constraints. Constraint rows live in NumPy arrays and are
+solved one graph color at a time, so every row in a color touches a
+different dynamic body and the whole color is solved in one vectorized
+pass. The solver shares the contact solver's velocity iteration loop.
+"""
+
+import logging
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
+from enum import Enum
+
+import numpy as np
+
+from .rigid_body import RigidBody
+from ..utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from .world import Constraint
+
+
+class ConstraintType(Enum):
+    """Supported constraint types."""
+    DISTANCE = "distance"
+    BALL_SOCKET = "ball_socket"
+    HINGE = "hinge"
+
+
+_TYPE_CODES = {
+    ConstraintType.DISTANCE: 0,
+    ConstraintType.BALL_SOCKET: 1,
+    ConstraintType.HINGE: 2
+}
+
+
+def rotation_matrices(euler: np.ndarray) -> np.ndarray:
+    """Build rotation matrices from XYZ Euler angles.
+    
+    Args:
+        euler: Euler angles in radians, shape (n, 3)
+    
+    Returns:
+        Rotation matrices R = Rz * Ry * Rx, shape (n, 3, 3)
+    """
+    cx, cy, cz = np.cos(euler).T
+    sx, sy, sz = np.sin(euler).T
+    
+    matrices = np.empty((euler.shape[0], 3, 3))
+    matrices[:, 0, 0] = cy * cz
+    matrices[:, 0, 1] = sx * sy * cz - cx * sz
+    matrices[:, 0, 2] = cx * sy * cz + sx * sz
+    matrices[:, 1, 0] = cy * sz
+    matrices[:, 1, 1] = sx * sy * sz + cx * cz
+    matrices[:, 1, 2] = cx * sy * sz - sx * cz
+    matrices[:, 2, 0] = -sy
+    matrices[:, 2, 1] = sx * cy
+    matrices[:, 2, 2] = cx * cy
+    return matrices
+
+
+def euler_angles(matrices: np.ndarray) -> np.ndarray:
+    """Recover XYZ Euler angles from rotation matrices.
+
+    Inverse of rotation_matrices(); at gimbal lock the x angle is zero.
+
+    Args:
+        matrices: Rotation matrices R = Rz * Ry * Rx, shape (n, 3, 3)
+
+    Returns:
+        Euler angles in radians, shape (n, 3)
+    """
+    cos_y = np.hypot(matrices[:, 0, 0], matrices[:, 1, 0])
+    locked = cos_y < 1e-9
+
+    euler = np.empty((matrices.shape[0], 3))
+    euler[:, 0] = np.where(locked, 0.0, np.arctan2(matrices[:, 2, 1], matrices[:, 2, 2]))
+    euler[:, 1] = np.arctan2(-matrices[:, 2, 0], cos_y)
+    euler[:, 2] = np.where(
+        locked,
+        np.arctan2(-matrices[:, 0, 1], matrices[:, 1, 1]),
+        np.arctan2(matrices[:, 1, 0], matrices[:, 0, 0])
+    )
+    return euler
+
+
+def _skew(vectors: np.ndarray) -> np.ndarray:
+    """Build cross product matrices so that skew(a) @ b == a x b."""
+    matrices = np.zeros((vectors.shape[0], 3, 3))
+    matrices[:, 0, 1] = -vectors[:, 2]
+    matrices[:, 0, 2] = vectors[:, 1]
+    matrices[:, 1, 0] = vectors[:, 2]
+    matrices[:, 1, 2] = -vectors[:, 0]
+    matrices[:, 2, 0] = -vectors[:, 1]
+    matrices[:, 2, 1] = vectors[:, 0]
+    return matrices
+
+
+def _perpendicular_basis(axes: np.ndarray):
+    """Build two unit vectors perpendicular to each axis.
+    
+    Args:
+        axes: Unit axes, shape (n, 3)
+    
+    Returns:
+        Tuple of (t1, t2) arrays, each shape (n, 3)
+    """
+    helper = np.zeros_like(axes)
+    use_x = np.abs(axes[:, 0]) < 0.57735
+    helper[use_x, 0] = 1.0
+    helper[~use_x, 1] = 1.0
+    
+    t1 = np.cross(axes, helper)
+    t1 /= np.linalg.norm(t1, axis=1, keepdims=True)
+    t2 = np.cross(axes, t1)
+    return t1, t2
+
+
+class ConstraintSolver:
+    """Array-backed storage and batched solver for joint constraints."""
+    
+    def __init__(self, capacity: int = 64):
+        self.logger = get_logger(__name__)
+        
+        # Solver settings
+        self.bias_factor = 0.2  # Baumgarte position drift correction
+        
+        # Slot bookkeeping (rows are kept dense with swap-remove)
+        self.count = 0
+        self._capacity = 0
+        self._constraints: List['Constraint'] = []
+        self._bodies_a: List[RigidBody] = []
+        self._bodies_b: List[RigidBody] = []
+        self._slots: Dict['Constraint', int] = {}
+        
+        # Graph coloring for batched solving
+        self._coloring_dirty = True
+        
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity: int):
+        """Grow the row arrays to the requested capacity.
+        
+        Args:
+            capacity: New row capacity
+        """
+        def grow(array: Optional[np.ndarray], shape, dtype) -> np.ndarray:
+            new_array = np.zeros(shape, dtype=dtype)
+            if array is not None:
+                new_array[:self.count] = array[:self.count]
+            return new_array
+        
+        old = self._capacity > 0
+        self.types = grow(self.types if old else None, capacity, np.int8)
+        self.local_anchor_a = grow(self.local_anchor_a if old else None, (capacity, 3), np.float64)
+        self.local_anchor_b = grow(self.local_anchor_b if old else None, (capacity, 3), np.float64)
+        self.local_axis_a = grow(self.local_axis_a if old else None, (capacity, 3), np.float64)
+        self.local_axis_b = grow(self.local_axis_b if old else None, (capacity, 3), np.float64)
+        self.rest_length = grow(self.rest_length if old else None, capacity, np.float64)
+        self.rope = grow(self.rope if old else None, capacity, np.bool_)
+        self.colors = grow(self.colors if old else None, capacity, np.int32)
+        self.linear_impulse = grow(self.linear_impulse if old else None, (capacity, 3), np.float64)
+        self.angular_impulse = grow(self.angular_impulse if old else None, (capacity, 2), np.float64)
+        self._capacity = capacity
+    
+    def add_constraint(self, constraint: 'Constraint') -> bool:
+        """Add a constraint and convert it into solver rows.
+        
+        Supported parameters: "anchor_a"/"anchor_b" (local offsets) or
+        "pivot" (world point), "length" and "rope" for distance constraints,
+        and "axis" (world axis) for hinges.
+        
+        Args:
+            constraint: Constraint to add
+        
+        Returns:
+            True if added successfully, False otherwise
+        """
+        try:
+            if constraint in self._slots:
+                return False
+            
+            constraint_type = ConstraintType(constraint.constraint_type)
+            params = constraint.parameters or {}
+            body_a, body_b = constraint.body_a, constraint.body_b
+            
+            if self.count == self._capacity:
+                self._allocate(self._capacity * 2)
+            
+            slot = self.count
+            rotations = rotation_matrices(np.array([body_a.rotation, body_b.rotation], dtype=np.float64))
+            position_a = np.asarray(body_a.position, dtype=np.float64)
+            position_b = np.asarray(body_b.position, dtype=np.float64)
+            
+            # Anchors in each body's local frame
+            if "pivot" in params:
+                pivot = np.asarray(params["pivot"], dtype=np.float64)
+                anchor_a = rotations[0].T @ (pivot - position_a)
+                anchor_b = rotations[1].T @ (pivot - position_b)
+            else:
+                anchor_a = np.asarray(params.get("anchor_a", (0.0, 0.0, 0.0)), dtype=np.float64)
+                anchor_b = np.asarray(params.get("anchor_b", (0.0, 0.0, 0.0)), dtype=np.float64)
+            
+            self.types[slot] = _TYPE_CODES[constraint_type]
+            self.local_anchor_a[slot] = anchor_a
+            self.local_anchor_b[slot] = anchor_b
+            
+            if constraint_type == ConstraintType.DISTANCE:
+                world_a = position_a + rotations[0] @ anchor_a
+                world_b = position_b + rotations[1] @ anchor_b
+                self.rest_length[slot] = params.get("length", float(np.linalg.norm(world_b - world_a)))
+                self.rope[slot] = bool(params.get("rope", False))
+            
+            if constraint_type == ConstraintType.HINGE:
+                axis = np.asarray(params.get("axis", (0.0, 0.0, 1.0)), dtype=np.float64)
+                axis = axis / np.linalg.norm(axis)
+                self.local_axis_a[slot] = rotations[0].T @ axis
+                self.local_axis_b[slot] = rotations[1].T @ axis
+            
+            self.linear_impulse[slot] = 0.0
+            self.angular_impulse[slot] = 0.0
+            
+            self._constraints.append(constraint)
+            self._bodies_a.append(body_a)
+            self._bodies_b.append(body_b)
+            self._slots[constraint] = slot
+            self.count += 1
+            self._coloring_dirty = True
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error adding constraint rows: {e}")
+            return False
+    
+    def remove_constraint(self, constraint: 'Constraint') -> bool:
+        """Remove a constraint in O(1) by moving the last row into its slot.
+        
+        Args:
+            constraint: Constraint to remove
+        
+        Returns:
+            True if removed, False if the constraint was not present
+        """
+        slot = self._slots.pop(constraint, None)
+        if slot is None:
+            return False
+        
+        last = self.count - 1
+        if slot != last:
+            for array in (self.types, self.local_anchor_a, self.local_anchor_b, self.local_axis_a,
+                          self.local_axis_b, self.rest_length, self.rope, self.colors,
+                          self.linear_impulse, self.angular_impulse):
+                array[slot] = array[last]
+            
+            moved = self._constraints[last]
+            self._constraints[slot] = moved
+            self._bodies_a[slot] = self._bodies_a[last]
+            self._bodies_b[slot] = self._bodies_b[last]
+            self._slots[moved] = slot
+        
+        self._constraints.pop()
+        self._bodies_a.pop()
+        self._bodies_b.pop()
+        self.count -= 1
+        self._coloring_dirty = True
+        return True
+    
+    def get_constraints(self) -> List['Constraint']:
+        """Get all constraints in slot order.
+        
+        Returns:
+            List of constraints
+        """
+        return self._constraints.copy()
+    
+    def clear(self):
+        """Remove all constraints."""
+        self._constraints.clear()
+        self._bodies_a.clear()
+        self._bodies_b.clear()
+        self._slots.clear()
+        self.count = 0
+        self._coloring_dirty = True
+    
+    def _update_coloring(self):
+        """Greedily color rows so that no two rows of a color share a dynamic body."""
+        if not self._coloring_dirty:
+            return
+        
+        used_colors: Dict[int, int] = {}  # body id -> bitmask of colors in use
+        for slot in range(self.count):
+            body_a, body_b = self._bodies_a[slot], self._bodies_b[slot]
+            mask = 0
+            if not body_a.is_static_body():
+                mask |= used_colors.get(body_a.body_id, 0)
+            if not body_b.is_static_body():
+                mask |= used_colors.get(body_b.body_id, 0)
+            
+            # Lowest free color
+            color = (~mask & (mask + 1)).bit_length() - 1
+            self.colors[slot] = color
+            
+            bit = 1 << color
+            if not body_a.is_static_body():
+                used_colors[body_a.body_id] = used_colors.get(body_a.body_id, 0) | bit
+            if not body_b.is_static_body():
+                used_colors[body_b.body_id] = used_colors.get(body_b.body_id, 0) | bit
+        
+        self._coloring_dirty = False
+    
+    def create_batch(self, constraints: Optional[List['Constraint']], delta_time: float) -> Optional['ConstraintBatch']:
+        """Gather the rows and body state needed to solve a set of constraints.
+        
+        Args:
+            constraints: Constraints to solve (None for all)
+            delta_time: Time step
+        
+        Returns:
+            Prepared batch or None if there is nothing to solve
+        """
+        if self.count == 0 or delta_time <= 0:
+            return None
+        
+        self._update_coloring()
+        
+        if constraints is None:
+            slots = np.arange(self.count)
+        else:
+            slots = np.array([self._slots[c] for c in constraints if c in self._slots], dtype=np.int64)
+        
+        if slots.size == 0:
+            return None
+        
+        return ConstraintBatch(self, slots, delta_time)
+    
+    def solve(self, iterations: int, delta_time: float):
+        """Solve all constraints on their own (without contacts).
+        
+        Args:
+            iterations: Velocity iterations
+            delta_time: Time step
+        """
+        batch = self.create_batch(None, delta_time)
+        if batch is None:
+            return
+        
+        batch.warm_start()
+        for iteration in range(iterations):
+            batch.solve_velocities()
+        batch.finish()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get constraint solver statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        self._update_coloring()
+        return {
+            "constraints": self.count,
+            "colors": int(self.colors[:self.count].max()) + 1 if self.count else 0,
+            "capacity": self._capacity
+        }
+
+
+class ConstraintBatch:
+    """Gathered solver state for one set of constraints (usually one island)."""
+    
+    def __init__(self, solver: ConstraintSolver, slots: np.ndarray, delta_time: float):
+        self.solver = solver
+        self.slots = slots
+        
+        # Unique bodies referenced by the rows
+        body_index: Dict[int, int] = {}
+        self.bodies: List[RigidBody] = []
+        index_a = np.empty(slots.size, dtype=np.int64)
+        index_b = np.empty(slots.size, dtype=np.int64)
+        for row, slot in enumerate(slots.tolist()):
+            for body, target in ((solver._bodies_a[slot], index_a), (solver._bodies_b[slot], index_b)):
+                index = body_index.get(body.body_id)
+                if index is None:
+                    index = len(self.bodies)
+                    body_index[body.body_id] = index
+                    self.bodies.append(body)
+                target[row] = index
+        self.index_a = index_a
+        self.index_b = index_b
+        
+        # Body state
+        bodies = self.bodies
+        position = np.array([body.position for body in bodies], dtype=np.float64)
+        rotation = np.array([body.rotation for body in bodies], dtype=np.float64)
+        self.inverse_mass = np.array([body.inverse_mass for body in bodies], dtype=np.float64)
+        self.inverse_inertia = np.array(
+            [[body.inverse_inertia_tensor[i][i] for i in range(3)] for body in bodies], dtype=np.float64
+        )
+        self.gather_velocities()
+        
+        # Rows grouped by color, split by row kind: (distance, point, hinge)
+        types = solver.types[slots]
+        colors = solver.colors[slots]
+        order = np.argsort(colors, kind="stable")
+        boundaries = np.flatnonzero(np.diff(colors[order])) + 1
+        distance_code = _TYPE_CODES[ConstraintType.DISTANCE]
+        hinge_code = _TYPE_CODES[ConstraintType.HINGE]
+        self.color_groups = [
+            (group[types[group] == distance_code], group[types[group] != distance_code],
+             group[types[group] == hinge_code])
+            for group in np.split(order, boundaries)
+        ]
+        
+        # World-space anchors and constraint geometry
+        matrices = rotation_matrices(rotation)
+        self.r_a = np.einsum("kij,kj->ki", matrices[index_a], solver.local_anchor_a[slots])
+        self.r_b = np.einsum("kij,kj->ki", matrices[index_b], solver.local_anchor_b[slots])
+        separation = (position[index_b] + self.r_b) - (position[index_a] + self.r_a)
+        
+        self.distance_rows = np.flatnonzero(types == distance_code)
+        self.point_rows = np.flatnonzero(types != distance_code)
+        self.hinge_rows = np.flatnonzero(types == hinge_code)
+        
+        bias_rate = solver.bias_factor / delta_time
+        inv_mass_sum = self.inverse_mass[index_a] + self.inverse_mass[index_b]
+        
+        # Distance rows: one row along the separation axis
+        rows = self.distance_rows
+        length = np.linalg.norm(separation[rows], axis=1)
+        safe_length = np.where(length > 1e-9, length, 1.0)
+        self.distance_normal = np.zeros((slots.size, 3))
+        self.distance_normal[rows] = separation[rows] / safe_length[:, None]
+        self.distance_normal[rows[length <= 1e-9], 1] = 1.0
+        rn_a = np.cross(self.r_a[rows], self.distance_normal[rows])
+        rn_b = np.cross(self.r_b[rows], self.distance_normal[rows])
+        k = (inv_mass_sum[rows]
+             + np.einsum("ki,ki->k", rn_a * self.inverse_inertia[index_a[rows]], rn_a)
+             + np.einsum("ki,ki->k", rn_b * self.inverse_inertia[index_b[rows]], rn_b))
+        self.distance_mass = np.zeros(slots.size)
+        self.distance_mass[rows] = np.where(k > 0.0, 1.0 / np.where(k > 0.0, k, 1.0), 0.0)
+        self.distance_bias = np.zeros(slots.size)
+        self.distance_bias[rows] = bias_rate * (length - solver.rest_length[slots[rows]])
+        self.rope = solver.rope[slots]
+        
+        # Point rows (ball-socket and hinge): 3x3 block keeping the anchors together
+        rows = self.point_rows
+        skew_a = _skew(self.r_a[rows])
+        skew_b = _skew(self.r_b[rows])
+        k_matrix = (inv_mass_sum[rows][:, None, None] * np.eye(3)
+                    - skew_a @ (self.inverse_inertia[index_a[rows]][:, :, None] * skew_a)
+                    - skew_b @ (self.inverse_inertia[index_b[rows]][:, :, None] * skew_b))
+        self.point_mass = np.zeros((slots.size, 3, 3))
+        solvable = np.abs(np.linalg.det(k_matrix)) > 1e-12
+        if solvable.any():
+            self.point_mass[rows[solvable]] = np.linalg.inv(k_matrix[solvable])
+        self.point_bias = np.zeros((slots.size, 3))
+        self.point_bias[rows] = bias_rate * separation[rows]
+        
+        # Hinge rows: two angular rows keeping the hinge axes aligned
+        rows = self.hinge_rows
+        axis_a = np.einsum("kij,kj->ki", matrices[index_a[rows]], solver.local_axis_a[slots[rows]])
+        axis_b = np.einsum("kij,kj->ki", matrices[index_b[rows]], solver.local_axis_b[slots[rows]])
+        t1, t2 = _perpendicular_basis(axis_a)
+        self.hinge_tangents = np.zeros((slots.size, 2, 3))
+        self.hinge_tangents[rows, 0] = t1
+        self.hinge_tangents[rows, 1] = t2
+        inertia_sum = self.inverse_inertia[index_a[rows]] + self.inverse_inertia[index_b[rows]]
+        self.hinge_mass = np.zeros((slots.size, 2))
+        self.hinge_bias = np.zeros((slots.size, 2))
+        misalignment = np.cross(axis_a, axis_b)
+        for column, tangent in enumerate((t1, t2)):
+            k = np.einsum("ki,ki->k", tangent * inertia_sum, tangent)
+            self.hinge_mass[rows, column] = np.where(k > 0.0, 1.0 / np.where(k > 0.0, k, 1.0), 0.0)
+            self.hinge_bias[rows, column] = bias_rate * np.einsum("ki,ki->k", misalignment, tangent)
+        
+        # Accumulated impulses (warm start values)
+        self.linear_impulse = solver.linear_impulse[slots].copy()
+        self.angular_impulse = solver.angular_impulse[slots].copy()
+    
+    def gather_velocities(self):
+        """Read body velocities into the batch arrays."""
+        self.linear_velocity = np.array([body.linear_velocity for body in self.bodies], dtype=np.float64)
+        self.angular_velocity = np.array([body.angular_velocity for body in self.bodies], dtype=np.float64)
+    
+    def scatter_velocities(self):
+        """Write the batch velocities back to dynamic bodies."""
+        linear = self.linear_velocity.tolist()
+        angular = self.angular_velocity.tolist()
+        for body, v, w in zip(self.bodies, linear, angular):
+            if not body.is_static_body():
+                body.linear_velocity = v
+                body.angular_velocity = w
+    
+    def _apply(self, rows: np.ndarray, linear: np.ndarray, angular_a: np.ndarray, angular_b: np.ndarray):
+        """Apply impulses to the bodies of a set of rows (+ to B, - to A).
+        
+        Args:
+            rows: Row indices (no dynamic body repeats within the set)
+            linear: Linear impulses, shape (n, 3)
+            angular_a: Angular impulses on body A, shape (n, 3)
+            angular_b: Angular impulses on body B, shape (n, 3)
+        """
+        index_a = self.index_a[rows]
+        index_b = self.index_b[rows]
+        self.linear_velocity[index_a] -= linear * self.inverse_mass[index_a, None]
+        self.linear_velocity[index_b] += linear * self.inverse_mass[index_b, None]
+        self.angular_velocity[index_a] -= angular_a * self.inverse_inertia[index_a]
+        self.angular_velocity[index_b] += angular_b * self.inverse_inertia[index_b]
+    
+    def warm_start(self):
+        """Apply the impulses accumulated during the previous step."""
+        for distance, point, hinge in self.color_groups:
+            group = np.concatenate((distance, point))
+            linear = np.concatenate((
+                self.distance_normal[distance] * self.linear_impulse[distance, :1],
+                self.linear_impulse[point]
+            ))
+            angular_impulse = np.einsum("kc,kci->ki", self.angular_impulse[group], self.hinge_tangents[group])
+            
+            angular_a = np.cross(self.r_a[group], linear) + angular_impulse
+            angular_b = np.cross(self.r_b[group], linear) + angular_impulse
+            self._apply(group, linear, angular_a, angular_b)
+    
+    def _relative_point_velocity(self, rows: np.ndarray) -> np.ndarray:
+        """Velocity of anchor B relative to anchor A for a set of rows."""
+        index_a = self.index_a[rows]
+        index_b = self.index_b[rows]
+        velocity_a = self.linear_velocity[index_a] + np.cross(self.angular_velocity[index_a], self.r_a[rows])
+        velocity_b = self.linear_velocity[index_b] + np.cross(self.angular_velocity[index_b], self.r_b[rows])
+        return velocity_b - velocity_a
+    
+    def solve_velocities(self):
+        """Run one velocity iteration over every color."""
+        for distance, point, hinge in self.color_groups:
+            if distance.size:
+                normal = self.distance_normal[distance]
+                cdot = np.einsum("ki,ki->k", self._relative_point_velocity(distance), normal)
+                delta = -self.distance_mass[distance] * (cdot + self.distance_bias[distance])
+                
+                # Ropes can only pull
+                old = self.linear_impulse[distance, 0]
+                new = np.where(self.rope[distance], np.minimum(old + delta, 0.0), old + delta)
+                self.linear_impulse[distance, 0] = new
+                
+                linear = normal * (new - old)[:, None]
+                self._apply(distance, linear, np.cross(self.r_a[distance], linear),
+                            np.cross(self.r_b[distance], linear))
+            
+            if point.size:
+                cdot = self._relative_point_velocity(point)
+                linear = -np.einsum("kij,kj->ki", self.point_mass[point], cdot + self.point_bias[point])
+                self.linear_impulse[point] += linear
+                self._apply(point, linear, np.cross(self.r_a[point], linear),
+                            np.cross(self.r_b[point], linear))
+            
+            if hinge.size:
+                relative_angular = (self.angular_velocity[self.index_b[hinge]]
+                                    - self.angular_velocity[self.index_a[hinge]])
+                tangents = self.hinge_tangents[hinge]
+                cdot = np.einsum("kci,ki->kc", tangents, relative_angular)
+                delta = -self.hinge_mass[hinge] * (cdot + self.hinge_bias[hinge])
+                self.angular_impulse[hinge] += delta
+                
+                angular = np.einsum("kc,kci->ki", delta, tangents)
+                self._apply(hinge, np.zeros_like(angular), angular, angular)
+    
+    def finish(self):
+        """Write velocities back to the bodies and store impulses for warm starting."""
+        self.scatter_velocities()
+        self.solver.linear_impulse[self.slots] = self.linear_impulse
+        self.solver.angular_impulse[self.slots] = self.angular_impulse
@@ -0,0 +1,213 @@
+"""
+Simulation Islands for Nexlify Physics Engine.
+
+This module groups rigid bodies that interact through contacts or
+constraints into islands. Islands are solved independently of each
+other and fall asleep or wake up as a single unit.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+
+from .rigid_body import RigidBody
+from .collision_detector import CollisionPair
+from ..utils.logger import get_logger
+
+
+@dataclass
+class Island:
+    """Group of dynamic bodies connected by contacts or constraints."""
+    bodies: List[RigidBody] = field(default_factory=list)
+    collision_pairs: List[CollisionPair] = field(default_factory=list)
+    constraints: List[Any] = field(default_factory=list)
+    
+    def is_sleeping(self) -> bool:
+        """Check if every body in the island is sleeping.
+        
+        Returns:
+            True if the whole island is asleep, False otherwise
+        """
+        return all(body.is_sleeping() for body in self.bodies)
+    
+    def is_resting(self, time_to_sleep: float) -> bool:
+        """Check if every body has been at rest long enough to sleep.
+        
+        Args:
+            time_to_sleep: Time a body must stay below its sleep threshold
+        
+        Returns:
+            True if the island can be put to sleep, False otherwise
+        """
+        return all(body.sleep_time >= time_to_sleep for body in self.bodies)
+    
+    def set_sleeping(self, sleeping: bool):
+        """Put the whole island to sleep or wake it up.
+        
+        Args:
+            sleeping: Whether the island should sleep
+        """
+        for body in self.bodies:
+            if sleeping:
+                body.set_sleeping(True)
+            elif body.is_sleeping():
+                body.wake_up()
+
+
+class IslandBuilder:
+    """Builds simulation islands from the contact and constraint graph."""
+    
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        
+        # Union-find storage, indexed by position in the body list
+        self._parent: List[int] = []
+        
+        # Bodies of islands put to sleep; sleeping pairs are not detected, so these keep them linked
+        self.sleeping_groups: List[List[RigidBody]] = []
+        
+        # Performance tracking
+        self.island_count = 0
+        self.sleeping_island_count = 0
+    
+    def build(self, bodies: List[RigidBody], collision_pairs: List[CollisionPair],
+              constraints: Optional[List[Any]] = None) -> List[Island]:
+        """Build islands for the current step.
+        
+        Static bodies never join islands, so a floor shared by many stacks
+        does not merge them into one island.
+        
+        Args:
+            bodies: All rigid bodies in the world
+            collision_pairs: Collision pairs found this step
+            constraints: Constraints with body_a/body_b attributes
+        
+        Returns:
+            List of islands
+        """
+        constraints = constraints or []
+        
+        try:
+            # Index dynamic bodies
+            dynamic_bodies = [body for body in bodies if not body.is_static_body()]
+            index: Dict[int, int] = {id(body): i for i, body in enumerate(dynamic_bodies)}
+            self._parent = list(range(len(dynamic_bodies)))
+            
+            # Link bodies through contacts and constraints
+            for pair in collision_pairs:
+                self._link(index, pair.body_a, pair.body_b)
+            for constraint in constraints:
+                self._link(index, constraint.body_a, constraint.body_b)
+            
+            # Keep sleeping islands whole, so touching any body wakes all of them in one step
+            groups = []
+            for group in self.sleeping_groups:
+                members = [body for body in group if id(body) in index]
+                for body in members[1:]:
+                    self._link(index, members[0], body)
+                if len(members) > 1 and all(body.is_sleeping() for body in members):
+                    groups.append(members)
+            self.sleeping_groups = groups
+            
+            # Gather bodies per root
+            islands_by_root: Dict[int, Island] = {}
+            for i, body in enumerate(dynamic_bodies):
+                root = self._find(i)
+                island = islands_by_root.get(root)
+                if island is None:
+                    island = Island()
+                    islands_by_root[root] = island
+                island.bodies.append(body)
+            
+            # Assign contacts and constraints to the island of their dynamic body
+            for pair in collision_pairs:
+                island = self._island_for(index, islands_by_root, pair.body_a, pair.body_b)
+                if island:
+                    island.collision_pairs.append(pair)
+            for constraint in constraints:
+                island = self._island_for(index, islands_by_root, constraint.body_a, constraint.body_b)
+                if island:
+                    island.constraints.append(constraint)
+            
+            islands = list(islands_by_root.values())
+            self.island_count = len(islands)
+            self.sleeping_island_count = sum(1 for island in islands if island.is_sleeping())
+            return islands
+        
+        except Exception as e:
+            self.logger.error(f"Error building islands: {e}")
+            return []
+    
+    def add_sleeping_island(self, island: Island):
+        """Remember the bodies of an island that was put to sleep.
+        
+        Args:
+            island: Island that just fell asleep
+        """
+        if len(island.bodies) > 1:
+            self.sleeping_groups.append(list(island.bodies))
+    
+    def _link(self, index: Dict[int, int], body_a: RigidBody, body_b: RigidBody):
+        """Merge the islands of two bodies.
+        
+        Args:
+            index: Body id to union-find index map
+            body_a: First rigid body
+            body_b: Second rigid body
+        """
+        i = index.get(id(body_a))
+        j = index.get(id(body_b))
+        if i is None or j is None:
+            return
+        
+        root_i = self._find(i)
+        root_j = self._find(j)
+        if root_i != root_j:
+            self._parent[root_j] = root_i
+    
+    def _find(self, i: int) -> int:
+        """Find the root of a union-find set with path halving.
+        
+        Args:
+            i: Body index
+        
+        Returns:
+            Root index
+        """
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    def _island_for(self, index: Dict[int, int], islands_by_root: Dict[int, Island],
+                    body_a: RigidBody, body_b: RigidBody) -> Optional[Island]:
+        """Get the island that owns an interaction between two bodies.
+        
+        Args:
+            index: Body id to union-find index map
+            islands_by_root: Islands keyed by union-find root
+            body_a: First rigid body
+            body_b: Second rigid body
+        
+        Returns:
+            Owning island or None if both bodies are static
+        """
+        i = index.get(id(body_a))
+        if i is None:
+            i = index.get(id(body_b))
+        if i is None:
+            return None
+        return islands_by_root.get(self._find(i))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get island builder statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "islands": self.island_count,
+            "sleeping_islands": self.sleeping_island_count,
+            "sleeping_groups": len(self.sleeping_groups)
+        }
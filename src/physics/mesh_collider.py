@@ -0,0 +1,495 @@
+"""
+Triangle Mesh Collider for Nexlify Physics Engine.
+
+This module provides a static triangle-mesh collider for level geometry.
+Triangles are organized in a bounding volume hierarchy stored as flat
+NumPy arrays, so it can be built once when the mesh is imported, saved
+next to the asset and loaded at level load without rebuilding.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+
+BVH_CACHE_SUFFIX = ".bvh.npz"
+BVH_FORMAT_VERSION = 2
+
+
+class TriangleMeshBVH:
+    """Bounding volume hierarchy over the triangles of a static mesh.
+    
+    Nodes are stored flattened: node i covers bounds_min[i]..bounds_max[i].
+    Inner nodes have child indices in left/right; leaves have left == -1
+    and own triangles first..first+count of the reordered triangle array.
+    Vertices are in the owning body's local space (position only, level
+    geometry is not rotated at runtime).
+    """
+    
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        
+        self.triangles = np.zeros((0, 3, 3), dtype=np.float64)
+        self.normals = np.zeros((0, 3), dtype=np.float64)
+        self.triangle_ids = np.zeros(0, dtype=np.int64)  # Original index of each triangle
+        
+        self.bounds_min = np.zeros((0, 3), dtype=np.float64)
+        self.bounds_max = np.zeros((0, 3), dtype=np.float64)
+        self.left = np.zeros(0, dtype=np.int32)
+        self.right = np.zeros(0, dtype=np.int32)
+        self.first = np.zeros(0, dtype=np.int32)
+        self.count = np.zeros(0, dtype=np.int32)
+        
+        # Hash of the source asset (or geometry), used to validate caches
+        self.source_hash = ""
+    
+    @staticmethod
+    def hash_geometry(vertices: np.ndarray, indices: np.ndarray) -> str:
+        """Hash mesh geometry for cache validation.
+        
+        Args:
+            vertices: Vertex positions, shape (n, 3)
+            indices: Triangle indices, shape (m, 3) or (3m,)
+        
+        Returns:
+            Hex digest of the geometry
+        """
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(vertices, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(indices, dtype=np.int64).tobytes())
+        return digest.hexdigest()
+    
+    @classmethod
+    def build(cls, vertices, indices, leaf_size: int = 4) -> 'TriangleMeshBVH':
+        """Build a BVH with median splits along the longest axis.
+        
+        Args:
+            vertices: Vertex positions, shape (n, 3)
+            indices: Triangle indices, shape (m, 3) or (3m,)
+            leaf_size: Maximum triangles per leaf
+        
+        Returns:
+            Built BVH
+        """
+        bvh = cls()
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        bvh.source_hash = cls.hash_geometry(vertices, indices)
+        
+        triangles = vertices[indices]
+        if len(triangles) == 0:
+            return bvh
+        
+        tri_min = triangles.min(axis=1)
+        tri_max = triangles.max(axis=1)
+        centroids = triangles.mean(axis=1)
+        
+        order = np.arange(len(triangles))
+        bounds_min, bounds_max, left, right, first, count = [], [], [], [], [], []
+        
+        def add_node(start: int, end: int) -> int:
+            ids = order[start:end]
+            bounds_min.append(tri_min[ids].min(axis=0))
+            bounds_max.append(tri_max[ids].max(axis=0))
+            left.append(-1)
+            right.append(-1)
+            first.append(start)
+            count.append(end - start)
+            return len(left) - 1
+        
+        # Depth-first build with an explicit stack of (node, start, end)
+        stack = [(add_node(0, len(order)), 0, len(order))]
+        while stack:
+            node, start, end = stack.pop()
+            if end - start <= leaf_size:
+                continue
+            
+            ids = order[start:end]
+            extent = centroids[ids].max(axis=0) - centroids[ids].min(axis=0)
+            axis = int(np.argmax(extent))
+            if extent[axis] <= 0.0:
+                continue
+            
+            # Median split keeps the tree balanced
+            mid = (end - start) // 2
+            partition = np.argpartition(centroids[ids, axis], mid)
+            order[start:end] = ids[partition]
+            
+            left_node = add_node(start, start + mid)
+            right_node = add_node(start + mid, end)
+            left[node] = left_node
+            right[node] = right_node
+            count[node] = 0
+            stack.append((right_node, start + mid, end))
+            stack.append((left_node, start, start + mid))
+        
+        bvh.triangles = triangles[order]
+        bvh.triangle_ids = order.copy()
+        bvh.bounds_min = np.array(bounds_min)
+        bvh.bounds_max = np.array(bounds_max)
+        bvh.left = np.array(left, dtype=np.int32)
+        bvh.right = np.array(right, dtype=np.int32)
+        bvh.first = np.array(first, dtype=np.int32)
+        bvh.count = np.array(count, dtype=np.int32)
+        bvh._update_normals()
+        return bvh
+    
+    def _update_normals(self):
+        """Compute unit face normals from the counter-clockwise winding."""
+        normals = np.cross(self.triangles[:, 1] - self.triangles[:, 0], self.triangles[:, 2] - self.triangles[:, 0])
+        lengths = np.linalg.norm(normals, axis=1)
+        self.normals = normals / np.where(lengths > 0.0, lengths, 1.0)[:, None]
+    
+    def save(self, path: str) -> bool:
+        """Save the BVH to an .npz file.
+        
+        Args:
+            path: Output path
+        
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        try:
+            with open(path, "wb") as file:
+                np.savez(
+                    file,
+                    version=np.array(BVH_FORMAT_VERSION),
+                    source_hash=np.array(self.source_hash),
+                    triangles=self.triangles,
+                    triangle_ids=self.triangle_ids,
+                    bounds_min=self.bounds_min,
+                    bounds_max=self.bounds_max,
+                    left=self.left,
+                    right=self.right,
+                    first=self.first,
+                    count=self.count
+                )
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error saving BVH to {path}: {e}")
+            return False
+    
+    @classmethod
+    def load(cls, path: str) -> Optional['TriangleMeshBVH']:
+        """Load a BVH saved with save().
+        
+        Args:
+            path: Path of the .npz file
+        
+        Returns:
+            Loaded BVH or None if the file is missing or out of date
+        """
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != BVH_FORMAT_VERSION:
+                    return None
+                
+                bvh = cls()
+                bvh.source_hash = str(data["source_hash"])
+                bvh.triangles = data["triangles"]
+                bvh.triangle_ids = data["triangle_ids"]
+                bvh.bounds_min = data["bounds_min"]
+                bvh.bounds_max = data["bounds_max"]
+                bvh.left = data["left"]
+                bvh.right = data["right"]
+                bvh.first = data["first"]
+                bvh.count = data["count"]
+            
+            bvh._update_normals()
+            return bvh
+        
+        except Exception as e:
+            get_logger(__name__).error(f"Error loading BVH from {path}: {e}")
+            return None
+    
+    @staticmethod
+    def cache_path(asset_path: str) -> str:
+        """Get the BVH cache path stored next to a mesh asset.
+        
+        Args:
+            asset_path: Path of the mesh asset
+        
+        Returns:
+            Path of the cached BVH
+        """
+        return str(Path(asset_path).with_suffix(Path(asset_path).suffix + BVH_CACHE_SUFFIX))
+    
+    @classmethod
+    def load_or_build(cls, asset_path: str, vertices=None, indices=None,
+                      source_hash: Optional[str] = None) -> 'TriangleMeshBVH':
+        """Load the cached BVH of an asset, rebuilding it if the asset changed.
+        
+        The cache is keyed by the hash of the asset file, so checking it
+        does not need the mesh to be parsed.
+        
+        Args:
+            asset_path: Path of the mesh asset
+            vertices: Vertex positions (read from the asset if omitted)
+            indices: Triangle indices (read from the asset if omitted)
+            source_hash: Precomputed hash of the asset content
+        
+        Returns:
+            BVH for the asset
+        """
+        from ..asset.nxmesh import hash_source
+        from ..asset.mesh_loader import load_mesh_file
+        
+        if source_hash is None:
+            source_hash = hash_source(asset_path)
+        
+        path = cls.cache_path(asset_path)
+        if Path(path).exists():
+            bvh = cls.load(path)
+            if bvh and bvh.source_hash == source_hash:
+                return bvh
+        
+        if vertices is None or indices is None:
+            mesh = load_mesh_file(asset_path)
+            vertices, indices = mesh.positions, mesh.indices
+        
+        bvh = cls.build(vertices, indices)
+        bvh.source_hash = source_hash
+        bvh.save(path)
+        return bvh
+    
+    def get_bounds(self, position: List[float]) -> Tuple[List[float], List[float]]:
+        """Get the world AABB of the mesh.
+        
+        Args:
+            position: Position of the owning body
+        
+        Returns:
+            (min bounds, max bounds)
+        """
+        if len(self.bounds_min) == 0:
+            return list(position), list(position)
+        return (
+            (self.bounds_min[0] + position).tolist(),
+            (self.bounds_max[0] + position).tolist()
+        )
+    
+    def query_aabb(self, box_min, box_max) -> np.ndarray:
+        """Find triangles whose bounds overlap a box.
+        
+        Args:
+            box_min: Minimum corner in mesh space
+            box_max: Maximum corner in mesh space
+        
+        Returns:
+            Indices into the reordered triangle array
+        """
+        if len(self.left) == 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        box_min = np.asarray(box_min, dtype=np.float64)
+        box_max = np.asarray(box_max, dtype=np.float64)
+        bounds_min, bounds_max = self.bounds_min, self.bounds_max
+        left, right, first, count = self.left, self.right, self.first, self.count
+        
+        ranges = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if (bounds_min[node] > box_max).any() or (bounds_max[node] < box_min).any():
+                continue
+            if left[node] < 0:
+                ranges.append(np.arange(first[node], first[node] + count[node]))
+            else:
+                stack.append(left[node])
+                stack.append(right[node])
+        
+        if not ranges:
+            return np.zeros(0, dtype=np.int64)
+        
+        candidates = np.concatenate(ranges)
+        tris = self.triangles[candidates]
+        overlap = ((tris.min(axis=1) <= box_max) & (tris.max(axis=1) >= box_min)).all(axis=1)
+        return candidates[overlap]
+    
+    def raycast(self, origin, direction, max_distance: float = float('inf')) -> Optional[Dict[str, Any]]:
+        """Find the closest triangle hit by a ray.
+        
+        Args:
+            origin: Ray origin in mesh space
+            direction: Ray direction (need not be normalized; distance is in its units)
+            max_distance: Maximum ray distance
+        
+        Returns:
+            Dictionary with "distance", "triangle" (original index),
+            "normal" (facing the ray) and "front_face", or None if nothing is hit
+        """
+        if len(self.left) == 0:
+            return None
+        
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse_direction = 1.0 / direction
+        
+        closest = max_distance
+        closest_index = -1
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            
+            # Slab test against the node bounds
+            with np.errstate(invalid="ignore"):
+                t1 = (self.bounds_min[node] - origin) * inverse_direction
+                t2 = (self.bounds_max[node] - origin) * inverse_direction
+            t_near = np.nanmax(np.minimum(t1, t2))
+            t_far = np.nanmin(np.maximum(t1, t2))
+            if t_near > t_far or t_far < 0.0 or t_near > closest:
+                continue
+            
+            if self.left[node] >= 0:
+                stack.append(self.left[node])
+                stack.append(self.right[node])
+                continue
+            
+            # Moller-Trumbore over the leaf's triangles
+            start = self.first[node]
+            tris = self.triangles[start:start + self.count[node]]
+            edge1 = tris[:, 1] - tris[:, 0]
+            edge2 = tris[:, 2] - tris[:, 0]
+            p = np.cross(direction, edge2)
+            det = np.einsum("ki,ki->k", edge1, p)
+            valid = np.abs(det) > 1e-12
+            inverse_det = np.where(valid, 1.0 / np.where(valid, det, 1.0), 0.0)
+            s = origin - tris[:, 0]
+            u = np.einsum("ki,ki->k", s, p) * inverse_det
+            q = np.cross(s, edge1)
+            v = (q @ direction) * inverse_det
+            t = np.einsum("ki,ki->k", edge2, q) * inverse_det
+            hit = valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0) & (t < closest)
+            if hit.any():
+                best = int(np.argmin(np.where(hit, t, np.inf)))
+                closest = float(t[best])
+                closest_index = start + best
+        
+        if closest_index < 0:
+            return None
+        
+        normal = self.normals[closest_index]
+        front_face = bool(np.dot(normal, direction) <= 0.0)
+        if not front_face:
+            normal = -normal
+        return {
+            "distance": closest,
+            "triangle": int(self.triangle_ids[closest_index]),
+            "normal": normal.tolist(),
+            "front_face": front_face
+        }
+    
+    def box_contacts(self, center, half_extents) -> List[Tuple[List[float], List[Dict[str, Any]], float]]:
+        """Generate contacts between an axis-aligned box and the mesh.
+        
+        Triangles are one-sided: only boxes whose center lies in front of a
+        triangle touch it. Contacts come from box corners below a triangle
+        and triangle vertices inside the box. They are grouped by face
+        normal so each group becomes one manifold.
+        
+        Args:
+            center: Box center in mesh space
+            half_extents: Box half extents
+        
+        Returns:
+            List of (normal, contact points, penetration) per normal group,
+            normals pointing out of the mesh
+        """
+        center = np.asarray(center, dtype=np.float64)
+        half_extents = np.asarray(half_extents, dtype=np.float64)
+        candidates = self.query_aabb(center - half_extents, center + half_extents)
+        if candidates.size == 0:
+            return []
+        
+        tris = self.triangles[candidates]
+        normals = self.normals[candidates]
+        
+        # Only triangles the box center is in front of
+        front = np.einsum("ki,ki->k", center - tris[:, 0], normals) > 0.0
+        tris, normals, candidates = tris[front], normals[front], candidates[front]
+        if candidates.size == 0:
+            return []
+        
+        signs = np.array([[x, y, z] for x in (-1.0, 1.0) for y in (-1.0, 1.0) for z in (-1.0, 1.0)])
+        corners = center + signs * half_extents
+        
+        groups: Dict[Tuple[float, float, float], Dict[str, Any]] = {}
+        
+        def add_contact(normal: np.ndarray, key: Tuple[int, int], feature_id: int,
+                        position: np.ndarray, depth: float):
+            # A corner under several coplanar triangles is one contact; the
+            # feature id stays that of the first triangle for warm starting
+            group = groups.setdefault(tuple(np.round(normal, 2)), {"normal": normal, "contacts": {}})
+            existing = group["contacts"].get(key)
+            if existing is None or depth > existing["penetration"]:
+                group["contacts"][key] = {
+                    "id": existing["id"] if existing else feature_id,
+                    "position": position.tolist(),
+                    "normal": normal.tolist(),
+                    "penetration": float(depth),
+                    "separation_velocity": 0.0
+                }
+        
+        # Box corners behind a triangle and inside its outline
+        distances = np.einsum("cki,ki->ck", corners[:, None, :] - tris[None, :, 0], normals)
+        inside = self._inside_triangles(corners, tris, normals)
+        corner_hits = (distances < 0.0) & inside
+        for corner, k in zip(*np.nonzero(corner_hits)):
+            depth = -distances[corner, k]
+            feature_id = (int(self.triangle_ids[candidates[k]]) * 8 + int(corner)) * 2
+            add_contact(normals[k], (0, int(corner)), feature_id, corners[corner] + normals[k] * depth * 0.5, depth)
+        
+        # Triangle vertices inside the box (boxes larger than the triangles)
+        vertex_inside = (np.abs(tris - center) <= half_extents).all(axis=2)
+        support = np.abs(normals) @ half_extents
+        for k, vertex in zip(*np.nonzero(vertex_inside)):
+            depth = float(np.dot(tris[k, vertex] - center, normals[k]) + support[k])
+            if depth > 0.0:
+                feature_id = (int(self.triangle_ids[candidates[k]]) * 3 + int(vertex)) * 2 + 1
+                add_contact(normals[k], (1, feature_id), feature_id, tris[k, vertex] - normals[k] * depth * 0.5, depth)
+        
+        results = []
+        for group in groups.values():
+            contacts = list(group["contacts"].values())
+            penetration = max(contact["penetration"] for contact in contacts)
+            results.append((group["normal"].tolist(), contacts, penetration))
+        return results
+    
+    @staticmethod
+    def _inside_triangles(points: np.ndarray, tris: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        """Check which points project inside which triangles.
+        
+        Args:
+            points: Points, shape (p, 3)
+            tris: Triangles, shape (k, 3, 3)
+            normals: Triangle normals, shape (k, 3)
+        
+        Returns:
+            Boolean array of shape (p, k)
+        """
+        inside = np.ones((points.shape[0], tris.shape[0]), dtype=bool)
+        for i in range(3):
+            edge = tris[:, (i + 1) % 3] - tris[:, i]
+            edge_normal = np.cross(normals, edge)
+            side = np.einsum("pki,ki->pk", points[:, None, :] - tris[None, :, i], edge_normal)
+            inside &= side >= 0.0
+        return inside
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get BVH statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "triangles": len(self.triangles),
+            "nodes": len(self.left),
+            "leaves": int((self.left < 0).sum()) if len(self.left) else 0
+        }
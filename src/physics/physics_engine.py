@@ -6,15 +6,22 @@ all physics simulation including rigid bodies, collision detection,
 and constraint solving.
 """
 
+import math
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Set
 
-from .config import PhysicsConfig, PhysicsStats, PhysicsStepMode
+from .config import PhysicsConfig, PhysicsStats, PhysicsStepMode, TimeDebtPolicy
 from .world import PhysicsWorld
 from .rigid_body import RigidBody
 from .collision_detector import CollisionDetector
 from .collision_resolver import CollisionResolver
+from .island import Island, IslandBuilder
+from .snapshot import SnapshotRing
+from .trigger_system import TriggerSystem
+from .transform_sync import TransformSync
+from .profiler import PhysicsProfiler
 from ..utils.logger import get_logger
 
 
@@ -30,6 +37,12 @@ class PhysicsEngine:
         self.world: Optional[PhysicsWorld] = None
         self.collision_detector: Optional[CollisionDetector] = None
         self.collision_resolver: Optional[CollisionResolver] = None
+        self.island_builder = IslandBuilder()
+        self._solver_pool: Optional[ThreadPoolExecutor] = None
+        self.snapshots: Optional[SnapshotRing] = None
+        self.trigger_system = TriggerSystem()
+        self.transform_sync = TransformSync()
+        self.profiler: Optional[PhysicsProfiler] = None
         
         # Performance tracking
         self.stats = PhysicsStats()
@@ -40,6 +53,9 @@ class PhysicsEngine:
         self.accumulator = 0.0
         self.last_time = time.time()
         
+        # Last step's deepest penetration, used to pick adaptive substeps
+        self.last_max_penetration = 0.0
+        
         # State
         self.is_running = False
         self.paused = False
@@ -71,6 +87,36 @@ class PhysicsEngine:
                 self.logger.error("Failed to initialize collision resolver")
                 return False
             
+            # Sort broad phase pairs so contacts are solved in the same order every run
+            self.collision_detector.deterministic = self.config.deterministic
+            self.collision_detector.layer_matrix = self.config.layer_collision_matrix
+            
+            # Scene queries on the world go through the same detector
+            self.world.collision_detector = self.collision_detector
+            
+            # Joints are solved inside the contact solver's iteration loop
+            self.collision_resolver.constraint_solver = self.world.constraint_solver
+            self.collision_resolver.velocity_tolerance = self.config.tolerance
+            
+            # Worker pool for solving independent islands
+            if self.config.solver_workers > 1:
+                self._solver_pool = ThreadPoolExecutor(
+                    max_workers=self.config.solver_workers,
+                    thread_name_prefix="physics-island"
+                )
+            
+            # Preallocated snapshot ring for rollback
+            if self.config.snapshot_capacity > 0:
+                self.snapshots = SnapshotRing(
+                    capacity=self.config.snapshot_capacity,
+                    max_bodies=self.config.snapshot_max_bodies,
+                    max_contacts=self.config.snapshot_max_bodies * 4
+                )
+            
+            # Step instrumentation
+            if self.config.profile_steps:
+                self.profiler = PhysicsProfiler(self.config.profile_history)
+            
             # Set default gravity
             if self.config.gravity is None:
                 self.config.gravity = [0.0, -9.81, 0.0]
@@ -117,7 +163,8 @@ class PhysicsEngine:
         """Step the physics simulation.
         
         Args:
-            delta_time: Time step (if None, uses real time)
+            delta_time: Time step (if None, uses real time, or one fixed
+                timestep in deterministic mode)
         """
         if not self.is_running or self.paused or not self.is_initialized:
             return
@@ -126,18 +173,33 @@ class PhysicsEngine:
             current_time = time.time()
             
             if delta_time is None:
-                delta_time = current_time - self.last_time
+                # Deterministic runs never advance by wall-clock time
+                if self.config.deterministic:
+                    delta_time = self.config.fixed_timestep
+                else:
+                    delta_time = current_time - self.last_time
             
             self.last_time = current_time
             
+            # Scene objects moved since the last frame move their bodies
+            self.transform_sync.push_to_physics()
+            
             # Handle different step modes
-            if self.config.step_mode == PhysicsStepMode.FIXED:
+            if self.config.deterministic:
+                self._step_fixed(delta_time)
+            elif self.config.step_mode == PhysicsStepMode.FIXED:
                 self._step_fixed(delta_time)
             elif self.config.step_mode == PhysicsStepMode.VARIABLE:
                 self._step_variable(delta_time)
             elif self.config.step_mode == PhysicsStepMode.ADAPTIVE:
                 self._step_adaptive(delta_time)
             
+            # Write body poses back, blended by how far into the next fixed step we are
+            alpha = 1.0
+            if self.config.interpolate_transforms and self.config.step_mode == PhysicsStepMode.FIXED:
+                alpha = min(self.accumulator / self.config.fixed_timestep, 1.0)
+            self.transform_sync.write_transforms(alpha)
+            
             # Update statistics
             self._update_stats(delta_time)
             
@@ -148,9 +210,15 @@ class PhysicsEngine:
         """Step with fixed timestep."""
         self.accumulator += delta_time
         
-        while self.accumulator >= self.config.fixed_timestep:
+        # Cap catch-up steps so a long frame cannot snowball into longer ones
+        substeps = 0
+        while self.accumulator >= self.config.fixed_timestep and substeps < self.config.max_substeps:
             self._physics_step(self.config.fixed_timestep)
             self.accumulator -= self.config.fixed_timestep
+            substeps += 1
+        
+        self.stats.substeps = substeps
+        self._settle_time_debt(self.config.max_substeps * self.config.fixed_timestep)
     
     def _step_variable(self, delta_time: float):
         """Step with variable timestep."""
@@ -159,10 +227,82 @@ class PhysicsEngine:
         self._physics_step(clamped_delta)
     
     def _step_adaptive(self, delta_time: float):
-        """Step with adaptive timestep."""
-        # TODO: Implement adaptive timestep based on simulation stability
-        clamped_delta = min(delta_time, self.config.max_timestep)
-        self._physics_step(clamped_delta)
+        """Step with adaptive substeps.
+        
+        The frame is split into as many equal substeps as the fastest body,
+        the deepest penetration and the solver residual of the last step
+        call for, each no longer than max_timestep and no more than
+        max_substeps per frame.
+        """
+        max_frame_time = self.config.max_substeps * self.config.max_timestep
+        
+        self.accumulator += delta_time
+        frame_time = min(self.accumulator, max_frame_time)
+        self.accumulator -= frame_time
+        
+        if frame_time <= 0.0:
+            self.stats.substeps = 0
+            return
+        
+        substeps = max(
+            math.ceil(frame_time / self.config.max_timestep - 1e-9),
+            self._required_substeps(frame_time)
+        )
+        substeps = min(substeps, self.config.max_substeps)
+        
+        substep_time = frame_time / substeps
+        for _ in range(substeps):
+            self._physics_step(substep_time)
+        
+        self.stats.substeps = substeps
+        self._settle_time_debt(max_frame_time)
+    
+    def _required_substeps(self, frame_time: float) -> int:
+        """Estimate how many substeps the current state needs.
+        
+        Args:
+            frame_time: Time to simulate this frame
+            
+        Returns:
+            Number of substeps (may exceed the per-frame cap)
+        """
+        substeps = 1
+        
+        # No body should move more than a fraction of its size per substep
+        if self.world:
+            for body in self.world.get_rigid_bodies():
+                if body.is_static_body() or body.is_sleeping():
+                    continue
+                velocity = body.linear_velocity
+                speed = math.sqrt(velocity[0] ** 2 + velocity[1] ** 2 + velocity[2] ** 2)
+                max_travel = self.config.adaptive_max_travel * min(body.scale) * 0.5
+                if max_travel > 0.0:
+                    substeps = max(substeps, math.ceil(speed * frame_time / max_travel))
+        
+        # Deep penetration or an unconverged solver ask for proportionally more
+        if self.last_max_penetration > self.config.adaptive_penetration_limit:
+            substeps = max(substeps, math.ceil(self.last_max_penetration / self.config.adaptive_penetration_limit))
+        
+        if self.collision_resolver and self.collision_resolver.last_residual > self.config.adaptive_residual_limit:
+            substeps = max(substeps, math.ceil(self.collision_resolver.last_residual / self.config.adaptive_residual_limit))
+        
+        return substeps
+    
+    def _settle_time_debt(self, max_debt: float):
+        """Apply the time debt policy to time the substep cap left over.
+        
+        Args:
+            max_debt: Most time that may be carried to later frames
+        """
+        if self.config.time_debt_policy == TimeDebtPolicy.CARRY:
+            self.accumulator = min(self.accumulator, max_debt)
+        elif self.config.step_mode == PhysicsStepMode.FIXED:
+            # Keep the fractional step so the fixed cadence stays smooth
+            self.accumulator %= self.config.fixed_timestep
+        else:
+            self.accumulator = 0.0
+        
+        self.stats.time_debt = self.accumulator
     
     def _physics_step(self, delta_time: float):
         """Perform a single physics step.
@@ -171,49 +311,168 @@ class PhysicsEngine:
             delta_time: Time step
         """
         step_start = time.time()
+        profiler = self.profiler
+        if profiler:
+            profiler.begin_step(self.step_count)
+        
+        # Remember where fast bodies start so their motion can be swept
+        ccd_start_positions = {}
+        if self.config.enable_ccd and self.world:
+            ccd_start_positions = self._gather_ccd_bodies()
         
         # Update rigid bodies
         if self.world:
             self.world.update_bodies(delta_time)
+        if profiler:
+            profiler.mark("integrate")
         
         # Detect collisions
         collision_pairs = []
         if self.collision_detector and self.world:
             collision_pairs = self.collision_detector.detect_collisions(self.world.get_rigid_bodies())
+            if profiler:
+                profiler.split("narrow_phase", "broad_phase", self.collision_detector.broad_phase_ns)
+            
+            # Catch fast bodies that passed through something during the step
+            if ccd_start_positions:
+                collision_pairs = self.collision_detector.detect_continuous_collisions(
+                    ccd_start_positions, collision_pairs
+                )
+            if profiler:
+                profiler.mark("ccd")
+            
+            # Send trigger and contact events; trigger pairs never reach the solver
+            collision_pairs = self.trigger_system.update(collision_pairs)
+            if profiler:
+                profiler.mark("triggers")
         
-        # Resolve collisions
-        if self.collision_resolver and collision_pairs:
-            self.collision_resolver.resolve_collisions(collision_pairs, delta_time)
-        
-        # Update constraints
+        # Build islands from the contact and constraint graph
+        islands: List[Island] = []
         if self.world:
-            self.world.update_constraints(delta_time)
-        
-        # Update sleeping bodies
+            islands = self.island_builder.build(
+                self.world.get_rigid_bodies(), collision_pairs, self.world.get_constraints()
+            )
+        
+        # Islands touched by an awake body wake up as a whole, fully sleeping ones are skipped
+        active_islands = []
+        for island in islands:
+            if island.is_sleeping():
+                continue
+            island.set_sleeping(False)
+            active_islands.append(island)
+        if profiler:
+            profiler.mark("islands")
+        
+        # Resolve collisions island by island
+        if self.collision_resolver:
+            self.collision_resolver.begin_step()
+            self._solve_islands(active_islands, delta_time)
+            self.collision_resolver.end_step()
+        if profiler:
+            profiler.mark("solver")
+        
+        # Update sleeping islands
         if self.config.enable_sleeping:
-            self._update_sleeping_bodies()
+            self._update_sleeping_islands(active_islands, delta_time)
+        if profiler:
+            profiler.mark("sleeping")
         
         # Update step statistics
         step_time = time.time() - step_start
         self.stats.step_time = step_time
         self.stats.collision_pairs = len(collision_pairs)
+        self.last_max_penetration = max((pair.penetration for pair in collision_pairs), default=0.0)
+        self.stats.islands = len(islands)
+        self.stats.sleeping_islands = len(islands) - len(active_islands)
         self.step_count += 1
     
-    def _update_sleeping_bodies(self):
-        """Update sleeping/awake status of rigid bodies."""
-        if not self.world:
-            return
+        # Record poses for the transform write-back
+        self.transform_sync.capture()
+        
+        if profiler:
+            profiler.mark("transform_sync")
+            self._record_profile(profiler, collision_pairs, islands)
+    
+    def _record_profile(self, profiler: PhysicsProfiler, collision_pairs: List, islands: List[Island]):
+        """Finish the profiler sample of the step that just ran.
         
+        Args:
+            profiler: Step profiler
+            collision_pairs: Collision pairs solved this step
+            islands: Islands built this step
+        """
+        bodies = self.world.get_rigid_bodies() if self.world else []
+        dynamic = [body for body in bodies if not body.is_static_body()]
+        sleeping = sum(1 for body in dynamic if body.is_sleeping())
+        detector = self.collision_detector
+        
+        profiler.end_step(
+            bodies=len(bodies),
+            broad_phase_pairs=detector.broad_phase_pairs if detector else 0,
+            narrow_phase_pairs=detector.narrow_phase_pairs if detector else 0,
+            contact_points=sum(len(pair.contact_points) for pair in collision_pairs),
+            solver_iterations=self.collision_resolver.iterations_used if self.collision_resolver else 0,
+            islands=len(islands),
+            sleeping_ratio=sleeping / len(dynamic) if dynamic else 0.0,
+            max_penetration=self.last_max_penetration,
+            grid_cells=len(detector.spatial_grid) if detector else 0
+        )
+        if detector:
+            profiler.record_occupancy(detector.get_grid_occupancy())
+    
+    def _gather_ccd_bodies(self) -> Dict[RigidBody, List[float]]:
+        """Select bodies that need continuous collision detection this step.
+        
+        Returns:
+            Start positions of bodies flagged for CCD or faster than the threshold
+        """
+        threshold_sq = self.config.ccd_velocity_threshold ** 2
+        start_positions = {}
         for body in self.world.get_rigid_bodies():
-            if body.is_sleeping():
+            if body.is_static_body() or body.is_sleeping() or body.is_trigger() or not body.collision_enabled:
                 continue
+            velocity = body.linear_velocity
+            if body.ccd_enabled or velocity[0] ** 2 + velocity[1] ** 2 + velocity[2] ** 2 >= threshold_sq:
+                start_positions[body] = body.position.copy()
+        return start_positions
+    
+    def _solve_islands(self, islands: List[Island], delta_time: float):
+        """Resolve collisions for each island independently.
+        
+        Args:
+            islands: Awake islands to solve
+            delta_time: Time step
+        """
+        solvable = [island for island in islands if island.collision_pairs or island.constraints]
+        resolver = self.collision_resolver
+        
+        def solve(island: Island):
+            return resolver.solve_island(island.collision_pairs, delta_time, island.constraints)
+        
+        if self._solver_pool and len(solvable) > 1:
+            # Islands share no dynamic bodies, so they can be solved concurrently
+            solutions = list(self._solver_pool.map(solve, solvable))
+        else:
+            solutions = [solve(island) for island in solvable]
+        
+        # Shared contact cache and counters are only written after every island is done
+        for solution in solutions:
+            resolver.merge_solution(solution)
+    
+    def _update_sleeping_islands(self, islands: List[Island], delta_time: float):
+        """Put islands to sleep once all of their bodies have come to rest.
+        
+        Args:
+            islands: Awake islands solved this step
+            delta_time: Time step
+        """
+        for island in islands:
+            for body in island.bodies:
+                body.update_sleep_time(delta_time)
             
-            # Check if body should sleep
-            if body.get_linear_velocity_magnitude() < self.config.sleep_threshold and \
-               body.get_angular_velocity_magnitude() < self.config.sleep_threshold:
-                body.set_sleeping(True)
-            else:
-                body.set_sleeping(False)
+            if island.is_resting(self.config.time_to_sleep):
+                island.set_sleeping(True)
+                self.island_builder.add_sleeping_island(island)
     
     def _update_stats(self, delta_time: float):
         """Update physics statistics."""
@@ -255,8 +514,37 @@ class PhysicsEngine:
         if not self.world:
             return False
         
+        self.trigger_system.remove_body(body)
+        self.transform_sync.unbind(body)
         return self.world.remove_rigid_body(body)
     
+    def bind_transform(self, body: RigidBody, game_object) -> bool:
+        """Let a body drive a GameObject's transform.
+        
+        The object's world pose is copied to the body now and whenever the
+        object or its parent is moved; otherwise the body's pose is written
+        back to the transform, relative to the parent, after each step.
+        
+        Args:
+            body: Rigid body (added to the simulation separately)
+            game_object: GameObject whose transform follows the body
+            
+        Returns:
+            True if bound successfully, False otherwise
+        """
+        return self.transform_sync.bind(body, game_object)
+    
+    def unbind_transform(self, body: RigidBody) -> bool:
+        """Stop a body driving its transform.
+        
+        Args:
+            body: Rigid body
+            
+        Returns:
+            True if the body was bound, False otherwise
+        """
+        return self.transform_sync.unbind(body)
+    
     def get_rigid_bodies(self) -> List[RigidBody]:
         """Get all rigid bodies in the simulation.
         
@@ -305,6 +593,71 @@ class PhysicsEngine:
             origin, direction, max_distance, self.world.get_rigid_bodies()
         )
     
+    def set_event_system(self, event_system):
+        """Deliver batched trigger and collision events through an event system.
+        
+        Args:
+            event_system: Scripting EventSystem, or None to stop delivery
+        """
+        self.trigger_system.set_event_system(event_system)
+    
+    def save_snapshot(self) -> int:
+        """Save the current state into the snapshot ring.
+        
+        Returns:
+            Frame number the snapshot was saved under, or -1 on failure
+        """
+        if not self.snapshots or not self.world:
+            self.logger.error("Snapshots are disabled (set PhysicsConfig.snapshot_capacity)")
+            return -1
+        
+        frame = self.step_count
+        if not self.snapshots.save(frame, self.world, self.collision_resolver, self.trigger_system):
+            return -1
+        return frame
+    
+    def restore_snapshot(self, frame: int) -> bool:
+        """Roll the simulation back to a saved frame.
+        
+        Args:
+            frame: Frame number returned by save_snapshot
+            
+        Returns:
+            True if restored successfully, False otherwise
+        """
+        if not self.snapshots or not self.world:
+            self.logger.error("Snapshots are disabled (set PhysicsConfig.snapshot_capacity)")
+            return False
+        
+        if not self.snapshots.restore(frame, self.world, self.collision_resolver, self.trigger_system):
+            return False
+        
+        self.step_count = frame
+        self.accumulator = 0.0
+        self.last_max_penetration = 0.0
+        self.transform_sync.reset()
+        return True
+    
+    def set_profiling(self, enabled: bool):
+        """Turn step instrumentation on or off.
+        
+        Args:
+            enabled: Whether to record per-step samples
+        """
+        self.config.profile_steps = enabled
+        if enabled and not self.profiler:
+            self.profiler = PhysicsProfiler(self.config.profile_history)
+        elif not enabled:
+            self.profiler = None
+    
+    def get_profiler(self) -> Optional[PhysicsProfiler]:
+        """Get the step profiler.
+        
+        Returns:
+            Profiler, or None while profiling is off
+        """
+        return self.profiler
+    
     def get_stats(self) -> PhysicsStats:
         """Get physics engine statistics.
         
@@ -354,5 +707,12 @@ class PhysicsEngine:
                 self.world.shutdown()
                 self.world = None
             
+            if self._solver_pool:
+                self._solver_pool.shutdown(wait=True)
+                self._solver_pool = None
+            
+            self.snapshots = None
+            self.transform_sync.clear()
+            
             self.is_initialized = False
             self.logger.info("✅ Physics engine shutdown complete")
\ No newline at end of file
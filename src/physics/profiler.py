@@ -0,0 +1,272 @@
+"""
+Physics Profiler for Nexlify Physics Engine.
+
+This module records per-step counters and phase timings of the physics
+engine into a bounded history, and samples the broad phase grid into an
+occupancy heatmap. Both can be queried from the editor or dumped to CSV
+to tune the grid cell size and solver iteration counts offline.
+"""
+
+import csv
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+
+# Phases timed by the engine, in step order
+PHASES = ("integrate", "broad_phase", "narrow_phase", "ccd", "triggers",
+          "islands", "solver", "sleeping", "transform_sync")
+
+
+@dataclass
+class StepSample:
+    """Counters and timings of one physics step. Times are in nanoseconds."""
+    step: int = 0
+    bodies: int = 0
+    broad_phase_pairs: int = 0
+    narrow_phase_pairs: int = 0
+    contact_points: int = 0
+    solver_iterations: int = 0
+    islands: int = 0
+    sleeping_ratio: float = 0.0
+    max_penetration: float = 0.0
+    grid_cells: int = 0
+    integrate_ns: int = 0
+    broad_phase_ns: int = 0
+    narrow_phase_ns: int = 0
+    ccd_ns: int = 0
+    triggers_ns: int = 0
+    islands_ns: int = 0
+    solver_ns: int = 0
+    sleeping_ns: int = 0
+    transform_sync_ns: int = 0
+    total_ns: int = 0
+
+
+class PhysicsProfiler:
+    """Per-step physics instrumentation with a grid occupancy heatmap."""
+    
+    def __init__(self, history: int = 600):
+        self.logger = get_logger(__name__)
+        
+        # Most recent samples, oldest first
+        self.samples: deque = deque(maxlen=history)
+        
+        # Step in progress
+        self._current: Optional[StepSample] = None
+        self._step_start_ns = 0
+        self._mark_ns = 0
+        
+        # Grid occupancy: last step, and body counts summed over all sampled steps
+        self.last_occupancy: Dict[Tuple[int, int, int], int] = {}
+        self.total_occupancy: Dict[Tuple[int, int, int], int] = {}
+        self.occupancy_steps = 0
+    
+    def begin_step(self, step: int):
+        """Start timing a physics step.
+        
+        Args:
+            step: Step number
+        """
+        self._current = StepSample(step=step)
+        self._step_start_ns = self._mark_ns = time.perf_counter_ns()
+    
+    def mark(self, phase: str) -> int:
+        """Charge the time since the previous mark to a phase.
+        
+        Args:
+            phase: One of PHASES
+        
+        Returns:
+            Elapsed nanoseconds
+        """
+        now = time.perf_counter_ns()
+        elapsed = now - self._mark_ns
+        self._mark_ns = now
+        if self._current is not None:
+            name = f"{phase}_ns"
+            setattr(self._current, name, getattr(self._current, name) + elapsed)
+        return elapsed
+    
+    def split(self, phase: str, first_phase: str, first_ns: int):
+        """Charge the time since the previous mark to two phases.
+        
+        Used for work timed internally by another system, such as the
+        collision detector's broad and narrow phases.
+        
+        Args:
+            phase: Phase that gets the remainder
+            first_phase: Phase that gets first_ns
+            first_ns: Nanoseconds measured for first_phase
+        """
+        elapsed = self.mark(phase)
+        if self._current is not None:
+            first_ns = min(first_ns, elapsed)
+            setattr(self._current, f"{phase}_ns", getattr(self._current, f"{phase}_ns") - first_ns)
+            setattr(self._current, f"{first_phase}_ns", getattr(self._current, f"{first_phase}_ns") + first_ns)
+    
+    def end_step(self, **counters) -> Optional[StepSample]:
+        """Finish the step and store its sample.
+        
+        Args:
+            **counters: StepSample counter fields for this step
+        
+        Returns:
+            The finished sample, or None if no step was started
+        """
+        sample = self._current
+        if sample is None:
+            return None
+        
+        for name, value in counters.items():
+            setattr(sample, name, value)
+        sample.total_ns = time.perf_counter_ns() - self._step_start_ns
+        
+        self.samples.append(sample)
+        self._current = None
+        return sample
+    
+    def record_occupancy(self, occupancy: Dict[Tuple[int, int, int], int]):
+        """Add a broad phase grid sample to the heatmap.
+        
+        Args:
+            occupancy: Body count keyed by grid cell
+        """
+        self.last_occupancy = occupancy
+        for cell, count in occupancy.items():
+            self.total_occupancy[cell] = self.total_occupancy.get(cell, 0) + count
+        self.occupancy_steps += 1
+    
+    def get_last_sample(self) -> Optional[StepSample]:
+        """Get the most recent step sample.
+        
+        Returns:
+            Sample or None if nothing has been recorded
+        """
+        return self.samples[-1] if self.samples else None
+    
+    def get_samples(self) -> List[StepSample]:
+        """Get the recorded step samples, oldest first.
+        
+        Returns:
+            List of samples
+        """
+        return list(self.samples)
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get the mean and peak of every sampled field.
+        
+        Returns:
+            Dictionary with "steps", "mean" and "max" entries
+        """
+        if not self.samples:
+            return {"steps": 0, "mean": {}, "max": {}}
+        
+        names = [f.name for f in fields(StepSample) if f.name != "step"]
+        values = np.array([[getattr(sample, name) for name in names] for sample in self.samples], dtype=np.float64)
+        return {
+            "steps": len(self.samples),
+            "mean": dict(zip(names, values.mean(axis=0).tolist())),
+            "max": dict(zip(names, values.max(axis=0).tolist()))
+        }
+    
+    def get_heatmap(self, axis: int = 1, average: bool = True) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Project grid occupancy onto a plane.
+        
+        Args:
+            axis: Axis summed away (1 = top-down XZ view)
+            average: Average over sampled steps instead of the last step
+        
+        Returns:
+            (2D array of body counts, grid coordinates of element [0, 0])
+        """
+        occupancy = self.total_occupancy if average else self.last_occupancy
+        if not occupancy:
+            return np.zeros((0, 0), dtype=np.float64), (0, 0)
+        
+        plane_axes = [i for i in range(3) if i != axis]
+        cells = np.array([[cell[i] for i in plane_axes] for cell in occupancy], dtype=np.int64)
+        counts = np.array(list(occupancy.values()), dtype=np.float64)
+        if average and self.occupancy_steps:
+            counts /= self.occupancy_steps
+        
+        origin = cells.min(axis=0)
+        shape = cells.max(axis=0) - origin + 1
+        heatmap = np.zeros(tuple(shape), dtype=np.float64)
+        np.add.at(heatmap, tuple((cells - origin).T), counts)
+        return heatmap, (int(origin[0]), int(origin[1]))
+    
+    def export_csv(self, path: str) -> bool:
+        """Write the step samples to a CSV file.
+        
+        Args:
+            path: Output file path
+        
+        Returns:
+            True if written successfully, False otherwise
+        """
+        try:
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(StepSample)])
+                writer.writeheader()
+                for sample in self.samples:
+                    writer.writerow(asdict(sample))
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error exporting physics samples: {e}")
+            return False
+    
+    def export_heatmap_csv(self, path: str) -> bool:
+        """Write the grid occupancy to a CSV file, one row per cell.
+        
+        Args:
+            path: Output file path
+        
+        Returns:
+            True if written successfully, False otherwise
+        """
+        try:
+            steps = max(self.occupancy_steps, 1)
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["x", "y", "z", "last_count", "mean_count"])
+                for cell in sorted(self.total_occupancy):
+                    writer.writerow([
+                        *cell,
+                        self.last_occupancy.get(cell, 0),
+                        self.total_occupancy[cell] / steps
+                    ])
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error exporting grid heatmap: {e}")
+            return False
+    
+    def clear(self):
+        """Drop all samples and heatmap data."""
+        self.samples.clear()
+        self._current = None
+        self.last_occupancy = {}
+        self.total_occupancy = {}
+        self.occupancy_steps = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get profiler statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        last = self.get_last_sample()
+        return {
+            "samples": len(self.samples),
+            "history": self.samples.maxlen,
+            "heatmap_cells": len(self.total_occupancy),
+            "last_step_ns": last.total_ns if last else 0
+        }
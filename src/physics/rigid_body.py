@@ -5,14 +5,20 @@ This module provides rigid body physics simulation including
 mass, velocity, forces, and collision response.
 """
 
+import itertools
 import logging
 import math
 from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
+from .collision_layers import MAX_LAYERS
 from ..utils.logger import get_logger
 
 
+# Source of stable body identifiers (used for contact caching and pair ordering)
+_body_ids = itertools.count(1)
+
+
 @dataclass
 class PhysicsMaterial:
     """Physics material properties."""
@@ -27,6 +33,7 @@ class RigidBody:
     
     def __init__(self):
         self.logger = get_logger(__name__)
+        self.body_id: int = next(_body_ids)
         
         # Position and orientation
         self.position: List[float] = [0.0, 0.0, 0.0]
@@ -55,7 +62,7 @@ class RigidBody:
         
         # State
         self.is_static: bool = False
-        self.is_sleeping: bool = False
+        self.sleeping: bool = False
         self.sleep_threshold: float = 0.1
         self.sleep_time: float = 0.0
         
@@ -65,6 +72,14 @@ class RigidBody:
         # Collision
         self.collision_enabled: bool = True
         self.trigger: bool = False
+        self.ccd_enabled: bool = False
+        self.mesh_collider = None  # TriangleMeshBVH for static level geometry
+        self.collider = None  # Collider component notified of trigger and collision events
+        
+        # Collision filtering
+        self.layer: int = 0  # GameObject layer, checked against the layer collision matrix
+        self.collision_category: int = 0x00000001  # Bits this body belongs to
+        self.collision_mask: int = 0xFFFFFFFF  # Categories this body collides with
         
     def set_position(self, position: List[float]):
         """Set the position of the rigid body.
@@ -185,7 +200,7 @@ class RigidBody:
             force: Force vector [x, y, z]
             point: Point of application (optional, defaults to center of mass)
         """
-        if self.is_static or self.is_sleeping:
+        if self.is_static or self.sleeping:
             return
         
         # Add linear force
@@ -208,7 +223,7 @@ class RigidBody:
         Args:
             torque: Torque vector [x, y, z]
         """
-        if self.is_static or self.is_sleeping:
+        if self.is_static or self.sleeping:
             return
         
         for i in range(3):
@@ -223,7 +238,7 @@ class RigidBody:
             impulse: Impulse vector [x, y, z]
             point: Point of application (optional)
         """
-        if self.is_static or self.is_sleeping:
+        if self.is_static or self.sleeping:
             return
         
         # Apply linear impulse
@@ -245,7 +260,7 @@ class RigidBody:
         Args:
             impulse: Angular impulse vector [x, y, z]
         """
-        if self.is_static or self.is_sleeping:
+        if self.is_static or self.sleeping:
             return
         
         for i in range(3):
@@ -270,6 +285,8 @@ class RigidBody:
                 self.mass = 1.0
                 self.inverse_mass = 1.0
         
+        # Static bodies must not rotate under contact impulses either
+        self._update_inertia_tensor()
         self.wake_up()
     
     def is_static_body(self) -> bool:
@@ -286,7 +303,7 @@ class RigidBody:
         Args:
             sleeping: Whether the body is sleeping
         """
-        self.is_sleeping = sleeping
+        self.sleeping = sleeping
         if sleeping:
             self.linear_velocity = [0.0, 0.0, 0.0]
             self.angular_velocity = [0.0, 0.0, 0.0]
@@ -299,11 +316,11 @@ class RigidBody:
         Returns:
             True if sleeping, False otherwise
         """
-        return self.is_sleeping
+        return self.sleeping
     
     def wake_up(self):
         """Wake up the rigid body."""
-        self.is_sleeping = False
+        self.sleeping = False
         self.sleep_time = 0.0
     
     def get_linear_velocity_magnitude(self) -> float:
@@ -396,6 +413,74 @@ class RigidBody:
         """
         return self.trigger
     
+    def set_ccd_enabled(self, enabled: bool):
+        """Always sweep this body for continuous collision detection.
+        
+        Args:
+            enabled: Whether the body is swept regardless of its speed
+        """
+        self.ccd_enabled = enabled
+    
+    def is_ccd_enabled(self) -> bool:
+        """Check if this body is always swept.
+        
+        Returns:
+            True if CCD is forced on, False otherwise
+        """
+        return self.ccd_enabled
+    
+    def set_mesh_collider(self, mesh_collider):
+        """Collide using a triangle mesh instead of the scale box.
+        
+        Mesh colliders are for level geometry, so the body becomes static.
+        
+        Args:
+            mesh_collider: TriangleMeshBVH in the body's local space, or None
+        """
+        self.mesh_collider = mesh_collider
+        if mesh_collider is not None:
+            self.set_static(True)
+    
+    def get_aabb(self) -> Tuple[List[float], List[float]]:
+        """Get the world-space bounding box.
+        
+        Returns:
+            (min bounds, max bounds)
+        """
+        if self.mesh_collider is not None:
+            return self.mesh_collider.get_bounds(self.position)
+        
+        half_size = [s * 0.5 for s in self.scale]
+        return (
+            [self.position[i] - half_size[i] for i in range(3)],
+            [self.position[i] + half_size[i] for i in range(3)]
+        )
+    
+    def set_layer(self, layer: int):
+        """Set the collision layer (usually the GameObject's layer).
+        
+        Args:
+            layer: Layer index (0-31)
+        
+        Raises:
+            ValueError: If the layer is out of range
+        """
+        if not 0 <= layer < MAX_LAYERS:
+            raise ValueError(f"Layer must be between 0 and {MAX_LAYERS - 1}, got {layer}")
+        self.layer = layer
+    
+    def set_collision_filter(self, category: int, mask: int):
+        """Set the collision category and mask bits.
+        
+        Two bodies collide only if each one's category is in the other's mask.
+        
+        Args:
+            category: 32-bit category bits this body belongs to
+            mask: 32-bit mask of categories this body collides with
+        """
+        self.collision_category = category & 0xFFFFFFFF
+        self.collision_mask = mask & 0xFFFFFFFF
+    
     def _update_inertia_tensor(self):
         """Update the inertia tensor based on mass and scale."""
         # Simple box inertia tensor
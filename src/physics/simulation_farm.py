@@ -0,0 +1,180 @@
+"""
+Simulation Farm for Nexlify Physics Engine.
+
+This module runs many independent, deterministic physics worlds across
+worker processes. Each worker builds its world, steps it with a fixed
+timestep and writes the final body state into a shared memory block
+owned by the farm, so results come back without pickling bodies.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from multiprocessing import shared_memory
+from typing import Dict, Any, Optional, List, Callable
+
+from .config import PhysicsConfig, PhysicsStepMode
+from .physics_engine import PhysicsEngine
+from .body_state import BodyState
+from ..utils.logger import get_logger
+
+
+@dataclass
+class SimulationJob:
+    """One independent simulation run.
+    
+    The setup callable receives a running engine and adds the bodies and
+    constraints of the scene. It must be a module-level function so it
+    can be sent to worker processes.
+    """
+    setup: Callable[[PhysicsEngine], None]
+    steps: int
+    config: PhysicsConfig = field(default_factory=PhysicsConfig)
+    max_bodies: int = 256
+    name: str = ""
+
+
+@dataclass
+class SimulationResult:
+    """Final state of a simulation run."""
+    name: str
+    state: Optional[BodyState]
+    checksum: str = ""
+    steps: int = 0
+    error: str = ""
+
+
+def run_deterministic(job: SimulationJob, state: BodyState) -> str:
+    """Run a job in the current process and capture its final state.
+    
+    Args:
+        job: Simulation to run
+        state: Body state to capture the result into
+    
+    Returns:
+        Checksum of the final state
+    """
+    config = replace(job.config, deterministic=True, step_mode=PhysicsStepMode.FIXED, solver_workers=0)
+    engine = PhysicsEngine(config)
+    if not engine.initialize():
+        raise RuntimeError("Physics engine failed to initialize")
+    
+    try:
+        engine.start()
+        job.setup(engine)
+        
+        for _ in range(job.steps):
+            engine.step()
+        
+        state.capture(engine.get_rigid_bodies())
+        return state.checksum()
+    
+    finally:
+        engine.shutdown()
+
+
+def _run_job(job: SimulationJob, memory_name: str, offset: int) -> Dict[str, Any]:
+    """Worker entry point: run a job and write its state into shared memory.
+    
+    Args:
+        job: Simulation to run
+        memory_name: Name of the farm's shared memory block
+        offset: Byte offset of this job's state in the block
+    
+    Returns:
+        Summary of the run
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        state = BodyState(job.max_bodies, memory.buf, offset)
+        checksum = run_deterministic(job, state)
+        count = state.count
+        
+        # Release the view before closing the block
+        del state
+        return {"count": count, "checksum": checksum}
+    
+    finally:
+        memory.close()
+
+
+class SimulationFarm:
+    """Shards independent deterministic simulations across processes."""
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.logger = get_logger(__name__)
+        self.max_workers = max_workers
+        
+        # Performance tracking
+        self.jobs_run = 0
+        self.jobs_failed = 0
+    
+    def run(self, jobs: List[SimulationJob]) -> List[SimulationResult]:
+        """Run simulation jobs in worker processes.
+        
+        Args:
+            jobs: Simulations to run
+        
+        Returns:
+            Results in the same order as the jobs
+        """
+        if not jobs:
+            return []
+        
+        # One shared block holds every job's state side by side
+        offsets = []
+        total_size = 0
+        for job in jobs:
+            offsets.append(total_size)
+            total_size += BodyState.nbytes(job.max_bodies)
+        
+        memory = shared_memory.SharedMemory(create=True, size=max(total_size, 1))
+        results: List[SimulationResult] = []
+        
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [
+                    pool.submit(_run_job, job, memory.name, offset)
+                    for job, offset in zip(jobs, offsets)
+                ]
+                
+                for job, offset, future in zip(jobs, offsets, futures):
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Simulation {job.name or '<unnamed>'} failed: {e}")
+                        self.jobs_failed += 1
+                        results.append(SimulationResult(name=job.name, state=None, error=str(e)))
+                        continue
+                    
+                    # Copy out of shared memory before it is released
+                    shared_state = BodyState(job.max_bodies, memory.buf, offset)
+                    shared_state.count = summary["count"]
+                    state = shared_state.copy()
+                    del shared_state
+                    
+                    self.jobs_run += 1
+                    results.append(SimulationResult(
+                        name=job.name,
+                        state=state,
+                        checksum=summary["checksum"],
+                        steps=job.steps
+                    ))
+            
+            return results
+        
+        finally:
+            memory.close()
+            memory.unlink()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get simulation farm statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "max_workers": self.max_workers,
+            "jobs_run": self.jobs_run,
+            "jobs_failed": self.jobs_failed
+        }
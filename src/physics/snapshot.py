@@ -0,0 +1,273 @@
+"""
+World Snapshots for Nexlify Physics Engine.
+
+This module captures the simulation state (body state, sleep flags,
+cached contact impulses, constraint impulses and the trigger system's
+overlaps and contacts) into a ring of
+preallocated arrays. Saving and restoring copy into existing storage
+and never allocate per frame, which makes rollback, replay scrubbing and
+"what if" re-simulation cheap.
+"""
+
+import logging
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+
+from .body_state import BodyState
+from .world import PhysicsWorld
+from .collision_resolver import CollisionResolver
+from .trigger_system import TriggerSystem
+from ..utils.logger import get_logger
+
+
+class SnapshotRing:
+    """Fixed-size ring of world snapshots keyed by frame number."""
+    
+    def __init__(self, capacity: int = 64, max_bodies: int = 1024,
+                 max_contacts: int = 4096, max_constraints: int = 256):
+        self.logger = get_logger(__name__)
+        
+        self.capacity = capacity
+        self.max_bodies = max_bodies
+        self.max_contacts = max_contacts
+        self.max_constraints = max_constraints
+        
+        # Frame number stored in each slot (-1 = empty)
+        self.frames = np.full(capacity, -1, dtype=np.int64)
+        self._slot_by_frame: Dict[int, int] = {}
+        self._next_slot = 0
+        
+        # Body state, one BodyState view per slot over a single buffer
+        state_size = BodyState.nbytes(max_bodies)
+        self._state_buffer = np.zeros(capacity * state_size, dtype=np.uint8)
+        self._states = [
+            BodyState(max_bodies, self._state_buffer.data, slot * state_size)
+            for slot in range(capacity)
+        ]
+        self.body_ids = np.zeros((capacity, max_bodies), dtype=np.int64)
+        self.sleeping = np.zeros((capacity, max_bodies), dtype=bool)
+        self.sleep_time = np.zeros((capacity, max_bodies), dtype=np.float64)
+        
+        # Warm starting cache: (body_a, body_b, feature) -> (normal, tangent 1, tangent 2)
+        self.contact_counts = np.zeros(capacity, dtype=np.int64)
+        self.contact_keys = np.zeros((capacity, max_contacts, 3), dtype=np.int64)
+        self.contact_impulses = np.zeros((capacity, max_contacts, 3), dtype=np.float64)
+        
+        # Accumulated constraint impulses in solver slot order
+        self.constraint_counts = np.zeros(capacity, dtype=np.int64)
+        self.constraint_linear = np.zeros((capacity, max_constraints, 3), dtype=np.float64)
+        self.constraint_angular = np.zeros((capacity, max_constraints, 2), dtype=np.float64)
+        
+        # Trigger overlaps and solid contacts as ordered body id pairs, so restoring
+        # does not replay enter or exit events for pairs that already existed
+        self.overlap_counts = np.zeros(capacity, dtype=np.int64)
+        self.overlap_pairs = np.zeros((capacity, max_contacts, 2), dtype=np.int64)
+        self.touching_counts = np.zeros(capacity, dtype=np.int64)
+        self.touching_pairs = np.zeros((capacity, max_contacts, 2), dtype=np.int64)
+        
+        # Performance tracking
+        self.saves = 0
+        self.restores = 0
+    
+    def save(self, frame: int, world: PhysicsWorld, resolver: Optional[CollisionResolver] = None,
+             triggers: Optional[TriggerSystem] = None) -> bool:
+        """Capture the world state, overwriting the oldest snapshot when full.
+        
+        Args:
+            frame: Frame number to store the snapshot under
+            world: Physics world to capture
+            resolver: Collision resolver whose contact cache is captured
+            triggers: Trigger system whose overlaps and contacts are captured
+        
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        try:
+            bodies = world.get_rigid_bodies()
+            contact_cache = resolver.contact_cache if resolver else {}
+            constraint_solver = world.constraint_solver
+            overlaps = list(triggers.trigger_overlaps) if triggers else []
+            touching = list(triggers.contacts) if triggers else []
+            
+            if len(bodies) > self.max_bodies:
+                self.logger.error(f"Snapshot holds {self.max_bodies} bodies, world has {len(bodies)}")
+                return False
+            if len(contact_cache) > self.max_contacts:
+                self.logger.error(f"Snapshot holds {self.max_contacts} contacts, cache has {len(contact_cache)}")
+                return False
+            if constraint_solver.count > self.max_constraints:
+                self.logger.error(f"Snapshot holds {self.max_constraints} constraints, world has {constraint_solver.count}")
+                return False
+            if max(len(overlaps), len(touching)) > self.max_contacts:
+                self.logger.error(f"Snapshot holds {self.max_contacts} trigger pairs, "
+                                  f"world has {max(len(overlaps), len(touching))}")
+                return False
+            
+            # Reuse the slot if this frame was already saved
+            slot = self._slot_by_frame.get(frame)
+            if slot is None:
+                slot = self._next_slot
+                self._next_slot = (self._next_slot + 1) % self.capacity
+                self._slot_by_frame.pop(int(self.frames[slot]), None)
+            
+            # Bodies
+            count = len(bodies)
+            self._states[slot].capture(bodies)
+            self.body_ids[slot, :count] = [body.body_id for body in bodies]
+            self.sleeping[slot, :count] = [body.sleeping for body in bodies]
+            self.sleep_time[slot, :count] = [body.sleep_time for body in bodies]
+            
+            # Contact cache
+            contacts = len(contact_cache)
+            self.contact_counts[slot] = contacts
+            if contacts:
+                self.contact_keys[slot, :contacts] = list(contact_cache.keys())
+                self.contact_impulses[slot, :contacts] = list(contact_cache.values())
+            
+            # Constraint impulses
+            constraints = constraint_solver.count
+            self.constraint_counts[slot] = constraints
+            self.constraint_linear[slot, :constraints] = constraint_solver.linear_impulse[:constraints]
+            self.constraint_angular[slot, :constraints] = constraint_solver.angular_impulse[:constraints]
+            
+            # Trigger overlaps and contacts
+            self.overlap_counts[slot] = len(overlaps)
+            if overlaps:
+                self.overlap_pairs[slot, :len(overlaps)] = overlaps
+            self.touching_counts[slot] = len(touching)
+            if touching:
+                self.touching_pairs[slot, :len(touching)] = touching
+            
+            self.frames[slot] = frame
+            self._slot_by_frame[frame] = slot
+            self.saves += 1
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error saving snapshot: {e}")
+            return False
+    
+    def restore(self, frame: int, world: PhysicsWorld, resolver: Optional[CollisionResolver] = None,
+                triggers: Optional[TriggerSystem] = None) -> bool:
+        """Restore the world to a saved frame.
+        
+        The world must still contain the bodies that were saved; bodies
+        added since are left untouched.
+        
+        Args:
+            frame: Frame number to restore
+            world: Physics world to restore into
+            resolver: Collision resolver whose contact cache is restored
+            triggers: Trigger system whose overlaps and contacts are restored
+        
+        Returns:
+            True if restored successfully, False otherwise
+        """
+        slot = self._slot_by_frame.get(frame)
+        if slot is None:
+            self.logger.error(f"No snapshot for frame {frame}")
+            return False
+        
+        try:
+            state = self._states[slot]
+            count = state.count
+            
+            # Match saved bodies by id
+            bodies_by_id = {body.body_id: body for body in world.get_rigid_bodies()}
+            bodies = [bodies_by_id.get(body_id) for body_id in self.body_ids[slot, :count].tolist()]
+            if any(body is None for body in bodies):
+                self.logger.error(f"Bodies saved in frame {frame} are no longer in the world")
+                return False
+            
+            state.apply(bodies)
+            sleeping = self.sleeping[slot, :count].tolist()
+            sleep_time = self.sleep_time[slot, :count].tolist()
+            for body, body_sleeping, body_sleep_time in zip(bodies, sleeping, sleep_time):
+                body.sleeping = body_sleeping
+                body.sleep_time = body_sleep_time
+                body.accumulated_force = [0.0, 0.0, 0.0]
+                body.accumulated_torque = [0.0, 0.0, 0.0]
+            
+            # Contact cache
+            if resolver:
+                contacts = int(self.contact_counts[slot])
+                keys = map(tuple, self.contact_keys[slot, :contacts].tolist())
+                impulses = map(tuple, self.contact_impulses[slot, :contacts].tolist())
+                resolver.contact_cache = dict(zip(keys, impulses))
+            
+            # Constraint impulses, only while the constraint set is unchanged
+            constraint_solver = world.constraint_solver
+            constraints = int(self.constraint_counts[slot])
+            if constraints == constraint_solver.count:
+                constraint_solver.linear_impulse[:constraints] = self.constraint_linear[slot, :constraints]
+                constraint_solver.angular_impulse[:constraints] = self.constraint_angular[slot, :constraints]
+            else:
+                constraint_solver.linear_impulse[:constraint_solver.count] = 0.0
+                constraint_solver.angular_impulse[:constraint_solver.count] = 0.0
+            
+            # Trigger overlaps and contacts; the trigger body comes first in an overlap
+            if triggers:
+                overlaps = {}
+                for key in map(tuple, self.overlap_pairs[slot, :int(self.overlap_counts[slot])].tolist()):
+                    body_a, body_b = bodies_by_id.get(key[0]), bodies_by_id.get(key[1])
+                    if body_a and body_b:
+                        overlaps[key] = (body_a, body_b) if body_a.trigger else (body_b, body_a)
+                touching = {}
+                for key in map(tuple, self.touching_pairs[slot, :int(self.touching_counts[slot])].tolist()):
+                    body_a, body_b = bodies_by_id.get(key[0]), bodies_by_id.get(key[1])
+                    if body_a and body_b:
+                        touching[key] = (body_a, body_b)
+                triggers.trigger_overlaps = overlaps
+                triggers.contacts = touching
+            
+            self.restores += 1
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error restoring snapshot: {e}")
+            return False
+    
+    def has_frame(self, frame: int) -> bool:
+        """Check if a frame is stored.
+        
+        Args:
+            frame: Frame number
+        
+        Returns:
+            True if the frame can be restored, False otherwise
+        """
+        return frame in self._slot_by_frame
+    
+    def get_frames(self) -> List[int]:
+        """Get the stored frame numbers, oldest first.
+        
+        Returns:
+            List of frame numbers
+        """
+        return sorted(self._slot_by_frame)
+    
+    def clear(self):
+        """Drop all snapshots."""
+        self.frames[:] = -1
+        self._slot_by_frame.clear()
+        self._next_slot = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot ring statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "capacity": self.capacity,
+            "stored_frames": len(self._slot_by_frame),
+            "saves": self.saves,
+            "restores": self.restores,
+            "memory_bytes": int(
+                self._state_buffer.nbytes + self.body_ids.nbytes + self.sleeping.nbytes
+                + self.sleep_time.nbytes + self.contact_keys.nbytes + self.contact_impulses.nbytes
+                + self.constraint_linear.nbytes + self.constraint_angular.nbytes
+                + self.overlap_pairs.nbytes + self.touching_pairs.nbytes
+            )
+        }
@@ -0,0 +1,296 @@
+"""
+Transform Sync for Nexlify Physics Engine.
+
+This module keeps GameObject transforms and rigid bodies in step. Moved
+transforms are pushed into physics only when they are dirty, and the
+poses of awake dynamic bodies are gathered into arrays once per physics
+step. Transforms are written from those arrays once per frame,
+interpolated between the last two steps so rendering stays smooth when
+the frame rate and the physics rate differ. Bodies live in world space;
+transforms of parented objects are converted to and from their parent's
+space.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .rigid_body import RigidBody
+from .constraint_solver import rotation_matrices, euler_angles
+from ..utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from ..core.game_object import GameObject
+
+
+class TransformSync:
+    """Bidirectional sync between rigid bodies and GameObject transforms."""
+    
+    def __init__(self, capacity: int = 64):
+        self.logger = get_logger(__name__)
+        
+        # Bound pairs, packed in slots [0, count)
+        self.bodies: List[RigidBody] = []
+        self.game_objects: List['GameObject'] = []
+        self._slot_by_body: Dict[int, int] = {}
+        
+        # Parent and parent world version at the last push, to notice parents moving
+        self._parent_keys: List[Optional[Tuple[int, int]]] = []
+        
+        # World poses of the last two physics steps (positions, rotations in degrees)
+        self.previous_position = np.zeros((capacity, 3), dtype=np.float64)
+        self.current_position = np.zeros((capacity, 3), dtype=np.float64)
+        self.previous_rotation = np.zeros((capacity, 3), dtype=np.float64)
+        self.current_rotation = np.zeros((capacity, 3), dtype=np.float64)
+        
+        # Slots awake at the last capture, and slots that fell asleep and need one final write
+        self._moving = np.zeros(capacity, dtype=bool)
+        self._settling = np.zeros(capacity, dtype=bool)
+        
+        # Performance tracking
+        self.pushed = 0
+        self.written = 0
+    
+    @property
+    def count(self) -> int:
+        """Number of bound bodies."""
+        return len(self.bodies)
+    
+    def bind(self, body: RigidBody, game_object: 'GameObject') -> bool:
+        """Drive a GameObject's transform from a body; its world pose moves the body first.
+        
+        Args:
+            body: Rigid body
+            game_object: GameObject whose transform follows the body
+        
+        Returns:
+            True if bound successfully, False otherwise
+        """
+        if body.body_id in self._slot_by_body:
+            self.logger.warning(f"Body {body.body_id} is already bound to a transform")
+            return False
+        
+        slot = self.count
+        if slot == len(self._moving):
+            self._grow(max(slot * 2, 16))
+        
+        self.bodies.append(body)
+        self.game_objects.append(game_object)
+        self._parent_keys.append(None)
+        self._slot_by_body[body.body_id] = slot
+        
+        # The scene is the source of truth until the first step
+        game_object.transform.dirty = True
+        self._push_slot(slot)
+        return True
+    
+    def unbind(self, body: RigidBody) -> bool:
+        """Stop syncing a body.
+        
+        Args:
+            body: Rigid body
+        
+        Returns:
+            True if the body was bound, False otherwise
+        """
+        slot = self._slot_by_body.pop(body.body_id, None)
+        if slot is None:
+            return False
+        
+        # Move the last binding into the freed slot
+        last = self.count - 1
+        if slot != last:
+            self.bodies[slot] = self.bodies[last]
+            self.game_objects[slot] = self.game_objects[last]
+            self._parent_keys[slot] = self._parent_keys[last]
+            for array in (self.previous_position, self.current_position,
+                          self.previous_rotation, self.current_rotation,
+                          self._moving, self._settling):
+                array[slot] = array[last]
+            self._slot_by_body[self.bodies[slot].body_id] = slot
+        
+        self.bodies.pop()
+        self.game_objects.pop()
+        self._parent_keys.pop()
+        self._moving[last] = False
+        self._settling[last] = False
+        return True
+    
+    def push_to_physics(self):
+        """Move bodies whose transforms, or whose parents, were moved since the last push."""
+        for slot, game_object in enumerate(self.game_objects):
+            if game_object.transform.dirty or self._parent_key(game_object) != self._parent_keys[slot]:
+                self._push_slot(slot)
+    
+    def _push_slot(self, slot: int):
+        """Copy one object's world pose into its body and restart its interpolation."""
+        body = self.bodies[slot]
+        game_object = self.game_objects[slot]
+        
+        world = game_object.get_world_matrix()
+        position = world[:3, 3]
+        rotation = np.degrees(euler_angles(self._unscaled(world[None, :3, :3]))[0])
+        
+        body.set_position(position.tolist())
+        body.set_rotation(np.radians(rotation).tolist())
+        
+        # A teleport must not be interpolated
+        self.previous_position[slot] = self.current_position[slot] = position
+        self.previous_rotation[slot] = self.current_rotation[slot] = rotation
+        
+        game_object.transform.dirty = False
+        self._parent_keys[slot] = self._parent_key(game_object)
+        self.pushed += 1
+    
+    @staticmethod
+    def _parent_key(game_object: 'GameObject') -> Optional[Tuple[int, int]]:
+        """Identify a GameObject's parent and the version of its world matrix."""
+        parent = game_object.parent
+        if parent is None:
+            return None
+        parent.get_world_matrix()
+        return id(parent), parent.world_version
+    
+    @staticmethod
+    def _depth(game_object: 'GameObject') -> int:
+        """Count a GameObject's ancestors."""
+        depth = 0
+        parent = game_object.parent
+        while parent is not None:
+            depth += 1
+            parent = parent.parent
+        return depth
+    
+    def _to_parent_space(self, parent: 'GameObject', position: np.ndarray,
+                         rotation: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert a world pose into a parent's space.
+        
+        Args:
+            parent: Parent GameObject
+            position: World position
+            rotation: World XYZ Euler angles in degrees
+        
+        Returns:
+            (local position, local rotation in degrees)
+        """
+        inverse = np.linalg.inv(parent.get_world_matrix())
+        local_position = inverse[:3, :3] @ position + inverse[:3, 3]
+        local_basis = inverse[None, :3, :3] @ rotation_matrices(np.radians(rotation)[None])
+        return local_position, np.degrees(euler_angles(self._unscaled(local_basis))[0])
+    
+    @staticmethod
+    def _unscaled(matrices: np.ndarray) -> np.ndarray:
+        """Remove scale from 3x3 transform matrices by normalizing their columns."""
+        return matrices / np.linalg.norm(matrices, axis=1, keepdims=True)
+    
+    def capture(self):
+        """Record the pose of every awake dynamic body after a physics step."""
+        count = self.count
+        if count == 0:
+            return
+        
+        awake = np.fromiter(
+            (not (body.is_static or body.sleeping) for body in self.bodies),
+            dtype=bool, count=count
+        )
+        
+        # Bodies that just fell asleep snap to their final pose on the next write
+        fell_asleep = self._moving[:count] & ~awake
+        self.previous_position[:count][fell_asleep] = self.current_position[:count][fell_asleep]
+        self.previous_rotation[:count][fell_asleep] = self.current_rotation[:count][fell_asleep]
+        self._settling[:count] |= fell_asleep
+        self._moving[:count] = awake
+        
+        slots = np.flatnonzero(awake)
+        if slots.size == 0:
+            return
+        
+        self.previous_position[slots] = self.current_position[slots]
+        self.previous_rotation[slots] = self.current_rotation[slots]
+        self.current_position[slots] = [self.bodies[slot].position for slot in slots]
+        self.current_rotation[slots] = np.degrees([self.bodies[slot].rotation for slot in slots])
+    
+    def reset(self):
+        """Snap every binding to its body's current pose (after a rollback)."""
+        count = self.count
+        if count == 0:
+            return
+        
+        self.current_position[:count] = [body.position for body in self.bodies]
+        self.current_rotation[:count] = np.degrees([body.rotation for body in self.bodies])
+        self.previous_position[:count] = self.current_position[:count]
+        self.previous_rotation[:count] = self.current_rotation[:count]
+        self._moving[:count] = False
+        self._settling[:count] = True
+    
+    def write_transforms(self, alpha: float = 1.0):
+        """Write interpolated poses to the transforms of moving bodies.
+        
+        Transforms moved by scripts since the last push keep their new
+        pose; it reaches physics on the next push.
+        
+        Args:
+            alpha: Blend between the previous (0) and current (1) step
+        """
+        count = self.count
+        slots = np.flatnonzero(self._moving[:count] | self._settling[:count])
+        self._settling[:count] = False
+        if slots.size == 0:
+            return
+        
+        positions = self.previous_position[slots] + (self.current_position[slots] - self.previous_position[slots]) * alpha
+        rotations = self.previous_rotation[slots] + (self.current_rotation[slots] - self.previous_rotation[slots]) * alpha
+        
+        # Parents are written before their children so each child is made relative to its parent's new pose
+        order = sorted(range(len(slots)), key=lambda index: self._depth(self.game_objects[slots[index]]))
+        
+        for index in order:
+            slot = int(slots[index])
+            game_object = self.game_objects[slot]
+            transform = game_object.transform
+            if transform.dirty:
+                continue
+            
+            position, rotation = positions[index], rotations[index]
+            if game_object.parent is not None:
+                position, rotation = self._to_parent_space(game_object.parent, position, rotation)
+            
+            transform.position = position.tolist()
+            transform.rotation = rotation.tolist()
+            transform.dirty = False
+            self._parent_keys[slot] = self._parent_key(game_object)
+        
+        self.written += len(slots)
+    
+    def _grow(self, capacity: int):
+        """Enlarge the pose arrays."""
+        for name in ('previous_position', 'current_position', 'previous_rotation',
+                     'current_rotation', '_moving', '_settling'):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+    
+    def clear(self):
+        """Unbind everything."""
+        self.bodies.clear()
+        self.game_objects.clear()
+        self._parent_keys.clear()
+        self._slot_by_body.clear()
+        self._moving[:] = False
+        self._settling[:] = False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get transform sync statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        count = self.count
+        return {
+            "bound_bodies": count,
+            "moving_bodies": int(self._moving[:count].sum()),
+            "transforms_pushed": self.pushed,
+            "transforms_written": self.written
+        }
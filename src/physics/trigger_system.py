@@ -0,0 +1,219 @@
+"""
+Trigger System for Nexlify Physics Engine.
+
+This module tracks trigger overlaps and solid contacts across steps.
+It diffs the current pairs against the previous step and delivers the
+enter, stay and exit sets as one batched event each per step, instead
+of one callback per contact. Trigger pairs are taken out of the pair
+list so they never reach the solver.
+
+When the batched events are processed by the event system, the
+Collider components linked to the bodies get their on_trigger_* and
+on_collision_* methods called, outside the physics step.
+"""
+
+import logging
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
+
+from .rigid_body import RigidBody
+from .collision_detector import CollisionPair
+from ..utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from ..scripting.event_system import EventSystem
+
+
+# Event names delivered through the scripting event system
+TRIGGER_ENTER_EVENT = "physics.trigger_enter"
+TRIGGER_STAY_EVENT = "physics.trigger_stay"
+TRIGGER_EXIT_EVENT = "physics.trigger_exit"
+COLLISION_ENTER_EVENT = "physics.collision_enter"
+COLLISION_EXIT_EVENT = "physics.collision_exit"
+
+# Collider method called for each event, and the pair entries naming the two bodies
+COLLIDER_CALLBACKS = {
+    TRIGGER_ENTER_EVENT: ("on_trigger_enter", "trigger", "other"),
+    TRIGGER_STAY_EVENT: ("on_trigger_stay", "trigger", "other"),
+    TRIGGER_EXIT_EVENT: ("on_trigger_exit", "trigger", "other"),
+    COLLISION_ENTER_EVENT: ("on_collision_enter", "body_a", "body_b"),
+    COLLISION_EXIT_EVENT: ("on_collision_exit", "body_a", "body_b"),
+}
+
+PairKey = Tuple[int, int]
+
+
+class TriggerSystem:
+    """Tracks trigger overlaps and contacts and batches their events."""
+    
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        
+        # Event system that receives the batched events
+        self.event_system: Optional['EventSystem'] = None
+        
+        # Overlaps from the previous step, keyed by ordered body ids
+        self.trigger_overlaps: Dict[PairKey, Tuple[RigidBody, RigidBody]] = {}
+        self.contacts: Dict[PairKey, Tuple[RigidBody, RigidBody]] = {}
+        
+        # Events of the last step
+        self.last_events: Dict[str, List[Dict[str, Any]]] = {}
+        
+        # Performance tracking
+        self.events_sent = 0
+    
+    def set_event_system(self, event_system: Optional['EventSystem']):
+        """Set the event system that receives trigger and collision events.
+        
+        Args:
+            event_system: Scripting event system or None to stop delivery
+        """
+        if self.event_system:
+            for event_name in COLLIDER_CALLBACKS:
+                self.event_system.unsubscribe(event_name, self._notify_colliders)
+        
+        self.event_system = event_system
+        if event_system:
+            for event_name in COLLIDER_CALLBACKS:
+                event_system.subscribe(event_name, self._notify_colliders)
+    
+    def _notify_colliders(self, event):
+        """Call the Collider methods of both bodies of each pair in an event.
+        
+        Args:
+            event: Batched trigger or collision event
+        """
+        method, first, second = COLLIDER_CALLBACKS[event.name]
+        for pair in event.data.get("pairs", []):
+            collider_a = pair[first].collider
+            collider_b = pair[second].collider
+            if collider_a is None or collider_b is None:
+                continue
+            getattr(collider_a, method)(collider_b)
+            getattr(collider_b, method)(collider_a)
+    
+    def update(self, collision_pairs: List[CollisionPair]) -> List[CollisionPair]:
+        """Split off trigger pairs, diff overlaps and send this step's events.
+        
+        Args:
+            collision_pairs: Collision pairs found this step
+        
+        Returns:
+            Collision pairs between solid bodies, for the solver
+        """
+        try:
+            solid_pairs = []
+            trigger_overlaps: Dict[PairKey, Tuple[RigidBody, RigidBody]] = {}
+            contacts: Dict[PairKey, Tuple[RigidBody, RigidBody]] = {}
+            
+            for pair in collision_pairs:
+                key = (pair.body_a.body_id, pair.body_b.body_id)
+                if pair.body_a.trigger:
+                    trigger_overlaps[key] = (pair.body_a, pair.body_b)
+                elif pair.body_b.trigger:
+                    trigger_overlaps[key] = (pair.body_b, pair.body_a)
+                else:
+                    contacts[key] = (pair.body_a, pair.body_b)
+                    solid_pairs.append(pair)
+            
+            # The broad phase skips pairs that cannot move; they still overlap
+            self._keep_resting(self.trigger_overlaps, trigger_overlaps)
+            self._keep_resting(self.contacts, contacts)
+            
+            events = {
+                TRIGGER_ENTER_EVENT: [
+                    self._trigger_data(bodies) for key, bodies in trigger_overlaps.items()
+                    if key not in self.trigger_overlaps
+                ],
+                TRIGGER_STAY_EVENT: [
+                    self._trigger_data(bodies) for key, bodies in trigger_overlaps.items()
+                    if key in self.trigger_overlaps
+                ],
+                TRIGGER_EXIT_EVENT: [
+                    self._trigger_data(bodies) for key, bodies in self.trigger_overlaps.items()
+                    if key not in trigger_overlaps
+                ],
+                COLLISION_ENTER_EVENT: [
+                    self._collision_data(bodies) for key, bodies in contacts.items()
+                    if key not in self.contacts
+                ],
+                COLLISION_EXIT_EVENT: [
+                    self._collision_data(bodies) for key, bodies in self.contacts.items()
+                    if key not in contacts
+                ]
+            }
+            
+            self.trigger_overlaps = trigger_overlaps
+            self.contacts = contacts
+            self.last_events = events
+            self._send_events(events)
+            
+            return solid_pairs
+        
+        except Exception as e:
+            self.logger.error(f"Error updating triggers: {e}")
+            return [pair for pair in collision_pairs if not (pair.body_a.trigger or pair.body_b.trigger)]
+    
+    def _keep_resting(self, previous: Dict[PairKey, Tuple[RigidBody, RigidBody]],
+                      current: Dict[PairKey, Tuple[RigidBody, RigidBody]]):
+        """Carry over previous pairs whose bodies are all static or sleeping.
+        
+        Args:
+            previous: Pairs from the previous step
+            current: Pairs found this step (updated in place)
+        """
+        for key, (body_a, body_b) in previous.items():
+            if key in current:
+                continue
+            if (body_a.is_static_body() or body_a.is_sleeping()) and \
+               (body_b.is_static_body() or body_b.is_sleeping()):
+                current[key] = (body_a, body_b)
+    
+    def _trigger_data(self, bodies: Tuple[RigidBody, RigidBody]) -> Dict[str, Any]:
+        """Build the event entry for a trigger overlap."""
+        return {"trigger": bodies[0], "other": bodies[1]}
+    
+    def _collision_data(self, bodies: Tuple[RigidBody, RigidBody]) -> Dict[str, Any]:
+        """Build the event entry for a contact."""
+        return {"body_a": bodies[0], "body_b": bodies[1]}
+    
+    def _send_events(self, events: Dict[str, List[Dict[str, Any]]]):
+        """Queue one event per non-empty batch.
+        
+        Args:
+            events: Event batches keyed by event name
+        """
+        if not self.event_system:
+            return
+        
+        for event_name, pairs in events.items():
+            if pairs:
+                self.event_system.queue_event(event_name, {"pairs": pairs}, source="physics")
+                self.events_sent += 1
+    
+    def remove_body(self, body: RigidBody):
+        """Forget overlaps of a removed body without sending exit events.
+        
+        Args:
+            body: Rigid body being removed
+        """
+        for pairs in (self.trigger_overlaps, self.contacts):
+            for key in [key for key in pairs if body.body_id in key]:
+                del pairs[key]
+    
+    def clear(self):
+        """Forget all overlaps."""
+        self.trigger_overlaps.clear()
+        self.contacts.clear()
+        self.last_events = {}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get trigger system statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "trigger_overlaps": len(self.trigger_overlaps),
+            "contacts": len(self.contacts),
+            "events_sent": self.events_sent
+        }
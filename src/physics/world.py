@@ -12,10 +12,12 @@ from dataclasses import dataclass
 
 from .rigid_body import RigidBody
 from .config import PhysicsConfig
+from .constraint_solver import ConstraintSolver
+from .collision_detector import CollisionDetector
 from ..utils.logger import get_logger
 
 
-@dataclass
+@dataclass(eq=False)
 class Constraint:
     """Physics constraint."""
     body_a: RigidBody
@@ -41,8 +43,13 @@ class PhysicsWorld:
         self.static_bodies: List[RigidBody] = []
         self.dynamic_bodies: List[RigidBody] = []
         
-        # Constraints
-        self.constraints: List[Constraint] = []
+        # Constraints (rows are stored in the solver's arrays)
+        self.constraint_solver = ConstraintSolver()
+        self._body_constraints: Dict[int, Set[Constraint]] = {}
+        self.constraint_iterations = 8
+        
+        # Detector used for scene queries (the physics engine shares its own)
+        self.collision_detector = CollisionDetector()
         
         # Performance tracking
         self.update_count = 0
@@ -118,6 +125,7 @@ class PhysicsWorld:
                 return False
             
             self.rigid_bodies.append(body)
+            body.sleep_threshold = self.config.sleep_threshold
             
             # Categorize body
             if body.is_static_body():
@@ -154,9 +162,10 @@ class PhysicsWorld:
             if body in self.dynamic_bodies:
                 self.dynamic_bodies.remove(body)
             
-            # Remove from constraints
-            self.constraints = [c for c in self.constraints 
-                              if c.body_a != body and c.body_b != body]
+            # Remove attached constraints
+            for constraint in list(self._body_constraints.get(body.body_id, ())):
+                self.remove_constraint(constraint)
+            self._body_constraints.pop(body.body_id, None)
             
             self.logger.debug(f"Removed rigid body from world")
             return True
@@ -204,7 +213,13 @@ class PhysicsWorld:
                 self.logger.error("Constraint bodies must be in world")
                 return False
             
-            self.constraints.append(constraint)
+            if not self.constraint_solver.add_constraint(constraint):
+                self.logger.error(f"Invalid constraint: {constraint.constraint_type}")
+                return False
+            
+            for body in (constraint.body_a, constraint.body_b):
+                self._body_constraints.setdefault(body.body_id, set()).add(constraint)
+            
             self.logger.debug(f"Added constraint: {constraint.constraint_type}")
             return True
             
@@ -222,8 +237,12 @@ class PhysicsWorld:
             True if removed successfully, False otherwise
         """
         try:
-            if constraint in self.constraints:
-                self.constraints.remove(constraint)
+            if self.constraint_solver.remove_constraint(constraint):
+                for body in (constraint.body_a, constraint.body_b):
+                    attached = self._body_constraints.get(body.body_id)
+                    if attached:
+                        attached.discard(constraint)
+                
                 self.logger.debug(f"Removed constraint: {constraint.constraint_type}")
                 return True
             return False
@@ -238,7 +257,7 @@ class PhysicsWorld:
         Returns:
             List of constraints
         """
-        return self.constraints.copy()
+        return self.constraint_solver.get_constraints()
     
     def update_bodies(self, delta_time: float):
         """Update all rigid bodies in the world.
@@ -253,15 +272,10 @@ class PhysicsWorld:
             # Apply time scale
             scaled_delta_time = delta_time * self.time_scale
             
-            # Update dynamic bodies
+            # Update dynamic bodies (sleeping is decided per island by the engine)
             for body in self.dynamic_bodies:
                 if not body.is_sleeping():
                     self._update_rigid_body(body, scaled_delta_time)
-                else:
-                    body.update_sleep_time(scaled_delta_time)
-            
-            # Update constraints
-            self.update_constraints(scaled_delta_time)
             
             # Update statistics
             self.update_count += 1
@@ -278,10 +292,10 @@ class PhysicsWorld:
             delta_time: Time step
         """
         try:
-            # Apply gravity
+            # Apply gravity directly so it doesn't count as activity that keeps the body awake
             if not body.is_static_body():
-                gravity_force = [self.gravity[i] * body.mass for i in range(3)]
-                body.add_force(gravity_force)
+                for i in range(3):
+                    body.accumulated_force[i] += self.gravity[i] * body.mass
             
             # Update linear motion
             for i in range(3):
@@ -311,60 +325,27 @@ class PhysicsWorld:
             body.accumulated_force = [0.0, 0.0, 0.0]
             body.accumulated_torque = [0.0, 0.0, 0.0]
             
-            # Check for sleeping
-            if body.should_sleep():
-                body.update_sleep_time(delta_time)
-                if body.sleep_time > 2.0:  # Sleep after 2 seconds of inactivity
-                    body.set_sleeping(True)
-            
         except Exception as e:
             self.logger.error(f"Error updating rigid body: {e}")
     
     def update_constraints(self, delta_time: float):
-        """Update all constraints in the world.
+        """Solve all constraints on their own.
+        
+        The physics engine solves constraints together with contacts inside
+        the collision resolver; this is for worlds stepped without one.
         
         Args:
             delta_time: Time step
         """
         try:
-            # Simple constraint solving (placeholder)
-            # In a real physics engine, this would implement proper constraint solving
-            # like sequential impulse or position-based dynamics
-            
-            for constraint in self.constraints:
-                self._solve_constraint(constraint, delta_time)
+            self.constraint_solver.solve(self.constraint_iterations, delta_time * self.time_scale)
                 
         except Exception as e:
             self.logger.error(f"Error updating constraints: {e}")
     
-    def _solve_constraint(self, constraint: Constraint, delta_time: float):
-        """Solve a single constraint.
-        
-        Args:
-            constraint: Constraint to solve
-            delta_time: Time step
-        """
-        try:
-            # Placeholder constraint solving
-            # This would implement actual constraint solving algorithms
-            # based on the constraint type
-            
-            if constraint.constraint_type == "distance":
-                # Distance constraint
-                pass
-            elif constraint.constraint_type == "hinge":
-                # Hinge constraint
-                pass
-            elif constraint.constraint_type == "ball_socket":
-                # Ball socket constraint
-                pass
-            
-        except Exception as e:
-            self.logger.error(f"Error solving constraint: {e}")
-    
     def raycast(self, origin: List[float], direction: List[float], 
                 max_distance: float = float('inf')) -> Optional[Dict[str, Any]]:
-        """Perform a raycast query.
+        """Perform a raycast query against the bodies in this world.
         
         Args:
             origin: Ray origin [x, y, z]
@@ -374,84 +355,7 @@ class PhysicsWorld:
         Returns:
             Hit information or None if no hit
         """
-        try:
-            # Simple raycast implementation
-            # In a real physics engine, this would use spatial partitioning
-            # and proper collision detection
-            
-            closest_hit = None
-            closest_distance = max_distance
-            
-            for body in self.rigid_bodies:
-                if not body.collision_enabled:
-                    continue
-                
-                # Simple AABB raycast
-                hit_distance = self._raycast_aabb(origin, direction, body)
-                
-                if hit_distance is not None and hit_distance < closest_distance:
-                    closest_distance = hit_distance
-                    closest_hit = {
-                        "body": body,
-                        "distance": hit_distance,
-                        "point": [origin[i] + direction[i] * hit_distance for i in range(3)],
-                        "normal": [0.0, 1.0, 0.0]  # Placeholder normal
-                    }
-            
-            return closest_hit
-            
-        except Exception as e:
-            self.logger.error(f"Error in raycast: {e}")
-            return None
-    
-    def _raycast_aabb(self, origin: List[float], direction: List[float], 
-                     body: RigidBody) -> Optional[float]:
-        """Perform AABB raycast against a rigid body.
-        
-        Args:
-            origin: Ray origin
-            direction: Ray direction
-            body: Rigid body to test
-            
-        Returns:
-            Hit distance or None if no hit
-        """
-        try:
-            # Simple AABB raycast
-            # This is a placeholder implementation
-            
-            # Get AABB bounds (simplified)
-            half_size = [s * 0.5 for s in body.scale]
-            min_bounds = [body.position[i] - half_size[i] for i in range(3)]
-            max_bounds = [body.position[i] + half_size[i] for i in range(3)]
-            
-            # Ray-AABB intersection test
-            t_min = 0.0
-            t_max = float('inf')
-            
-            for i in range(3):
-                if abs(direction[i]) < 1e-6:
-                    # Ray is parallel to the plane
-                    if origin[i] < min_bounds[i] or origin[i] > max_bounds[i]:
-                        return None
-                else:
-                    t1 = (min_bounds[i] - origin[i]) / direction[i]
-                    t2 = (max_bounds[i] - origin[i]) / direction[i]
-                    
-                    if t1 > t2:
-                        t1, t2 = t2, t1
-                    
-                    t_min = max(t_min, t1)
-                    t_max = min(t_max, t2)
-                    
-                    if t_min > t_max:
-                        return None
-            
-            return t_min if t_min >= 0 else None
-            
-        except Exception as e:
-            self.logger.error(f"Error in AABB raycast: {e}")
-            return None
+        return self.collision_detector.raycast(origin, direction, max_distance, self.rigid_bodies)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get physics world statistics.
@@ -463,7 +367,7 @@ class PhysicsWorld:
             "total_bodies": len(self.rigid_bodies),
             "dynamic_bodies": len(self.dynamic_bodies),
             "static_bodies": len(self.static_bodies),
-            "constraints": len(self.constraints),
+            "constraints": self.constraint_solver.count,
             "update_count": self.update_count,
             "time_scale": self.time_scale
         }
@@ -473,7 +377,8 @@ class PhysicsWorld:
         self.rigid_bodies.clear()
         self.static_bodies.clear()
         self.dynamic_bodies.clear()
-        self.constraints.clear()
+        self.constraint_solver.clear()
+        self._body_constraints.clear()
         self.logger.info("Physics world cleared")
     
     def shutdown(self):
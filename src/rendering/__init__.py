@@ -8,6 +8,7 @@ including modern graphics API support, shader management, and rendering pipeline
 from .renderer import Renderer
 from .device import GraphicsDevice, GraphicsAPI
 from .resources import ResourceManager
+from .primitives import PrimitiveGenerator
 from .shaders import ShaderManager
 from .pipeline import RenderPipeline
 from .scene_renderer import SceneRenderer
@@ -17,6 +18,7 @@ __all__ = [
     'GraphicsDevice',
     'GraphicsAPI',
     'ResourceManager',
+    'PrimitiveGenerator',
     'ShaderManager',
     'RenderPipeline',
     'SceneRenderer'
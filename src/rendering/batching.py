@@ -0,0 +1,262 @@
+"""
+Draw Batching for Nexlify Engine.
+
+This module reduces draw calls in two ways:
+- Instancing: consecutive render objects sharing a mesh and material are
+  drawn with one instanced draw, their world matrices packed into a
+  single instance buffer
+- Static batching: small meshes of static objects are transformed into
+  world space and merged per material and region into one mesh at load
+  time, so a forest of props becomes a handful of draws
+"""
+
+import itertools
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..asset.mesh_loader import MeshData
+from ..core.components import MeshRenderer
+from .culling import aabbs_in_frustum
+from .scene_extraction import FLAG_VISIBLE, FLAG_TRANSPARENT
+from ..utils.logger import get_logger
+
+
+def find_instance_runs(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Find runs of equal keys in draw order.
+    
+    Args:
+        keys: Per-object batch keys (mesh and material)
+    
+    Returns:
+        Start offsets and lengths of the runs
+    """
+    if not len(keys):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return starts, np.diff(np.r_[starts, len(keys)])
+
+
+def merge_meshes(meshes: List[MeshData], matrices: np.ndarray) -> MeshData:
+    """Bake transforms into copies of meshes and concatenate them.
+    
+    Args:
+        meshes: Meshes to merge
+        matrices: (n, 4, 4) world matrix per mesh
+    
+    Returns:
+        One mesh in world space
+    """
+    vertices = []
+    indices = []
+    base = 0
+    for mesh, matrix in zip(meshes, matrices.astype(np.float64)):
+        baked = mesh.vertices.astype(np.float64)
+        baked[:, 0:3] = baked[:, 0:3] @ matrix[:3, :3].T + matrix[:3, 3]
+        normals = baked[:, 3:6] @ np.linalg.inv(matrix[:3, :3])
+        baked[:, 3:6] = normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        vertices.append(baked.astype(np.float32))
+        indices.append(mesh.indices.astype(np.uint32) + np.uint32(base))
+        base += mesh.vertex_count
+    return MeshData(np.concatenate(vertices), np.concatenate(indices))
+
+
+@dataclass
+class StaticBatch:
+    """Static objects merged into one world-space mesh."""
+    mesh_name: str
+    material_id: int
+    layer: int
+    bounds_min: np.ndarray
+    bounds_max: np.ndarray
+    renderers: List[MeshRenderer]
+    source_keys: List[tuple]  # (world version, renderer revision) at build time
+
+
+class StaticBatcher:
+    """Builds and tracks static batches for a scene extractor."""
+    
+    _names = itertools.count()
+    
+    def __init__(self, resource_manager=None, cell_size: float = 32.0, max_batch_vertices: int = 65536):
+        self.resource_manager = resource_manager
+        self.logger = get_logger(__name__)
+        
+        # Objects are batched with others of the same material in the same grid cell
+        self.cell_size = cell_size
+        self.max_batch_vertices = max_batch_vertices
+        
+        self.batches: List[StaticBatch] = []
+        self._bounds_min = np.zeros((0, 3), dtype=np.float32)
+        self._bounds_max = np.zeros((0, 3), dtype=np.float32)
+        self._mask = np.zeros(0, dtype=bool)
+        self._mask_key: tuple = ()
+    
+    def build(self, extractor) -> int:
+        """Merge the small static opaque objects of an extracted scene.
+        
+        Args:
+            extractor: SceneExtractor that has extracted the scene
+        
+        Returns:
+            Number of batches built
+        """
+        self.clear()
+        if self.resource_manager is None:
+            return 0
+        
+        try:
+            count = extractor.count
+            flags = extractor.flags[:count]
+            eligible = np.flatnonzero((flags & FLAG_VISIBLE != 0) & (flags & FLAG_TRANSPARENT == 0))
+            
+            # Group by material, layer and grid cell so batches stay small enough to cull
+            cells = np.floor(extractor.bounds_center[:count] / self.cell_size).astype(np.int64)
+            groups: Dict[tuple, List[int]] = {}
+            for slot in eligible.tolist():
+                renderer = extractor.renderers[slot]
+                mesh_info = extractor.meshes[extractor.mesh_ids[slot]]
+                if not renderer.game_object.is_static or mesh_info is None or mesh_info.mesh_data is None:
+                    continue
+                key = (int(extractor.material_ids[slot]), int(extractor.layers[slot])) + tuple(cells[slot].tolist())
+                groups.setdefault(key, []).append(slot)
+            
+            for key, slots in groups.items():
+                for chunk in self._split(extractor, slots):
+                    if len(chunk) > 1:
+                        self._add_batch(extractor, key[0], key[1], chunk)
+            
+            self._update_bounds()
+            batched = sum(len(batch.renderers) for batch in self.batches)
+            self.logger.info(f"Built {len(self.batches)} static batches from {batched} objects")
+            return len(self.batches)
+        
+        except Exception as e:
+            self.logger.error(f"Failed to build static batches: {e}")
+            self.clear()
+            return 0
+    
+    def _split(self, extractor, slots: List[int]) -> List[List[int]]:
+        """Split a group so no batch exceeds the vertex limit."""
+        chunks = [[]]
+        vertices = 0
+        for slot in slots:
+            vertex_count = extractor.meshes[extractor.mesh_ids[slot]].vertex_count
+            if chunks[-1] and vertices + vertex_count > self.max_batch_vertices:
+                chunks.append([])
+                vertices = 0
+            chunks[-1].append(slot)
+            vertices += vertex_count
+        return chunks
+    
+    def _add_batch(self, extractor, material_id: int, layer: int, slots: List[int]):
+        """Merge slots into one uploaded mesh."""
+        meshes = [extractor.meshes[extractor.mesh_ids[slot]].mesh_data for slot in slots]
+        mesh = merge_meshes(meshes, extractor.world_matrices[slots])
+        name = f"static_batch_{next(self._names)}"
+        if not self.resource_manager.add_mesh(name, mesh):
+            return
+        
+        renderers = [extractor.renderers[slot] for slot in slots]
+        bounds_min, bounds_max = mesh.get_bounds()
+        self.batches.append(StaticBatch(
+            mesh_name=name,
+            material_id=material_id,
+            layer=layer,
+            bounds_min=bounds_min,
+            bounds_max=bounds_max,
+            renderers=renderers,
+            source_keys=[(r.game_object.world_version, r.revision) for r in renderers]
+        ))
+    
+    def _update_bounds(self):
+        """Stack batch bounds for culling and force a mask rebuild."""
+        self._bounds_min = np.array([batch.bounds_min for batch in self.batches], dtype=np.float32).reshape(-1, 3)
+        self._bounds_max = np.array([batch.bounds_max for batch in self.batches], dtype=np.float32).reshape(-1, 3)
+        self._mask_key = ()
+    
+    def batched_mask(self, extractor) -> np.ndarray:
+        """Slots drawn by a static batch instead of individually.
+        
+        A batch whose objects moved, changed or left the scene is dropped,
+        and its objects are drawn individually again. Call after every
+        extract so changed slots are not missed.
+        
+        Args:
+            extractor: SceneExtractor the batches were built from
+        
+        Returns:
+            Boolean mask over the extractor's slots
+        """
+        key = (id(extractor), extractor.layout_version, extractor.bounds_version)
+        if key == self._mask_key:
+            return self._mask
+        
+        # Slots only moved in place: check just the batches holding rewritten slots
+        batches = self.batches
+        if self._mask_key[:2] == key[:2]:
+            changed = extractor.changed_slots[self._mask[extractor.changed_slots]]
+            if not len(changed):
+                self._mask_key = key
+                return self._mask
+            changed_renderers = {id(extractor.renderers[slot]) for slot in changed.tolist()}
+            batches = [batch for batch in batches
+                       if any(id(renderer) in changed_renderers for renderer in batch.renderers)]
+        
+        stale = [
+            batch for batch in batches
+            if any(extractor.slot_of(renderer) is None
+                   or (renderer.game_object.world_version, renderer.revision) != source_key
+                   for renderer, source_key in zip(batch.renderers, batch.source_keys))
+        ]
+        for batch in stale:
+            self.logger.warning(f"Static batch {batch.mesh_name} changed at runtime; drawing its objects individually")
+            self._release(batch)
+            self.batches.remove(batch)
+        if stale:
+            self._update_bounds()
+        
+        mask = np.zeros(extractor.count, dtype=bool)
+        for batch in self.batches:
+            mask[[extractor.slot_of(renderer) for renderer in batch.renderers]] = True
+        self._mask = mask
+        self._mask_key = key
+        return mask
+    
+    def cull(self, planes: Optional[np.ndarray]) -> List[StaticBatch]:
+        """Get the batches whose bounds touch a frustum.
+        
+        Args:
+            planes: (6, 4) frustum planes, or None for all batches
+        
+        Returns:
+            Visible batches
+        """
+        if planes is None or not self.batches:
+            return list(self.batches)
+        visible = aabbs_in_frustum(planes, self._bounds_min, self._bounds_max)
+        return [batch for batch, keep in zip(self.batches, visible.tolist()) if keep]
+    
+    def _release(self, batch: StaticBatch):
+        """Free the merged mesh of a batch."""
+        if self.resource_manager is not None:
+            self.resource_manager.remove_mesh(batch.mesh_name)
+    
+    def clear(self):
+        """Drop all batches and free their meshes."""
+        for batch in self.batches:
+            self._release(batch)
+        self.batches = []
+        self._update_bounds()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get static batching statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "static_batches": len(self.batches),
+            "batched_objects": sum(len(batch.renderers) for batch in self.batches)
+        }
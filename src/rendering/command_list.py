@@ -0,0 +1,232 @@
+"""
+Command Lists for Nexlify Engine.
+
+This module records draw submission into compact command lists so the
+work of turning a sorted render queue into draws can be spread over
+worker threads:
+- A command list is a growable (n, 4) int64 array of opcode and arguments
+  referring to extractor slots, instance offsets and shader ids
+- Workers record disjoint chunks of the render queue with a handful of
+  NumPy operations per chunk; chunk edges are moved to instance run
+  starts so instanced draws are never split
+- The main thread submits the lists in order, and the pipeline elides
+  the state changes repeated at chunk edges
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+
+from .batching import find_instance_runs
+from ..utils.logger import get_logger
+
+
+# Opcodes
+CMD_SET_STATE = 0  # blend mode id, shader id
+CMD_DRAW = 1  # slot
+CMD_DRAW_INSTANCED = 2  # first slot, start instance, instance count
+CMD_DRAW_STATIC_BATCH = 3  # index into the frame's visible batches
+
+# Blend modes of CMD_SET_STATE
+BLEND_MODES = ("opaque", "alpha")
+
+
+class CommandList:
+    """Array-backed list of recorded render commands."""
+    
+    def __init__(self, capacity: int = 256):
+        self.commands = np.zeros((capacity, 4), dtype=np.int64)
+        self.count = 0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def reset(self):
+        """Drop all commands, keeping the storage."""
+        self.count = 0
+    
+    def _reserve(self, count: int):
+        """Grow the storage geometrically to fit count more commands."""
+        needed = self.count + count
+        if needed > len(self.commands):
+            grown = np.zeros((max(needed, len(self.commands) * 2), 4), dtype=np.int64)
+            grown[:self.count] = self.commands[:self.count]
+            self.commands = grown
+    
+    def append(self, opcode: int, a: int = 0, b: int = 0, c: int = 0):
+        """Record one command.
+        
+        Args:
+            opcode: Command opcode
+            a: First argument
+            b: Second argument
+            c: Third argument
+        """
+        self._reserve(1)
+        self.commands[self.count] = (opcode, a, b, c)
+        self.count += 1
+    
+    def extend(self, commands: np.ndarray):
+        """Record a block of commands.
+        
+        Args:
+            commands: (n, 4) opcodes and arguments
+        """
+        self._reserve(len(commands))
+        self.commands[self.count:self.count + len(commands)] = commands
+        self.count += len(commands)
+    
+    def view(self) -> np.ndarray:
+        """The recorded commands as an (n, 4) array."""
+        return self.commands[:self.count]
+
+
+def record_draws(command_list: CommandList, extractor, shader_ids: np.ndarray, indices: np.ndarray,
+                 instance_offset: int, blend_mode: int, instancing: bool):
+    """Record the draws of a chunk of the render queue.
+    
+    Args:
+        command_list: List to append to
+        extractor: SceneExtractor holding the render objects
+        shader_ids: Shader id of each material
+        indices: Slots of the chunk, in queue order
+        instance_offset: Position of the chunk in the uploaded instance matrices
+        blend_mode: Index into BLEND_MODES for the state commands
+        instancing: Whether runs sharing mesh and material become instanced draws
+    """
+    if not len(indices):
+        return
+    
+    if instancing:
+        starts, counts = find_instance_runs(extractor.sort_keys[indices])
+    else:
+        starts = np.arange(len(indices), dtype=np.int64)
+        counts = np.ones(len(indices), dtype=np.int64)
+    
+    slots = indices[starts]
+    shaders = shader_ids[extractor.material_ids[slots]]
+    changes = np.r_[True, shaders[1:] != shaders[:-1]]
+    
+    # Draws, each shifted down by the state commands recorded before it
+    draw_rows = np.arange(len(starts)) + np.cumsum(changes)
+    commands = np.zeros((len(starts) + int(changes.sum()), 4), dtype=np.int64)
+    commands[draw_rows, 0] = np.where(counts > 1, CMD_DRAW_INSTANCED, CMD_DRAW)
+    commands[draw_rows, 1] = slots
+    commands[draw_rows, 2] = instance_offset + starts
+    commands[draw_rows, 3] = counts
+    
+    state_rows = draw_rows[changes] - 1
+    commands[state_rows, 0] = CMD_SET_STATE
+    commands[state_rows, 1] = blend_mode
+    commands[state_rows, 2] = shaders[changes]
+    command_list.extend(commands)
+
+
+class CommandRecorder:
+    """Records render queue chunks into command lists on worker threads."""
+    
+    def __init__(self, threads: Optional[int] = None, chunk_size: int = 1024):
+        self.logger = get_logger(__name__)
+        
+        # Queue entries per chunk; smaller queues are recorded on the calling thread
+        self.chunk_size = chunk_size
+        self.threads = threads or min(4, os.cpu_count() or 1)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        
+        # Command lists reused across frames, per recording stream
+        self._lists: Dict[str, List[CommandList]] = {}
+        
+        # Performance tracking
+        self.recorded_commands = 0
+        self.recorded_chunks = 0
+    
+    def chunk_bounds(self, extractor, indices: np.ndarray, instancing: bool) -> List[int]:
+        """Split a queue into chunks whose edges fall on instance run starts.
+        
+        Args:
+            extractor: SceneExtractor holding the render objects
+            indices: Slots in queue order
+            instancing: Whether instance runs must stay whole
+        
+        Returns:
+            Chunk edges, starting with 0 and ending with len(indices)
+        """
+        edges = np.arange(0, len(indices), self.chunk_size)
+        if instancing and len(edges) > 1:
+            run_starts, _ = find_instance_runs(extractor.sort_keys[indices])
+            edges = np.unique(run_starts[np.minimum(np.searchsorted(run_starts, edges), len(run_starts) - 1)])
+        return edges.tolist() + [len(indices)]
+    
+    def record(self, stream: str, extractor, shader_ids: np.ndarray, indices: np.ndarray,
+               blend_mode: int, instancing: bool) -> List[Future]:
+        """Start recording a queue into command lists.
+        
+        Args:
+            stream: Name of the recording, e.g. the pass; its lists are reused next frame
+            extractor: SceneExtractor holding the render objects
+            shader_ids: Shader id of each material
+            indices: Slots in queue order
+            blend_mode: Index into BLEND_MODES
+            instancing: Whether runs sharing mesh and material become instanced draws
+        
+        Returns:
+            Futures of the command lists, in submission order
+        """
+        bounds = self.chunk_bounds(extractor, indices, instancing)
+        chunks = list(zip(bounds[:-1], bounds[1:]))
+        lists = self._lists.setdefault(stream, [])
+        while len(lists) < len(chunks):
+            lists.append(CommandList())
+        
+        def record_chunk(command_list: CommandList, start: int, end: int) -> CommandList:
+            command_list.reset()
+            record_draws(command_list, extractor, shader_ids, indices[start:end], start, blend_mode, instancing)
+            return command_list
+        
+        futures = []
+        for command_list, (start, end) in zip(lists, chunks):
+            if len(chunks) > 1 and self.threads > 1:
+                futures.append(self._executor().submit(record_chunk, command_list, start, end))
+            else:
+                future = Future()
+                future.set_result(record_chunk(command_list, start, end))
+                futures.append(future)
+        
+        self.recorded_chunks += len(chunks)
+        return futures
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="record")
+        return self._pool
+    
+    def count_commands(self, command_lists: List[CommandList]):
+        """Add submitted lists to the statistics."""
+        self.recorded_commands += sum(len(command_list) for command_list in command_lists)
+    
+    def reset_stats(self):
+        """Reset per-frame statistics."""
+        self.recorded_commands = 0
+        self.recorded_chunks = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recording statistics for the last frame.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "recorded_commands": self.recorded_commands,
+            "recorded_chunks": self.recorded_chunks,
+            "threads": self.threads
+        }
+    
+    def shutdown(self):
+        """Stop the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self._lists.clear()
@@ -0,0 +1,211 @@
+"""
+Frustum Culling for Nexlify Engine.
+
+This module tests packed bounding volumes against the six planes of a
+camera frustum in single NumPy passes. Large object sets are first
+grouped into spatially coherent chunks (sorted along a Morton curve) so
+whole chunks outside or inside the frustum are decided with one test,
+and only objects in chunks crossing a plane are tested individually.
+"""
+
+from typing import Dict, Any
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+
+# Chunk classification
+OUTSIDE = 0
+INTERSECTING = 1
+INSIDE = 2
+
+
+def frustum_planes(view_projection: np.ndarray) -> np.ndarray:
+    """Extract normalized frustum planes from a view-projection matrix.
+    
+    Planes follow the Gribb-Hartmann method for column-vector matrices
+    with clip-space depth in [-w, w]. A point p is inside a plane when
+    dot(plane[:3], p) + plane[3] >= 0.
+    
+    Args:
+        view_projection: 4x4 projection * view matrix
+    
+    Returns:
+        (6, 4) planes: left, right, bottom, top, near, far
+    """
+    m = np.asarray(view_projection, dtype=np.float64)
+    planes = np.array([
+        m[3] + m[0], m[3] - m[0],
+        m[3] + m[1], m[3] - m[1],
+        m[3] + m[2], m[3] - m[2]
+    ])
+    planes /= np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes
+
+
+def classify_aabbs(planes: np.ndarray, centers: np.ndarray, extents: np.ndarray) -> np.ndarray:
+    """Classify boxes against a frustum.
+    
+    Conservative: boxes near a frustum corner may be reported as
+    intersecting although they are outside.
+    
+    Args:
+        planes: (6, 4) frustum planes
+        centers: (n, 3) box centers
+        extents: (n, 3) box half sizes
+    
+    Returns:
+        (n,) OUTSIDE, INTERSECTING or INSIDE
+    """
+    distance = centers @ planes[:, :3].T + planes[:, 3]
+    reach = extents @ np.abs(planes[:, :3]).T
+    result = np.full(len(centers), INTERSECTING, dtype=np.int8)
+    result[np.all(distance >= reach, axis=1)] = INSIDE
+    result[np.any(distance < -reach, axis=1)] = OUTSIDE
+    return result
+
+
+def aabbs_in_frustum(planes: np.ndarray, bounds_min: np.ndarray, bounds_max: np.ndarray) -> np.ndarray:
+    """Test boxes against a frustum.
+    
+    Args:
+        planes: (6, 4) frustum planes
+        bounds_min: (n, 3) box minimum corners
+        bounds_max: (n, 3) box maximum corners
+    
+    Returns:
+        (n,) True for boxes that are at least partly inside
+    """
+    centers = (bounds_min + bounds_max) * 0.5
+    extents = (bounds_max - bounds_min) * 0.5
+    distance = centers @ planes[:, :3].T + planes[:, 3]
+    reach = extents @ np.abs(planes[:, :3]).T
+    return np.all(distance >= -reach, axis=1)
+
+
+def spheres_in_frustum(planes: np.ndarray, centers: np.ndarray, radii: np.ndarray) -> np.ndarray:
+    """Test spheres against a frustum.
+    
+    Args:
+        planes: (6, 4) frustum planes
+        centers: (n, 3) sphere centers
+        radii: (n,) sphere radii
+    
+    Returns:
+        (n,) True for spheres that are at least partly inside
+    """
+    distance = centers @ planes[:, :3].T + planes[:, 3]
+    return np.all(distance >= -radii[:, None], axis=1)
+
+
+def _morton_codes(points: np.ndarray) -> np.ndarray:
+    """Interleave 10-bit quantized coordinates into 30-bit Morton codes."""
+    low = points.min(axis=0)
+    size = np.maximum(points.max(axis=0) - low, 1e-9)
+    cells = ((points - low) / size * 1023.0).astype(np.uint64)
+    
+    # Spread the 10 bits of each axis two bits apart
+    cells = (cells | (cells << np.uint64(16))) & np.uint64(0x030000FF)
+    cells = (cells | (cells << np.uint64(8))) & np.uint64(0x0300F00F)
+    cells = (cells | (cells << np.uint64(4))) & np.uint64(0x030C30C3)
+    cells = (cells | (cells << np.uint64(2))) & np.uint64(0x09249249)
+    return (cells[:, 0] << np.uint64(2)) | (cells[:, 1] << np.uint64(1)) | cells[:, 2]
+
+
+class FrustumCuller:
+    """Culls extracted render objects against a camera frustum."""
+    
+    def __init__(self, chunk_size: int = 64, hierarchy_threshold: int = 1024):
+        self.logger = get_logger(__name__)
+        
+        # Objects per chunk, and the object count from which chunks are used
+        self.chunk_size = chunk_size
+        self.hierarchy_threshold = hierarchy_threshold
+        
+        # Slots sorted along a Morton curve and the bounds of each chunk of them
+        self._order = np.zeros(0, dtype=np.int64)
+        self._chunk_starts = np.zeros(0, dtype=np.int64)
+        self._chunk_min = np.zeros((0, 3), dtype=np.float32)
+        self._chunk_max = np.zeros((0, 3), dtype=np.float32)
+        self._layout_key: tuple = ()
+        self._bounds_key: tuple = ()
+        
+        # Performance tracking
+        self.tested_objects = 0
+        self.tested_chunks = 0
+        self.culled_objects = 0
+    
+    def cull(self, extractor, indices: np.ndarray, planes: np.ndarray) -> np.ndarray:
+        """Keep the objects whose bounds touch the frustum.
+        
+        Args:
+            extractor: SceneExtractor holding the object bounds
+            indices: Candidate slot indices
+            planes: (6, 4) frustum planes
+        
+        Returns:
+            The visible subset of indices, in their original order
+        """
+        count = extractor.count
+        if count < self.hierarchy_threshold:
+            visible = aabbs_in_frustum(planes, extractor.bounds_min[indices], extractor.bounds_max[indices])
+            self.tested_objects = len(indices)
+            self.tested_chunks = 0
+            self.culled_objects = len(indices) - int(visible.sum())
+            return indices[visible]
+        
+        self._update_chunks(extractor)
+        
+        # Decide whole chunks, then test objects only in chunks crossing a plane
+        chunk_min, chunk_max = self._chunk_min, self._chunk_max
+        chunk_state = classify_aabbs(planes, (chunk_min + chunk_max) * 0.5, (chunk_max - chunk_min) * 0.5)
+        chunk_sizes = np.diff(np.append(self._chunk_starts, count))
+        state = np.repeat(chunk_state, chunk_sizes)
+        
+        visible_sorted = state == INSIDE
+        crossing = np.flatnonzero(state == INTERSECTING)
+        if len(crossing):
+            slots = self._order[crossing]
+            visible_sorted[crossing] = aabbs_in_frustum(
+                planes, extractor.bounds_min[slots], extractor.bounds_max[slots]
+            )
+        
+        visible_slots = np.empty(count, dtype=bool)
+        visible_slots[self._order] = visible_sorted
+        visible = visible_slots[indices]
+        
+        self.tested_objects = len(crossing)
+        self.tested_chunks = len(chunk_state)
+        self.culled_objects = len(indices) - int(visible.sum())
+        return indices[visible]
+    
+    def _update_chunks(self, extractor):
+        """Re-sort slots after they were added or removed, refit chunk bounds after moves."""
+        count = extractor.count
+        layout_key = (id(extractor), extractor.layout_version)
+        if layout_key != self._layout_key:
+            centers = extractor.bounds_center[:count]
+            self._order = np.argsort(_morton_codes(centers), kind='stable')
+            self._chunk_starts = np.arange(0, count, self.chunk_size)
+            self._layout_key = layout_key
+            self._bounds_key = ()
+        
+        bounds_key = (id(extractor), extractor.bounds_version)
+        if bounds_key != self._bounds_key:
+            self._chunk_min = np.minimum.reduceat(extractor.bounds_min[self._order], self._chunk_starts, axis=0)
+            self._chunk_max = np.maximum.reduceat(extractor.bounds_max[self._order], self._chunk_starts, axis=0)
+            self._bounds_key = bounds_key
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get culling statistics for the last frame.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "tested_objects": self.tested_objects,
+            "tested_chunks": self.tested_chunks,
+            "culled_objects": self.culled_objects,
+            "chunks": len(self._chunk_starts)
+        }
@@ -2,7 +2,8 @@
 Graphics Device abstraction for Nexlify Engine.
 
 This module provides a unified interface for different graphics APIs
-(DirectX 12, Vulkan) and manages GPU resources and capabilities.
+(DirectX 12, Vulkan, and a CPU software rasterizer for headless
+rendering) and manages GPU resources and capabilities.
 """
 
 import logging
@@ -11,6 +12,9 @@ from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
+import numpy as np
+
+from .software import SoftwareRasterizer
 from ..utils.logger import get_logger
 
 
@@ -19,6 +23,7 @@ class GraphicsAPI(Enum):
     DIRECTX_12 = "DirectX12"
     VULKAN = "Vulkan"
     OPENGL = "OpenGL"
+    SOFTWARE = "Software"
 
 
 @dataclass
@@ -60,6 +65,8 @@ class GraphicsDevice:
         self._device_handle = None
         self._command_queue = None
         self._swap_chain = None
+        self._software: Optional[SoftwareRasterizer] = None
+        self._next_target = 0
         
     def initialize(self, window_handle: int, width: int, height: int) -> bool:
         """Initialize the graphics device.
@@ -81,6 +88,8 @@ class GraphicsDevice:
                 return self._init_vulkan(window_handle, width, height)
             elif self.api == GraphicsAPI.OPENGL:
                 return self._init_opengl(window_handle, width, height)
+            elif self.api == GraphicsAPI.SOFTWARE:
+                return self._init_software(width, height)
             else:
                 self.logger.error(f"Unsupported graphics API: {self.api}")
                 return False
@@ -186,6 +195,37 @@ class GraphicsDevice:
             self.logger.error(f"Failed to initialize OpenGL: {e}")
             return False
     
+    def _init_software(self, width: int, height: int) -> bool:
+        """Initialize the software rasterizer; no window is needed."""
+        try:
+            self.logger.info("Creating software rasterizer...")
+            
+            self._software = SoftwareRasterizer(width, height)
+            self.device_info = DeviceInfo(
+                name="Nexlify Software Rasterizer",
+                vendor="Nexlify",
+                driver_version="1.0.0",
+                memory_total=4096,
+                memory_available=4096,
+                api_version="1.0",
+                capabilities=DeviceCapabilities(
+                    supports_compute_shaders=False,
+                    supports_geometry_shaders=False,
+                    supports_tessellation=False,
+                    max_anisotropy=1,
+                    supports_msaa=False,
+                    max_msaa_samples=1
+                )
+            )
+            
+            self.is_initialized = True
+            self.logger.info(f"✅ Software rasterizer initialized successfully ({width}x{height})")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to initialize software rasterizer: {e}")
+            return False
+    
     def create_buffer(self, size: int, usage: str, data: Optional[bytes] = None) -> int:
         """Create a GPU buffer.
         
@@ -200,11 +240,51 @@ class GraphicsDevice:
         if not self.is_initialized:
             raise RuntimeError("Graphics device not initialized")
         
+        if self._software:
+            buffer_id = self._software.create_buffer(size, data)
+            self.logger.debug(f"Created buffer: {buffer_id} (size: {size}, usage: {usage})")
+            return buffer_id
+        
         # TODO: Implement actual buffer creation
         buffer_id = hash(f"buffer_{size}_{usage}_{id(data)}")
         self.logger.debug(f"Created buffer: {buffer_id} (size: {size}, usage: {usage})")
         return buffer_id
     
+    def update_buffer(self, buffer: int, data, offset: int = 0) -> bool:
+        """Overwrite part of a GPU buffer.
+        
+        Args:
+            buffer: Buffer handle
+            data: New contents
+            offset: Byte offset to write at
+            
+        Returns:
+            True if buffer updated successfully, False otherwise
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Graphics device not initialized")
+        
+        if self._software:
+            return self._software.update_buffer(buffer, data, offset)
+        
+        self.logger.debug(f"Updated buffer: {buffer} ({len(memoryview(data).cast('B'))} bytes at {offset})")
+        return True
+    
+    def release_buffer(self, buffer: int):
+        """Free a GPU buffer.
+        
+        Args:
+            buffer: Buffer handle
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.release(buffer)
+            return
+        
+        self.logger.debug(f"Released buffer: {buffer}")
+    
     def create_texture(self, width: int, height: int, format: str, data: Optional[bytes] = None) -> int:
         """Create a GPU texture.
         
@@ -220,11 +300,75 @@ class GraphicsDevice:
         if not self.is_initialized:
             raise RuntimeError("Graphics device not initialized")
         
+        if self._software:
+            texture_id = self._software.create_texture(width, height, format, data)
+            self.logger.debug(f"Created texture: {texture_id} ({width}x{height}, {format})")
+            return texture_id
+        
         # TODO: Implement actual texture creation
         texture_id = hash(f"texture_{width}_{height}_{format}_{id(data)}")
         self.logger.debug(f"Created texture: {texture_id} ({width}x{height}, {format})")
         return texture_id
     
+    def create_render_target(self, width: int, height: int, format: str) -> int:
+        """Create an offscreen render target.
+        
+        Args:
+            width: Target width
+            height: Target height
+            format: Pixel format (RGBA8, RGBA16F, D32, etc.)
+            
+        Returns:
+            Render target handle/ID
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Graphics device not initialized")
+        
+        if self._software:
+            target_id = self._software.create_render_target(width, height, format)
+            self.logger.debug(f"Created render target: {target_id} ({width}x{height}, {format})")
+            return target_id
+        
+        target_id = hash(f"render_target_{width}_{height}_{format}_{id(self)}_{self._next_target}")
+        self._next_target += 1
+        self.logger.debug(f"Created render target: {target_id} ({width}x{height}, {format})")
+        return target_id
+    
+    def release_render_target(self, target: int):
+        """Free an offscreen render target.
+        
+        Args:
+            target: Render target handle
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.release(target)
+            return
+        
+        self.logger.debug(f"Released render target: {target}")
+    
+    def set_render_targets(self, color: Optional[int] = None, depth: Optional[int] = None) -> bool:
+        """Bind the targets following draws and clears go to.
+        
+        Args:
+            color: Color target handle, None for the back buffer
+            depth: Depth target handle, None for the back buffer depth (or
+                no depth buffer with an offscreen color target)
+            
+        Returns:
+            True if the targets were bound, False otherwise
+        """
+        if not self.is_initialized:
+            return False
+        
+        if self._software:
+            return self._software.set_render_targets(color, depth)
+        
+        self.logger.debug(f"Setting render targets: color {color}, depth {depth}")
+        return True
+    
     def create_shader(self, source: str, stage: str) -> int:
         """Create a shader from source code.
         
@@ -276,9 +420,28 @@ class GraphicsDevice:
         if not self.is_initialized:
             return
         
+        if self._software:
+            self._software.clear(color)
+            return
+        
         # TODO: Implement actual clear operation
         self.logger.debug(f"Clearing render target with color: {color}")
     
+    def clear_depth_stencil(self, depth: float = 1.0):
+        """Clear the depth buffer.
+        
+        Args:
+            depth: Clear depth
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.clear_depth(depth)
+            return
+        
+        self.logger.debug(f"Clearing depth buffer to {depth}")
+    
     def set_viewport(self, x: int, y: int, width: int, height: int):
         """Set the viewport.
         
@@ -291,9 +454,112 @@ class GraphicsDevice:
         if not self.is_initialized:
             return
         
+        if self._software:
+            software = self._software
+            if x + width > software.width or y + height > software.height:
+                software.resize(max(x + width, software.width), max(y + height, software.height))
+            software.viewport = (x, y, width, height)
+            return
+        
         # TODO: Implement actual viewport setting
         self.logger.debug(f"Setting viewport: {x}, {y}, {width}, {height}")
     
+    def set_vertex_buffer(self, buffer: int, stride: int):
+        """Bind the vertex buffer for following draws.
+        
+        Args:
+            buffer: Buffer handle
+            stride: Vertex size in bytes
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.vertex_buffer = buffer
+            self._software.vertex_stride = stride
+            return
+        
+        self.logger.debug(f"Binding vertex buffer {buffer} (stride: {stride})")
+    
+    def set_index_buffer(self, buffer: int):
+        """Bind the index buffer (uint32 indices) for following draws.
+        
+        Args:
+            buffer: Buffer handle
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.index_buffer = buffer
+            return
+        
+        self.logger.debug(f"Binding index buffer {buffer}")
+    
+    def set_instance_buffer(self, buffer: int):
+        """Bind the per-instance buffer of row-major float32 4x4 world matrices.
+        
+        Args:
+            buffer: Buffer handle
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.instance_buffer = buffer
+            return
+        
+        self.logger.debug(f"Binding instance buffer {buffer}")
+    
+    def set_texture(self, texture: Optional[int]):
+        """Bind the albedo texture, or None for untextured draws.
+        
+        Args:
+            texture: Texture handle
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.texture = texture
+            return
+        
+        self.logger.debug(f"Binding texture {texture}")
+    
+    def set_shader_constants(self, constants: Dict[str, Any]):
+        """Update shader constants such as world and view_projection matrices.
+        
+        Args:
+            constants: Constant values by name
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.constants.update(constants)
+            return
+        
+        self.logger.debug(f"Setting shader constants: {', '.join(constants)}")
+    
+    def set_render_state(self, blend_mode: str = "opaque", depth_test: bool = True,
+                         depth_write: bool = True, cull_mode: str = "back"):
+        """Set blend, depth and rasterizer state.
+        
+        Args:
+            blend_mode: opaque, alpha or additive
+            depth_test: Whether fragments are depth tested
+            depth_write: Whether fragments write depth
+            cull_mode: back, front or none
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.set_render_state(blend_mode, depth_test, depth_write, cull_mode)
+            return
+        
+        self.logger.debug(f"Setting render state: {blend_mode}, depth {depth_test}/{depth_write}, cull {cull_mode}")
+    
     def draw(self, vertex_count: int, start_vertex: int = 0):
         """Draw primitives.
         
@@ -304,6 +570,10 @@ class GraphicsDevice:
         if not self.is_initialized:
             return
         
+        if self._software:
+            self._software.draw(vertex_count, start_vertex)
+            return
+        
         # TODO: Implement actual draw call
         self.logger.debug(f"Drawing {vertex_count} vertices starting at {start_vertex}")
     
@@ -318,9 +588,44 @@ class GraphicsDevice:
         if not self.is_initialized:
             return
         
+        if self._software:
+            self._software.draw_indexed(index_count, start_index, base_vertex)
+            return
+        
         # TODO: Implement actual indexed draw call
         self.logger.debug(f"Drawing {index_count} indices starting at {start_index}, base vertex {base_vertex}")
     
+    def draw_indexed_instanced(self, index_count: int, instance_count: int, start_index: int = 0,
+                               base_vertex: int = 0, start_instance: int = 0):
+        """Draw indexed primitives once per instance.
+        
+        Args:
+            index_count: Number of indices per instance
+            instance_count: Number of instances to draw
+            start_index: Starting index
+            base_vertex: Base vertex offset
+            start_instance: First matrix in the bound instance buffer
+        """
+        if not self.is_initialized:
+            return
+        
+        if self._software:
+            self._software.draw_indexed_instanced(index_count, instance_count, start_index, base_vertex, start_instance)
+            return
+        
+        self.logger.debug(f"Drawing {instance_count} instances of {index_count} indices from instance {start_instance}")
+    
+    def read_render_target(self) -> Optional[np.ndarray]:
+        """Read back the color target.
+        
+        Returns:
+            (height, width, 4) uint8 RGBA copy, or None if the backend
+            cannot read back
+        """
+        if not self._software:
+            return None
+        return self._software.read_color()
+    
     def get_device_info(self) -> Optional[DeviceInfo]:
         """Get device information.
         
@@ -338,6 +643,9 @@ class GraphicsDevice:
         if not self.device_info:
             return (0, 0)
         
+        if self._software:
+            return (self._software.get_memory_usage() // (1024 * 1024), self.device_info.memory_total)
+        
         # TODO: Implement actual memory usage tracking
         used = self.device_info.memory_total - self.device_info.memory_available
         return (used, self.device_info.memory_total)
@@ -351,6 +659,9 @@ class GraphicsDevice:
             # - Release all resources
             # - Destroy device
             # - Clean up swap chain
+            if self._software:
+                self._software.shutdown()
+                self._software = None
             
             self.is_initialized = False
             self.device_info = None
@@ -0,0 +1,249 @@
+"""
+Clustered Light Culling for Nexlify Engine.
+
+This module assigns point and spot lights to clusters (froxels): the
+view frustum is split into screen tiles and into depth slices that grow
+exponentially with distance. Each cluster gets a compact list of the
+lights that can reach it, so shading a pixel only loops over the lights
+of its cluster instead of every light in the scene.
+
+Assignment is vectorized. Each light is expanded into (light, cluster)
+pairs over the depth slices its sphere spans. The pairs are tested
+against the clusters' view-space boxes, and for spot lights each
+cluster's bounding sphere is also tested against the cone. The survivors
+are sorted into per-cluster offset and index arrays (CSR).
+
+Directional lights reach every pixel and are not clustered.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .scene_extraction import LightInfo
+from ..utils.logger import get_logger
+
+
+@dataclass
+class LightClusters:
+    """Per-cluster light lists of one frame, as the shading stage reads them."""
+    tiles_x: int
+    tiles_y: int
+    slices: int
+    near: float
+    far: float
+    view_matrix: np.ndarray
+    
+    # Clustered lights: world positions, spot directions, color * intensity and ranges
+    positions: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    directions: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    colors: np.ndarray = field(default_factory=lambda: np.zeros((0, 3)))
+    ranges: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    
+    # Cosines of the spot cone's edge and of where its falloff starts; below -1 for point lights
+    cos_outer: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    cos_inner: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    
+    # Lights of cluster c are light_indices[offsets[c]:offsets[c + 1]]
+    offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.int64))
+    light_indices: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+    
+    @property
+    def light_count(self) -> int:
+        """Number of clustered lights."""
+        return len(self.ranges)
+    
+    def slice_of(self, depth: np.ndarray) -> np.ndarray:
+        """Depth slice of view-space distances in front of the camera."""
+        scale = self.slices / math.log(self.far / self.near)
+        slices = np.floor(np.log(np.maximum(depth, self.near) / self.near) * scale)
+        return np.clip(slices, 0, self.slices - 1).astype(np.int64)
+    
+    def cluster_of(self, screen_x: np.ndarray, screen_y: np.ndarray, depth: np.ndarray) -> np.ndarray:
+        """Cluster index of screen positions.
+        
+        Args:
+            screen_x: Horizontal position in [0, 1), left to right
+            screen_y: Vertical position in [0, 1), top to bottom
+            depth: View-space distance in front of the camera
+        
+        Returns:
+            Cluster indices
+        """
+        tile_x = np.clip((screen_x * self.tiles_x).astype(np.int64), 0, self.tiles_x - 1)
+        tile_y = np.clip((screen_y * self.tiles_y).astype(np.int64), 0, self.tiles_y - 1)
+        return (self.slice_of(depth) * self.tiles_y + tile_y) * self.tiles_x + tile_x
+
+
+class LightClusterer:
+    """Bins point and spot lights into view-space clusters."""
+    
+    def __init__(self, tiles_x: int = 16, tiles_y: int = 8, slices: int = 24, max_distance: float = 500.0):
+        self.logger = get_logger(__name__)
+        
+        # Grid dimensions; slices end at the far plane or max_distance, whichever is nearer
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.slices = slices
+        self.max_distance = max_distance
+        
+        # View-space cluster boxes, rebuilt when the projection changes
+        self._bounds_min = np.zeros((0, 3))
+        self._bounds_max = np.zeros((0, 3))
+        self._bounds_key: tuple = ()
+        
+        # Last frame's result
+        self.clusters: Optional[LightClusters] = None
+        
+        # Performance tracking
+        self.clustered_lights = 0
+        self.tested_pairs = 0
+        self.assigned_pairs = 0
+    
+    @property
+    def cluster_count(self) -> int:
+        """Number of clusters in the grid."""
+        return self.tiles_x * self.tiles_y * self.slices
+    
+    def _update_bounds(self, projection: np.ndarray, near: float, far: float):
+        """Compute the view-space box of every cluster.
+        
+        Each tile edge is a line through the view volume; its points at the
+        slice depths give the corners of the clusters. This holds for
+        perspective and orthographic projections alike.
+        """
+        key = (projection.tobytes(), near, far, self.tiles_x, self.tiles_y, self.slices)
+        if key == self._bounds_key:
+            return
+        self._bounds_key = key
+        
+        # Tile edge lines from the near to the far plane, in view space
+        x = np.linspace(-1.0, 1.0, self.tiles_x + 1)
+        y = np.linspace(1.0, -1.0, self.tiles_y + 1)
+        grid_x, grid_y = np.meshgrid(x, y)
+        inverse = np.linalg.inv(projection)
+        
+        def unproject(ndc_z: float) -> np.ndarray:
+            points = np.stack([grid_x, grid_y, np.full_like(grid_x, ndc_z), np.ones_like(grid_x)], axis=-1)
+            points = points @ inverse.T
+            return points[..., :3] / points[..., 3:4]
+        
+        start, end = unproject(-1.0), unproject(1.0)
+        
+        # Points of each edge line at each slice boundary depth (view space looks down -Z)
+        depths = near * (far / near) ** (np.arange(self.slices + 1) / self.slices)
+        t = (-depths[:, None, None] - start[None, :, :, 2]) / (end[None, :, :, 2] - start[None, :, :, 2])
+        points = start[None] + (end - start)[None] * t[..., None]
+        
+        # A cluster's box spans the corners of its tile at both of its slice depths
+        slices, rows, columns = self.slices, self.tiles_y, self.tiles_x
+        corners = np.stack([
+            points[s:s + slices, r:r + rows, c:c + columns].reshape(-1, 3)
+            for s in (0, 1) for r in (0, 1) for c in (0, 1)
+        ])
+        self._bounds_min = corners.min(axis=0)
+        self._bounds_max = corners.max(axis=0)
+    
+    def build(self, lights: List[LightInfo], view_matrix: np.ndarray, projection: np.ndarray, near: float,
+              far: float) -> LightClusters:
+        """Assign the frame's point and spot lights to clusters.
+        
+        Args:
+            lights: Extracted lights
+            view_matrix: Camera view matrix
+            projection: Camera projection matrix
+            near: Near clip distance
+            far: Far clip distance
+        
+        Returns:
+            Light clusters of the frame
+        """
+        view_matrix = np.asarray(view_matrix, dtype=np.float64)
+        projection = np.asarray(projection, dtype=np.float64)
+        far = max(min(far, self.max_distance), near * 1.001)
+        self._update_bounds(projection, near, far)
+        
+        local = [light for light in lights if light.light_type != "directional"]
+        clusters = LightClusters(self.tiles_x, self.tiles_y, self.slices, near, far, view_matrix)
+        clusters.offsets = np.zeros(self.cluster_count + 1, dtype=np.int64)
+        self.clusters = clusters
+        self.clustered_lights = len(local)
+        self.tested_pairs = 0
+        self.assigned_pairs = 0
+        if not local:
+            return clusters
+        
+        clusters.positions = np.array([light.position for light in local], dtype=np.float64)
+        clusters.directions = np.array([light.direction for light in local], dtype=np.float64)
+        clusters.colors = np.array([light.color for light in local], dtype=np.float64) \
+            * np.array([light.intensity for light in local])[:, None]
+        clusters.ranges = np.array([light.range for light in local], dtype=np.float64)
+        
+        # spot_angle is the full cone angle; the falloff covers its outer fifth
+        spot = np.array([light.light_type == "spot" for light in local])
+        half_angle = np.radians(np.array([light.spot_angle for light in local], dtype=np.float64)) * 0.5
+        clusters.cos_outer = np.where(spot, np.cos(half_angle), -2.0)
+        clusters.cos_inner = np.where(spot, np.cos(half_angle * 0.8), -1.0)
+        
+        # Light spheres in view space, and the depth slices each one spans
+        centers = clusters.positions @ view_matrix[:3, :3].T + view_matrix[:3, 3]
+        radii = clusters.ranges
+        depth = -centers[:, 2]
+        reaches = (depth + radii > near) & (depth - radii < far)
+        first = clusters.slice_of(depth - radii)
+        last = clusters.slice_of(depth + radii)
+        
+        # One (light, cluster) pair per cluster in the spanned slices
+        tiles = self.tiles_x * self.tiles_y
+        counts = np.where(reaches, (last - first + 1) * tiles, 0)
+        light = np.repeat(np.arange(len(local)), counts)
+        cluster = first[light] * tiles + (np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts))
+        self.tested_pairs = len(light)
+        
+        # Sphere against the cluster box
+        center = centers[light]
+        gap = np.maximum(np.maximum(self._bounds_min[cluster] - center, center - self._bounds_max[cluster]), 0.0)
+        keep = np.einsum('ij,ij->i', gap, gap) <= radii[light] ** 2
+        light, cluster = light[keep], cluster[keep]
+        
+        # Spot cone against the cluster's bounding sphere
+        spots = np.flatnonzero(spot[light])
+        if len(spots):
+            spot_light, spot_cluster = light[spots], cluster[spots]
+            box_center = (self._bounds_min[spot_cluster] + self._bounds_max[spot_cluster]) * 0.5
+            box_radius = np.linalg.norm(self._bounds_max[spot_cluster] - box_center, axis=1)
+            axis = clusters.directions[spot_light] @ view_matrix[:3, :3].T
+            offset = box_center - centers[spot_light]
+            along = np.einsum('ij,ij->i', offset, axis)
+            across = np.sqrt(np.maximum(np.einsum('ij,ij->i', offset, offset) - along ** 2, 0.0))
+            angle = half_angle[spot_light]
+            outside_cone = np.cos(angle) * across - np.sin(angle) * along > box_radius
+            behind = along < -box_radius
+            culled = np.zeros(len(light), dtype=bool)
+            culled[spots] = outside_cone | behind
+            light, cluster = light[~culled], cluster[~culled]
+        
+        # Compact per-cluster lists; pairs were generated light by light, so lists stay in light order
+        order = np.argsort(cluster, kind='stable')
+        clusters.light_indices = light[order].astype(np.int32)
+        clusters.offsets[1:] = np.cumsum(np.bincount(cluster, minlength=self.cluster_count))
+        self.assigned_pairs = len(light)
+        return clusters
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get clustering statistics for the last frame.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        counts = np.diff(self.clusters.offsets) if self.clusters is not None else np.zeros(1, dtype=np.int64)
+        return {
+            "clusters": self.cluster_count,
+            "clustered_lights": self.clustered_lights,
+            "tested_pairs": self.tested_pairs,
+            "assigned_pairs": self.assigned_pairs,
+            "max_lights_per_cluster": int(counts.max()) if len(counts) else 0,
+            "occupied_clusters": int(np.count_nonzero(counts))
+        }
@@ -0,0 +1,105 @@
+"""
+Level of Detail Selection for Nexlify Engine.
+
+This module picks the detail level of every visible object from the
+fraction of the screen height its bounding sphere covers. A level is
+switched only once the size moves a margin past the threshold between
+two levels, so objects hovering at a threshold do not pop back and forth
+every frame.
+"""
+
+from typing import Dict, Any, Sequence
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+
+class LODSelector:
+    """Selects mesh detail levels by projected screen size."""
+    
+    def __init__(self, screen_sizes: Sequence[float] = (0.5, 0.25, 0.125), hysteresis: float = 0.1,
+                 bias: float = 1.0):
+        self.logger = get_logger(__name__)
+        
+        # Screen height fractions below which levels 1, 2, ... are used (decreasing)
+        self.screen_sizes = np.array(screen_sizes, dtype=np.float64)
+        
+        # Relative margin around each threshold before switching
+        self.hysteresis = hysteresis
+        
+        # Multiplies screen sizes; above 1 keeps detail further away
+        self.bias = bias
+        
+        # Performance tracking
+        self.level_counts = np.zeros(len(screen_sizes) + 1, dtype=np.int64)
+        self.switched_objects = 0
+    
+    def screen_sizes_of(self, extractor, indices: np.ndarray, camera_position: np.ndarray,
+                        projection: np.ndarray) -> np.ndarray:
+        """Fraction of the screen height covered by each object's bounding sphere.
+        
+        Args:
+            extractor: SceneExtractor holding the object bounds
+            indices: Slots to measure
+            camera_position: World position of the camera
+            projection: Camera projection matrix
+        
+        Returns:
+            Screen height fraction per slot
+        """
+        projection = np.asarray(projection, dtype=np.float64)
+        radius = extractor.bounds_radius[indices].astype(np.float64)
+        if projection[3][3] == 1.0:
+            # Orthographic: size does not depend on distance
+            return radius * projection[1][1]
+        distance = np.linalg.norm(extractor.bounds_center[indices] - camera_position, axis=1)
+        return radius * projection[1][1] / np.maximum(distance, 1e-6)
+    
+    def select(self, extractor, indices: np.ndarray, camera_position: np.ndarray,
+               projection: np.ndarray) -> np.ndarray:
+        """Update the detail levels of visible objects.
+        
+        Args:
+            extractor: SceneExtractor holding the objects and their current levels
+            indices: Visible slots
+            camera_position: World position of the camera
+            projection: Camera projection matrix
+        
+        Returns:
+            Detail level of each visible slot
+        """
+        if not len(indices):
+            self.level_counts[:] = 0
+            self.switched_objects = 0
+            return np.zeros(0, dtype=np.uint8)
+        
+        sizes = self.screen_sizes_of(extractor, indices, camera_position, projection)[:, None] * self.bias
+        thresholds = self.screen_sizes[None, :]
+        
+        # Levels the size is clearly past, and levels it may still be at
+        coarsest = np.count_nonzero(sizes < thresholds * (1.0 + self.hysteresis), axis=1)
+        finest = np.count_nonzero(sizes < thresholds * (1.0 - self.hysteresis), axis=1)
+        current = extractor.lod_levels[indices].astype(np.int64)
+        levels = np.clip(current, finest, coarsest)
+        
+        # Meshes without enough detail levels draw their coarsest one
+        levels = np.minimum(levels, extractor.mesh_lod_counts[extractor.mesh_ids[indices]] - 1)
+        
+        changed = levels != current
+        extractor.set_lod_levels(indices[changed], levels[changed])
+        
+        self.level_counts = np.bincount(levels, minlength=len(self.screen_sizes) + 1)
+        self.switched_objects = int(changed.sum())
+        return levels.astype(np.uint8)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get selection statistics for the last frame.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "objects_per_level": self.level_counts.tolist(),
+            "switched_objects": self.switched_objects
+        }
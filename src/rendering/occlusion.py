@@ -0,0 +1,285 @@
+"""
+Occlusion Culling for Nexlify Engine.
+
+This module culls objects hidden behind others on the CPU, before any
+draw is recorded:
+- The largest visible opaque objects are picked as occluders and their
+  coarsest detail level is rasterized into a small depth buffer; all
+  occluder triangles are rasterized together with NumPy, one texel
+  candidate per array element, and a texel is only written where a
+  triangle covers it entirely
+- A hierarchical-Z chain is built from it, each level keeping the
+  farthest depth of a 2x2 block of the level below
+- Every candidate's bounding box is projected to a screen rectangle and
+  its nearest depth, and compared against the level where the rectangle
+  covers at most 2x2 texels; it is hidden if it lies behind all of them
+
+Depth is in [0, 1] as in the software rasterizer. Pixels no occluder
+covers hold infinity, so nothing is culled through gaps.
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .software import _clip_near
+from .scene_extraction import FLAG_TRANSPARENT
+from ..utils.logger import get_logger
+
+
+# Upper bound on triangle * pixel candidates evaluated at once
+RASTER_CHUNK_ELEMENTS = 1 << 20
+
+# Corners of the unit cube, for projecting bounding boxes
+_BOX_CORNERS = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64)
+
+
+def build_hiz(depth: np.ndarray) -> List[np.ndarray]:
+    """Build a max-depth mip chain down to a single texel.
+    
+    Args:
+        depth: (height, width) depth buffer
+    
+    Returns:
+        Levels, full resolution first
+    """
+    levels = [depth]
+    while max(levels[-1].shape) > 1:
+        level = levels[-1]
+        height, width = level.shape
+        
+        # Odd edges are padded with empty depth, which never occludes
+        padded = np.full((height + height % 2, width + width % 2), np.inf)
+        padded[:height, :width] = level
+        levels.append(padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).max(axis=(1, 3)))
+    return levels
+
+
+class OcclusionCuller:
+    """Culls render objects behind a rasterized set of occluders."""
+    
+    def __init__(self, width: int = 128, height: int = 64, max_occluders: int = 32,
+                 min_occluder_size: float = 0.1, max_occluder_triangles: int = 16384):
+        self.logger = get_logger(__name__)
+        
+        # Resolution of the occlusion depth buffer
+        self.width = width
+        self.height = height
+        
+        # Occluders: the largest opaque objects covering at least this fraction of the screen height
+        self.max_occluders = max_occluders
+        self.min_occluder_size = min_occluder_size
+        self.max_occluder_triangles = max_occluder_triangles
+        
+        # How far behind the Hi-Z a box must be to be culled, against rounding on occluder surfaces
+        self.depth_bias = 1e-6
+        
+        # Depth buffer and Hi-Z chain of the last frame
+        self.depth = np.full((height, width), np.inf)
+        self.hiz: List[np.ndarray] = [self.depth]
+        
+        # Performance tracking
+        self.occluders = 0
+        self.occluder_triangles = 0
+        self.tested_objects = 0
+        self.occluded_objects = 0
+    
+    def cull(self, extractor, indices: np.ndarray, view_projection: np.ndarray, camera_position: np.ndarray,
+             projection_scale: float) -> np.ndarray:
+        """Remove the objects hidden behind the frame's occluders.
+        
+        Args:
+            extractor: SceneExtractor holding the objects
+            indices: Visible slots after frustum culling
+            view_projection: Camera projection * view matrix
+            camera_position: World position of the camera
+            projection_scale: Projection matrix [1][1], to estimate screen sizes
+        
+        Returns:
+            The unoccluded subset of indices, in their original order
+        """
+        view_projection = np.asarray(view_projection, dtype=np.float64)
+        occluders = self._select_occluders(extractor, indices, camera_position, projection_scale)
+        self.render_occluders(extractor, occluders, view_projection)
+        
+        visible = self.test_bounds(extractor.bounds_min[indices], extractor.bounds_max[indices], view_projection)
+        self.tested_objects = len(indices)
+        self.occluded_objects = len(indices) - int(visible.sum())
+        return indices[visible]
+    
+    def _select_occluders(self, extractor, indices: np.ndarray, camera_position: np.ndarray,
+                          projection_scale: float) -> np.ndarray:
+        """Pick the largest opaque objects on screen as occluders."""
+        opaque = indices[(extractor.flags[indices] & FLAG_TRANSPARENT) == 0]
+        if not len(opaque):
+            return opaque
+        distance = np.linalg.norm(extractor.bounds_center[opaque] - camera_position, axis=1)
+        sizes = extractor.bounds_radius[opaque] * projection_scale / np.maximum(distance, 1e-6)
+        order = np.argsort(-sizes, kind='stable')[:self.max_occluders]
+        return opaque[order[sizes[order] >= self.min_occluder_size]]
+    
+    def _occluder_mesh(self, mesh_info) -> Optional[Any]:
+        """Get the coarsest detail level of a mesh that keeps CPU data."""
+        if mesh_info is None:
+            return None
+        for level in range(mesh_info.lod_count - 1, -1, -1):
+            mesh_data = mesh_info.get_lod(level).mesh_data
+            if mesh_data is not None:
+                return mesh_data
+        return None
+    
+    def render_occluders(self, extractor, slots: np.ndarray, view_projection: np.ndarray):
+        """Rasterize occluders into the depth buffer and rebuild the Hi-Z chain.
+        
+        Args:
+            extractor: SceneExtractor holding the objects
+            slots: Occluder slots, most important first
+            view_projection: Camera projection * view matrix
+        """
+        triangles = []
+        budget = self.max_occluder_triangles
+        for slot in slots.tolist():
+            mesh_data = self._occluder_mesh(extractor.meshes[extractor.mesh_ids[slot]])
+            if mesh_data is None or mesh_data.index_count // 3 > budget:
+                continue
+            positions = np.c_[np.asarray(mesh_data.positions, dtype=np.float64), np.ones(mesh_data.vertex_count)]
+            clip = positions @ (view_projection @ extractor.world_matrices[slot].astype(np.float64)).T
+            triangles.append(clip[np.asarray(mesh_data.indices, dtype=np.int64).reshape(-1, 3)])
+            budget -= mesh_data.index_count // 3
+        
+        self.occluders = len(triangles)
+        self.occluder_triangles = self.max_occluder_triangles - budget
+        self.depth = np.full((self.height, self.width), np.inf)
+        if triangles:
+            self._rasterize(np.concatenate(triangles))
+        self.hiz = build_hiz(self.depth)
+    
+    def _rasterize(self, clip: np.ndarray):
+        """Rasterize clip-space triangles conservatively, keeping the nearest depth per texel.
+        
+        Args:
+            clip: (n, 3, 4) triangle vertices in clip space
+        """
+        # Drop triangles outside a side or far plane, clip the rest at the near plane
+        xyz, w = clip[:, :, 0:3], clip[:, :, 3:4]
+        outside = np.any(np.all(xyz > w, axis=1) | np.all(xyz < -w, axis=1), axis=1)
+        clip = _clip_near(clip[~outside])
+        if not len(clip):
+            return
+        
+        ndc = clip[:, :, 0:3] / clip[:, :, 3:4]
+        x = (ndc[:, :, 0] * 0.5 + 0.5) * self.width
+        y = (0.5 - ndc[:, :, 1] * 0.5) * self.height
+        z = ndc[:, :, 2] * 0.5 + 0.5
+        
+        # Texels lying entirely within each triangle's bounds, clamped to the buffer
+        area = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+        left = np.maximum(np.ceil(x.min(axis=1)), 0).astype(np.int64)
+        top = np.maximum(np.ceil(y.min(axis=1)), 0).astype(np.int64)
+        right = np.minimum(np.floor(x.max(axis=1)) - 1, self.width - 1).astype(np.int64)
+        bottom = np.minimum(np.floor(y.max(axis=1)) - 1, self.height - 1).astype(np.int64)
+        columns = np.maximum(right - left + 1, 0)
+        pixels = columns * np.maximum(bottom - top + 1, 0)
+        kept = np.flatnonzero((pixels > 0) & (np.abs(area) > 1e-12))
+        
+        depth = self.depth.ravel()
+        ends = np.cumsum(pixels[kept])
+        start = 0
+        while start < len(kept):
+            # A chunk of triangles with a bounded number of pixel candidates
+            base = ends[start - 1] if start else 0
+            stop = max(int(np.searchsorted(ends, base + RASTER_CHUNK_ELEMENTS, side='right')), start + 1)
+            chunk = kept[start:stop]
+            counts = pixels[chunk]
+            triangle = np.repeat(np.arange(len(chunk)), counts)
+            local = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+            px = left[chunk][triangle] + local % columns[chunk][triangle]
+            py = top[chunk][triangle] + local // columns[chunk][triangle]
+            
+            # A texel is only written when the triangle covers all of it, so partial coverage
+            # at occluder edges never hides anything: all four corners must be inside, and
+            # the depth written is the farthest of the triangle's plane over the texel
+            tx, ty, tz = x[chunk][triangle], y[chunk][triangle], z[chunk][triangle]
+            inv_area = 1.0 / area[chunk][triangle]
+            inside = np.ones(len(px), dtype=bool)
+            texel_depth = np.full(len(px), -np.inf)
+            for cx, cy in ((px, py), (px + 1, py), (px, py + 1), (px + 1, py + 1)):
+                w0 = ((tx[:, 1] - cx) * (ty[:, 2] - cy) - (tx[:, 2] - cx) * (ty[:, 1] - cy)) * inv_area
+                w1 = ((tx[:, 2] - cx) * (ty[:, 0] - cy) - (tx[:, 0] - cx) * (ty[:, 2] - cy)) * inv_area
+                w2 = 1.0 - w0 - w1
+                inside &= (w0 >= 0.0) & (w1 >= 0.0) & (w2 >= 0.0)
+                texel_depth = np.maximum(texel_depth, w0 * tz[:, 0] + w1 * tz[:, 1] + w2 * tz[:, 2])
+            
+            np.minimum.at(depth, (py * self.width + px)[inside], texel_depth[inside])
+            start = stop
+    
+    def test_bounds(self, bounds_min: np.ndarray, bounds_max: np.ndarray, view_projection: np.ndarray) -> np.ndarray:
+        """Test axis-aligned boxes against the Hi-Z chain.
+        
+        Args:
+            bounds_min: (n, 3) box minimums
+            bounds_max: (n, 3) box maximums
+            view_projection: Camera projection * view matrix
+        
+        Returns:
+            (n,) bool, True where a box may be visible
+        """
+        count = len(bounds_min)
+        visible = np.ones(count, dtype=bool)
+        if not count or not np.isfinite(self.depth).any():
+            return visible
+        
+        # Project the eight corners of every box
+        bounds_min = np.asarray(bounds_min, dtype=np.float64)
+        extent = np.asarray(bounds_max, dtype=np.float64) - bounds_min
+        corners = bounds_min[:, None, :] + _BOX_CORNERS[None] * extent[:, None, :]
+        clip = np.einsum('nkj,ij->nki', np.concatenate([corners, np.ones((count, 8, 1))], axis=2),
+                         np.asarray(view_projection, dtype=np.float64))
+        
+        # Boxes reaching the camera plane are always visible
+        in_front = np.all(clip[:, :, 3] > 1e-6, axis=1) & np.all(clip[:, :, 2] >= -clip[:, :, 3], axis=1)
+        tested = np.flatnonzero(in_front)
+        if not len(tested):
+            return visible
+        ndc = clip[tested, :, 0:3] / clip[tested, :, 3:4]
+        x = (ndc[:, :, 0] * 0.5 + 0.5) * self.width
+        y = (0.5 - ndc[:, :, 1] * 0.5) * self.height
+        nearest = ndc[:, :, 2].min(axis=1) * 0.5 + 0.5
+        
+        # Pixels the screen rectangle touches; rectangles off the buffer are left to frustum culling
+        left = np.floor(x.min(axis=1)).astype(np.int64)
+        top = np.floor(y.min(axis=1)).astype(np.int64)
+        right = np.floor(x.max(axis=1)).astype(np.int64)
+        bottom = np.floor(y.max(axis=1)).astype(np.int64)
+        on_screen = (right >= 0) & (bottom >= 0) & (left < self.width) & (top < self.height)
+        left, top = np.clip(left, 0, self.width - 1), np.clip(top, 0, self.height - 1)
+        right, bottom = np.clip(right, 0, self.width - 1), np.clip(bottom, 0, self.height - 1)
+        
+        # The level where the rectangle spans at most two texels per axis
+        span = np.maximum(right - left, bottom - top) + 1
+        levels = np.minimum(np.ceil(np.log2(span)).astype(np.int64), len(self.hiz) - 1)
+        farthest = np.full(len(tested), np.inf)
+        for level in np.unique(levels).tolist():
+            rows = np.flatnonzero(levels == level)
+            hiz = self.hiz[level]
+            x0, x1 = left[rows] >> level, right[rows] >> level
+            y0, y1 = top[rows] >> level, bottom[rows] >> level
+            farthest[rows] = np.maximum(np.maximum(hiz[y0, x0], hiz[y0, x1]), np.maximum(hiz[y1, x0], hiz[y1, x1]))
+        
+        occluded = on_screen & (nearest > farthest + self.depth_bias)
+        visible[tested[occluded]] = False
+        return visible
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get occlusion statistics for the last frame.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "occluders": self.occluders,
+            "occluder_triangles": self.occluder_triangles,
+            "tested_objects": self.tested_objects,
+            "occluded_objects": self.occluded_objects,
+            "resolution": (self.width, self.height)
+        }
@@ -3,18 +3,22 @@ Render Pipeline for Nexlify Engine.
 
 This module implements the rendering pipeline including:
 - Pipeline state management
-- Render passes
+- Render passes, scheduled by a render graph from the targets they use
 - Post-processing effects
 - Performance optimization
 """
 
 import logging
-from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Callable
+from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
 from .device import GraphicsDevice
 from .shaders import ShaderManager
+from .render_graph import RenderGraph
+from ..asset.mesh_loader import VERTEX_STRIDE
 from ..utils.logger import get_logger
 
 
@@ -45,8 +49,12 @@ class RenderPassInfo:
     pass_type: RenderPass
     enabled: bool = True
     clear_color: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0)
+    clear_target: bool = True
     clear_depth: bool = True
     clear_stencil: bool = False
+    reads: List[str] = field(default_factory=list)
+    writes: List[str] = field(default_factory=list)
+    execute: Optional[Callable] = None  # Called instead of the frame's render function
 
 
 class RenderPipeline:
@@ -63,17 +71,33 @@ class RenderPipeline:
         self.viewport_width = 0
         self.viewport_height = 0
         
-        # Render passes
+        # Render passes, in declaration order; the render graph decides what runs and when
         self.render_passes: Dict[str, RenderPassInfo] = {}
         self.pass_order: List[str] = []
+        self.render_graph = RenderGraph()
         
-        # Current camera
+        # Current camera and its matrices at set_camera time
         self.current_camera = None
+        self._camera_constants: Dict[str, Any] = {}
+        
+        # Clustered light lists of the frame, for shading
+        self._light_constants: Dict[str, Any] = {}
+        
+        # Packed per-instance world matrices, uploaded once per pass
+        self._instance_buffer: Optional[int] = None
+        self._instance_capacity = 0
+        
+        # Resources bound on the device, so unchanged bindings are not re-sent
+        self._bindings: Dict[str, Any] = {}
         
         # Performance tracking
         self.draw_calls = 0
         self.triangles = 0
         self.vertices = 0
+        self.objects = 0
+        self.instanced_draws = 0
+        self.state_changes = 0
+        self.redundant_state_changes = 0
         
     def initialize(self) -> bool:
         """Initialize the render pipeline.
@@ -84,6 +108,10 @@ class RenderPipeline:
         try:
             self.logger.info("Initializing render pipeline...")
             
+            # The back buffer and its depth are owned by the device
+            self.render_graph.import_resource("color", "RGBA8")
+            self.render_graph.import_resource("depth", "D32")
+            
             # Setup default render passes
             self._setup_default_passes()
             
@@ -101,14 +129,16 @@ class RenderPipeline:
             # Opaque pass
             self.add_render_pass("opaque", RenderPass.OPAQUE, (0.2, 0.3, 0.4, 1.0))
             
-            # Transparent pass
-            self.add_render_pass("transparent", RenderPass.TRANSPARENT, (0.0, 0.0, 0.0, 0.0))
+            # Transparent pass, drawn over the opaque results and depth tested against them
+            self.add_render_pass("transparent", RenderPass.TRANSPARENT, (0.0, 0.0, 0.0, 0.0),
+                                 clear_target=False, clear_depth=False, reads=["depth"], writes=["color"])
             
-            # UI pass
-            self.add_render_pass("ui", RenderPass.UI, (0.0, 0.0, 0.0, 0.0))
+            # UI pass, drawn on top of the scene
+            self.add_render_pass("ui", RenderPass.UI, (0.0, 0.0, 0.0, 0.0), clear_target=False)
             
             # Post-process pass
-            self.add_render_pass("post_process", RenderPass.POST_PROCESS, (0.0, 0.0, 0.0, 1.0))
+            self.add_render_pass("post_process", RenderPass.POST_PROCESS, (0.0, 0.0, 0.0, 1.0),
+                                 clear_target=False, clear_depth=False, reads=["color"], writes=["color"])
             
             self.logger.info("Default render passes setup complete")
             
@@ -116,13 +146,25 @@ class RenderPipeline:
             self.logger.error(f"Failed to setup default passes: {e}")
     
     def add_render_pass(self, name: str, pass_type: RenderPass, 
-                       clear_color: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0)) -> bool:
+                       clear_color: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0),
+                       clear_target: bool = True, clear_depth: bool = True,
+                       reads: Optional[List[str]] = None, writes: Optional[List[str]] = None,
+                       execute: Optional[Callable] = None) -> bool:
         """Add a render pass.
         
+        Passes only run when their outputs reach the back buffer ("color"
+        and "depth"), directly or through passes reading them.
+        
         Args:
             name: Pass name
             pass_type: Type of render pass
             clear_color: Clear color for this pass
+            clear_target: Whether the pass clears the color target
+            clear_depth: Whether the pass clears the depth buffer
+            reads: Render targets the pass reads
+            writes: Render targets the pass renders to (default: color and depth)
+            execute: Function called as execute(name, pass_info) instead of
+                the frame's render function
             
         Returns:
             True if pass added successfully, False otherwise
@@ -131,11 +173,18 @@ class RenderPipeline:
             pass_info = RenderPassInfo(
                 name=name,
                 pass_type=pass_type,
-                clear_color=clear_color
+                clear_color=clear_color,
+                clear_target=clear_target,
+                clear_depth=clear_depth,
+                reads=list(reads or []),
+                writes=list(writes) if writes is not None else ["color", "depth"],
+                execute=execute
             )
             
             self.render_passes[name] = pass_info
-            self.pass_order.append(name)
+            if name not in self.pass_order:
+                self.pass_order.append(name)
+            self.render_graph.add_pass(name, pass_info.reads, pass_info.writes)
             
             self.logger.info(f"Added render pass: {name} ({pass_type.value})")
             return True
@@ -158,6 +207,7 @@ class RenderPipeline:
                 del self.render_passes[name]
                 if name in self.pass_order:
                     self.pass_order.remove(name)
+                self.render_graph.remove_pass(name)
                 
                 self.logger.info(f"Removed render pass: {name}")
                 return True
@@ -186,13 +236,16 @@ class RenderPipeline:
             if not pass_info.enabled:
                 return True  # Pass is disabled, skip it
             
-            # Clear render target
-            self.device.clear_render_target(pass_info.clear_color)
-            
-            # Reset stats for this pass
-            self.draw_calls = 0
-            self.triangles = 0
-            self.vertices = 0
+            # Bind the targets the pass declared, then clear the ones it writes
+            color, depth = self._pass_targets(pass_info)
+            if not self.device.set_render_targets(color, depth):
+                self.logger.error(f"Cannot bind the render targets of pass {pass_name}")
+                return False
+            written = [self.render_graph.resources.get(name) for name in pass_info.writes]
+            if pass_info.clear_target and any(r is not None and not r.is_depth for r in written):
+                self.device.clear_render_target(pass_info.clear_color)
+            if pass_info.clear_depth and any(r is not None and r.is_depth for r in written):
+                self.device.clear_depth_stencil()
             
             self.logger.debug(f"Began render pass: {pass_name}")
             return True
@@ -201,6 +254,52 @@ class RenderPipeline:
             self.logger.error(f"Failed to begin render pass {pass_name}: {e}")
             return False
     
+    def _pass_targets(self, pass_info: RenderPassInfo) -> Tuple[Optional[int], Optional[int]]:
+        """Get the color and depth targets a pass draws to.
+        
+        The first color and depth targets among the pass's writes are bound;
+        a pass only reading a depth target still depth tests against it.
+        """
+        graph = self.render_graph
+        color = depth = None
+        color_found = depth_found = False
+        for name in pass_info.writes + pass_info.reads:
+            resource = graph.resources.get(name)
+            if resource is None:
+                continue
+            if resource.is_depth and not depth_found:
+                depth, depth_found = graph.get_handle(name), True
+            elif not resource.is_depth and not color_found and name in pass_info.writes:
+                color, color_found = graph.get_handle(name), True
+        return color, depth
+    
+    def add_render_target(self, name: str, format: str = "RGBA8", width: int = 0, height: int = 0) -> bool:
+        """Declare a transient render target for passes to read and write.
+        
+        Transient targets whose lifetimes do not overlap share memory.
+        
+        Args:
+            name: Target name
+            format: Pixel format, e.g. RGBA8, RGBA16F or D32
+            width: Width in pixels, 0 to follow the viewport
+            height: Height in pixels, 0 to follow the viewport
+            
+        Returns:
+            True if the target was declared, False otherwise
+        """
+        return self.render_graph.add_resource(name, format, width, height)
+    
+    def get_render_target(self, name: str) -> Optional[int]:
+        """Get the device handle of a render target for the current frame.
+        
+        Args:
+            name: Target name
+            
+        Returns:
+            Target handle, or None for the back buffer
+        """
+        return self.render_graph.get_handle(name)
+    
     def end_render_pass(self, pass_name: str) -> bool:
         """End a render pass.
         
@@ -231,19 +330,21 @@ class RenderPipeline:
             True if state set successfully, False otherwise
         """
         try:
+            # Draws sorted by state mostly re-request the state already set
+            if state == self.current_state:
+                self.redundant_state_changes += 1
+                return True
+            
             # Validate shader program
             if not self.shader_manager.get_shader_program(state.shader_program):
                 self.logger.error(f"Shader program not found: {state.shader_program}")
                 return False
             
             self.current_state = state
+            self.state_changes += 1
             
-            # TODO: Apply pipeline state to graphics device
-            # This would involve:
-            # - Setting shader program
-            # - Configuring blend state
-            # - Setting depth/stencil state
-            # - Configuring rasterizer state
+            # TODO: Bind the shader program once shaders compile to device programs
+            self.device.set_render_state(state.blend_mode, state.depth_test, state.depth_write, state.cull_mode)
             
             self.logger.debug(f"Set pipeline state: {state.shader_program}")
             return True
@@ -260,13 +361,29 @@ class RenderPipeline:
         """
         self.current_camera = camera
         
-        # TODO: Update camera matrices in constant buffers
-        # This would involve:
-        # - Calculating view matrix
-        # - Calculating projection matrix
-        # - Updating GPU constant buffers
-        
+        # Snapshot the matrices now, so passes rendered later on another thread see this frame's camera
+        self._camera_constants = {}
+        if camera is not None and hasattr(camera, 'get_view_projection_matrix'):
+            self._camera_constants["view_projection"] = camera.get_view_projection_matrix()
+            game_object = getattr(camera, 'game_object', None)
+            if game_object is not None:
+                self._camera_constants["camera_position"] = game_object.get_world_matrix()[:3, 3].copy()
         self.logger.debug("Camera set")
+        
+    def set_light_clusters(self, clusters):
+        """Set the clustered lights shading reads this frame.
+        
+        Args:
+            clusters: LightClusters of the frame, or None for no local lights
+        """
+        self._light_constants = {"light_clusters": clusters}
+    
+    def _update_frame_constants(self):
+        """Upload the current camera's matrices and light clusters for this frame."""
+        if self._camera_constants:
+            self.device.set_shader_constants(self._camera_constants)
+        if self._light_constants:
+            self.device.set_shader_constants(self._light_constants)
     
     def resize_viewport(self, width: int, height: int):
         """Resize the viewport.
@@ -295,33 +412,87 @@ class RenderPipeline:
             render_func: Function to call for each pass
         """
         try:
-            for pass_name in self.pass_order:
+            self.reset_stats()
+            self.invalidate_bindings()
+            self._update_frame_constants()
+            
+            # Compiled once per graph change; culls, orders and aliases the passes
+            compiled = self.render_graph.compile(self.viewport_width, self.viewport_height)
+            self.render_graph.allocate(self.device)
+            
+            for pass_name in compiled.order:
                 if self.begin_render_pass(pass_name):
                     # Call render function for this pass
-                    render_func(pass_name, self.render_passes[pass_name])
+                    pass_info = self.render_passes[pass_name]
+                    (pass_info.execute or render_func)(pass_name, pass_info)
                     self.end_render_pass(pass_name)
+            
+            self.device.set_render_targets(None, None)
                     
         except Exception as e:
             self.logger.error(f"Error rendering passes: {e}")
     
-    def draw_mesh(self, mesh_info, material_info, transform_matrix):
+    def invalidate_bindings(self):
+        """Forget the state and resources bound on the device.
+        
+        Call when something outside the pipeline changed device state.
+        """
+        self.current_state = None
+        self._bindings.clear()
+    
+    def _bind(self, slot: str, resource, bind_func, *args) -> bool:
+        """Bind a resource unless it is already bound.
+        
+        Args:
+            slot: Binding slot name
+            resource: Resource to bind, compared by identity
+            bind_func: Device function performing the binding
+            *args: Arguments for bind_func
+            
+        Returns:
+            True if the device was called, False if the binding was elided
+        """
+        if slot in self._bindings and self._bindings[slot] is resource:
+            self.redundant_state_changes += 1
+            return False
+        bind_func(*args)
+        self._bindings[slot] = resource
+        self.state_changes += 1
+        return True
+    
+    def _bind_geometry(self, mesh_info):
+        """Bind the vertex and index buffers of a mesh."""
+        self._bind("vertex_buffer", mesh_info.vertex_buffer, self.device.set_vertex_buffer,
+                   mesh_info.vertex_buffer, VERTEX_STRIDE * 4)
+        self._bind("index_buffer", mesh_info.index_buffer, self.device.set_index_buffer, mesh_info.index_buffer)
+    
+    def _bind_material(self, material_info):
+        """Bind the texture and constants of a material."""
+        if material_info is None:
+            material_info = {}
+        if self._bind("material", material_info, self.device.set_texture, material_info.get("texture_handle")):
+            self.device.set_shader_constants({
+                "base_color": material_info.get("base_color", (1.0, 1.0, 1.0, 1.0))
+            })
+    
+    def draw_mesh(self, mesh_info, material_info, transform_matrix, object_count: int = 1):
         """Draw a mesh with the specified material and transform.
         
         Args:
             mesh_info: Mesh information
             material_info: Material information
             transform_matrix: Transform matrix
+            object_count: Number of scene objects merged into the mesh
         """
         try:
-            # TODO: Implement actual mesh drawing
-            # This would involve:
-            # - Setting vertex/index buffers
-            # - Setting material properties
-            # - Setting transform matrix
-            # - Issuing draw call
+            self._bind_geometry(mesh_info)
+            self._bind_material(material_info)
+            self.device.set_shader_constants({"world": transform_matrix})
+            self.device.draw_indexed(mesh_info.index_count)
             
             # Update stats
             self.draw_calls += 1
+            self.objects += object_count
             self.triangles += mesh_info.index_count // 3
             self.vertices += mesh_info.vertex_count
             
@@ -330,8 +501,61 @@ class RenderPipeline:
         except Exception as e:
             self.logger.error(f"Failed to draw mesh: {e}")
     
-    def get_stats(self) -> Dict[str, int]:
-        """Get rendering statistics.
+    def upload_instances(self, transforms: np.ndarray) -> bool:
+        """Upload world matrices for following instanced draws.
+        
+        Args:
+            transforms: (n, 4, 4) world matrices in draw order
+            
+        Returns:
+            True if the instances were uploaded, False otherwise
+        """
+        try:
+            data = np.ascontiguousarray(transforms, dtype=np.float32)
+            if not len(data):
+                return True
+            
+            # Grow geometrically so steady scenes stop reallocating
+            if len(data) > self._instance_capacity:
+                if self._instance_buffer is not None:
+                    self.device.release_buffer(self._instance_buffer)
+                self._instance_capacity = max(len(data), self._instance_capacity * 2, 64)
+                self._instance_buffer = self.device.create_buffer(self._instance_capacity * 64, "instance")
+                self._bindings.pop("instance_buffer", None)
+            
+            return self.device.update_buffer(self._instance_buffer, data.data)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to upload instances: {e}")
+            return False
+    
+    def draw_mesh_instanced(self, mesh_info, material_info, start_instance: int, instance_count: int):
+        """Draw a mesh once per uploaded world matrix in a range.
+        
+        Args:
+            mesh_info: Mesh information
+            material_info: Material information
+            start_instance: First matrix passed to upload_instances
+            instance_count: Number of instances
+        """
+        try:
+            self._bind_geometry(mesh_info)
+            self._bind("instance_buffer", self._instance_buffer, self.device.set_instance_buffer, self._instance_buffer)
+            self._bind_material(material_info)
+            self.device.draw_indexed_instanced(mesh_info.index_count, instance_count, start_instance=start_instance)
+            
+            # Update stats
+            self.draw_calls += 1
+            self.instanced_draws += 1
+            self.objects += instance_count
+            self.triangles += instance_count * (mesh_info.index_count // 3)
+            self.vertices += instance_count * mesh_info.vertex_count
+            
+        except Exception as e:
+            self.logger.error(f"Failed to draw instanced mesh: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rendering statistics for the current frame.
         
         Returns:
             Dictionary of rendering stats
@@ -339,7 +563,13 @@ class RenderPipeline:
         return {
             "draw_calls": self.draw_calls,
             "triangles": self.triangles,
-            "vertices": self.vertices
+            "vertices": self.vertices,
+            "objects": self.objects,
+            "instanced_draws": self.instanced_draws,
+            "state_changes": self.state_changes,
+            "redundant_state_changes": self.redundant_state_changes,
+            "render_graph": self.render_graph.get_stats(),
+            "draw_call_reduction": 1.0 - self.draw_calls / self.objects if self.objects else 0.0
         }
     
     def reset_stats(self):
@@ -347,6 +577,10 @@ class RenderPipeline:
         self.draw_calls = 0
         self.triangles = 0
         self.vertices = 0
+        self.objects = 0
+        self.instanced_draws = 0
+        self.state_changes = 0
+        self.redundant_state_changes = 0
     
     def get_render_pass(self, name: str) -> Optional[RenderPassInfo]:
         """Get a render pass by name.
@@ -371,6 +605,7 @@ class RenderPipeline:
         """
         if name in self.render_passes:
             self.render_passes[name].enabled = enabled
+            self.render_graph.set_pass_enabled(name, enabled)
             self.logger.info(f"Render pass {name} {'enabled' if enabled else 'disabled'}")
             return True
         return False
@@ -381,12 +616,18 @@ class RenderPipeline:
             self.logger.info("Shutting down render pipeline...")
             
             # Clear render passes
+            self.render_graph.release()
+            self.render_graph = RenderGraph()
             self.render_passes.clear()
             self.pass_order.clear()
             
             # Reset state
-            self.current_state = None
+            self.invalidate_bindings()
             self.current_camera = None
+            if self._instance_buffer is not None:
+                self.device.release_buffer(self._instance_buffer)
+                self._instance_buffer = None
+                self._instance_capacity = 0
             
             self.is_initialized = False
             self.logger.info("✅ Render pipeline shutdown complete")
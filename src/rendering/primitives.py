@@ -0,0 +1,457 @@
+"""
+Procedural Primitives for Nexlify Engine.
+
+This module generates the engine's built-in meshes (sphere, capsule,
+cylinder, plane grid, torus and icosphere) in the interleaved vertex
+layout used by the mesh loaders. Every shape is built from whole-array
+NumPy operations, so generation cost does not grow with Python loop
+overhead as the resolution goes up. Generated meshes are cached by their
+parameters, which makes regenerating a primitive with unchanged settings
+free.
+"""
+
+import inspect
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable
+
+import numpy as np
+
+from ..asset.mesh_loader import MeshData, SubMesh, VERTEX_STRIDE
+from ..utils.logger import get_logger
+
+
+def _build_mesh(positions: np.ndarray, normals: np.ndarray, uvs: np.ndarray,
+                indices: np.ndarray) -> MeshData:
+    """Pack attribute arrays into a read-only MeshData."""
+    vertices = np.empty((len(positions), VERTEX_STRIDE), dtype=np.float32)
+    vertices[:, 0:3] = positions
+    vertices[:, 3:6] = normals
+    vertices[:, 6:8] = uvs
+    indices = np.ascontiguousarray(indices, dtype=np.uint32).reshape(-1)
+    
+    # Cached meshes are shared between callers
+    vertices.flags.writeable = False
+    indices.flags.writeable = False
+    return MeshData(vertices=vertices, indices=indices, submeshes=[SubMesh(0, len(indices))])
+
+
+def _grid_indices(rows: int, cols: int, flip: bool = False) -> np.ndarray:
+    """Triangulate a (rows + 1) x (cols + 1) vertex grid.
+    
+    Args:
+        rows: Quad rows
+        cols: Quad columns
+        flip: Reverse the winding
+    
+    Returns:
+        (rows * cols * 2, 3) triangle indices
+    """
+    r, c = np.meshgrid(np.arange(rows), np.arange(cols), indexing='ij')
+    a = (r * (cols + 1) + c).reshape(-1)
+    b = a + cols + 1
+    if flip:
+        triangles = np.stack((a, a + 1, b, a + 1, b + 1, b), axis=1)
+    else:
+        triangles = np.stack((a, b, a + 1, a + 1, b, b + 1), axis=1)
+    return triangles.reshape(-1, 3)
+
+
+def _lathe(radius: np.ndarray, height: np.ndarray, normal_radius: np.ndarray,
+           normal_height: np.ndarray, v: np.ndarray, segments: int) -> Tuple[np.ndarray, ...]:
+    """Revolve a profile curve around the Y axis.
+    
+    The profile must run down the outside of the surface (top to bottom
+    for a sphere) so triangles wind counter-clockwise seen from outside.
+    
+    Args:
+        radius: Distance of each profile point from the axis
+        height: Y of each profile point
+        normal_radius: Radial component of each profile normal
+        normal_height: Y component of each profile normal
+        v: Texture V of each profile point
+        segments: Steps around the axis
+    
+    Returns:
+        (positions, normals, uvs, triangles)
+    """
+    u = np.linspace(0.0, 1.0, segments + 1)
+    theta = u * 2.0 * np.pi
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    
+    # Rows follow the profile, columns go around the axis
+    rows, cols = len(radius), segments + 1
+    positions = np.empty((rows, cols, 3))
+    positions[..., 0] = np.outer(radius, cos_t)
+    positions[..., 1] = height[:, None]
+    positions[..., 2] = np.outer(radius, sin_t)
+    
+    normals = np.empty((rows, cols, 3))
+    normals[..., 0] = np.outer(normal_radius, cos_t)
+    normals[..., 1] = normal_height[:, None]
+    normals[..., 2] = np.outer(normal_radius, sin_t)
+    
+    uvs = np.empty((rows, cols, 2))
+    uvs[..., 0] = u
+    uvs[..., 1] = v[:, None]
+    
+    # Drop the zero-area triangles of quads that touch a pole
+    triangles = _grid_indices(rows - 1, segments, flip=True).reshape(rows - 1, segments, 2, 3)
+    keep = np.ones(triangles.shape[:3], dtype=bool)
+    if radius[0] == 0.0:
+        keep[0, :, 0] = False
+    if radius[-1] == 0.0:
+        keep[-1, :, 1] = False
+    
+    return (positions.reshape(-1, 3), normals.reshape(-1, 3), uvs.reshape(-1, 2),
+            triangles[keep])
+
+
+def _disk(radius: float, y: float, segments: int, facing_up: bool) -> Tuple[np.ndarray, ...]:
+    """Build a triangle fan closing a cylinder end.
+    
+    Returns:
+        (positions, normals, uvs, triangles)
+    """
+    theta = np.linspace(0.0, 2.0 * np.pi, segments + 1)
+    positions = np.zeros((segments + 2, 3))
+    positions[1:, 0] = np.cos(theta) * radius
+    positions[1:, 2] = np.sin(theta) * radius
+    positions[:, 1] = y
+    
+    normals = np.zeros((segments + 2, 3))
+    normals[:, 1] = 1.0 if facing_up else -1.0
+    
+    uvs = np.full((segments + 2, 2), 0.5)
+    uvs[1:, 0] += np.cos(theta) * 0.5
+    uvs[1:, 1] += np.sin(theta) * 0.5
+    
+    ring = np.arange(1, segments + 1)
+    first, second = (ring + 1, ring) if facing_up else (ring, ring + 1)
+    triangles = np.stack((np.zeros(segments, dtype=np.int64), first, second), axis=1)
+    return positions, normals, uvs, triangles
+
+
+def _merge(*parts: Tuple[np.ndarray, ...]) -> MeshData:
+    """Concatenate (positions, normals, uvs, triangles) parts into one mesh."""
+    offsets = np.cumsum([0] + [len(part[0]) for part in parts[:-1]])
+    return _build_mesh(
+        np.concatenate([part[0] for part in parts]),
+        np.concatenate([part[1] for part in parts]),
+        np.concatenate([part[2] for part in parts]),
+        np.concatenate([part[3] + offset for part, offset in zip(parts, offsets)])
+    )
+
+
+def _require(condition: bool, message: str):
+    """Reject an invalid primitive parameter."""
+    if not condition:
+        raise ValueError(message)
+
+
+def create_sphere(radius: float = 1.0, segments: int = 32, rings: int = 16) -> MeshData:
+    """Generate a UV sphere.
+    
+    Args:
+        radius: Sphere radius
+        segments: Steps around the Y axis (>= 3)
+        rings: Steps from pole to pole (>= 2)
+    
+    Returns:
+        Generated mesh
+    """
+    _require(segments >= 3 and rings >= 2, "Sphere needs at least 3 segments and 2 rings")
+    v = np.linspace(0.0, 1.0, rings + 1)
+    phi = v * np.pi
+    sin_p, cos_p = np.sin(phi), np.cos(phi)
+    sin_p[[0, -1]] = 0.0
+    return _merge(_lathe(sin_p * radius, cos_p * radius, sin_p, cos_p, v, segments))
+
+
+def create_capsule(radius: float = 0.5, height: float = 2.0, segments: int = 32,
+                   rings: int = 8) -> MeshData:
+    """Generate a capsule along the Y axis.
+    
+    Args:
+        radius: Cap radius
+        height: Total height including both caps (a sphere if not above 2 * radius)
+        segments: Steps around the Y axis (>= 3)
+        rings: Steps across each hemispherical cap (>= 1)
+    
+    Returns:
+        Generated mesh
+    """
+    _require(segments >= 3 and rings >= 1, "Capsule needs at least 3 segments and 1 ring")
+    half = height * 0.5 - radius
+    if half <= 0.0:
+        return create_sphere(radius, segments, rings * 2)
+    
+    # Top cap, then bottom cap; the two equator rows bound the cylindrical band
+    phi = np.concatenate((np.linspace(0.0, 0.5 * np.pi, rings + 1),
+                          np.linspace(0.5 * np.pi, np.pi, rings + 1)))
+    offset = np.repeat([half, -half], rings + 1)
+    sin_p, cos_p = np.sin(phi), np.cos(phi)
+    sin_p[[0, -1]] = 0.0
+    heights = cos_p * radius + offset
+    
+    # V follows the length of the profile so the texture does not stretch
+    lengths = np.hypot(np.diff(sin_p * radius), np.diff(heights))
+    v = np.concatenate(([0.0], np.cumsum(lengths)))
+    v /= max(v[-1], 1e-12)
+    return _merge(_lathe(sin_p * radius, heights, sin_p, cos_p, v, segments))
+
+
+def create_cylinder(radius: float = 0.5, height: float = 2.0, segments: int = 32,
+                    caps: bool = True) -> MeshData:
+    """Generate a cylinder along the Y axis.
+    
+    Args:
+        radius: Cylinder radius
+        height: Cylinder height
+        segments: Steps around the Y axis (>= 3)
+        caps: Close both ends
+    
+    Returns:
+        Generated mesh
+    """
+    _require(segments >= 3, "Cylinder needs at least 3 segments")
+    half = height * 0.5
+    parts = [_lathe(np.array([radius, radius]), np.array([half, -half]),
+                    np.ones(2), np.zeros(2), np.array([0.0, 1.0]), segments)]
+    if caps:
+        parts.append(_disk(radius, half, segments, facing_up=True))
+        parts.append(_disk(radius, -half, segments, facing_up=False))
+    return _merge(*parts)
+
+
+def create_plane(width: float = 10.0, depth: float = 10.0, subdivisions_x: int = 1,
+                 subdivisions_z: int = 1) -> MeshData:
+    """Generate a subdivided plane in the XZ plane facing +Y.
+    
+    Args:
+        width: Size along X
+        depth: Size along Z
+        subdivisions_x: Quads along X (>= 1)
+        subdivisions_z: Quads along Z (>= 1)
+    
+    Returns:
+        Generated mesh
+    """
+    _require(subdivisions_x >= 1 and subdivisions_z >= 1, "Plane needs at least one quad per axis")
+    u = np.linspace(0.0, 1.0, subdivisions_x + 1)
+    v = np.linspace(0.0, 1.0, subdivisions_z + 1)
+    uu, vv = np.meshgrid(u, v)
+    
+    positions = np.zeros((uu.size, 3))
+    positions[:, 0] = (uu.reshape(-1) - 0.5) * width
+    positions[:, 2] = (vv.reshape(-1) - 0.5) * depth
+    normals = np.zeros((uu.size, 3))
+    normals[:, 1] = 1.0
+    uvs = np.stack((uu.reshape(-1), vv.reshape(-1)), axis=1)
+    
+    return _build_mesh(positions, normals, uvs, _grid_indices(subdivisions_z, subdivisions_x))
+
+
+def create_torus(major_radius: float = 1.0, minor_radius: float = 0.25, segments: int = 48,
+                 sides: int = 16) -> MeshData:
+    """Generate a torus around the Y axis.
+    
+    Args:
+        major_radius: Distance from the center to the middle of the tube
+        minor_radius: Tube radius
+        segments: Steps around the Y axis (>= 3)
+        sides: Steps around the tube (>= 3)
+    
+    Returns:
+        Generated mesh
+    """
+    _require(segments >= 3 and sides >= 3, "Torus needs at least 3 segments and 3 sides")
+    
+    # The tube profile starts at the outer equator and runs down first
+    v = np.linspace(0.0, 1.0, sides + 1)
+    angle = v * 2.0 * np.pi
+    cos_a, sin_a = np.cos(angle), -np.sin(angle)
+    return _merge(_lathe(major_radius + cos_a * minor_radius, sin_a * minor_radius,
+                         cos_a, sin_a, v, segments))
+
+
+# Icosahedron with unit circumradius
+_GOLDEN = (1.0 + 5.0 ** 0.5) / 2.0
+_ICOSAHEDRON_VERTICES = np.array([
+    [-1, _GOLDEN, 0], [1, _GOLDEN, 0], [-1, -_GOLDEN, 0], [1, -_GOLDEN, 0],
+    [0, -1, _GOLDEN], [0, 1, _GOLDEN], [0, -1, -_GOLDEN], [0, 1, -_GOLDEN],
+    [_GOLDEN, 0, -1], [_GOLDEN, 0, 1], [-_GOLDEN, 0, -1], [-_GOLDEN, 0, 1],
+]) / np.hypot(1.0, _GOLDEN)
+_ICOSAHEDRON_FACES = np.array([
+    [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+    [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+    [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+    [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+])
+
+
+def create_icosphere(radius: float = 1.0, subdivisions: int = 3) -> MeshData:
+    """Generate a sphere by subdividing an icosahedron.
+    
+    Triangles are evenly sized, unlike the UV sphere's, at the cost of a
+    texture seam. Each subdivision splits every triangle into four.
+    
+    Args:
+        radius: Sphere radius
+        subdivisions: Subdivision passes (0 gives the icosahedron, at most 8)
+    
+    Returns:
+        Generated mesh
+    """
+    _require(0 <= subdivisions <= 8, "Icosphere subdivisions must be between 0 and 8")
+    positions = _ICOSAHEDRON_VERTICES.copy()
+    faces = _ICOSAHEDRON_FACES.copy()
+    
+    for _ in range(subdivisions):
+        # One midpoint vertex per unique edge
+        edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        keys = edges[:, 0] * len(positions) + edges[:, 1]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        unique_edges = edges[first]
+        midpoints = positions[unique_edges[:, 0]] + positions[unique_edges[:, 1]]
+        midpoints /= np.linalg.norm(midpoints, axis=1, keepdims=True)
+        
+        mid = (inverse.reshape(-1, 3) + len(positions))
+        a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+        ab, bc, ca = mid[:, 0], mid[:, 1], mid[:, 2]
+        faces = np.concatenate((
+            np.stack((a, ab, ca), axis=1),
+            np.stack((b, bc, ab), axis=1),
+            np.stack((c, ca, bc), axis=1),
+            np.stack((ab, bc, ca), axis=1)
+        ))
+        positions = np.concatenate((positions, midpoints))
+    
+    uvs = np.stack((
+        0.5 + np.arctan2(positions[:, 2], positions[:, 0]) / (2.0 * np.pi),
+        np.arccos(np.clip(positions[:, 1], -1.0, 1.0)) / np.pi
+    ), axis=1)
+    return _build_mesh(positions * radius, positions, uvs, faces)
+
+
+PRIMITIVES: Dict[str, Callable[..., MeshData]] = {
+    "sphere": create_sphere,
+    "capsule": create_capsule,
+    "cylinder": create_cylinder,
+    "plane": create_plane,
+    "torus": create_torus,
+    "icosphere": create_icosphere,
+}
+
+
+class PrimitiveGenerator:
+    """Generates procedural meshes and caches them by shape and parameters."""
+    
+    def __init__(self, max_cached: int = 64):
+        self.logger = get_logger(__name__)
+        
+        # Generated meshes, least recently used first
+        self.max_cached = max_cached
+        self.cache: OrderedDict = OrderedDict()
+        
+        # Performance tracking
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def make_key(self, kind: str, **params) -> Tuple:
+        """Get the cache key of a primitive.
+        
+        Defaults are filled in, so equivalent calls share a key.
+        
+        Args:
+            kind: Primitive name (see PRIMITIVES)
+            **params: Shape parameters
+        
+        Returns:
+            Hashable key
+        
+        Raises:
+            ValueError: If the primitive or a parameter is unknown
+        """
+        factory = PRIMITIVES.get(kind)
+        if factory is None:
+            raise ValueError(f"Unknown primitive: {kind}")
+        try:
+            bound = inspect.signature(factory).bind(**params)
+        except TypeError as e:
+            raise ValueError(f"Invalid parameters for {kind}: {e}") from e
+        bound.apply_defaults()
+        return (kind,) + tuple(bound.arguments.items())
+    
+    def generate(self, kind: str, **params) -> MeshData:
+        """Get a primitive mesh, generating it if it is not cached.
+        
+        The returned arrays are read-only because they are shared.
+        
+        Args:
+            kind: Primitive name (see PRIMITIVES)
+            **params: Shape parameters
+        
+        Returns:
+            Generated mesh
+        """
+        key = self.make_key(kind, **params)
+        mesh = self.cache.get(key)
+        if mesh is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return mesh
+        
+        mesh = PRIMITIVES[kind](**params)
+        self.cache_misses += 1
+        self.cache[key] = mesh
+        while len(self.cache) > self.max_cached:
+            self.cache.popitem(last=False)
+        return mesh
+    
+    def sphere(self, radius: float = 1.0, segments: int = 32, rings: int = 16) -> MeshData:
+        """Get a cached UV sphere (see create_sphere)."""
+        return self.generate("sphere", radius=radius, segments=segments, rings=rings)
+    
+    def capsule(self, radius: float = 0.5, height: float = 2.0, segments: int = 32,
+                rings: int = 8) -> MeshData:
+        """Get a cached capsule (see create_capsule)."""
+        return self.generate("capsule", radius=radius, height=height, segments=segments, rings=rings)
+    
+    def cylinder(self, radius: float = 0.5, height: float = 2.0, segments: int = 32,
+                 caps: bool = True) -> MeshData:
+        """Get a cached cylinder (see create_cylinder)."""
+        return self.generate("cylinder", radius=radius, height=height, segments=segments, caps=caps)
+    
+    def plane(self, width: float = 10.0, depth: float = 10.0, subdivisions_x: int = 1,
+              subdivisions_z: int = 1) -> MeshData:
+        """Get a cached plane grid (see create_plane)."""
+        return self.generate("plane", width=width, depth=depth,
+                             subdivisions_x=subdivisions_x, subdivisions_z=subdivisions_z)
+    
+    def torus(self, major_radius: float = 1.0, minor_radius: float = 0.25, segments: int = 48,
+              sides: int = 16) -> MeshData:
+        """Get a cached torus (see create_torus)."""
+        return self.generate("torus", major_radius=major_radius, minor_radius=minor_radius,
+                             segments=segments, sides=sides)
+    
+    def icosphere(self, radius: float = 1.0, subdivisions: int = 3) -> MeshData:
+        """Get a cached icosphere (see create_icosphere)."""
+        return self.generate("icosphere", radius=radius, subdivisions=subdivisions)
+    
+    def clear_cache(self):
+        """Drop all cached meshes."""
+        self.cache.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get generator statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "cached_meshes": len(self.cache),
+            "cached_bytes": sum(mesh.vertices.nbytes + mesh.indices.nbytes for mesh in self.cache.values()),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses
+        }
@@ -0,0 +1,412 @@
+"""
+Render Graph for Nexlify Engine.
+
+This module schedules render passes from the resources they declare:
+- Passes read and write named resources instead of running in a fixed list
+- Compilation culls passes whose outputs never reach an imported resource
+  (such as the back buffer), orders the rest by their dependencies and
+  computes the lifetime of every transient render target
+- Transient targets with non-overlapping lifetimes share one physical
+  target, so a chain of post-process effects ping-pongs between a few
+  targets instead of allocating one per effect
+
+The compiled result is cached until passes, resources or the viewport
+change, so a steady frame costs a dictionary lookup.
+"""
+
+import heapq
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field
+
+from ..utils.logger import get_logger
+
+
+# Bytes per pixel of render target formats
+FORMAT_BYTES = {
+    "R8": 1,
+    "RG8": 2,
+    "RGBA8": 4,
+    "R16F": 2,
+    "RGBA16F": 8,
+    "R32F": 4,
+    "RGBA32F": 16,
+    "D24S8": 4,
+    "D32": 4
+}
+
+DEPTH_FORMATS = ("D24S8", "D32")
+
+
+@dataclass
+class GraphResource:
+    """A render target known to the graph."""
+    name: str
+    format: str = "RGBA8"
+    width: int = 0  # 0 follows the viewport
+    height: int = 0
+    imported: bool = False  # Owned outside the graph, e.g. the back buffer
+    handle: Optional[int] = None  # Device handle of an imported resource
+    
+    @property
+    def is_depth(self) -> bool:
+        """Whether the resource is a depth target."""
+        return self.format in DEPTH_FORMATS
+
+
+@dataclass
+class GraphPass:
+    """A pass and the resources it uses."""
+    name: str
+    reads: List[str] = field(default_factory=list)
+    writes: List[str] = field(default_factory=list)
+    side_effects: bool = False  # Never culled, even if nothing reads its outputs
+    enabled: bool = True
+
+
+@dataclass
+class CompiledGraph:
+    """Execution plan of a render graph."""
+    order: List[str]
+    culled: List[str]
+    lifetimes: Dict[str, Tuple[int, int]]  # Transient resource -> (first, last) position in order
+    aliases: Dict[str, int]  # Transient resource -> physical target slot
+    slots: List[Tuple[int, int, str]]  # (width, height, format) per physical target
+    transient_bytes: int = 0  # Memory the transient targets would take without aliasing
+    physical_bytes: int = 0
+
+
+class RenderGraph:
+    """Declarative pass graph with pass culling and transient aliasing."""
+    
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        
+        # Declared resources and passes; declaration order breaks scheduling ties
+        self.resources: Dict[str, GraphResource] = {}
+        self.passes: Dict[str, GraphPass] = {}
+        
+        # Compiled plan, reused until the graph or the viewport changes
+        self.version = 0
+        self.compiled: Optional[CompiledGraph] = None
+        self._compiled_key: tuple = ()
+        
+        # Physical targets by slot, kept across frames and recompiles
+        self._targets: List[Tuple[Tuple[int, int, str], int]] = []
+        self._device = None
+    
+    def add_resource(self, name: str, format: str = "RGBA8", width: int = 0, height: int = 0) -> bool:
+        """Declare a transient render target.
+        
+        Args:
+            name: Resource name
+            format: Pixel format, e.g. RGBA8 or D32
+            width: Width in pixels, 0 to follow the viewport
+            height: Height in pixels, 0 to follow the viewport
+        
+        Returns:
+            True if declared, False if the format is unknown
+        """
+        if format not in FORMAT_BYTES:
+            self.logger.error(f"Unknown render target format: {format}")
+            return False
+        self.resources[name] = GraphResource(name, format, width, height)
+        self.version += 1
+        return True
+    
+    def import_resource(self, name: str, format: str = "RGBA8", handle: Optional[int] = None) -> bool:
+        """Declare a resource owned outside the graph.
+        
+        Passes writing imported resources are the roots pass culling starts from.
+        
+        Args:
+            name: Resource name
+            format: Pixel format
+            handle: Device handle, None for the back buffer
+        
+        Returns:
+            True if declared, False if the format is unknown
+        """
+        if format not in FORMAT_BYTES:
+            self.logger.error(f"Unknown render target format: {format}")
+            return False
+        self.resources[name] = GraphResource(name, format, imported=True, handle=handle)
+        self.version += 1
+        return True
+    
+    def add_pass(self, name: str, reads: Optional[List[str]] = None, writes: Optional[List[str]] = None,
+                 side_effects: bool = False) -> bool:
+        """Declare a pass.
+        
+        A pass reading a resource runs after the passes writing it; a pass
+        writing a resource another pass also writes runs after the writers
+        declared before it.
+        
+        Args:
+            name: Pass name
+            reads: Resources the pass samples or reads
+            writes: Resources the pass renders to
+            side_effects: Whether the pass must run although nothing uses its outputs
+        
+        Returns:
+            True if declared, False otherwise
+        """
+        self.passes[name] = GraphPass(name, list(reads or []), list(writes or []), side_effects)
+        self.version += 1
+        return True
+    
+    def remove_pass(self, name: str) -> bool:
+        """Remove a pass.
+        
+        Args:
+            name: Pass name
+        
+        Returns:
+            True if removed, False if not found
+        """
+        if self.passes.pop(name, None) is None:
+            return False
+        self.version += 1
+        return True
+    
+    def set_pass_enabled(self, name: str, enabled: bool) -> bool:
+        """Include or exclude a pass from compilation.
+        
+        Args:
+            name: Pass name
+            enabled: Whether the pass takes part
+        
+        Returns:
+            True if the pass exists, False otherwise
+        """
+        graph_pass = self.passes.get(name)
+        if graph_pass is None:
+            return False
+        if graph_pass.enabled != enabled:
+            graph_pass.enabled = enabled
+            self.version += 1
+        return True
+    
+    def compile(self, width: int, height: int) -> CompiledGraph:
+        """Cull, order and alias the graph for a viewport size.
+        
+        Args:
+            width: Viewport width
+            height: Viewport height
+        
+        Returns:
+            Compiled execution plan
+        """
+        key = (self.version, width, height)
+        if self.compiled is not None and key == self._compiled_key:
+            return self.compiled
+        
+        passes = [graph_pass for graph_pass in self.passes.values() if graph_pass.enabled]
+        for graph_pass in passes:
+            for name in graph_pass.reads + graph_pass.writes:
+                if name not in self.resources:
+                    self.logger.warning(f"Pass {graph_pass.name} uses undeclared resource {name}")
+        
+        dependencies = self._dependencies(passes)
+        live = self._live_passes(passes, dependencies)
+        order = self._schedule(passes, dependencies, live)
+        
+        compiled = CompiledGraph(
+            order=order,
+            culled=[graph_pass.name for graph_pass in passes if graph_pass.name not in live],
+            lifetimes={},
+            aliases={},
+            slots=[]
+        )
+        self._alias(compiled, width, height)
+        
+        self.compiled = compiled
+        self._compiled_key = key
+        self.logger.debug(f"Compiled render graph: {len(order)} passes, {len(compiled.culled)} culled, "
+                          f"{len(compiled.aliases)} transient targets in {len(compiled.slots)} physical targets")
+        return compiled
+    
+    def _dependencies(self, passes: List[GraphPass]) -> Dict[str, set]:
+        """Find the passes each pass must run after."""
+        writers: Dict[str, List[int]] = {}
+        for position, graph_pass in enumerate(passes):
+            for name in graph_pass.writes:
+                writers.setdefault(name, []).append(position)
+        
+        dependencies = {graph_pass.name: set() for graph_pass in passes}
+        for position, graph_pass in enumerate(passes):
+            for name in graph_pass.reads:
+                # The latest writer declared before the reader, else the first declared after it
+                producers = [writer for writer in writers.get(name, []) if writer != position]
+                earlier = [writer for writer in producers if writer < position]
+                if earlier:
+                    dependencies[graph_pass.name].add(passes[earlier[-1]].name)
+                elif producers:
+                    dependencies[graph_pass.name].add(passes[producers[0]].name)
+            for name in graph_pass.writes:
+                # Writes to a shared resource keep their declaration order
+                earlier = [writer for writer in writers[name] if writer < position]
+                if earlier:
+                    dependencies[graph_pass.name].add(passes[earlier[-1]].name)
+        return dependencies
+    
+    def _live_passes(self, passes: List[GraphPass], dependencies: Dict[str, set]) -> set:
+        """Walk back from passes with visible results; everything unreached is culled."""
+        live = set()
+        stack = [
+            graph_pass.name for graph_pass in passes
+            if graph_pass.side_effects or any(self._is_imported(name) for name in graph_pass.writes)
+        ]
+        while stack:
+            name = stack.pop()
+            if name in live:
+                continue
+            live.add(name)
+            stack.extend(dependencies[name])
+        return live
+    
+    def _is_imported(self, name: str) -> bool:
+        """Whether a resource is owned outside the graph."""
+        resource = self.resources.get(name)
+        return resource is not None and resource.imported
+    
+    def _schedule(self, passes: List[GraphPass], dependencies: Dict[str, set], live: set) -> List[str]:
+        """Topologically sort live passes, preferring declaration order."""
+        position = {graph_pass.name: index for index, graph_pass in enumerate(passes)}
+        remaining = {name: len(dependencies[name] & live) for name in live}
+        dependents: Dict[str, List[str]] = {name: [] for name in live}
+        for name in live:
+            for dependency in dependencies[name] & live:
+                dependents[dependency].append(name)
+        
+        ready = [(position[name], name) for name, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, name = heapq.heappop(ready)
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    heapq.heappush(ready, (position[dependent], dependent))
+        
+        if len(order) < len(live):
+            self.logger.error("Render graph has a dependency cycle; using declaration order")
+            order = [graph_pass.name for graph_pass in passes if graph_pass.name in live]
+        return order
+    
+    def _alias(self, compiled: CompiledGraph, width: int, height: int):
+        """Assign transient resources to physical targets by lifetime."""
+        for position, name in enumerate(compiled.order):
+            graph_pass = self.passes[name]
+            for resource_name in graph_pass.reads + graph_pass.writes:
+                resource = self.resources.get(resource_name)
+                if resource is None or resource.imported:
+                    continue
+                first, _ = compiled.lifetimes.get(resource_name, (position, position))
+                compiled.lifetimes[resource_name] = (first, position)
+        
+        # Greedy interval assignment: reuse a same-sized target whose last user already ran
+        free_after: List[int] = []
+        for resource_name, (first, last) in sorted(compiled.lifetimes.items(), key=lambda item: item[1]):
+            resource = self.resources[resource_name]
+            desc = (resource.width or width, resource.height or height, resource.format)
+            size = desc[0] * desc[1] * FORMAT_BYTES[desc[2]]
+            compiled.transient_bytes += size
+            
+            slot = next((index for index, busy in enumerate(free_after)
+                         if busy < first and compiled.slots[index] == desc), None)
+            if slot is None:
+                slot = len(compiled.slots)
+                compiled.slots.append(desc)
+                free_after.append(last)
+                compiled.physical_bytes += size
+            else:
+                free_after[slot] = last
+            compiled.aliases[resource_name] = slot
+    
+    def allocate(self, device) -> bool:
+        """Create the physical targets of the compiled plan, reusing existing ones.
+        
+        Args:
+            device: GraphicsDevice to create targets on
+        
+        Returns:
+            True if all targets exist, False otherwise
+        """
+        if self.compiled is None:
+            return False
+        
+        try:
+            self._device = device
+            
+            # Keep targets whose description still matches a slot, release the rest
+            wanted = list(self.compiled.slots)
+            kept: List[Tuple[Tuple[int, int, str], int]] = [None] * len(wanted)
+            for desc, handle in self._targets:
+                if desc in wanted:
+                    slot = wanted.index(desc)
+                    kept[slot] = (desc, handle)
+                    wanted[slot] = None
+                else:
+                    device.release_render_target(handle)
+            
+            for slot, desc in enumerate(wanted):
+                if desc is not None:
+                    kept[slot] = (desc, device.create_render_target(*desc))
+            self._targets = kept
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Failed to allocate render graph targets: {e}")
+            return False
+    
+    def get_handle(self, name: str) -> Optional[int]:
+        """Get the device handle a resource renders to this frame.
+        
+        Args:
+            name: Resource name
+        
+        Returns:
+            Target handle, or None for the back buffer or an unknown resource
+        """
+        resource = self.resources.get(name)
+        if resource is None:
+            return None
+        if resource.imported:
+            return resource.handle
+        slot = self.compiled.aliases.get(name) if self.compiled else None
+        if slot is None or slot >= len(self._targets):
+            return None
+        return self._targets[slot][1]
+    
+    def get_pass(self, name: str) -> Optional[GraphPass]:
+        """Get a pass by name."""
+        return self.passes.get(name)
+    
+    def release(self):
+        """Release all physical targets."""
+        if self._device is not None:
+            for _, handle in self._targets:
+                self._device.release_render_target(handle)
+        self._targets = []
+        self.compiled = None
+        self._compiled_key = ()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics of the compiled graph.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        compiled = self.compiled
+        if compiled is None:
+            return {"passes": len(self.passes), "executed_passes": 0, "culled_passes": 0,
+                    "transient_targets": 0, "physical_targets": 0, "aliasing_saved_bytes": 0}
+        return {
+            "passes": len(self.passes),
+            "executed_passes": len(compiled.order),
+            "culled_passes": len(compiled.culled),
+            "transient_targets": len(compiled.aliases),
+            "physical_targets": len(compiled.slots),
+            "aliasing_saved_bytes": compiled.transient_bytes - compiled.physical_bytes
+        }
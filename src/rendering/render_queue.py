@@ -0,0 +1,184 @@
+"""
+Render Queue for Nexlify Engine.
+
+This module orders draws with 64-bit sort keys so one argsort yields a
+submission order that minimizes pipeline state changes:
+    
+    opaque:       pass:4 | shader:8 | material:14 | mesh:14 | lod:4 | depth:20
+    transparent:  pass:4 | sorting order:8 | inverted depth:24 | material:14 | mesh:14
+
+Opaque draws are grouped by state and drawn front to back within a
+group; transparent draws are ordered back to front.
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .scene_extraction import FLAG_TRANSPARENT
+from ..utils.logger import get_logger
+
+
+# Pass field values
+PASS_OPAQUE = 0
+PASS_TRANSPARENT = 1
+
+DEFAULT_SHADER = "default"
+
+
+def quantize_depth(distances: np.ndarray, bits: int) -> np.ndarray:
+    """Map distances onto unsigned integers over their own range.
+    
+    Args:
+        distances: Distances to the camera
+        bits: Width of the result
+    
+    Returns:
+        uint64 values in [0, 2**bits - 1], increasing with distance
+    """
+    if not len(distances):
+        return np.zeros(0, dtype=np.uint64)
+    low = distances.min()
+    span = max(float(distances.max() - low), 1e-9)
+    scale = float((1 << bits) - 1)
+    return np.round((distances - low) / span * scale).astype(np.uint64)
+
+
+def _field(values: np.ndarray, bits: int, shift: int) -> np.ndarray:
+    """Pack a field into its key bits; values wider than the field wrap."""
+    return (values.astype(np.uint64) & np.uint64((1 << bits) - 1)) << np.uint64(shift)
+
+
+def make_opaque_keys(shader_ids: np.ndarray, material_ids: np.ndarray, mesh_ids: np.ndarray,
+                     depth: np.ndarray, lod_levels: Optional[np.ndarray] = None) -> np.ndarray:
+    """Build opaque sort keys: state first, then front to back.
+    
+    Args:
+        shader_ids: Shader program per draw
+        material_ids: Material per draw
+        mesh_ids: Mesh per draw
+        depth: 20-bit quantized distance per draw
+        lod_levels: Detail level per draw (defaults to full detail)
+    
+    Returns:
+        uint64 keys
+    """
+    keys = (_field(np.full(len(depth), PASS_OPAQUE), 4, 60) | _field(shader_ids, 8, 52)
+            | _field(material_ids, 14, 38) | _field(mesh_ids, 14, 24) | _field(depth, 20, 0))
+    if lod_levels is not None:
+        keys |= _field(lod_levels, 4, 20)
+    return keys
+
+
+def make_transparent_keys(sorting_orders: np.ndarray, depth: np.ndarray, material_ids: np.ndarray,
+                          mesh_ids: np.ndarray) -> np.ndarray:
+    """Build transparent sort keys: sorting order, then back to front.
+    
+    Args:
+        sorting_orders: Renderer sorting order per draw (-128 to 127)
+        depth: 24-bit quantized distance per draw
+        material_ids: Material per draw
+        mesh_ids: Mesh per draw
+    
+    Returns:
+        uint64 keys
+    """
+    order = np.clip(sorting_orders.astype(np.int64) + 128, 0, 255)
+    inverted = np.uint64((1 << 24) - 1) - depth
+    return (_field(np.full(len(depth), PASS_TRANSPARENT), 4, 60) | _field(order, 8, 52)
+            | _field(inverted, 24, 28) | _field(material_ids, 14, 14) | _field(mesh_ids, 14, 0))
+
+
+class RenderQueue:
+    """Sorts the visible render objects of a frame by their sort keys."""
+    
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        
+        # Shader programs interned to key ids, and the id of each material
+        self.shader_names: List[str] = []
+        self._shader_ids: Dict[str, int] = {}
+        self.material_shaders = np.zeros(0, dtype=np.int64)
+        
+        # Sorted slots and keys of the last build
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.keys = np.zeros(0, dtype=np.uint64)
+        self.order = np.zeros(0, dtype=np.int64)
+        self.opaque_count = 0
+    
+    @property
+    def opaque(self) -> np.ndarray:
+        """Opaque slots in draw order."""
+        return self.indices[:self.opaque_count]
+    
+    @property
+    def transparent(self) -> np.ndarray:
+        """Transparent slots in draw order (back to front)."""
+        return self.indices[self.opaque_count:]
+    
+    def shader_of(self, extractor, index: int) -> str:
+        """Get the shader program of a render object."""
+        return self.shader_names[self.material_shaders[extractor.material_ids[index]]]
+    
+    def _update_material_shaders(self, materials: List[Dict[str, Any]]):
+        """Map each extracted material to its interned shader program id."""
+        ids = []
+        for material in materials:
+            name = material.get("shader", DEFAULT_SHADER)
+            if name not in self._shader_ids:
+                self._shader_ids[name] = len(self.shader_names)
+                self.shader_names.append(name)
+            ids.append(self._shader_ids[name])
+        self.material_shaders = np.array(ids, dtype=np.int64)
+    
+    def build(self, extractor, indices: np.ndarray, distances: np.ndarray,
+              sort_by_distance: bool = True, sort_by_state: bool = True):
+        """Sort visible objects into draw order.
+        
+        Args:
+            extractor: SceneExtractor holding the render objects
+            indices: Visible slots
+            distances: Camera distance of each visible slot
+            sort_by_distance: Whether depth contributes to the keys
+            sort_by_state: Whether shader, material and mesh contribute to opaque keys
+        """
+        self._update_material_shaders(extractor.materials)
+        transparent = (extractor.flags[indices] & FLAG_TRANSPARENT) != 0
+        material_ids = extractor.material_ids[indices]
+        mesh_ids = extractor.mesh_ids[indices]
+        
+        keys = np.empty(len(indices), dtype=np.uint64)
+        opaque = ~transparent
+        if sort_by_distance:
+            opaque_depth = quantize_depth(distances[opaque], 20)
+            transparent_depth = quantize_depth(distances[transparent], 24)
+        else:
+            opaque_depth = np.zeros(int(opaque.sum()), dtype=np.uint64)
+            transparent_depth = np.zeros(int(transparent.sum()), dtype=np.uint64)
+        
+        if sort_by_state:
+            keys[opaque] = make_opaque_keys(self.material_shaders[material_ids[opaque]], material_ids[opaque],
+                                            mesh_ids[opaque], opaque_depth, extractor.lod_levels[indices[opaque]])
+        else:
+            zeros = np.zeros(len(opaque_depth), dtype=np.uint64)
+            keys[opaque] = make_opaque_keys(zeros, zeros, zeros, opaque_depth)
+        keys[transparent] = make_transparent_keys(extractor.sorting_orders[indices[transparent]], transparent_depth,
+                                                  material_ids[transparent], mesh_ids[transparent])
+        
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+        self.indices = indices[self.order]
+        self.opaque_count = int(opaque.sum())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "queued": len(self.indices),
+            "opaque": self.opaque_count,
+            "transparent": len(self.indices) - self.opaque_count,
+            "shader_programs": len(self.shader_names)
+        }
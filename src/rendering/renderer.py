@@ -97,9 +97,10 @@ class Renderer:
             if not self.pipeline.initialize():
                 self.logger.error("Failed to initialize render pipeline")
                 return False
+            self.pipeline.resize_viewport(width, height)
             
             # Initialize scene renderer
-            self.scene_renderer = SceneRenderer(self.device, self.pipeline)
+            self.scene_renderer = SceneRenderer(self.device, self.pipeline, self.resource_manager)
             if not self.scene_renderer.initialize():
                 self.logger.error("Failed to initialize scene renderer")
                 return False
@@ -143,6 +144,10 @@ class Renderer:
         if not self.is_initialized:
             return False
         
+        # The previous frame may still be rendering on the scene renderer's render thread
+        if self.scene_renderer:
+            self.scene_renderer.wait_for_frame()
+        
         # Begin device frame
         if not self.device.begin_frame():
             return False
@@ -7,17 +7,26 @@ including textures, meshes, and other assets.
 
 import os
 import logging
-from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass
+import itertools
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from PIL import Image
 import numpy as np
 
 from .device import GraphicsDevice
+from ..asset.mesh_loader import load_mesh_file, MeshData, MESH_EXTENSIONS, VERTEX_STRIDE
+from ..asset.nxmesh import load_or_compile, read_nxmesh
+from .primitives import PrimitiveGenerator
 from ..utils.logger import get_logger
 
 
+# Meshes up to this size keep their CPU data so they can be merged into static batches
+CPU_MESH_MAX_VERTICES = 4096
+
+
 @dataclass
 class TextureInfo:
     """Texture information."""
@@ -36,6 +45,24 @@ class MeshInfo:
     vertex_buffer: int
     index_buffer: int
     material_count: int
+    bounds_min: Tuple[float, float, float] = (-1.0, -1.0, -1.0)
+    bounds_max: Tuple[float, float, float] = (1.0, 1.0, 1.0)
+    mesh_data: Optional[MeshData] = field(default=None, compare=False, repr=False)
+    
+    # Coarser detail levels, finest first, and their simplification errors
+    lods: List["MeshInfo"] = field(default_factory=list, compare=False, repr=False)
+    lod_errors: List[float] = field(default_factory=list, compare=False, repr=False)
+    
+    @property
+    def lod_count(self) -> int:
+        """Number of detail levels, including the full-detail mesh."""
+        return len(self.lods) + 1
+    
+    def get_lod(self, level: int) -> "MeshInfo":
+        """Get a detail level, clamped to the coarsest available."""
+        if level <= 0 or not self.lods:
+            return self
+        return self.lods[min(level, len(self.lods)) - 1]
 
 
 class ResourceManager:
@@ -51,6 +78,10 @@ class ResourceManager:
         self.meshes: Dict[str, MeshInfo] = {}
         self.materials: Dict[str, Dict[str, Any]] = {}
         
+        # Procedural meshes, and their uploads keyed by shape parameters (LRU, bounded like the generator)
+        self.primitives = PrimitiveGenerator()
+        self.primitive_meshes: OrderedDict = OrderedDict()
+        
         # Asset paths
         self.asset_paths: List[str] = [
             "assets/textures",
@@ -173,19 +204,8 @@ class ResourceManager:
             ], dtype=np.uint32)
             
             # Create GPU buffers
-            vertex_buffer = self.device.create_buffer(
-                vertices.nbytes, "vertex", vertices.tobytes()
-            )
-            index_buffer = self.device.create_buffer(
-                indices.nbytes, "index", indices.tobytes()
-            )
-            
-            self.meshes["default_cube"] = MeshInfo(
-                vertex_count=24,
-                index_count=36,
-                vertex_buffer=vertex_buffer,
-                index_buffer=index_buffer,
-                material_count=1
+            self.meshes["default_cube"] = self._upload_mesh(
+                MeshData(vertices.reshape(-1, VERTEX_STRIDE), indices)
             )
             
             self.logger.debug("Created default cube mesh")
@@ -196,68 +216,52 @@ class ResourceManager:
     def _create_default_sphere(self):
         """Create a default sphere mesh."""
         try:
-            # Generate sphere vertices and indices
-            segments = 32
-            rings = 16
-            
-            vertices = []
-            indices = []
-            
-            # Generate vertices
-            for ring in range(rings + 1):
-                v = ring / rings
-                phi = v * np.pi
-                
-                for segment in range(segments + 1):
-                    u = segment / segments
-                    theta = u * 2.0 * np.pi
-                    
-                    x = np.cos(theta) * np.sin(phi)
-                    y = np.cos(phi)
-                    z = np.sin(theta) * np.sin(phi)
-                    
-                    # Position
-                    vertices.extend([x, y, z])
-                    # Normal (same as position for unit sphere)
-                    vertices.extend([x, y, z])
-                    # UV
-                    vertices.extend([u, v])
-            
-            # Generate indices
-            for ring in range(rings):
-                for segment in range(segments):
-                    current = ring * (segments + 1) + segment
-                    next_ring = current + segments + 1
-                    
-                    indices.extend([
-                        current, next_ring, current + 1,
-                        current + 1, next_ring, next_ring + 1
-                    ])
-            
-            vertices_array = np.array(vertices, dtype=np.float32)
-            indices_array = np.array(indices, dtype=np.uint32)
-            
-            # Create GPU buffers
-            vertex_buffer = self.device.create_buffer(
-                vertices_array.nbytes, "vertex", vertices_array.tobytes()
-            )
-            index_buffer = self.device.create_buffer(
-                indices_array.nbytes, "index", indices_array.tobytes()
-            )
-            
-            self.meshes["default_sphere"] = MeshInfo(
-                vertex_count=len(vertices) // 8,  # 8 floats per vertex
-                index_count=len(indices),
-                vertex_buffer=vertex_buffer,
-                index_buffer=index_buffer,
-                material_count=1
-            )
+            self.meshes["default_sphere"] = self._upload_mesh(self.primitives.sphere(1.0, 32, 16))
             
             self.logger.debug("Created default sphere mesh")
             
         except Exception as e:
             self.logger.error(f"Failed to create default sphere: {e}")
     
+    def create_primitive(self, name: str, kind: str, **params) -> bool:
+        """Create a procedural mesh.
+        
+        Meshes with the same shape and parameters share their GPU buffers,
+        so regenerating an unchanged primitive does not upload it again.
+        Uploads evicted from the bounded cache, and meshes replaced under
+        the same name, are freed once no mesh name refers to them.
+        
+        Args:
+            name: Mesh name
+            kind: Primitive type ("sphere", "capsule", "cylinder", "plane", "torus" or "icosphere")
+            **params: Shape parameters, such as radius and resolution
+            
+        Returns:
+            True if mesh created successfully, False otherwise
+        """
+        try:
+            key = self.primitives.make_key(kind, **params)
+            mesh_info = self.primitive_meshes.get(key)
+            if mesh_info is None:
+                mesh_info = self._upload_mesh(self.primitives.generate(kind, **params))
+                self.primitive_meshes[key] = mesh_info
+            else:
+                self.primitive_meshes.move_to_end(key)
+            
+            previous = self.meshes.get(name)
+            self.meshes[name] = mesh_info
+            
+            while len(self.primitive_meshes) > self.primitives.max_cached:
+                _, evicted = self.primitive_meshes.popitem(last=False)
+                self._release_if_unused(evicted)
+            if previous is not None and previous is not mesh_info:
+                self._release_if_unused(previous)
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to create {kind} mesh {name}: {e}")
+            return False
+    
     def load_texture(self, name: str, path: str) -> bool:
         """Load a texture from file.
         
@@ -316,18 +320,105 @@ class ResourceManager:
                 self.logger.error(f"Mesh file not found: {path}")
                 return False
             
-            # TODO: Implement actual mesh loading
-            # This would involve:
-            # - Loading .obj, .fbx, .gltf files
-            # - Parsing vertex data
-            # - Creating GPU buffers
+            # Source meshes go through their compiled cache; anything else is parsed
+            extension = Path(path).suffix.lower()
+            if extension in MESH_EXTENSIONS or extension == '.nxmesh':
+                compiled = load_or_compile(path) if extension != '.nxmesh' else read_nxmesh(path)
+                mesh = compiled.mesh
+                lods = list(zip(compiled.lods[1:], compiled.lod_errors[1:]))
+            else:
+                mesh = load_mesh_file(path)
+                lods = []
+            self.meshes[name] = self._upload_mesh(mesh, lods)
+            
+            self.logger.info(f"Loaded mesh: {name} ({mesh.vertex_count} vertices, {mesh.index_count // 3} triangles)")
+            return True
             
-            self.logger.warning(f"Mesh loading not implemented yet: {path}")
+        except Exception as e:
+            self.logger.error(f"Failed to load mesh {name}: {e}")
             return False
+    
+    def add_mesh(self, name: str, mesh: MeshData, lods: Sequence[Tuple[MeshData, float]] = ()) -> bool:
+        """Upload a mesh built at runtime.
+        
+        Args:
+            name: Mesh name
+            mesh: Mesh with interleaved vertices and indices
+            lods: Coarser (mesh, error) detail levels, finest first
+            
+        Returns:
+            True if mesh uploaded successfully, False otherwise
+        """
+        try:
+            self.meshes[name] = self._upload_mesh(mesh, lods)
+            return True
             
         except Exception as e:
-            self.logger.error(f"Failed to load mesh {name}: {e}")
+            self.logger.error(f"Failed to add mesh {name}: {e}")
+            return False
+    
+    def remove_mesh(self, name: str) -> bool:
+        """Remove a mesh and free its GPU buffers.
+        
+        Args:
+            name: Mesh name
+            
+        Returns:
+            True if the mesh existed, False otherwise
+        """
+        mesh_info = self.meshes.pop(name, None)
+        if mesh_info is None:
             return False
+        
+        self._release_if_unused(mesh_info)
+        return True
+    
+    def _release_if_unused(self, mesh_info: MeshInfo):
+        """Free a mesh's GPU buffers unless a mesh name or the primitive cache still uses them.
+        
+        Args:
+            mesh_info: Mesh that was dropped
+        """
+        # Primitive meshes share buffers between names
+        shared = itertools.chain(self.primitive_meshes.values(), self.meshes.values())
+        if any(other is mesh_info for other in shared):
+            return
+        
+        for level in [mesh_info] + mesh_info.lods:
+            self.device.release_buffer(level.vertex_buffer)
+            self.device.release_buffer(level.index_buffer)
+    
+    def _upload_mesh(self, mesh: MeshData, lods: Sequence[Tuple[MeshData, float]] = ()) -> MeshInfo:
+        """Create GPU buffers for a mesh and its detail levels.
+        
+        Args:
+            mesh: Mesh with interleaved vertices and indices
+            lods: Coarser (mesh, error) detail levels, finest first
+            
+        Returns:
+            Mesh information
+        """
+        # The arrays are contiguous, so their memory is handed over without a copy
+        vertex_buffer = self.device.create_buffer(
+            mesh.vertices.nbytes, "vertex", mesh.vertices.data
+        )
+        index_buffer = self.device.create_buffer(
+            mesh.indices.nbytes, "index", mesh.indices.data
+        )
+        
+        bounds_min, bounds_max = mesh.get_bounds()
+        return MeshInfo(
+            vertex_count=mesh.vertex_count,
+            index_count=mesh.index_count,
+            vertex_buffer=vertex_buffer,
+            index_buffer=index_buffer,
+            material_count=max(len(mesh.submeshes), 1),
+            bounds_min=tuple(bounds_min.tolist()),
+            bounds_max=tuple(bounds_max.tolist()),
+            mesh_data=mesh if mesh.vertex_count <= CPU_MESH_MAX_VERTICES else None,
+            lods=[self._upload_mesh(lod) for lod, _ in lods],
+            lod_errors=[error for _, error in lods]
+        )
     
     def get_texture(self, name: str) -> Optional[TextureInfo]:
         """Get a texture by name.
@@ -398,6 +489,8 @@ class ResourceManager:
         self.textures.clear()
         self.meshes.clear()
         self.materials.clear()
+        self.primitives.clear_cache()
+        self.primitive_meshes.clear()
         self.logger.info("Resource cache cleared")
     
     def shutdown(self):
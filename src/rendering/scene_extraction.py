@@ -0,0 +1,413 @@
+"""
+Scene Extraction for Nexlify Engine.
+
+This module turns the scene graph into flat arrays the renderer can cull,
+sort and submit without touching GameObjects. Every enabled MeshRenderer
+owns a slot in preallocated arrays (world matrix, world bounds, mesh and
+material ids, layer, flags and sort key) that persist across frames.
+
+Extraction is incremental. The scene is walked only when its structure
+changes, and only slots whose world matrix or renderer settings changed
+are rewritten. A frame in which nothing moved costs two comparisons.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from ..core.components import MeshRenderer, Light
+from ..core.game_object import GameObject, Transform
+from ..utils.logger import get_logger
+
+
+# Per-object flag bits
+FLAG_VISIBLE = 1
+FLAG_CAST_SHADOWS = 2
+FLAG_RECEIVE_SHADOWS = 4
+FLAG_TRANSPARENT = 8
+
+# Mesh drawn by renderers with no mesh path
+DEFAULT_MESH = "default_cube"
+DEFAULT_MATERIAL = "default_material"
+
+# Lights shine along their local -Z axis
+LIGHT_FORWARD = np.array([0.0, 0.0, -1.0])
+
+_LIGHT_TYPES = {"point": "point", "directional": "directional", "spot": "spot", "area": "point"}
+
+
+@dataclass
+class LightInfo:
+    """Light information for rendering."""
+    position: Tuple[float, float, float]
+    direction: Tuple[float, float, float]
+    color: Tuple[float, float, float]
+    intensity: float
+    light_type: str  # "directional", "point", "spot"
+    range: float = 10.0
+    spot_angle: float = 45.0
+
+
+class SceneExtractor:
+    """Incrementally mirrors scene renderers into packed arrays."""
+    
+    def __init__(self, resource_manager=None, capacity: int = 256):
+        self.resource_manager = resource_manager
+        self.logger = get_logger(__name__)
+        
+        # Extracted renderers, packed in slots [0, count)
+        self.renderers: List[MeshRenderer] = []
+        self._slot_by_renderer: Dict[int, int] = {}
+        self._slot_keys: List[Optional[tuple]] = []
+        
+        # Per-slot render data
+        self.world_matrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.bounds_min = np.zeros((capacity, 3), dtype=np.float32)
+        self.bounds_max = np.zeros((capacity, 3), dtype=np.float32)
+        self.bounds_center = np.zeros((capacity, 3), dtype=np.float32)
+        self.bounds_radius = np.zeros(capacity, dtype=np.float32)
+        self.mesh_ids = np.zeros(capacity, dtype=np.int32)
+        self.material_ids = np.zeros(capacity, dtype=np.int32)
+        self.layers = np.zeros(capacity, dtype=np.int32)
+        self.sorting_orders = np.zeros(capacity, dtype=np.int32)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.sort_keys = np.zeros(capacity, dtype=np.uint64)
+        
+        # Detail level drawn for each slot, kept across frames for hysteresis
+        self.lod_levels = np.zeros(capacity, dtype=np.uint8)
+        
+        # Interned meshes and materials; ids index these lists
+        self.meshes: List[Any] = []
+        self.materials: List[Dict[str, Any]] = []
+        self._mesh_ids: Dict[str, int] = {}
+        self._material_ids: Dict[str, int] = {}
+        self._mesh_bounds = np.zeros((0, 2, 3), dtype=np.float64)
+        self.mesh_lod_counts = np.zeros(0, dtype=np.int32)
+        
+        # Extracted lights, rebuilt when any of them changes
+        self.light_components: List[Light] = []
+        self.lights: List[LightInfo] = []
+        self._light_keys: Optional[List[tuple]] = None
+        
+        # Change detection
+        self._structure_key: tuple = ()
+        self._change_key: tuple = ()
+        
+        # Bumped when slots are added or removed, and when slot bounds change
+        self.layout_version = 0
+        self.bounds_version = 0
+        
+        # Slots rewritten by the last extract
+        self.changed_slots = np.zeros(0, dtype=np.int64)
+        
+        # Performance tracking
+        self.last_extracted = 0
+        self.total_extracted = 0
+        self.scene_walks = 0
+    
+    _SLOT_ARRAYS = ('world_matrices', 'bounds_min', 'bounds_max', 'bounds_center', 'bounds_radius',
+                    'mesh_ids', 'material_ids', 'layers', 'sorting_orders', 'flags', 'sort_keys',
+                    'lod_levels')
+    
+    @property
+    def count(self) -> int:
+        """Number of extracted renderers."""
+        return len(self.renderers)
+    
+    def slot_of(self, renderer: MeshRenderer) -> Optional[int]:
+        """Get the slot of an extracted renderer, or None."""
+        return self._slot_by_renderer.get(id(renderer))
+    
+    def extract(self, scene) -> int:
+        """Bring the arrays up to date with a scene.
+        
+        Args:
+            scene: Scene to extract
+        
+        Returns:
+            Number of renderer slots rewritten
+        """
+        self.last_extracted = 0
+        self.changed_slots = np.zeros(0, dtype=np.int64)
+        structure_key = (id(scene), scene.version, GameObject.structure_version)
+        change_key = (Transform.changes, MeshRenderer.changes, GameObject.layer_changes)
+        if structure_key == self._structure_key and change_key == self._change_key:
+            return 0
+        
+        if structure_key != self._structure_key:
+            self._walk_scene(scene)
+            self._structure_key = structure_key
+        self._change_key = change_key
+        
+        # Rewrite slots whose world matrix, renderer or layer changed
+        changed = []
+        for slot, renderer in enumerate(self.renderers):
+            game_object = renderer.game_object
+            game_object.get_world_matrix()
+            key = (game_object.world_version, renderer.revision, game_object.layer)
+            if key != self._slot_keys[slot]:
+                self._slot_keys[slot] = key
+                changed.append(slot)
+        
+        if changed:
+            self.changed_slots = np.array(changed, dtype=np.int64)
+            self._write_slots(self.changed_slots)
+        self._extract_lights()
+        
+        self.last_extracted = len(changed)
+        self.total_extracted += len(changed)
+        return len(changed)
+    
+    def _walk_scene(self, scene):
+        """Collect the enabled renderers and lights of active objects."""
+        renderers = []
+        lights = []
+        stack = list(reversed(scene.root_objects))
+        while stack:
+            game_object = stack.pop()
+            if not game_object.active:
+                continue
+            for component in game_object.components:
+                if not component.enabled:
+                    continue
+                if isinstance(component, MeshRenderer):
+                    renderers.append(component)
+                elif isinstance(component, Light):
+                    lights.append(component)
+            stack.extend(reversed(game_object.children))
+        
+        # Drop renderers that left, then add the new ones
+        present = {id(renderer) for renderer in renderers}
+        for renderer in list(self.renderers):
+            if id(renderer) not in present:
+                self._remove_slot(self._slot_by_renderer[id(renderer)])
+        for renderer in renderers:
+            if id(renderer) not in self._slot_by_renderer:
+                self._add_slot(renderer)
+        
+        if lights != self.light_components:
+            self.light_components = lights
+            self._light_keys = None
+        
+        self.scene_walks += 1
+    
+    def _add_slot(self, renderer: MeshRenderer):
+        """Append a renderer; its data is written on the next pass."""
+        slot = self.count
+        if slot == len(self.flags):
+            self._grow(max(slot * 2, 16))
+        self.renderers.append(renderer)
+        self._slot_keys.append(None)
+        self.lod_levels[slot] = 0
+        self._slot_by_renderer[id(renderer)] = slot
+        self.layout_version += 1
+    
+    def _remove_slot(self, slot: int):
+        """Remove a renderer by moving the last slot into its place."""
+        renderer = self.renderers[slot]
+        del self._slot_by_renderer[id(renderer)]
+        
+        last = self.count - 1
+        if slot != last:
+            moved = self.renderers[last]
+            self.renderers[slot] = moved
+            self._slot_keys[slot] = self._slot_keys[last]
+            self._slot_by_renderer[id(moved)] = slot
+            for name in self._SLOT_ARRAYS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+        
+        self.renderers.pop()
+        self._slot_keys.pop()
+        self.flags[last] = 0
+        self.layout_version += 1
+        self.bounds_version += 1
+    
+    def _write_slots(self, slots: np.ndarray):
+        """Recompute the render data of the given slots."""
+        renderers = [self.renderers[slot] for slot in slots.tolist()]
+        matrices = np.array([renderer.game_object.get_world_matrix() for renderer in renderers])
+        mesh_ids = np.array([self._mesh_id(renderer.mesh_path) for renderer in renderers], dtype=np.int32)
+        material_ids = np.array([self._material_id(renderer.material_path) for renderer in renderers], dtype=np.int32)
+        
+        flags = np.array([
+            (FLAG_VISIBLE if renderer.visible else 0)
+            | (FLAG_CAST_SHADOWS if renderer.cast_shadows else 0)
+            | (FLAG_RECEIVE_SHADOWS if renderer.receive_shadows else 0)
+            for renderer in renderers
+        ], dtype=np.uint8)
+        transparent = np.array([self.materials[material_id]["transparent"] for material_id in material_ids.tolist()], dtype=bool)
+        flags[transparent] |= FLAG_TRANSPARENT
+        
+        # World AABB of the transformed local box, and the sphere around it
+        local = self._mesh_bounds[mesh_ids]
+        local_center = (local[:, 0] + local[:, 1]) * 0.5
+        local_extent = (local[:, 1] - local[:, 0]) * 0.5
+        rotation = matrices[:, :3, :3]
+        center = np.einsum('nij,nj->ni', rotation, local_center) + matrices[:, :3, 3]
+        extent = np.einsum('nij,nj->ni', np.abs(rotation), local_extent)
+        
+        self.world_matrices[slots] = matrices
+        self.bounds_min[slots] = center - extent
+        self.bounds_max[slots] = center + extent
+        self.bounds_center[slots] = center
+        self.bounds_radius[slots] = np.linalg.norm(extent, axis=1)
+        self.mesh_ids[slots] = mesh_ids
+        self.material_ids[slots] = material_ids
+        self.layers[slots] = [renderer.game_object.layer for renderer in renderers]
+        self.sorting_orders[slots] = [renderer.sorting_order for renderer in renderers]
+        self.flags[slots] = flags
+        self.lod_levels[slots] = np.minimum(self.lod_levels[slots], self.mesh_lod_counts[mesh_ids] - 1)
+        self._update_sort_keys(slots)
+        self.bounds_version += 1
+    
+    def _update_sort_keys(self, slots: np.ndarray):
+        """Pack material, detail level and mesh into the instancing keys of slots."""
+        self.sort_keys[slots] = ((self.material_ids[slots].astype(np.uint64) << np.uint64(32))
+                                 | (self.lod_levels[slots].astype(np.uint64) << np.uint64(24))
+                                 | self.mesh_ids[slots].astype(np.uint64))
+    
+    def set_lod_levels(self, slots: np.ndarray, levels: np.ndarray):
+        """Change the detail level drawn for slots.
+        
+        Args:
+            slots: Slots to update
+            levels: New detail level of each slot
+        """
+        if not len(slots):
+            return
+        self.lod_levels[slots] = levels
+        self._update_sort_keys(slots)
+    
+    def _extract_lights(self):
+        """Rebuild the light list if any light moved or changed."""
+        keys = []
+        for light in self.light_components:
+            game_object = light.game_object
+            game_object.get_world_matrix()
+            keys.append((game_object.world_version, light.revision))
+        if keys == self._light_keys:
+            return
+        self._light_keys = keys
+        
+        self.lights = []
+        for light in self.light_components:
+            matrix = light.game_object.get_world_matrix()
+            direction = matrix[:3, :3] @ LIGHT_FORWARD
+            length = np.linalg.norm(direction)
+            if length > 0.0:
+                direction /= length
+            self.lights.append(LightInfo(
+                position=tuple(matrix[:3, 3].tolist()),
+                direction=tuple(direction.tolist()),
+                color=tuple(light.color),
+                intensity=light.intensity,
+                light_type=_LIGHT_TYPES.get(light.light_type.lower(), "point"),
+                range=light.range,
+                spot_angle=light.spot_angle
+            ))
+    
+    def _mesh_id(self, mesh_path: str) -> int:
+        """Intern a mesh, loading it through the resource manager if needed."""
+        name = mesh_path or DEFAULT_MESH
+        mesh_id = self._mesh_ids.get(name)
+        if mesh_id is not None:
+            return mesh_id
+        
+        mesh_info = None
+        if self.resource_manager is not None:
+            mesh_info = self.resource_manager.get_mesh(name)
+            if mesh_info is None and os.path.isfile(name) and self.resource_manager.load_mesh(name, name):
+                mesh_info = self.resource_manager.get_mesh(name)
+        if mesh_info is None:
+            self.logger.warning(f"Mesh not available for rendering: {name}")
+        
+        bounds = np.array([
+            mesh_info.bounds_min if mesh_info else (-1.0, -1.0, -1.0),
+            mesh_info.bounds_max if mesh_info else (1.0, 1.0, 1.0)
+        ], dtype=np.float64)
+        
+        mesh_id = len(self.meshes)
+        self.meshes.append(mesh_info)
+        self._mesh_ids[name] = mesh_id
+        self._mesh_bounds = np.concatenate((self._mesh_bounds, bounds[None]))
+        self.mesh_lod_counts = np.append(self.mesh_lod_counts, np.int32(mesh_info.lod_count if mesh_info else 1))
+        return mesh_id
+    
+    def _material_id(self, material_path: str) -> int:
+        """Intern a material."""
+        name = material_path or DEFAULT_MATERIAL
+        material_id = self._material_ids.get(name)
+        if material_id is not None:
+            return material_id
+        
+        properties = None
+        if self.resource_manager is not None:
+            properties = self.resource_manager.get_material(name)
+        material = dict(properties or {})
+        material.setdefault("name", name)
+        material["transparent"] = bool(
+            material.get("transparent") or material.get("blend_mode") in ("alpha", "additive")
+        )
+        texture = material.get("texture")
+        if texture and self.resource_manager is not None:
+            texture_info = self.resource_manager.get_texture(texture)
+            material["texture_handle"] = texture_info.handle if texture_info else None
+        
+        material_id = len(self.materials)
+        self.materials.append(material)
+        self._material_ids[name] = material_id
+        return material_id
+    
+    def refresh_resources(self):
+        """Re-resolve meshes and materials, e.g. after assets were reloaded."""
+        self.meshes.clear()
+        self.materials.clear()
+        self._mesh_ids.clear()
+        self._material_ids.clear()
+        self._mesh_bounds = np.zeros((0, 2, 3), dtype=np.float64)
+        self.mesh_lod_counts = np.zeros(0, dtype=np.int32)
+        self._slot_keys = [None] * self.count
+        self._change_key = ()
+    
+    def _grow(self, capacity: int):
+        """Enlarge the slot arrays."""
+        for name in self._SLOT_ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+    
+    def clear(self):
+        """Forget all extracted data."""
+        self.renderers.clear()
+        self._slot_by_renderer.clear()
+        self._slot_keys.clear()
+        self.flags[:] = 0
+        self.layout_version += 1
+        self.light_components = []
+        self.lights = []
+        self._light_keys = []
+        self._structure_key = ()
+        self._change_key = ()
+        self.refresh_resources()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get extraction statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "render_objects": self.count,
+            "lights": len(self.lights),
+            "meshes": len(self.meshes),
+            "materials": len(self.materials),
+            "last_extracted": self.last_extracted,
+            "total_extracted": self.total_extracted,
+            "scene_walks": self.scene_walks,
+            "capacity": len(self.flags)
+        }
@@ -10,12 +10,24 @@ This module handles rendering of 3D scenes including:
 
 import logging
 import math
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
-from .device import GraphicsDevice
-from .pipeline import RenderPipeline
+import numpy as np
+
+from .device import GraphicsDevice, GraphicsAPI
+from .pipeline import RenderPipeline, PipelineState
 from .resources import ResourceManager
+from .scene_extraction import SceneExtractor, LightInfo, FLAG_VISIBLE
+from .culling import FrustumCuller, frustum_planes
+from .batching import StaticBatcher, StaticBatch
+from .lod import LODSelector
+from .light_clustering import LightClusterer
+from .occlusion import OcclusionCuller
+from .render_queue import RenderQueue
+from .command_list import (CommandList, CommandRecorder, BLEND_MODES, CMD_SET_STATE, CMD_DRAW,
+                           CMD_DRAW_INSTANCED, CMD_DRAW_STATIC_BATCH)
 from ..utils.logger import get_logger
 
 
@@ -29,18 +41,6 @@ class RenderObject:
     layer: int = 0
 
 
-@dataclass
-class LightInfo:
-    """Light information for rendering."""
-    position: Tuple[float, float, float]
-    direction: Tuple[float, float, float]
-    color: Tuple[float, float, float]
-    intensity: float
-    light_type: str  # "directional", "point", "spot"
-    range: float = 10.0
-    spot_angle: float = 45.0
-
-
 @dataclass
 class SceneRenderStats:
     """Scene rendering statistics."""
@@ -48,32 +48,69 @@ class SceneRenderStats:
     triangles: int = 0
     vertices: int = 0
     culled_objects: int = 0
+    occluded_objects: int = 0
     lights_processed: int = 0
+    instanced_draws: int = 0
+    static_batch_draws: int = 0
 
 
 class SceneRenderer:
     """Renders 3D scenes with lighting and materials."""
     
-    def __init__(self, device: GraphicsDevice, pipeline: RenderPipeline):
+    def __init__(self, device: GraphicsDevice, pipeline: RenderPipeline,
+                 resource_manager: Optional[ResourceManager] = None):
         self.device = device
         self.pipeline = pipeline
+        self.resource_manager = resource_manager
         self.logger = get_logger(__name__)
         self.is_initialized = False
         
         # Rendering state
         self.current_scene = None
         self.current_camera = None
-        self.render_objects: List[RenderObject] = []
         self.lights: List[LightInfo] = []
         
+        # Point and spot lights binned into view-space clusters for shading
+        self.light_clusterer = LightClusterer()
+        
+        # Render objects live in the extractor's arrays; passes work on slot indices
+        self.extractor = SceneExtractor(resource_manager)
+        self.visible_indices = np.zeros(0, dtype=np.int64)
+        self.distances = np.zeros(0, dtype=np.float32)
+        
+        # Batching: instancing per frame, static batches built on request
+        self.static_batcher = StaticBatcher(resource_manager)
+        self.visible_batches: List[StaticBatch] = []
+        self.instancing_enabled = True
+        
         # Culling
+        self.culler = FrustumCuller()
+        self.occlusion_culler = OcclusionCuller()
         self.frustum_culling_enabled = True
         self.occlusion_culling_enabled = False
         
+        # Detail levels by projected screen size
+        self.lod_selector = LODSelector()
+        self.lod_enabled = True
+        
         # Sorting
+        self.render_queue = RenderQueue()
         self.sort_by_distance = True
         self.sort_by_material = True
         
+        # Pipeline states by (blend mode, shader program), reused across frames
+        self._pipeline_states: Dict[Tuple[str, str], PipelineState] = {}
+        
+        # Command lists recorded on worker threads, by pass
+        self.recorder = CommandRecorder()
+        self._recorded: Dict[str, List[Future]] = {}
+        
+        # Software frames can rasterize on a render thread while the next frame simulates
+        self.async_submission = False
+        self._frame_executor: Optional[ThreadPoolExecutor] = None
+        self._frame_future: Optional[Future] = None
+        self._completed_stats = SceneRenderStats()
+        
         # Performance tracking
         self.stats = SceneRenderStats()
         
@@ -111,8 +148,12 @@ class SceneRenderer:
             return
         
         try:
+            # The previous frame may still be rasterizing on the render thread
+            self.wait_for_frame()
+            
             self.current_scene = scene
             self.current_camera = camera
+            self.pipeline.set_camera(camera)
             
             # Reset stats
             self.stats = SceneRenderStats()
@@ -126,57 +167,109 @@ class SceneRenderer:
             # Perform culling
             if self.frustum_culling_enabled:
                 self._frustum_cull()
+            if self.occlusion_culling_enabled:
+                self._occlusion_cull()
+            
+            # Pick detail levels of the visible objects
+            self._select_lods()
             
             # Sort objects for optimal rendering
             self._sort_objects()
             
-            # Render all passes
-            self.pipeline.render_all_passes(self._render_pass)
+            # Everything after this point reads only extracted data, not the scene
+            if self._submits_async():
+                if self._frame_executor is None:
+                    self._frame_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+                self._frame_future = self._frame_executor.submit(self._submit_frame, self.stats)
+            else:
+                self._submit_frame(self.stats)
             
         except Exception as e:
             self.logger.error(f"Error rendering scene: {e}", exc_info=True)
     
+    def _submits_async(self) -> bool:
+        """Whether frames are submitted on the render thread.
+        
+        Only the software backend is thread-agnostic; GPU backends submit
+        on the thread owning the device.
+        """
+        return self.async_submission and self.device.api == GraphicsAPI.SOFTWARE
+    
+    def _submit_frame(self, stats: SceneRenderStats):
+        """Record command lists and render all passes.
+        
+        Args:
+            stats: Statistics of the frame being submitted
+        """
+        try:
+            self._record_commands()
+            self.pipeline.render_all_passes(self._render_pass)
+            self._completed_stats = stats
+            
+        except Exception as e:
+            self.logger.error(f"Error submitting frame: {e}", exc_info=True)
+    
+    def wait_for_frame(self):
+        """Block until the frame submitted on the render thread is complete."""
+        future, self._frame_future = self._frame_future, None
+        if future is not None:
+            future.result()
+    
+    def _record_commands(self):
+        """Start recording the sorted queue into command lists on worker threads."""
+        queue = self.render_queue
+        self.recorder.reset_stats()
+        
+        # The few static batches are recorded here, ahead of the opaque queue
+        batches = CommandList(max(2 * len(self.visible_batches), 1))
+        for position, batch in enumerate(self.visible_batches):
+            batches.append(CMD_SET_STATE, BLEND_MODES.index("opaque"), int(queue.material_shaders[batch.material_id]))
+            batches.append(CMD_DRAW_STATIC_BATCH, position)
+        recorded_batches = Future()
+        recorded_batches.set_result(batches)
+        
+        self._recorded = {
+            "static_batches": [recorded_batches],
+            "opaque": self.recorder.record("opaque", self.extractor, queue.material_shaders, queue.opaque,
+                                           BLEND_MODES.index("opaque"), self.instancing_enabled),
+            "transparent": self.recorder.record("transparent", self.extractor, queue.material_shaders,
+                                                queue.transparent, BLEND_MODES.index("alpha"), False)
+        }
+    
+    def _submit(self, futures: List[Future]):
+        """Execute recorded command lists in order.
+        
+        Args:
+            futures: Command lists of a pass, as returned by the recorder
+        """
+        shader_names = self.render_queue.shader_names
+        for future in futures:
+            command_list = future.result()
+            for opcode, a, b, c in command_list.view().tolist():
+                if opcode == CMD_SET_STATE:
+                    self._set_pass_state(BLEND_MODES[a], shader_names[b])
+                elif opcode == CMD_DRAW:
+                    self._render_object(a)
+                elif opcode == CMD_DRAW_INSTANCED:
+                    self._render_instances(a, b, c)
+                elif opcode == CMD_DRAW_STATIC_BATCH:
+                    self._render_static_batch(self.visible_batches[a])
+            self.recorder.count_commands([command_list])
+    
     def _extract_render_objects(self, scene):
         """Extract renderable objects from scene."""
         try:
-            self.render_objects.clear()
-            
-            # TODO: Extract objects from scene
-            # This would involve:
-            # - Iterating through scene game objects
-            # - Finding objects with mesh renderer components
-            # - Calculating transform matrices
-            # - Computing distance to camera
-            
-            # For now, create some mock objects
-            from .resources import MeshInfo
-            
-            # Mock cube
-            cube_mesh = MeshInfo(
-                vertex_count=24,
-                index_count=36,
-                vertex_buffer=1,
-                index_buffer=1,
-                material_count=1
-            )
+            changed = self.extractor.extract(scene)
             
-            cube_transform = [
-                [1.0, 0.0, 0.0, 0.0],
-                [0.0, 1.0, 0.0, 0.0],
-                [0.0, 0.0, 1.0, 0.0],
-                [0.0, 0.0, 0.0, 1.0]
-            ]
-            
-            render_object = RenderObject(
-                mesh_info=cube_mesh,
-                material_info={"name": "default_material"},
-                transform_matrix=cube_transform,
-                distance_to_camera=5.0
-            )
-            
-            self.render_objects.append(render_object)
+            # Everything visible is a candidate until culling narrows it down
+            count = self.extractor.count
+            visible = (self.extractor.flags[:count] & FLAG_VISIBLE) != 0
+            if self.static_batcher.batches:
+                visible &= ~self.static_batcher.batched_mask(self.extractor)
+            self.visible_indices = np.flatnonzero(visible)
+            self.visible_batches = list(self.static_batcher.batches)
             
-            self.logger.debug(f"Extracted {len(self.render_objects)} render objects")
+            self.logger.debug(f"Extracted {count} render objects ({changed} updated)")
             
         except Exception as e:
             self.logger.error(f"Error extracting render objects: {e}")
@@ -184,24 +277,18 @@ class SceneRenderer:
     def _extract_lights(self, scene):
         """Extract lights from scene."""
         try:
-            self.lights.clear()
-            
-            # TODO: Extract lights from scene
-            # This would involve:
-            # - Finding objects with light components
-            # - Extracting light properties
-            # - Calculating light positions and directions
-            
-            # For now, create a mock directional light
-            light = LightInfo(
-                position=(0.0, 10.0, 0.0),
-                direction=(-0.5, -1.0, -0.5),
-                color=(1.0, 1.0, 1.0),
-                intensity=1.5,
-                light_type="directional"
-            )
-            
-            self.lights.append(light)
+            # Lights are gathered by the same extraction pass as render objects
+            self.lights = self.extractor.lights
+            self.stats.lights_processed = len(self.lights)
+            
+            # Each cluster of the view gets the list of lights that can reach it
+            camera = self.current_camera
+            clusters = None
+            if hasattr(camera, 'get_projection_matrix') and hasattr(camera, 'get_view_matrix'):
+                clusters = self.light_clusterer.build(self.lights, camera.get_view_matrix(),
+                                                      camera.get_projection_matrix(),
+                                                      camera.near_clip, camera.far_clip)
+            self.pipeline.set_light_clusters(clusters)
             
             self.logger.debug(f"Extracted {len(self.lights)} lights")
             
@@ -214,20 +301,32 @@ class SceneRenderer:
             if not self.current_camera:
                 return
             
-            culled_count = 0
-            visible_objects = []
-            
-            for obj in self.render_objects:
-                # TODO: Implement actual frustum culling
-                # This would involve:
-                # - Getting camera frustum planes
-                # - Testing object bounding box against frustum
-                # - Culling objects outside frustum
+            camera = self.current_camera
+            extractor = self.extractor
+            indices = self.visible_indices
+            before = len(indices)
+            
+            # Layers the camera does not render
+            culling_mask = getattr(camera, 'culling_mask', None)
+            if culling_mask is not None and len(indices):
+                layers = extractor.layers[indices].astype(np.int64)
+                indices = indices[(culling_mask >> layers) & 1 == 1]
+            if culling_mask is not None:
+                self.visible_batches = [batch for batch in self.visible_batches
+                                        if (culling_mask >> batch.layer) & 1]
+            
+            # Bounds outside the view frustum
+            if hasattr(camera, 'get_view_projection_matrix'):
+                planes = frustum_planes(camera.get_view_projection_matrix())
+                if len(indices):
+                    indices = self.culler.cull(extractor, indices, planes)
+                if self.visible_batches:
+                    visible_batches = set(map(id, self.static_batcher.cull(planes)))
+                    self.visible_batches = [batch for batch in self.visible_batches if id(batch) in visible_batches]
+            
+            self.visible_indices = indices
+            culled_count = before - len(indices)
                 
-                # For now, assume all objects are visible
-                visible_objects.append(obj)
-            
-            self.render_objects = visible_objects
             self.stats.culled_objects = culled_count
             
             self.logger.debug(f"Frustum culling: {culled_count} objects culled")
@@ -235,19 +334,63 @@ class SceneRenderer:
         except Exception as e:
             self.logger.error(f"Error during frustum culling: {e}")
     
+    def _occlusion_cull(self):
+        """Remove render objects and static batches hidden behind large occluders."""
+        try:
+            camera = self.current_camera
+            if not hasattr(camera, 'get_view_projection_matrix'):
+                return
+            
+            view_projection = camera.get_view_projection_matrix()
+            culler = self.occlusion_culler
+            before = len(self.visible_indices)
+            self.visible_indices = culler.cull(self.extractor, self.visible_indices, view_projection,
+                                               self._get_camera_position(), camera.get_projection_matrix()[1][1])
+            
+            if self.visible_batches:
+                visible = culler.test_bounds(np.array([batch.bounds_min for batch in self.visible_batches]),
+                                             np.array([batch.bounds_max for batch in self.visible_batches]),
+                                             view_projection)
+                self.visible_batches = [batch for batch, keep in zip(self.visible_batches, visible.tolist()) if keep]
+            
+            self.stats.occluded_objects = before - len(self.visible_indices)
+            self.logger.debug(f"Occlusion culling: {self.stats.occluded_objects} objects occluded")
+            
+        except Exception as e:
+            self.logger.error(f"Error during occlusion culling: {e}")
+    
+    def _select_lods(self):
+        """Choose the detail level of every visible object."""
+        try:
+            extractor = self.extractor
+            indices = self.visible_indices
+            camera = self.current_camera
+            if not self.lod_enabled or not hasattr(camera, 'get_projection_matrix'):
+                detailed = indices[extractor.lod_levels[indices] != 0]
+                extractor.set_lod_levels(detailed, np.zeros(len(detailed), dtype=np.uint8))
+                return
+            
+            self.lod_selector.select(extractor, indices, self._get_camera_position(),
+                                     camera.get_projection_matrix())
+            
+        except Exception as e:
+            self.logger.error(f"Error selecting LODs: {e}")
+    
     def _sort_objects(self):
         """Sort render objects for optimal rendering."""
         try:
-            if self.sort_by_distance:
-                # Sort by distance to camera (back to front for transparency)
-                self.render_objects.sort(key=lambda obj: obj.distance_to_camera, reverse=True)
+            indices = self.visible_indices
+            camera_position = self._get_camera_position()
+            self.distances = np.linalg.norm(self.extractor.bounds_center[indices] - camera_position, axis=1)
             
-            if self.sort_by_material:
-                # TODO: Sort by material to minimize state changes
-                # This would involve grouping objects by material
-                pass
+            # Opaque objects grouped by state then front to back, transparent ones back to front
+            queue = self.render_queue
+            queue.build(self.extractor, indices, self.distances,
+                        sort_by_distance=self.sort_by_distance, sort_by_state=self.sort_by_material)
+            indices, self.distances = queue.indices, self.distances[queue.order]
             
-            self.logger.debug(f"Sorted {len(self.render_objects)} render objects")
+            self.visible_indices = indices
+            self.logger.debug(f"Sorted {len(indices)} render objects")
             
         except Exception as e:
             self.logger.error(f"Error sorting objects: {e}")
@@ -275,21 +418,15 @@ class SceneRenderer:
     def _render_opaque_pass(self):
         """Render opaque objects."""
         try:
-            # Set pipeline state for opaque rendering
-            from .pipeline import PipelineState
-            opaque_state = PipelineState(
-                shader_program="default",
-                blend_mode="opaque",
-                depth_test=True,
-                depth_write=True,
-                cull_mode="back"
-            )
+            # Static batches first, then the remaining objects
+            self._submit(self._recorded.get("static_batches", []))
             
-            self.pipeline.set_pipeline_state(opaque_state)
+            # Runs sharing mesh and material become instanced draws over one packed buffer
+            if self.instancing_enabled:
+                self.pipeline.upload_instances(self.extractor.world_matrices[self.render_queue.opaque])
             
-            # Render all opaque objects
-            for obj in self.render_objects:
-                self._render_object(obj)
+            # The queue keeps equal shaders together, so state is only switched between groups
+            self._submit(self._recorded.get("opaque", []))
             
         except Exception as e:
             self.logger.error(f"Error rendering opaque pass: {e}")
@@ -297,21 +434,8 @@ class SceneRenderer:
     def _render_transparent_pass(self):
         """Render transparent objects."""
         try:
-            # Set pipeline state for transparent rendering
-            from .pipeline import PipelineState
-            transparent_state = PipelineState(
-                shader_program="default",
-                blend_mode="alpha",
-                depth_test=True,
-                depth_write=False,
-                cull_mode="back"
-            )
-            
-            self.pipeline.set_pipeline_state(transparent_state)
-            
-            # TODO: Render transparent objects
-            # This would involve filtering objects by transparency
-            # and rendering them back to front
+            # Render transparent objects back to front, as ordered by the queue
+            self._submit(self._recorded.get("transparent", []))
             
         except Exception as e:
             self.logger.error(f"Error rendering transparent pass: {e}")
@@ -345,23 +469,158 @@ class SceneRenderer:
         except Exception as e:
             self.logger.error(f"Error rendering post-process pass: {e}")
     
-    def _render_object(self, obj: RenderObject):
+    def _set_pass_state(self, blend_mode: str, shader_program: str):
+        """Set the pipeline state for a blend mode and shader program.
+        
+        States are cached so the pipeline can elide re-setting an equal one.
+        
+        Args:
+            blend_mode: "opaque" or "alpha"
+            shader_program: Shader program name
+        """
+        key = (blend_mode, shader_program)
+        state = self._pipeline_states.get(key)
+        if state is None:
+            state = PipelineState(
+                shader_program=shader_program,
+                blend_mode=blend_mode,
+                depth_test=True,
+                depth_write=blend_mode == "opaque",
+                cull_mode="back"
+            )
+            self._pipeline_states[key] = state
+        self.pipeline.set_pipeline_state(state)
+    
+    def _render_object(self, index: int):
         """Render a single object.
         
         Args:
-            obj: Object to render
+            index: Render object slot in the extractor
         """
         try:
+            extractor = self.extractor
+            mesh_info = self._lod_mesh(index)
+            if mesh_info is None:
+                return
+            
             # Draw the mesh
             self.pipeline.draw_mesh(
-                obj.mesh_info,
-                obj.material_info,
-                obj.transform_matrix
+                mesh_info,
+                extractor.materials[extractor.material_ids[index]],
+                extractor.world_matrices[index]
             )
             
+            self.stats.draw_calls += 1
+            self.stats.triangles += mesh_info.index_count // 3
+            self.stats.vertices += mesh_info.vertex_count
+            
         except Exception as e:
             self.logger.error(f"Error rendering object: {e}")
     
+    def _render_instances(self, index: int, start_instance: int, instance_count: int):
+        """Render a run of objects sharing one mesh and material.
+        
+        Args:
+            index: Slot of the first object in the run
+            start_instance: Offset of the run in the uploaded instances
+            instance_count: Number of objects in the run
+        """
+        try:
+            extractor = self.extractor
+            mesh_info = self._lod_mesh(index)
+            if mesh_info is None:
+                return
+            
+            self.pipeline.draw_mesh_instanced(
+                mesh_info,
+                extractor.materials[extractor.material_ids[index]],
+                start_instance,
+                instance_count
+            )
+            
+            self.stats.draw_calls += 1
+            self.stats.instanced_draws += 1
+            self.stats.triangles += instance_count * (mesh_info.index_count // 3)
+            self.stats.vertices += instance_count * mesh_info.vertex_count
+            
+        except Exception as e:
+            self.logger.error(f"Error rendering instances: {e}")
+    
+    def _render_static_batch(self, batch: StaticBatch):
+        """Render a static batch.
+        
+        Args:
+            batch: Static batch to draw
+        """
+        try:
+            mesh_info = self.resource_manager.get_mesh(batch.mesh_name)
+            if mesh_info is None:
+                return
+            
+            self.pipeline.draw_mesh(
+                mesh_info,
+                self.extractor.materials[batch.material_id],
+                np.eye(4, dtype=np.float32),
+                object_count=len(batch.renderers)
+            )
+            
+            self.stats.draw_calls += 1
+            self.stats.static_batch_draws += 1
+            self.stats.triangles += mesh_info.index_count // 3
+            self.stats.vertices += mesh_info.vertex_count
+            
+        except Exception as e:
+            self.logger.error(f"Error rendering static batch: {e}")
+    
+    def build_static_batches(self, scene) -> int:
+        """Merge small static objects of a scene into static batches.
+        
+        Call after loading a scene. Objects must be marked static and use
+        meshes small enough to keep their CPU data.
+        
+        Args:
+            scene: Scene to batch
+            
+        Returns:
+            Number of batches built
+        """
+        self.extractor.extract(scene)
+        return self.static_batcher.build(self.extractor)
+    
+    def _get_camera_position(self) -> np.ndarray:
+        """Get the world position of the current camera."""
+        camera = self.current_camera
+        game_object = getattr(camera, 'game_object', None)
+        if game_object is None:
+            return np.zeros(3)
+        return game_object.get_world_matrix()[:3, 3]
+    
+    def _lod_mesh(self, index: int):
+        """Get the mesh drawn for a slot at its current detail level."""
+        mesh_info = self.extractor.meshes[self.extractor.mesh_ids[index]]
+        return mesh_info.get_lod(int(self.extractor.lod_levels[index])) if mesh_info else None
+    
+    def get_render_objects(self) -> List[RenderObject]:
+        """Get the visible objects of the last frame, in draw order.
+        
+        Builds RenderObject records on request for tools and debugging;
+        the render passes themselves work on the extractor's arrays.
+        
+        Returns:
+            List of render objects
+        """
+        extractor = self.extractor
+        return [
+            RenderObject(
+                mesh_info=self._lod_mesh(index),
+                material_info=extractor.materials[extractor.material_ids[index]],
+                transform_matrix=extractor.world_matrices[index].tolist(),
+                distance_to_camera=float(distance),
+                layer=int(extractor.layers[index])
+            )
+            for index, distance in zip(self.visible_indices.tolist(), self.distances.tolist())
+        ]
+    
     def set_frustum_culling(self, enabled: bool):
         """Enable or disable frustum culling.
         
@@ -380,6 +639,15 @@ class SceneRenderer:
         self.occlusion_culling_enabled = enabled
         self.logger.info(f"Occlusion culling {'enabled' if enabled else 'disabled'}")
     
+    def set_lod_enabled(self, enabled: bool):
+        """Enable or disable detail level selection.
+        
+        Args:
+            enabled: Whether to draw coarser levels of small objects
+        """
+        self.lod_enabled = enabled
+        self.logger.info(f"LOD selection {'enabled' if enabled else 'disabled'}")
+    
     def set_sort_by_distance(self, enabled: bool):
         """Enable or disable distance sorting.
         
@@ -398,22 +666,52 @@ class SceneRenderer:
         self.sort_by_material = enabled
         self.logger.info(f"Material sorting {'enabled' if enabled else 'disabled'}")
     
+    def set_async_submission(self, enabled: bool):
+        """Enable or disable submitting frames on a render thread.
+        
+        With the software backend, render_scene returns once the scene is
+        extracted, culled and sorted, and the frame is recorded and
+        rasterized while the caller simulates the next one. Call
+        wait_for_frame before reading the render target.
+        
+        Args:
+            enabled: Whether to submit asynchronously
+        """
+        if not enabled:
+            self.wait_for_frame()
+        self.async_submission = enabled
+        self.logger.info(f"Asynchronous submission {'enabled' if enabled else 'disabled'}")
+    
     def get_stats(self) -> SceneRenderStats:
         """Get scene rendering statistics.
         
+        With asynchronous submission these are of the last completed frame.
+        
         Returns:
             Current scene rendering statistics
         """
-        return self.stats
+        return self._completed_stats if self._submits_async() else self.stats
     
     def shutdown(self):
         """Shutdown the scene renderer."""
         if self.is_initialized:
             self.logger.info("Shutting down scene renderer...")
             
+            # Finish the frame in flight and stop the worker threads
+            self.wait_for_frame()
+            if self._frame_executor is not None:
+                self._frame_executor.shutdown(wait=True)
+                self._frame_executor = None
+            self.recorder.shutdown()
+            self._recorded = {}
+            
             # Clear rendering state
-            self.render_objects.clear()
-            self.lights.clear()
+            self.static_batcher.clear()
+            self.visible_batches = []
+            self.extractor.clear()
+            self.visible_indices = np.zeros(0, dtype=np.int64)
+            self.lights = []
+            self.pipeline.set_light_clusters(None)
             self.current_scene = None
             self.current_camera = None
             
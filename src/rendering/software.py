@@ -0,0 +1,685 @@
+"""
+Software Rasterizer for Nexlify Engine.
+
+This module implements the CPU backend behind GraphicsAPI.SOFTWARE. It
+keeps buffers and textures in NumPy arrays and rasterizes indexed
+triangles into an offscreen RGBA target with a depth buffer:
+- Vertices are transformed, near-clipped and projected in one pass per draw
+- Triangles are binned into screen tiles
+- Tiles are rasterized in parallel on a thread pool, each testing all of
+  its triangles against all of its pixels at once
+
+It needs no GPU or window, which makes it suitable for headless rendering
+such as golden-image tests, thumbnails and server-side previews.
+"""
+
+import os
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+
+# Interleaved vertex layout shared with the mesh loader: position, normal, uv
+DEFAULT_VERTEX_STRIDE = 32
+
+# Upper bound on triangle * pixel elements evaluated at once within a tile
+CHUNK_ELEMENTS = 1 << 18
+
+# Upper bound on instance * vertex count transformed in one batch
+INSTANCE_CHUNK_VERTICES = 1 << 18
+
+
+def _clip_near(vertices: np.ndarray) -> np.ndarray:
+    """Clip triangles against the near plane (z >= -w in clip space).
+    
+    Args:
+        vertices: (n, 3, k) triangle vertices starting with clip x, y, z, w
+    
+    Returns:
+        (m, 3, k) triangles in front of the near plane, winding preserved
+    """
+    distance = vertices[:, :, 2] + vertices[:, :, 3]
+    inside = distance >= 0.0
+    inside_count = inside.sum(axis=1)
+    corners = np.arange(3)
+    result = [vertices[inside_count == 3]]
+    
+    # One vertex inside: rotate it to the front and shrink the triangle
+    one = np.flatnonzero(inside_count == 1)
+    if len(one):
+        order = (np.argmax(inside[one], axis=1)[:, None] + corners) % 3
+        tri = vertices[one[:, None], order]
+        d = distance[one[:, None], order]
+        a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+        ab = a + (b - a) * (d[:, 0] / (d[:, 0] - d[:, 1]))[:, None]
+        ac = a + (c - a) * (d[:, 0] / (d[:, 0] - d[:, 2]))[:, None]
+        result.append(np.stack([a, ab, ac], axis=1))
+    
+    # Two vertices inside: rotate the outside one to the front, emit a quad
+    two = np.flatnonzero(inside_count == 2)
+    if len(two):
+        order = (np.argmin(inside[two], axis=1)[:, None] + corners) % 3
+        tri = vertices[two[:, None], order]
+        d = distance[two[:, None], order]
+        a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+        ba = b + (a - b) * (d[:, 1] / (d[:, 1] - d[:, 0]))[:, None]
+        ca = c + (a - c) * (d[:, 2] / (d[:, 2] - d[:, 0]))[:, None]
+        result.append(np.stack([ba, b, c], axis=1))
+        result.append(np.stack([ba, c, ca], axis=1))
+    
+    return np.concatenate(result) if len(result) > 1 else result[0]
+
+
+class SoftwareRasterizer:
+    """Tiled NumPy rasterizer rendering into an offscreen RGBA target."""
+    
+    def __init__(self, width: int, height: int, tile_size: int = 64, threads: Optional[int] = None):
+        self.logger = get_logger(__name__)
+        self.tile_size = tile_size
+        
+        # Back buffer, and the color and depth targets draws currently go to
+        self.back_color = np.zeros((height, width, 4), dtype=np.uint8)
+        self.back_depth = np.ones((height, width), dtype=np.float32)
+        self.color = self.back_color
+        self.depth = self.back_depth
+        self.viewport = (0, 0, width, height)
+        self._back_viewport = self.viewport
+        
+        # Resources by handle; color render targets are textures so later passes can sample them
+        self.buffers: Dict[int, np.ndarray] = {}
+        self.textures: Dict[int, np.ndarray] = {}
+        self.depth_targets: Dict[int, np.ndarray] = {}
+        self._scratch_depth = np.ones((0, 0), dtype=np.float32)
+        self._handles = itertools.count(1)
+        
+        # Bound state
+        self.vertex_buffer: Optional[int] = None
+        self.vertex_stride = DEFAULT_VERTEX_STRIDE
+        self.index_buffer: Optional[int] = None
+        self.instance_buffer: Optional[int] = None
+        self.texture: Optional[int] = None
+        self.blend_mode = "opaque"
+        self.depth_test = True
+        self.depth_write = True
+        self.cull_mode = "back"
+        self.constants: Dict[str, Any] = {
+            "world": np.eye(4),
+            "view_projection": np.eye(4),
+            "base_color": (1.0, 1.0, 1.0, 1.0),
+            "light_direction": (-0.4, -1.0, -0.6),
+            "ambient": 0.25
+        }
+        
+        # Tiles are independent, so they are rasterized in parallel
+        self._pool = ThreadPoolExecutor(max_workers=threads or os.cpu_count() or 1,
+                                        thread_name_prefix="raster")
+        
+        # Performance tracking
+        self.draw_calls = 0
+        self.triangles_submitted = 0
+        self.triangles_rasterized = 0
+        self.tiles_rasterized = 0
+    
+    @property
+    def width(self) -> int:
+        """Render target width."""
+        return self.color.shape[1]
+    
+    @property
+    def height(self) -> int:
+        """Render target height."""
+        return self.color.shape[0]
+    
+    def resize(self, width: int, height: int):
+        """Reallocate the render targets.
+        
+        Args:
+            width: New target width
+            height: New target height
+        """
+        self.back_color = np.zeros((height, width, 4), dtype=np.uint8)
+        self.back_depth = np.ones((height, width), dtype=np.float32)
+        self.color = self.back_color
+        self.depth = self.back_depth
+        self.viewport = (0, 0, width, height)
+    
+    def create_buffer(self, size: int, data=None) -> int:
+        """Create a buffer holding a copy of data.
+        
+        Args:
+            size: Buffer size in bytes
+            data: Optional initial contents (any bytes-like object)
+        
+        Returns:
+            Buffer handle
+        """
+        buffer = np.zeros(size, dtype=np.uint8)
+        if data is not None:
+            source = np.frombuffer(data, dtype=np.uint8)
+            buffer[:len(source)] = source[:size]
+        
+        handle = next(self._handles)
+        self.buffers[handle] = buffer
+        return handle
+    
+    def create_texture(self, width: int, height: int, format: str, data=None) -> int:
+        """Create an RGBA texture.
+        
+        Args:
+            width: Texture width
+            height: Texture height
+            format: RGBA8 or RGB8
+            data: Optional pixel rows, top row first
+        
+        Returns:
+            Texture handle
+        """
+        texture = np.full((height, width, 4), 255, dtype=np.uint8)
+        if data is not None:
+            pixels = np.frombuffer(data, dtype=np.uint8)
+            if format == "RGBA8":
+                texture[:] = pixels.reshape(height, width, 4)
+            elif format == "RGB8":
+                texture[:, :, :3] = pixels.reshape(height, width, 3)
+            else:
+                self.logger.warning(f"Unsupported software texture format: {format}")
+        
+        handle = next(self._handles)
+        self.textures[handle] = texture
+        return handle
+    
+    def create_render_target(self, width: int, height: int, format: str) -> int:
+        """Create an offscreen color or depth target.
+        
+        Color targets are stored as RGBA8 whatever their format.
+        
+        Args:
+            width: Target width
+            height: Target height
+            format: Pixel format; D24S8 and D32 create depth targets
+        
+        Returns:
+            Target handle
+        """
+        handle = next(self._handles)
+        if format in ("D24S8", "D32"):
+            self.depth_targets[handle] = np.ones((height, width), dtype=np.float32)
+        else:
+            self.textures[handle] = np.zeros((height, width, 4), dtype=np.uint8)
+        return handle
+    
+    def set_render_targets(self, color: Optional[int] = None, depth: Optional[int] = None) -> bool:
+        """Bind the targets following draws and clears go to.
+        
+        Args:
+            color: Color target handle, None for the back buffer
+            depth: Depth target handle; None for the back buffer depth, or
+                no depth buffer when drawing to an offscreen color target
+        
+        Returns:
+            True if bound, False if a handle is unknown or the sizes differ
+        """
+        color_target = self.back_color if color is None else self.textures.get(color)
+        if depth is not None:
+            depth_target = self.depth_targets.get(depth)
+        elif color is None or color_target is None:
+            depth_target = self.back_depth
+        else:
+            # Without a depth target every fragment passes the depth test
+            if self._scratch_depth.shape != color_target.shape[:2]:
+                self._scratch_depth = np.ones(color_target.shape[:2], dtype=np.float32)
+            depth_target = self._scratch_depth
+            depth_target.fill(1.0)
+        if color_target is None or depth_target is None:
+            self.logger.error(f"Unknown render target: color {color}, depth {depth}")
+            return False
+        if color_target.shape[:2] != depth_target.shape:
+            self.logger.error(f"Render target sizes differ: {color_target.shape[:2]} and {depth_target.shape}")
+            return False
+        
+        # Offscreen targets are drawn over their full size; the back buffer keeps its viewport
+        if self.color is self.back_color:
+            self._back_viewport = self.viewport
+        self.color = color_target
+        self.depth = depth_target
+        if color_target is self.back_color:
+            self.viewport = self._back_viewport
+        else:
+            self.viewport = (0, 0, color_target.shape[1], color_target.shape[0])
+        return True
+    
+    def update_buffer(self, handle: int, data, offset: int = 0) -> bool:
+        """Overwrite part of a buffer.
+        
+        Args:
+            handle: Buffer handle
+            data: New contents (any bytes-like object)
+            offset: Byte offset to write at
+            
+        Returns:
+            True if the data fit into the buffer, False otherwise
+        """
+        buffer = self.buffers.get(handle)
+        source = np.frombuffer(data, dtype=np.uint8)
+        if buffer is None or offset + len(source) > len(buffer):
+            return False
+        buffer[offset:offset + len(source)] = source
+        return True
+    
+    def release(self, handle: int):
+        """Free a buffer or texture.
+        
+        Args:
+            handle: Resource handle
+        """
+        self.buffers.pop(handle, None)
+        self.textures.pop(handle, None)
+        self.depth_targets.pop(handle, None)
+    
+    def set_render_state(self, blend_mode: str, depth_test: bool, depth_write: bool, cull_mode: str):
+        """Set blending, depth and face culling state."""
+        self.blend_mode = blend_mode
+        self.depth_test = depth_test
+        self.depth_write = depth_write
+        self.cull_mode = cull_mode
+    
+    def clear(self, color: Tuple[float, float, float, float]):
+        """Clear the color target.
+        
+        Args:
+            color: Clear color (RGBA, 0-1)
+        """
+        self.color[:] = np.clip(np.round(np.asarray(color) * 255.0), 0, 255).astype(np.uint8)
+    
+    def clear_depth(self, depth: float = 1.0):
+        """Clear the depth buffer.
+        
+        Args:
+            depth: Clear depth
+        """
+        self.depth[:] = depth
+    
+    def draw(self, vertex_count: int, start_vertex: int = 0):
+        """Draw non-indexed triangles from the bound vertex buffer."""
+        self._draw(np.arange(start_vertex, start_vertex + vertex_count, dtype=np.int64))
+    
+    def draw_indexed(self, index_count: int, start_index: int = 0, base_vertex: int = 0):
+        """Draw indexed triangles from the bound vertex and index buffers."""
+        indices = self.buffers[self.index_buffer].view(np.uint32)[start_index:start_index + index_count]
+        self._draw(indices.astype(np.int64) + base_vertex)
+    
+    def draw_indexed_instanced(self, index_count: int, instance_count: int, start_index: int = 0,
+                               base_vertex: int = 0, start_instance: int = 0):
+        """Draw indexed triangles once per world matrix in the bound instance buffer."""
+        indices = self.buffers[self.index_buffer].view(np.uint32)[start_index:start_index + index_count]
+        indices = indices.astype(np.int64) + base_vertex
+        worlds = self.buffers[self.instance_buffer].view(np.float32).reshape(-1, 4, 4)
+        worlds = worlds[start_instance:start_instance + instance_count]
+        
+        # Instances are transformed together, a bounded number of vertices at a time
+        vertex_span = max(int(indices.max() - indices.min()) + 1, 1) if len(indices) else 1
+        chunk = max(INSTANCE_CHUNK_VERTICES // vertex_span, 1)
+        for start in range(0, len(worlds), chunk):
+            self._draw(indices, worlds[start:start + chunk])
+    
+    def _draw(self, indices: np.ndarray, worlds: Optional[np.ndarray] = None):
+        """Transform, clip, bin and rasterize a triangle list.
+        
+        Args:
+            indices: Vertex indices, three per triangle
+            worlds: (n, 4, 4) instance world matrices; the world constant if None
+        """
+        self.draw_calls += 1
+        indices = indices[:len(indices) - len(indices) % 3]
+        if not len(indices):
+            return
+        
+        # Vertex stage over the referenced vertex range, for every instance at once
+        floats = self.buffers[self.vertex_buffer].view(np.float32).reshape(-1, self.vertex_stride // 4)
+        first = int(indices.min())
+        vertices = floats[first:int(indices.max()) + 1].astype(np.float64)
+        
+        if worlds is None:
+            worlds = np.asarray(self.constants["world"], dtype=np.float64)[None]
+        worlds = np.asarray(worlds, dtype=np.float64)
+        view_projection = np.asarray(self.constants["view_projection"], dtype=np.float64)
+        positions = np.c_[vertices[:, 0:3], np.ones(len(vertices))]
+        clip = np.einsum('vj,nij->nvi', positions, view_projection @ worlds)
+        
+        shape = (len(worlds), len(vertices))
+        attributes = [clip]
+        if vertices.shape[1] >= 6:
+            attributes.append(np.einsum('vj,nji->nvi', vertices[:, 3:6], np.linalg.inv(worlds[:, :3, :3])))
+        else:
+            attributes.append(np.zeros(shape + (3,)))
+        if vertices.shape[1] >= 8:
+            attributes.append(np.broadcast_to(vertices[:, 6:8], shape + (2,)))
+        else:
+            attributes.append(np.zeros(shape + (2,)))
+        
+        # World positions, only needed to shade with clustered lights
+        clusters = self.constants.get("light_clusters")
+        if clusters is not None and not clusters.light_count:
+            clusters = None
+        if clusters is not None:
+            attributes.append(np.einsum('vj,nij->nvi', positions, worlds)[:, :, 0:3])
+        triangles = np.concatenate(attributes, axis=2)[:, (indices - first).reshape(-1, 3)]
+        triangles = triangles.reshape(-1, 3, triangles.shape[-1])
+        self.triangles_submitted += len(triangles)
+        
+        # Drop triangles entirely outside one of the side or far planes, then clip
+        xyz, w = triangles[:, :, 0:3], triangles[:, :, 3:4]
+        outside = np.any(np.all(xyz > w, axis=1) | np.all(xyz < -w, axis=1), axis=1)
+        triangles = _clip_near(triangles[~outside])
+        if not len(triangles):
+            return
+        
+        # Project to the viewport; depth goes from [-1, 1] to [0, 1]
+        vx, vy, vw, vh = self.viewport
+        inv_w = 1.0 / triangles[:, :, 3]
+        ndc = triangles[:, :, 0:3] * inv_w[:, :, None]
+        screen = np.empty((len(triangles), 3, 3))
+        screen[:, :, 0] = vx + (ndc[:, :, 0] * 0.5 + 0.5) * vw
+        screen[:, :, 1] = vy + (0.5 - ndc[:, :, 1] * 0.5) * vh
+        screen[:, :, 2] = ndc[:, :, 2] * 0.5 + 0.5
+        
+        # Counter-clockwise in NDC is clockwise on screen (y points down): negative area
+        x, y = screen[:, :, 0], screen[:, :, 1]
+        area = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+        keep = np.abs(area) > 1e-12
+        if self.cull_mode == "back":
+            keep &= area < 0.0
+        elif self.cull_mode == "front":
+            keep &= area > 0.0
+        
+        # Pixel bounds, clamped to the viewport and target
+        left = np.maximum(np.floor(x.min(axis=1) - 0.5), max(vx, 0))
+        top = np.maximum(np.floor(y.min(axis=1) - 0.5), max(vy, 0))
+        right = np.minimum(np.ceil(x.max(axis=1) - 0.5), min(vx + vw, self.width) - 1)
+        bottom = np.minimum(np.ceil(y.max(axis=1) - 0.5), min(vy + vh, self.height) - 1)
+        keep &= (left <= right) & (top <= bottom)
+        
+        kept = np.flatnonzero(keep)
+        if not len(kept):
+            return
+        self.triangles_rasterized += len(kept)
+        
+        batch = {
+            "screen": screen[kept],
+            "left": left[kept].astype(np.int64),
+            "top": top[kept].astype(np.int64),
+            "right": right[kept].astype(np.int64),
+            "bottom": bottom[kept].astype(np.int64),
+            "inv_w": inv_w[kept],
+            "normals": triangles[kept, :, 4:7] * inv_w[kept][:, :, None],
+            "uvs": triangles[kept, :, 7:9] * inv_w[kept][:, :, None],
+            "positions": triangles[kept, :, 9:12] * inv_w[kept][:, :, None] if clusters is not None else None,
+            "clusters": clusters,
+            "texture": self.textures.get(self.texture),
+            "base_color": np.asarray(self.constants["base_color"], dtype=np.float64),
+            "light": self._light_direction(),
+            "ambient": float(self.constants["ambient"]),
+            "blend_mode": self.blend_mode,
+            "depth_test": self.depth_test,
+            "depth_write": self.depth_write
+        }
+        jobs = self._bin(left[kept], top[kept], right[kept], bottom[kept])
+        self.tiles_rasterized += len(jobs)
+        
+        if len(jobs) > 1:
+            list(self._pool.map(lambda job: self._raster_tile(batch, *job), jobs))
+        else:
+            for job in jobs:
+                self._raster_tile(batch, *job)
+    
+    def _light_direction(self) -> np.ndarray:
+        """Normalized direction the light travels in."""
+        direction = np.asarray(self.constants["light_direction"], dtype=np.float64)
+        return direction / max(np.linalg.norm(direction), 1e-12)
+    
+    def _bin(self, left, top, right, bottom) -> List[Tuple[int, int, np.ndarray]]:
+        """Assign triangles to the tiles their bounds overlap.
+        
+        Returns:
+            (tile x, tile y, triangle indices in submission order) per tile
+        """
+        size = self.tile_size
+        tx0, ty0 = (left // size).astype(np.int64), (top // size).astype(np.int64)
+        tx1, ty1 = (right // size).astype(np.int64), (bottom // size).astype(np.int64)
+        columns = tx1 - tx0 + 1
+        counts = columns * (ty1 - ty0 + 1)
+        
+        # One (triangle, tile) pair per overlapped tile
+        triangle = np.repeat(np.arange(len(counts)), counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        tile_x = tx0[triangle] + offset % columns[triangle]
+        tile_y = ty0[triangle] + offset // columns[triangle]
+        
+        tiles_per_row = (self.width + size - 1) // size
+        tile = tile_y * tiles_per_row + tile_x
+        order = np.argsort(tile, kind='stable')
+        tile, triangle = tile[order], triangle[order]
+        starts = np.flatnonzero(np.r_[True, tile[1:] != tile[:-1]])
+        ends = np.r_[starts[1:], len(tile)]
+        return [
+            (int(tile[start] % tiles_per_row), int(tile[start] // tiles_per_row), triangle[start:end])
+            for start, end in zip(starts.tolist(), ends.tolist())
+        ]
+    
+    def _raster_tile(self, batch: Dict[str, Any], tile_x: int, tile_y: int, triangles: np.ndarray):
+        """Resolve and shade the nearest fragment of each pixel in one tile."""
+        size = self.tile_size
+        vx, vy, vw, vh = self.viewport
+        x0, y0 = max(tile_x * size, vx), max(tile_y * size, vy)
+        x1 = min(tile_x * size + size, vx + vw, self.width)
+        y1 = min(tile_y * size + size, vy + vh, self.height)
+        tile_width = x1 - x0
+        pixel_count = tile_width * (y1 - y0)
+        
+        # Fragments: every pixel of each triangle's bounds within the tile
+        left = np.maximum(batch["left"][triangles], x0)
+        top = np.maximum(batch["top"][triangles], y0)
+        widths = np.maximum(np.minimum(batch["right"][triangles], x1 - 1) - left + 1, 0)
+        heights = np.maximum(np.minimum(batch["bottom"][triangles], y1 - 1) - top + 1, 0)
+        counts = widths * heights
+        ends = np.cumsum(counts)
+        
+        # Nearest covered fragment per pixel, a chunk of triangles at a time
+        best_z = np.full(pixel_count, np.inf)
+        best = np.zeros(pixel_count, dtype=np.int64)
+        best_weights = np.zeros((pixel_count, 3))
+        start = 0
+        while start < len(triangles):
+            stop = max(int(np.searchsorted(ends, ends[start] - counts[start] + CHUNK_ELEMENTS, 'right')), start + 1)
+            chunk = slice(start, stop)
+            start = stop
+            
+            chunk_counts = counts[chunk]
+            total = int(chunk_counts.sum())
+            if not total:
+                continue
+            owner = np.repeat(np.arange(len(chunk_counts)), chunk_counts)
+            offset = np.arange(total) - np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+            row_width = widths[chunk][owner]
+            fx = left[chunk][owner] + offset % row_width
+            fy = top[chunk][owner] + offset // row_width
+            
+            ids = triangles[chunk][owner]
+            weights, z = self._barycentrics(batch["screen"][ids], fx + 0.5, fy + 0.5)
+            covered = np.flatnonzero(np.all(weights >= 0.0, axis=1) & (z >= 0.0) & (z <= 1.0))
+            if not len(covered):
+                continue
+            pixel = (fy[covered] - y0) * tile_width + (fx[covered] - x0)
+            z = z[covered]
+            
+            # Nearest per pixel; on equal depth the earlier triangle wins
+            nearest = np.full(pixel_count, np.inf)
+            np.minimum.at(nearest, pixel, z)
+            candidates = np.flatnonzero(z == nearest[pixel])
+            pixel_ids, first = np.unique(pixel[candidates], return_index=True)
+            winners = covered[candidates[first]]
+            closer = nearest[pixel_ids] < best_z[pixel_ids]
+            pixel_ids, winners = pixel_ids[closer], winners[closer]
+            best_z[pixel_ids] = nearest[pixel_ids]
+            best[pixel_ids] = ids[winners]
+            best_weights[pixel_ids] = weights[winners]
+        
+        depth = self.depth[y0:y1, x0:x1].reshape(-1)
+        mask = np.isfinite(best_z)
+        if batch["depth_test"]:
+            mask &= best_z < depth
+        pixels = np.flatnonzero(mask)
+        if not len(pixels):
+            return
+        
+        # Perspective-correct attributes of the winning triangles
+        owner = best[pixels]
+        weights = best_weights[pixels]
+        inv_w = np.einsum('pi,pi->p', weights, batch["inv_w"][owner])
+        normals = np.einsum('pi,pij->pj', weights, batch["normals"][owner]) / inv_w[:, None]
+        uvs = np.einsum('pi,pij->pj', weights, batch["uvs"][owner]) / inv_w[:, None]
+        
+        # Lambert lighting times material color and texture
+        normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        diffuse = np.clip(normals @ -batch["light"], 0.0, 1.0)
+        ambient = batch["ambient"]
+        lighting = np.repeat((ambient + (1.0 - ambient) * diffuse)[:, None], 3, axis=1)
+        if batch["clusters"] is not None:
+            positions = np.einsum('pi,pij->pj', weights, batch["positions"][owner]) / inv_w[:, None]
+            lighting += self._clustered_lighting(batch["clusters"], pixels % tile_width + x0,
+                                                 pixels // tile_width + y0, positions, normals)
+        rgba = np.empty((len(pixels), 4))
+        rgba[:, :3] = batch["base_color"][:3] * lighting
+        rgba[:, 3] = batch["base_color"][3]
+        texture = batch["texture"]
+        if texture is not None:
+            height, width = texture.shape[:2]
+            column = (np.floor(uvs[:, 0] * width).astype(np.int64)) % width
+            row = (np.floor((1.0 - uvs[:, 1]) * height).astype(np.int64)) % height
+            rgba *= texture[row, column] / 255.0
+        
+        color = self.color[y0:y1, x0:x1].reshape(-1, 4)
+        if batch["blend_mode"] == "alpha":
+            destination = color[pixels] / 255.0
+            alpha = rgba[:, 3:4]
+            rgba[:, :3] = rgba[:, :3] * alpha + destination[:, :3] * (1.0 - alpha)
+            rgba[:, 3:4] = alpha + destination[:, 3:4] * (1.0 - alpha)
+        elif batch["blend_mode"] == "additive":
+            destination = color[pixels] / 255.0
+            rgba[:, :3] = destination[:, :3] + rgba[:, :3] * rgba[:, 3:4]
+            rgba[:, 3] = destination[:, 3]
+        color[pixels] = np.clip(np.round(rgba * 255.0), 0, 255).astype(np.uint8)
+        
+        if batch["depth_write"]:
+            depth[pixels] = best_z[pixels]
+        
+        self.color[y0:y1, x0:x1] = color.reshape(y1 - y0, x1 - x0, 4)
+        self.depth[y0:y1, x0:x1] = depth.reshape(y1 - y0, x1 - x0)
+    
+    def _clustered_lighting(self, clusters, px: np.ndarray, py: np.ndarray, positions: np.ndarray,
+                            normals: np.ndarray) -> np.ndarray:
+        """Sum the point and spot lights of each pixel's cluster.
+        
+        Args:
+            clusters: LightClusters of the frame
+            px: Pixel columns
+            py: Pixel rows
+            positions: (p, 3) world positions
+            normals: (p, 3) unit world normals
+        
+        Returns:
+            (p, 3) light color reaching each pixel
+        """
+        vx, vy, vw, vh = self.viewport
+        view = clusters.view_matrix
+        depth = -(positions @ view[2, :3] + view[2, 3])
+        cluster = clusters.cluster_of((px + 0.5 - vx) / vw, (py + 0.5 - vy) / vh, depth)
+        
+        # One (pixel, light) pair per light listed in the pixel's cluster
+        first = clusters.offsets[cluster]
+        counts = clusters.offsets[cluster + 1] - first
+        total = int(counts.sum())
+        result = np.zeros((len(px), 3))
+        if not total:
+            return result
+        pixel = np.repeat(np.arange(len(px)), counts)
+        light = clusters.light_indices[np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(total)]
+        
+        # Lambert with a windowed falloff to zero at the range, and the spot cone's soft edge
+        to_light = clusters.positions[light] - positions[pixel]
+        distance = np.maximum(np.linalg.norm(to_light, axis=1), 1e-6)
+        to_light /= distance[:, None]
+        n_dot_l = np.maximum(np.einsum('ij,ij->i', normals[pixel], to_light), 0.0)
+        falloff = np.clip(1.0 - (distance / clusters.ranges[light]) ** 2, 0.0, 1.0) ** 2
+        cos_angle = -np.einsum('ij,ij->i', to_light, clusters.directions[light])
+        cos_outer, cos_inner = clusters.cos_outer[light], clusters.cos_inner[light]
+        cone = np.clip((cos_angle - cos_outer) / (cos_inner - cos_outer), 0.0, 1.0)
+        contribution = clusters.colors[light] * (n_dot_l * falloff * cone)[:, None]
+        
+        for channel in range(3):
+            result[:, channel] = np.bincount(pixel, weights=contribution[:, channel], minlength=len(px))
+        return result
+    
+    @staticmethod
+    def _barycentrics(screen: np.ndarray, px: np.ndarray, py: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Screen-space barycentric weights and depth.
+        
+        Args:
+            screen: (..., 3, 3) screen vertices, broadcast against the pixels
+            px: Pixel center x coordinates
+            py: Pixel center y coordinates
+        
+        Returns:
+            (..., 3) weights and (...) depth
+        """
+        x, y, z = screen[..., 0], screen[..., 1], screen[..., 2]
+        x0, x1, x2 = x[..., 0], x[..., 1], x[..., 2]
+        y0, y1, y2 = y[..., 0], y[..., 1], y[..., 2]
+        area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        w0 = ((x1 - px) * (y2 - py) - (x2 - px) * (y1 - py)) / area
+        w1 = ((x2 - px) * (y0 - py) - (x0 - px) * (y2 - py)) / area
+        w2 = 1.0 - w0 - w1
+        weights = np.stack([w0, w1, w2], axis=-1)
+        depth = w0 * z[..., 0] + w1 * z[..., 1] + w2 * z[..., 2]
+        return weights, depth
+    
+    def read_color(self) -> np.ndarray:
+        """Copy of the back buffer as (height, width, 4) uint8."""
+        return self.back_color.copy()
+    
+    def read_depth(self) -> np.ndarray:
+        """Copy of the back buffer depth as (height, width) float32."""
+        return self.back_depth.copy()
+    
+    def get_memory_usage(self) -> int:
+        """Bytes held by targets, buffers and textures."""
+        resources = sum(array.nbytes for array in itertools.chain(
+            self.buffers.values(), self.textures.values(), self.depth_targets.values()))
+        return self.back_color.nbytes + self.back_depth.nbytes + resources
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rasterizer statistics.
+        
+        Returns:
+            Dictionary of statistics
+        """
+        return {
+            "draw_calls": self.draw_calls,
+            "triangles_submitted": self.triangles_submitted,
+            "triangles_rasterized": self.triangles_rasterized,
+            "tiles_rasterized": self.tiles_rasterized,
+            "buffers": len(self.buffers),
+            "textures": len(self.textures),
+            "memory_bytes": self.get_memory_usage()
+        }
+    
+    def shutdown(self):
+        """Release resources and stop the worker threads."""
+        self._pool.shutdown(wait=True)
+        self.buffers.clear()
+        self.textures.clear()
+        self.depth_targets.clear()
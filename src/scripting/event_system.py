@@ -222,19 +222,23 @@ class EventSystem:
         """
         try:
             # Process priority listeners first
+            called = []
             if event.name in self.priority_listeners:
                 for priority in [EventPriority.CRITICAL, EventPriority.HIGH, 
                                EventPriority.NORMAL, EventPriority.LOW]:
                     if priority in self.priority_listeners[event.name]:
                         for callback in self.priority_listeners[event.name][priority]:
+                            called.append(callback)
                             try:
                                 callback(event)
                             except Exception as e:
                                 self.logger.error(f"Error in event callback for {event.name}: {e}")
             
-            # Process regular listeners
+            # Process regular listeners (subscribe() registers in both tables; call each once)
             if event.name in self.listeners:
                 for callback in self.listeners[event.name]:
+                    if callback in called:
+                        continue
                     try:
                         callback(event)
                     except Exception as e:
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script for Nexlify mesh loading.
+
+This script checks the mesh loaders end to end:
+- OBJ polygons are triangulated, welded and split by material
+- Missing OBJ normals are generated
+- Negative OBJ indices count back from the vertices defined so far
+- GLB buffers are read with node transforms applied
+- Compiled .nxmesh caches are memory-mapped and recompiled when stale
+"""
+
+import json
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.asset.mesh_loader import load_mesh_file, VERTEX_STRIDE
+from src.asset.nxmesh import load_or_compile, read_nxmesh, write_nxmesh, nxmesh_path
+
+
+def _write(directory: Path, name: str, data) -> str:
+    """Write a test file and return its path."""
+    path = directory / name
+    if isinstance(data, str):
+        path.write_text(data)
+    else:
+        path.write_bytes(data)
+    return str(path)
+
+
+def test_obj_quads_and_materials():
+    """Test OBJ triangulation, vertex welding and material submeshes."""
+    print("\n🧪 Testing OBJ loading...")
+
+    directory = Path(tempfile.mkdtemp())
+    path = _write(directory, "quad.obj", "\n".join([
+        "v 0 0 0", "v 1 0 0", "v 1 1 0", "v 0 1 0",
+        "vt 0 0", "vt 1 0", "vt 1 1", "vt 0 1",
+        "vn 0 0 1",
+        "usemtl red",
+        "f 1/1/1 2/2/1 3/3/1 4/4/1",
+        "usemtl blue",
+        "f -4/1/1 -2/3/1 -1/4/1",
+        ""
+    ]))
+
+    mesh = load_mesh_file(path)
+    assert mesh.vertices.shape == (4, VERTEX_STRIDE)
+    assert mesh.vertices.dtype == np.float32 and mesh.indices.dtype == np.uint32
+    assert mesh.indices.tolist() == [0, 1, 2, 0, 2, 3, 0, 2, 3]
+    assert [(s.first_index, s.index_count, s.material) for s in mesh.submeshes] == [(0, 6, "red"), (6, 3, "blue")]
+    assert mesh.uvs[2].tolist() == [1.0, 1.0]
+
+    print("✅ OBJ quad triangulated into 3 triangles over 2 materials")
+
+
+def test_obj_generated_normals():
+    """Test that OBJ files without normals get smooth normals."""
+    print("\n🧪 Testing generated normals...")
+
+    directory = Path(tempfile.mkdtemp())
+    path = _write(directory, "tri.obj", "v 0 0 0\nv 1 0 0\nv 0 0 -1\nf 1 2 3\n")
+
+    mesh = load_mesh_file(path)
+    assert np.allclose(mesh.normals, [0.0, 1.0, 0.0])
+
+    print("✅ Normals generated")
+
+
+def test_obj_relative_indices():
+    """Test negative OBJ indices in a file with several objects."""
+    print("\n🧪 Testing relative OBJ indices...")
+
+    # Each object refers to its own three vertices, defined just above its face
+    directory = Path(tempfile.mkdtemp())
+    path = _write(directory, "objects.obj", "\n".join([
+        "o first", "v 0 0 0", "v 1 0 0", "v 0 1 0", "f -3 -2 -1",
+        "o second", "v 5 0 0", "v 6 0 0", "v 5 1 0", "f -3 -2 -1",
+        ""
+    ]))
+
+    mesh = load_mesh_file(path)
+    assert mesh.indices.tolist() == [0, 1, 2, 3, 4, 5]
+    assert mesh.positions[mesh.indices].tolist() == [
+        [0, 0, 0], [1, 0, 0], [0, 1, 0], [5, 0, 0], [6, 0, 0], [5, 1, 0]
+    ]
+
+    print("✅ Negative indices resolved per object")
+
+
+def test_glb_loading():
+    """Test GLB chunk parsing, accessors and node transforms."""
+    print("\n🧪 Testing GLB loading...")
+
+    positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    indices = np.array([0, 1, 2], dtype=np.uint16)
+    binary = positions.tobytes() + indices.tobytes() + b"\0\0"
+
+    document = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0, "translation": [0, 0, 5]}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1, "material": 0}]}],
+        "materials": [{"name": "stone"}],
+        "buffers": [{"byteLength": len(binary)}],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": 36},
+            {"buffer": 0, "byteOffset": 36, "byteLength": 6}
+        ],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": 3, "type": "VEC3"},
+            {"bufferView": 1, "componentType": 5123, "count": 3, "type": "SCALAR"}
+        ]
+    }
+    json_chunk = json.dumps(document).encode()
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    glb = (
+        struct.pack("<III", 0x46546C67, 2, 28 + len(json_chunk) + len(binary))
+        + struct.pack("<II", len(json_chunk), 0x4E4F534A) + json_chunk
+        + struct.pack("<II", len(binary), 0x004E4942) + binary
+    )
+
+    mesh = load_mesh_file(_write(Path(tempfile.mkdtemp()), "tri.glb", glb))
+    assert mesh.positions.tolist() == [[0, 0, 5], [1, 0, 5], [0, 1, 5]]
+    assert mesh.indices.tolist() == [0, 1, 2]
+    assert mesh.submeshes[0].material == "stone"
+
+    print("✅ GLB triangle loaded at its node's translation")
+
+
+def test_nxmesh_cache():
+    """Test .nxmesh round trips, memory mapping and stale cache detection."""
+    print("\n🧪 Testing compiled mesh cache...")
+
+    directory = Path(tempfile.mkdtemp())
+    path = _write(directory, "quad.obj", "v 0 0 0\nv 2 0 0\nv 2 1 0\nv 0 1 0\nusemtl red\nf 1 2 3 4\n")
+
+    compiled = load_or_compile(path)
+    parsed = load_mesh_file(path)
+    assert isinstance(compiled.mesh.vertices, np.memmap)
+    assert np.array_equal(compiled.mesh.vertices, parsed.vertices)
+    assert np.array_equal(compiled.mesh.indices, parsed.indices)
+    assert compiled.mesh.submeshes[0].material == "red"
+    assert compiled.bounds[1].tolist() == [2.0, 1.0, 0.0]
+
+    # Editing the source invalidates the cache
+    _write(directory, "quad.obj", "v 0 0 0\nv 3 0 0\nv 0 1 0\nf 1 2 3\n")
+    recompiled = load_or_compile(path)
+    assert recompiled.mesh.index_count == 3 and recompiled.bounds[1][0] == 3.0
+
+    # Coarser levels are stored alongside LOD 0
+    lod_path = str(directory / "lods.nxmesh")
+    write_nxmesh(lod_path, parsed, "hash", lods=[(recompiled.mesh, 0.25)])
+    levels = read_nxmesh(lod_path)
+    assert levels.lod_errors == [0.0, 0.25]
+    assert levels.lods[1].indices.tolist() == [0, 1, 2]
+    assert levels.lods[1].vertices.ctypes.data % 64 == 0
+    assert load_mesh_file(nxmesh_path(path)).index_count == 3
+
+    print("✅ Compiled mesh mapped, recompiled after a source edit, LODs round-tripped")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Testing Nexlify Mesh Loading")
+    print("=" * 50)
+
+    try:
+        test_obj_quads_and_materials()
+        test_obj_generated_normals()
+        test_obj_relative_indices()
+        test_glb_loading()
+        test_nxmesh_cache()
+
+        print("\n" + "=" * 50)
+        print("✅ All tests completed successfully!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
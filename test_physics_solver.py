@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Test script for the Nexlify physics solver.
+
+This script checks the rigid body solver end to end:
+- Box stacks settle and fall asleep as one island
+- Long frames are capped at max_substeps and their time debt dropped or carried
+- The step profiler times every phase, counts solver iterations run and exports CSV
+- Separate stacks are solved as islands on worker threads and woken separately
+- Friction brings sliding bodies to rest
+- Layer matrix and category masks keep filtered bodies from colliding
+- Contacts are warm started from the previous step
+- Joint constraints hold their bodies together and can be removed
+- Fast bodies do not tunnel through thin walls with CCD enabled
+- Deterministic runs match bit for bit across worker processes
+- Restoring a snapshot replays the following steps bit for bit
+- Boxes rest on triangle-mesh level geometry and its BVH is cached by source hash
+- Trigger enter, stay and exit events reach the event system and Collider callbacks
+- Bodies drive their GameObject transforms and moved transforms move bodies, through parents
+"""
+
+import csv
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.physics import (
+    PhysicsEngine, PhysicsConfig, PhysicsStepMode, TimeDebtPolicy, RigidBody, Constraint,
+    BodyState, SimulationFarm, SimulationJob, TriangleMeshBVH, PhysicsWorld
+)
+from src.physics.simulation_farm import run_deterministic
+from src.physics.profiler import PHASES
+from src.asset.nxmesh import hash_source
+from src.scripting.event_system import EventSystem
+from src.core.components import Collider
+
+
+def _create_engine(config: PhysicsConfig = None) -> PhysicsEngine:
+    """Create a running engine with a large static floor at y=0."""
+    engine = PhysicsEngine(config or PhysicsConfig())
+    assert engine.initialize()
+    engine.start()
+
+    floor = RigidBody()
+    floor.set_mass(0)
+    floor.set_scale([100.0, 1.0, 100.0])
+    floor.set_position([0.0, -0.5, 0.0])
+    engine.add_rigid_body(floor)
+
+    return engine
+
+
+def _create_box(engine: PhysicsEngine, position) -> RigidBody:
+    """Create a unit box at the given position."""
+    body = RigidBody()
+    body.set_mass(1.0)
+    body.set_position(list(position))
+    engine.add_rigid_body(body)
+    return body
+
+
+def test_stack_settles_and_sleeps():
+    """Test that a box stack stays upright and sleeps as one island."""
+    print("🧪 Testing box stack...")
+
+    engine = _create_engine()
+    boxes = [_create_box(engine, [0.0, 0.5 + i, 0.0]) for i in range(3)]
+
+    for _ in range(300):
+        engine.step(1.0 / 60.0)
+
+    for i, box in enumerate(boxes):
+        assert abs(box.position[1] - (0.5 + i)) < 0.1, box.position
+    assert all(box.is_sleeping() for box in boxes)
+
+    print(f"✅ Stack settled: {[round(box.position[1], 3) for box in boxes]}")
+    engine.shutdown()
+
+
+def test_friction_stops_sliding_box():
+    """Test that friction stops a sliding box at the expected distance."""
+    print("\n🧪 Testing friction...")
+
+    engine = _create_engine()
+    box = _create_box(engine, [0.0, 0.49, 0.0])
+    box.linear_damping = 0.0
+    box.set_linear_velocity([3.0, 0.0, 0.0])
+
+    for _ in range(120):
+        engine.step(1.0 / 60.0)
+
+    # v^2 / (2 * mu * g) with mu = 0.5
+    expected = 3.0 * 3.0 / (2.0 * 0.5 * 9.81)
+    assert abs(box.linear_velocity[0]) < 1e-3
+    assert abs(box.position[0] - expected) < 0.15, box.position
+
+    print(f"✅ Box slid {box.position[0]:.3f} (expected {expected:.3f})")
+    engine.shutdown()
+
+
+def test_long_frame_substeps():
+    """Test the substep cap and time debt policies on a one second frame."""
+    print("\n🧪 Testing long frames...")
+
+    for mode, step in ((PhysicsStepMode.FIXED, 1.0 / 60.0), (PhysicsStepMode.ADAPTIVE, 1.0 / 30.0)):
+        for policy in (TimeDebtPolicy.DROP, TimeDebtPolicy.CARRY):
+            engine = _create_engine(PhysicsConfig(step_mode=mode, max_substeps=4, time_debt_policy=policy))
+            _create_box(engine, [0.0, 2.0, 0.0])
+
+            engine.step(1.0)
+            assert engine.stats.substeps == 4 and engine.step_count == 4
+
+            if policy == TimeDebtPolicy.DROP:
+                # Whatever the cap left over is gone; fixed steps only keep their partial step
+                limit = step if mode == PhysicsStepMode.FIXED else 0.0
+                assert engine.stats.time_debt == engine.accumulator <= limit + 1e-9
+            else:
+                # At most one capped frame is carried and caught up on the next frame
+                assert abs(engine.stats.time_debt - 4 * step) < 1e-9
+                engine.step(0.0)
+                assert engine.stats.substeps == 4 and engine.step_count == 8
+            engine.shutdown()
+
+    print("✅ Substeps capped at 4, time debt dropped or carried by policy")
+
+
+def test_step_profiler():
+    """Test phase timings, solver iteration counts and the CSV export."""
+    print("\n🧪 Testing step profiler...")
+
+    engine = _create_engine(PhysicsConfig(profile_steps=True, profile_history=50))
+    for i in range(3):
+        _create_box(engine, [0.0, 0.5 + i, 0.0])
+    for _ in range(60):
+        engine.step(1.0 / 60.0)
+
+    samples = engine.profiler.get_samples()
+    assert len(samples) == 50
+    last = samples[-1]
+    phases = [getattr(last, f"{phase}_ns") for phase in PHASES]
+    assert last.integrate_ns > 0 and last.solver_ns > 0 and last.total_ns >= sum(phases)
+
+    # Iterations are the ones run, which end early once the resting stack has converged
+    resolver = engine.collision_resolver
+    configured = resolver.position_iterations + resolver.velocity_iterations
+    assert 0 < last.solver_iterations < configured
+    assert last.solver_iterations == resolver.iterations_used
+
+    path = Path(tempfile.mkdtemp()) / "steps.csv"
+    assert engine.profiler.export_csv(str(path))
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [{name: str(value) for name, value in asdict(sample).items()} for sample in samples] == rows
+
+    print(f"✅ {len(rows)} samples exported, {last.solver_iterations} of {configured} iterations used at rest")
+    engine.shutdown()
+
+
+def test_islands_solve_and_sleep_separately():
+    """Test that separate stacks are solved as islands on worker threads."""
+    print("\n🧪 Testing islands...")
+
+    def run(workers: int):
+        engine = _create_engine(PhysicsConfig(solver_workers=workers))
+        stacks = [[_create_box(engine, [x, 0.5 + i, 0.0]) for i in range(3)] for x in (-5.0, 5.0)]
+        for _ in range(30):
+            engine.step(1.0 / 60.0)
+        return engine, stacks
+
+    # Threaded islands merge into the same contacts and poses as solving inline
+    engine, stacks = run(2)
+    inline, inline_stacks = run(0)
+    assert engine.stats.islands == 2
+    assert engine.collision_resolver.get_stats()["cached_contacts"] == 24
+    assert sorted(engine.collision_resolver.contact_cache.values()) == \
+        sorted(inline.collision_resolver.contact_cache.values())
+    for stack, inline_stack in zip(stacks, inline_stacks):
+        assert [box.position for box in stack] == [box.position for box in inline_stack]
+    inline.shutdown()
+
+    for _ in range(300):
+        engine.step(1.0 / 60.0)
+    assert all(box.is_sleeping() for stack in stacks for box in stack)
+
+    # A box dropped on one stack wakes that whole island in one step and leaves the other asleep
+    _create_box(engine, [-5.0, 4.0, 0.0])
+    for _ in range(60):
+        engine.step(1.0 / 60.0)
+        awake = [not box.is_sleeping() for box in stacks[0]]
+        if any(awake):
+            break
+    assert all(awake), awake
+    for _ in range(30):
+        engine.step(1.0 / 60.0)
+    assert not any(box.is_sleeping() for box in stacks[0])
+    assert all(box.is_sleeping() for box in stacks[1])
+
+    print(f"✅ Two islands solved on threads, {engine.stats.sleeping_islands} asleep after the drop")
+    engine.shutdown()
+
+
+def test_collision_filtering():
+    """Test that the layer matrix and category masks filter contacts."""
+    print("\n🧪 Testing collision filtering...")
+
+    engine = _create_engine()
+    floor = engine.world.get_rigid_bodies()[0]
+    floor.set_collision_filter(0x1, 0x1)
+    engine.collision_detector.layer_matrix.set_layer_collision(0, 2, False)
+
+    # One box resting normally, one on a layer that ignores the floor's, one outside the floor's mask
+    resting = _create_box(engine, [-3.0, 0.49, 0.0])
+    layered = _create_box(engine, [0.0, 0.49, 0.0])
+    layered.set_layer(2)
+    masked = _create_box(engine, [3.0, 0.49, 0.0])
+    masked.set_collision_filter(0x2, 0xFFFFFFFF)
+
+    for _ in range(30):
+        engine.step(1.0 / 60.0)
+
+    assert abs(resting.position[1] - 0.5) < 0.05, resting.position
+    assert layered.position[1] < 0.0 and masked.position[1] < 0.0
+    assert engine.collision_detector.filtered_pairs >= 2
+
+    try:
+        resting.set_layer(32)
+        assert False, "layer 32 accepted"
+    except ValueError:
+        pass
+    assert resting.layer == 0
+
+    print(f"✅ {engine.collision_detector.filtered_pairs} pairs filtered, filtered boxes fell through")
+    engine.shutdown()
+
+
+def test_contacts_are_warm_started():
+    """Test that persistent contacts reuse cached impulses."""
+    print("\n🧪 Testing warm starting...")
+
+    engine = _create_engine()
+    _create_box(engine, [0.0, 0.49, 0.0])
+
+    for _ in range(10):
+        engine.step(1.0 / 60.0)
+
+    stats = engine.collision_resolver.get_stats()
+    assert stats["cached_contacts"] == 4
+    assert stats["warm_started_contacts"] > 0
+
+    print(f"✅ Warm started {stats['warm_started_contacts']} contacts")
+    engine.shutdown()
+
+
+def test_joint_constraints():
+    """Test that distance and hinge joints keep their anchors together."""
+    print("\n🧪 Testing joint constraints...")
+
+    engine = _create_engine()
+    anchors = []
+    for x in (-5.0, 5.0):
+        anchor = RigidBody()
+        anchor.set_mass(0)
+        anchor.set_scale([0.1, 0.1, 0.1])
+        anchor.set_position([x, 10.0, 0.0])
+        engine.add_rigid_body(anchor)
+        anchors.append(anchor)
+
+    pendulum = _create_box(engine, [-3.0, 10.0, 0.0])
+    door = _create_box(engine, [6.0, 10.0, 0.0])
+    rope = Constraint(anchors[0], pendulum, "distance", {"length": 2.0})
+    hinge = Constraint(anchors[1], door, "hinge", {"pivot": [5.0, 10.0, 0.0], "axis": [0.0, 0.0, 1.0]})
+    assert engine.world.add_constraint(rope)
+    assert engine.world.add_constraint(hinge)
+
+    for _ in range(120):
+        engine.step(1.0 / 60.0)
+
+    length = sum((p - a) ** 2 for p, a in zip(pendulum.position, anchors[0].position)) ** 0.5
+    radius = sum((p - a) ** 2 for p, a in zip(door.position, anchors[1].position)) ** 0.5
+    assert abs(length - 2.0) < 0.05, length
+    assert abs(radius - 1.0) < 0.05, radius
+    assert abs(door.position[2]) < 1e-6
+
+    assert engine.world.remove_constraint(rope)
+    assert engine.world.get_constraints() == [hinge]
+    engine.remove_rigid_body(door)
+    assert engine.world.get_constraints() == []
+
+    print(f"✅ Pendulum length {length:.3f}, hinge radius {radius:.3f}")
+    engine.shutdown()
+
+
+def test_ccd_prevents_tunnelling():
+    """Test that a fast projectile stops at a thin wall only with CCD."""
+    print("\n🧪 Testing continuous collision detection...")
+
+    for enable_ccd in (False, True):
+        config = PhysicsConfig(gravity=[0.0, 0.0, 0.0], fixed_timestep=1.0 / 30.0, enable_ccd=enable_ccd)
+        engine = PhysicsEngine(config)
+        assert engine.initialize()
+        engine.start()
+
+        wall = RigidBody()
+        wall.set_mass(0)
+        wall.set_scale([0.1, 5.0, 5.0])
+        wall.set_position([5.0, 0.0, 0.0])
+        engine.add_rigid_body(wall)
+
+        projectile = _create_box(engine, [0.0, 0.0, 0.0])
+        projectile.set_scale([0.2, 0.2, 0.2])
+        projectile.set_linear_velocity([200.0, 0.0, 0.0])
+
+        for _ in range(5):
+            engine.step(1.0 / 30.0)
+
+        if enable_ccd:
+            assert projectile.position[0] < 5.0, projectile.position
+            assert projectile.linear_velocity[0] <= 0.0
+        else:
+            assert projectile.position[0] > 5.0, projectile.position
+
+        engine.shutdown()
+
+    print("✅ Projectile stopped at the wall with CCD")
+
+
+def _build_pile(engine: PhysicsEngine):
+    """Build a small, slightly offset box pile (used by the simulation farm)."""
+    floor = RigidBody()
+    floor.set_mass(0)
+    floor.set_scale([100.0, 1.0, 100.0])
+    floor.set_position([0.0, -0.5, 0.0])
+    engine.add_rigid_body(floor)
+
+    for i in range(6):
+        _create_box(engine, [0.3 * (i % 3), 0.5 + 1.1 * i, 0.2 * (i % 2)])
+
+
+def test_deterministic_farm():
+    """Test that farm workers reproduce an in-process run exactly."""
+    print("\n🧪 Testing deterministic simulation farm...")
+
+    jobs = [SimulationJob(setup=_build_pile, steps=120, name=f"pile_{i}") for i in range(3)]
+    results = SimulationFarm(max_workers=2).run(jobs)
+
+    local_state = BodyState(64)
+    local_checksum = run_deterministic(jobs[0], local_state)
+
+    assert all(not result.error for result in results)
+    assert {result.checksum for result in results} == {local_checksum}
+    assert results[0].state.count == 7
+    assert (results[0].state.position == local_state.position[:7]).all()
+
+    print(f"✅ {len(results)} runs matched checksum {local_checksum[:12]}")
+
+
+def test_snapshot_replay():
+    """Test that restoring a snapshot replays the same steps exactly."""
+    print("\n🧪 Testing snapshot replay...")
+
+    engine = PhysicsEngine(PhysicsConfig(deterministic=True, snapshot_capacity=4))
+    assert engine.initialize()
+    engine.start()
+    _build_pile(engine)
+    boxes = [body for body in engine.world.get_rigid_bodies() if not body.is_static_body()]
+
+    # A box falling through a trigger volume: inside it at frame 20, below it by frame 40
+    boxes.append(_create_box(engine, [10.0, 5.0, 0.0]))
+    sensor = RigidBody()
+    sensor.set_mass(0)
+    sensor.set_trigger(True)
+    sensor.set_scale([2.0, 1.0, 2.0])
+    sensor.set_position([10.0, 4.4, 0.0])
+    engine.add_rigid_body(sensor)
+
+    for _ in range(20):
+        engine.step(1.0 / 60.0)
+    frame = engine.save_snapshot()
+    assert frame == 20
+    overlaps = dict(engine.trigger_system.trigger_overlaps)
+    assert overlaps
+
+    for _ in range(20):
+        engine.step(1.0 / 60.0)
+    expected = [list(box.position) for box in boxes]
+    assert not engine.trigger_system.trigger_overlaps
+
+    # Overlaps come back with the bodies, so the replay does not report them entering again
+    assert engine.restore_snapshot(frame)
+    assert engine.trigger_system.trigger_overlaps == overlaps
+    engine.step(1.0 / 60.0)
+    assert not engine.trigger_system.last_events["physics.trigger_enter"]
+    for _ in range(19):
+        engine.step(1.0 / 60.0)
+    assert [list(box.position) for box in boxes] == expected
+
+    print(f"✅ Frames 20-40 replayed bit for bit with {len(overlaps)} trigger overlaps restored")
+    engine.shutdown()
+
+
+def test_mesh_collider(tmp_path=None):
+    """Test box contacts and raycasts against a cached triangle-mesh floor."""
+    print("\n🧪 Testing triangle mesh collider...")
+
+    import numpy as np
+
+    # A 60x60 floor made of two triangles, cached next to its asset
+    asset_path = Path(tmp_path or tempfile.mkdtemp()) / "floor.obj"
+    asset_path.write_text("v -30 0 -30\nv 30 0 -30\nv 30 0 30\nv -30 0 30\nf 1 3 2\nf 1 4 3\n")
+    mesh = TriangleMeshBVH.load_or_build(str(asset_path))
+    assert Path(TriangleMeshBVH.cache_path(str(asset_path))).exists()
+    assert mesh.source_hash == hash_source(str(asset_path)) and len(mesh.triangles) == 2
+
+    # The cache is checked against the file alone; editing the file rebuilds it
+    empty = np.zeros((0, 3))
+    assert len(TriangleMeshBVH.load_or_build(str(asset_path), empty, empty).triangles) == 2
+    asset_path.write_text(asset_path.read_text() + "v 0 5 0\nf 1 2 5\n")
+    assert len(TriangleMeshBVH.load_or_build(str(asset_path)).triangles) == 3
+
+    engine = PhysicsEngine(PhysicsConfig())
+    assert engine.initialize()
+    engine.start()
+
+    floor = RigidBody()
+    floor.set_mesh_collider(mesh)
+    engine.add_rigid_body(floor)
+    box = _create_box(engine, [2.0, 3.0, 1.0])
+
+    # Far from the mesh origin the lever arm would spin the floor if it kept any inertia
+    distant = _create_box(engine, [20.0, 0.6, 20.0])
+
+    for _ in range(300):
+        engine.step(1.0 / 60.0)
+
+    assert abs(box.position[1] - 0.5) < 0.05, box.position
+    assert abs(distant.position[1] - 0.5) < 0.05 and distant.is_sleeping(), distant.position
+    hit = engine.raycast([4.0, 5.0, -3.0], [0.0, -1.0, 0.0])
+    assert hit and hit["body"] is floor and abs(hit["distance"] - 5.0) < 1e-9
+    assert hit["normal"] == [0.0, 1.0, 0.0]
+    assert engine.world.raycast([4.0, 5.0, -3.0], [0.0, -1.0, 0.0]) == hit
+    engine.shutdown()
+
+    # A world used without an engine answers raycasts with its own detector
+    world = PhysicsWorld(PhysicsConfig())
+    assert world.initialize()
+    world.add_rigid_body(RigidBody())
+    assert world.raycast([0.0, 5.0, 0.0], [0.0, -1.0, 0.0])["distance"] == 4.5
+
+    print(f"✅ Box rests on the mesh at y={box.position[1]:.3f}")
+
+
+def test_trigger_events():
+    """Test trigger enter, stay and exit events and Collider callbacks."""
+    print("\n🧪 Testing trigger events...")
+
+    class RecordingCollider(Collider):
+        def __init__(self, is_trigger: bool = False):
+            super().__init__(is_trigger)
+            self.calls = []
+
+        def on_trigger_enter(self, other):
+            self.calls.append(("enter", other))
+
+        def on_trigger_stay(self, other):
+            self.calls.append(("stay", other))
+
+        def on_trigger_exit(self, other):
+            self.calls.append(("exit", other))
+
+    events = EventSystem()
+    assert events.initialize()
+    batches = []
+    for name in ("physics.trigger_enter", "physics.trigger_stay", "physics.trigger_exit"):
+        events.subscribe(name, lambda event: batches.append((event.name, len(event.data["pairs"]))))
+
+    engine = PhysicsEngine(PhysicsConfig(gravity=[0.0, 0.0, 0.0]))
+    assert engine.initialize()
+    engine.start()
+    engine.set_event_system(events)
+
+    # A box gliding through a sensor volume
+    sensor = RigidBody()
+    sensor.set_mass(0)
+    sensor.set_scale([2.0, 2.0, 2.0])
+    sensor_collider = RecordingCollider(is_trigger=True)
+    sensor_collider.apply_filter(sensor)
+    engine.add_rigid_body(sensor)
+
+    box = _create_box(engine, [-3.0, 0.0, 0.0])
+    box.linear_damping = 0.0
+    box.set_linear_velocity([6.0, 0.0, 0.0])
+    box_collider = RecordingCollider()
+    box_collider.apply_filter(box)
+
+    for _ in range(60):
+        engine.step(1.0 / 60.0)
+        events.update(1.0 / 60.0)
+
+    # Events are batched per step and the box passes straight through
+    names = [name for name, _ in batches]
+    assert names[0] == "physics.trigger_enter" and names[-1] == "physics.trigger_exit"
+    assert set(names[1:-1]) == {"physics.trigger_stay"} and len(names) > 3
+    assert all(count == 1 for _, count in batches)
+    assert abs(box.position[0] - 3.0) < 1e-6
+
+    # Both colliders are told, each about the other
+    kinds = [kind for kind, _ in sensor_collider.calls]
+    assert kinds == [name.split("_")[-1] for name in names]
+    assert all(other is box_collider for _, other in sensor_collider.calls)
+    assert [kind for kind, _ in box_collider.calls] == kinds
+
+    print(f"✅ Enter, {len(names) - 2} stays and exit delivered through the event system")
+    engine.shutdown()
+
+
+def test_transform_sync():
+    """Test that bound transforms follow their bodies and push teleports."""
+    print("\n🧪 Testing transform sync...")
+
+    import numpy as np
+    from src.core.game_object import GameObject
+
+    engine = _create_engine()
+    game_object = GameObject("Crate")
+    game_object.transform.set_position(0.0, 3.0, 0.0)
+
+    body = RigidBody()
+    engine.add_rigid_body(body)
+    assert engine.bind_transform(body, game_object)
+    assert body.position == [0.0, 3.0, 0.0]
+
+    for _ in range(30):
+        engine.step(1.0 / 60.0)
+    assert game_object.transform.position[1] < 3.0
+    assert not game_object.transform.dirty
+
+    # Moving the transform teleports the body on the next step
+    game_object.transform.set_position(4.0, 2.0, 0.0)
+    engine.step(0.0)
+    assert body.position == [4.0, 2.0, 0.0]
+
+    # A child of a turned, scaled parent starts at its world pose
+    parent = GameObject("Shelf")
+    parent.transform.set_position(10.0, 0.0, 0.0)
+    parent.transform.set_rotation(0.0, 90.0, 0.0)
+    parent.transform.set_scale(2.0, 2.0, 2.0)
+    child = GameObject("Jar")
+    child.set_parent(parent)
+    child.transform.set_position(1.0, 3.0, 0.0)
+
+    child_body = RigidBody()
+    engine.add_rigid_body(child_body)
+    assert engine.bind_transform(child_body, child)
+    assert np.allclose(child_body.position, [10.0, 6.0, -2.0])
+    assert np.allclose(child_body.rotation, [0.0, np.pi / 2, 0.0])
+
+    # Its fall is written back in the parent's space
+    for _ in range(30):
+        engine.step(1.0 / 60.0)
+    assert np.allclose(child.transform.position[0::2], [1.0, 0.0]) and child.transform.position[1] < 3.0
+    assert np.allclose(child.transform.rotation, [0.0, 0.0, 0.0], atol=1e-9)
+    world = child.get_world_matrix()[:3, 3]
+    assert np.allclose(world[0::2], child_body.position[0::2])
+    assert abs(world[1] - child_body.position[1]) <= abs(child_body.linear_velocity[1]) / 60.0 + 1e-9
+
+    # Moving the parent carries the body along
+    parent.transform.set_position(20.0, 0.0, 0.0)
+    engine.step(0.0)
+    assert np.allclose([child_body.position[0], child_body.position[2]], [20.0, -2.0])
+
+    engine.shutdown()
+    print("✅ Transforms followed their bodies, in world and parent space")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Testing Nexlify Physics Solver")
+    print("=" * 50)
+
+    try:
+        test_stack_settles_and_sleeps()
+        test_long_frame_substeps()
+        test_step_profiler()
+        test_islands_solve_and_sleep_separately()
+        test_friction_stops_sliding_box()
+        test_collision_filtering()
+        test_contacts_are_warm_started()
+        test_joint_constraints()
+        test_ccd_prevents_tunnelling()
+        test_deterministic_farm()
+        test_snapshot_replay()
+        test_mesh_collider()
+        test_trigger_events()
+        test_transform_sync()
+
+        print("\n" + "=" * 50)
+        print("✅ All tests completed successfully!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
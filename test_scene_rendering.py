@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""
+Test script for Nexlify scene rendering.
+
+This script checks the scene renderer's CPU side:
+- Renderers and lights are extracted from the scene graph with world matrices
+- Extraction only rewrites objects that changed
+- Frustum culling keeps exactly the objects the camera can see
+- The software backend rasterizes with depth testing and near clipping
+- Instancing and static batching cut draw calls without changing the image
+- The render queue groups opaque draws by state and sorts transparent ones back to front
+- The render graph culls unused passes, orders by dependencies and aliases targets
+- Command lists recorded in chunks on worker threads submit the same frame
+- Simplified detail levels are chosen by screen size with hysteresis, including
+  levels the asset pipeline generated for a source mesh
+- Hi-Z occlusion culling drops objects hidden behind occluders, not visible ones,
+  even past occluder edges that fall inside an occlusion texel
+- Clustered light lists shade the same as testing every light at every pixel
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.core.game_object import GameObject
+from src.core.scene import Scene
+from src.core.components import MeshRenderer, Light, Camera
+from src.rendering.scene_extraction import SceneExtractor, FLAG_VISIBLE
+from src.rendering.culling import FrustumCuller, frustum_planes, aabbs_in_frustum
+from src.rendering.device import GraphicsDevice, GraphicsAPI
+from src.rendering.renderer import Renderer
+from src.rendering.pipeline import RenderPass
+from src.rendering.render_graph import RenderGraph
+from src.rendering.command_list import CommandRecorder
+from src.rendering.occlusion import build_hiz
+from src.rendering.light_clustering import LightClusterer
+from src.rendering.primitives import create_plane, create_icosphere
+from src.asset.mesh_simplifier import generate_lods
+from src.asset.nxmesh import write_nxmesh
+from src.asset.asset_pipeline import AssetPipeline, AssetInfo, AssetType
+
+
+@contextmanager
+def software_renderer(width: int = 64, height: int = 48):
+    """Run a software renderer in a temporary working directory.
+
+    The resource manager creates its asset folders in the working
+    directory, so each test gets its own.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        renderer = Renderer(GraphicsAPI.SOFTWARE)
+        try:
+            assert renderer.initialize(0, width, height)
+            yield renderer
+        finally:
+            renderer.shutdown()
+            os.chdir(cwd)
+
+
+def test_scene_extraction():
+    """Test hierarchical extraction and incremental updates."""
+    print("\n🧪 Testing scene extraction...")
+
+    scene = Scene()
+    parent = GameObject("Parent")
+    scene.add_game_object(parent)
+    parent.transform.set_position(5.0, 0.0, 0.0)
+    parent.transform.set_rotation(0.0, 90.0, 0.0)
+
+    child = GameObject("Child")
+    scene.add_game_object(child, parent)
+    child.transform.set_position(0.0, 0.0, 2.0)
+    renderer = child.add_component(MeshRenderer())
+
+    lamp = GameObject("Lamp")
+    scene.add_game_object(lamp)
+    lamp.add_component(Light("Directional"))
+    lamp.transform.set_rotation(-90.0, 0.0, 0.0)
+
+    extractor = SceneExtractor()
+    assert extractor.extract(scene) == 1
+    assert np.allclose(extractor.bounds_center[0], [7.0, 0.0, 0.0], atol=1e-5)
+    assert np.allclose(extractor.lights[0].direction, [0.0, -1.0, 0.0], atol=1e-6)
+
+    # Nothing changed, nothing rewritten
+    assert extractor.extract(scene) == 0
+
+    # Moving the parent moves the child
+    parent.transform.translate(0.0, 3.0, 0.0)
+    assert extractor.extract(scene) == 1
+    assert np.allclose(extractor.bounds_center[0], [7.0, 3.0, 0.0], atol=1e-5)
+
+    # Layer changes reach the slot, for camera culling masks
+    child.set_layer(5)
+    assert extractor.extract(scene) == 1
+    assert extractor.layers[0] == 5
+
+    # Disabled renderers and lights stop being extracted
+    renderer.set_enabled(False)
+    lamp.get_component(Light).set_enabled(False)
+    extractor.extract(scene)
+    assert extractor.count == 0 and not extractor.lights
+    renderer.set_enabled(True)
+    extractor.extract(scene)
+    assert extractor.count == 1 and extractor.flags[0] & FLAG_VISIBLE
+
+    renderer.set_visible(False)
+    extractor.extract(scene)
+    assert not extractor.flags[0] & FLAG_VISIBLE
+
+    child.remove_component(renderer)
+    extractor.extract(scene)
+    assert extractor.count == 0
+
+    print("✅ Hierarchy extracted, unchanged frames skipped, layers, disables and removals tracked")
+
+
+def test_frustum_culling():
+    """Test camera matrices and chunked frustum culling."""
+    print("\n🧪 Testing frustum culling...")
+
+    eye = GameObject("Eye")
+    eye.transform.set_position(0.0, 0.0, 10.0)
+    camera = eye.add_component(Camera(fov=90.0, near_clip=1.0, far_clip=100.0))
+    camera.set_aspect_ratio(1.0)
+
+    # The near plane maps to depth -1, a point on the view axis to the center
+    clip = camera.get_view_projection_matrix() @ np.array([0.0, 0.0, 9.0, 1.0])
+    assert np.allclose(clip[:3] / clip[3], [0.0, 0.0, -1.0])
+
+    scene = Scene()
+    rng = np.random.default_rng(7)
+    for index, position in enumerate(rng.uniform(-150.0, 150.0, size=(3000, 3))):
+        cube = GameObject(f"Cube{index}")
+        scene.add_game_object(cube)
+        cube.transform.set_position(*position.tolist())
+        cube.add_component(MeshRenderer())
+
+    extractor = SceneExtractor()
+    extractor.extract(scene)
+    indices = np.arange(extractor.count)
+    planes = frustum_planes(camera.get_view_projection_matrix())
+
+    culler = FrustumCuller(chunk_size=32, hierarchy_threshold=1000)
+    visible = culler.cull(extractor, indices, planes)
+    expected = indices[aabbs_in_frustum(planes, extractor.bounds_min[:extractor.count], extractor.bounds_max[:extractor.count])]
+    assert 0 < len(visible) < len(indices)
+    assert np.array_equal(visible, expected)
+    assert culler.get_stats()["tested_objects"] < len(indices)
+
+    # Everything visible sits in front of the camera within 90 degrees
+    centers = extractor.bounds_center[visible]
+    depth = 10.0 - centers[:, 2]
+    assert np.all(depth > 1.0 - np.sqrt(3.0))
+    assert np.all(np.abs(centers[:, :2]) <= depth[:, None] + np.sqrt(6.0))
+
+    print(f"✅ {len(visible)} of {len(indices)} objects visible, "
+          f"{culler.get_stats()['tested_objects']} tested individually")
+
+
+def test_software_rasterizer():
+    """Test headless rendering with the software backend."""
+    print("\n🧪 Testing software rasterizer...")
+
+    device = GraphicsDevice(GraphicsAPI.SOFTWARE)
+    assert device.initialize(0, 64, 64)
+
+    eye = GameObject("Eye")
+    camera = eye.add_component(Camera(fov=90.0, near_clip=0.1, far_clip=50.0))
+    camera.set_aspect_ratio(1.0)
+    device.set_shader_constants({"view_projection": camera.get_view_projection_matrix(),
+                                 "light_direction": (0.0, 0.0, -1.0), "ambient": 1.0})
+
+    def upload(mesh):
+        return (device.create_buffer(mesh.vertices.nbytes, "vertex", mesh.vertices.data),
+                device.create_buffer(mesh.indices.nbytes, "index", mesh.indices.data),
+                mesh.index_count)
+
+    def draw(buffers, world, color):
+        device.set_vertex_buffer(buffers[0], 32)
+        device.set_index_buffer(buffers[1])
+        device.set_shader_constants({"world": world, "base_color": color})
+        device.draw_indexed(buffers[2])
+
+    # A ground plane reaching behind the camera, drawn after a nearer ball
+    ground = np.eye(4)
+    ground[1, 3] = -1.0
+    ball = np.eye(4)
+    ball[2, 3] = -3.0
+    device.clear_render_target((0.0, 0.0, 0.0, 1.0))
+    device.clear_depth_stencil()
+    draw(upload(create_icosphere(1.0, 2)), ball, (1.0, 0.0, 0.0, 1.0))
+    draw(upload(create_plane(40.0, 40.0)), ground, (0.0, 1.0, 0.0, 1.0))
+
+    image = device.read_render_target()
+    assert image.shape == (64, 64, 4)
+    assert tuple(image[32, 32]) == (255, 0, 0, 255)  # ball in front of the ground
+    assert tuple(image[2, 32]) == (0, 0, 0, 255)  # sky above the horizon
+    assert tuple(image[62, 2]) == (0, 255, 0, 255)  # near-clipped ground below it
+
+    # Blending over the opaque result without writing depth
+    device.set_render_state("alpha", depth_test=True, depth_write=False, cull_mode="back")
+    glass = np.eye(4)
+    glass[2, 3] = -1.5
+    glass[0, 0] = glass[1, 1] = glass[2, 2] = 0.25
+    draw(upload(create_icosphere(1.0, 2)), glass, (0.0, 0.0, 1.0, 0.5))
+    assert np.allclose(device.read_render_target()[32, 32], (128, 0, 128, 255), atol=1)
+
+    used, _ = device.get_memory_usage()
+    assert used >= 0
+    device.shutdown()
+
+    print("✅ Depth test, near clipping and blending produce the expected pixels")
+
+
+def test_batching():
+    """Test instanced and static batches against individual draws."""
+    print("\n🧪 Testing draw batching...")
+
+    with software_renderer() as renderer:
+
+        scene = Scene()
+        rng = np.random.default_rng(3)
+        for index, (x, z) in enumerate(rng.uniform(-20.0, 20.0, size=(300, 2))):
+            tree = GameObject(f"Tree{index}")
+            scene.add_game_object(tree)
+            tree.transform.set_position(x, 0.0, z - 25.0)
+            tree.transform.set_scale(0.3, 1.5, 0.3)
+            tree.add_component(MeshRenderer())
+            tree.set_static(index % 2 == 0)
+
+        eye = GameObject("Eye")
+        scene.add_game_object(eye)
+        eye.transform.set_position(0.0, 3.0, 0.0)
+        camera = eye.add_component(Camera())
+        camera.set_aspect_ratio(64.0 / 48.0)
+
+        scene_renderer = renderer.scene_renderer
+        scene_renderer.instancing_enabled = False
+        renderer.render_scene(scene, camera)
+        individual = renderer.device.read_render_target()
+        objects = renderer.pipeline.get_stats()["objects"]
+        assert renderer.pipeline.get_stats()["draw_calls"] == objects
+
+        scene_renderer.instancing_enabled = True
+        renderer.render_scene(scene, camera)
+        stats = renderer.pipeline.get_stats()
+        assert stats["draw_calls"] == 1 and stats["objects"] == objects
+        assert np.array_equal(renderer.device.read_render_target(), individual)
+
+        assert scene_renderer.build_static_batches(scene) > 0
+        renderer.render_scene(scene, camera)
+        stats = renderer.pipeline.get_stats()
+        # Batches are culled as a whole, so they may carry objects outside the view
+        assert stats["objects"] >= objects and stats["draw_call_reduction"] > 0.9
+        assert np.mean(renderer.device.read_render_target() != individual) < 0.01
+
+        # Moving a batched object returns its batch to individual drawing
+        batches = len(scene_renderer.static_batcher.batches)
+        scene_renderer.static_batcher.batches[0].renderers[0].game_object.transform.translate(0.0, 1.0, 0.0)
+        renderer.render_scene(scene, camera)
+        assert len(scene_renderer.static_batcher.batches) == batches - 1
+
+    print(f"✅ {objects} objects in {stats['draw_calls']} draws, same image as individual draws")
+
+
+def test_render_queue():
+    """Test sort key ordering and elided state changes."""
+    print("\n🧪 Testing render queue...")
+
+    with software_renderer() as renderer:
+        shaders = renderer.shader_manager
+        assert shaders.create_shader_program("unlit", shaders.get_shader_program("default"))
+        resources = renderer.resource_manager
+        resources.create_material("red", {"base_color": (1.0, 0.0, 0.0, 1.0)})
+        resources.create_material("blue", {"base_color": (0.0, 0.0, 1.0, 1.0), "shader": "unlit"})
+        resources.create_material("glass", {"base_color": (1.0, 1.0, 1.0, 0.5), "transparent": True})
+
+        scene = Scene()
+        rng = np.random.default_rng(5)
+        materials = ["red", "blue", "glass"]
+        for index, (x, y, z) in enumerate(rng.uniform((-8.0, -4.0, -40.0), (8.0, 4.0, -5.0), size=(90, 3))):
+            box = GameObject(f"Box{index}")
+            scene.add_game_object(box)
+            box.transform.set_position(x, y, z)
+            box.add_component(MeshRenderer(material_path=materials[index % 3]))
+
+        eye = GameObject("Eye")
+        scene.add_game_object(eye)
+        camera = eye.add_component(Camera())
+        camera.set_aspect_ratio(64.0 / 48.0)
+
+        scene_renderer = renderer.scene_renderer
+        scene_renderer.instancing_enabled = False
+        renderer.render_scene(scene, camera)
+        stats = renderer.pipeline.get_stats()
+        sorted_changes = stats["state_changes"]
+
+        queue = scene_renderer.render_queue
+        extractor = scene_renderer.extractor
+        opaque, transparent = queue.opaque, queue.transparent
+        assert len(opaque) and len(transparent)
+        assert np.all(np.diff(queue.keys.astype(np.float64)) >= 0)
+
+        # Opaque objects come in one group per material, front to back inside a group
+        opaque_materials = extractor.material_ids[opaque]
+        assert np.count_nonzero(np.diff(opaque_materials)) == 1
+        distances = np.linalg.norm(extractor.bounds_center[opaque], axis=1)
+        for material_id in np.unique(opaque_materials):
+            assert np.all(np.diff(distances[opaque_materials == material_id]) >= -1e-3)
+
+        # Transparent objects are drawn back to front
+        distances = np.linalg.norm(extractor.bounds_center[transparent], axis=1)
+        assert np.all(np.diff(distances) <= 1e-3)
+        assert stats["redundant_state_changes"] > stats["state_changes"]
+
+        # Without state sorting the same frame switches state far more often
+        scene_renderer.set_sort_by_material(False)
+        renderer.render_scene(scene, camera)
+        unsorted_changes = renderer.pipeline.get_stats()["state_changes"]
+        assert unsorted_changes > 2 * sorted_changes
+
+    print(f"✅ {len(opaque)} opaque and {len(transparent)} transparent draws, "
+          f"{sorted_changes} state changes sorted vs {unsorted_changes} unsorted")
+
+
+def test_render_graph():
+    """Test pass culling, dependency ordering and transient aliasing."""
+    print("\n🧪 Testing render graph...")
+
+    # Effects declared before the pass producing their input still run after it
+    graph = RenderGraph()
+    graph.import_resource("color")
+    for index in range(6):
+        graph.add_resource(f"fx{index}", "RGBA16F")
+    for index in range(1, 6):
+        graph.add_pass(f"effect{index}", reads=[f"fx{index - 1}"], writes=[f"fx{index}"])
+    graph.add_pass("scene", writes=["fx0"])
+    graph.add_pass("composite", reads=["fx5"], writes=["color"])
+    graph.add_resource("debug_view")
+    graph.add_pass("debug", reads=["fx2"], writes=["debug_view"])
+
+    compiled = graph.compile(320, 240)
+    assert compiled.order == ["scene"] + [f"effect{index}" for index in range(1, 6)] + ["composite"]
+    assert compiled.culled == ["debug"]
+    # Six chained targets ping-pong between two physical ones
+    assert len(compiled.aliases) == 6 and len(compiled.slots) == 2
+    assert compiled.physical_bytes * 3 == compiled.transient_bytes
+    assert graph.compile(320, 240) is compiled
+
+    # Disabling the only reader of a target culls its producers too
+    graph.set_pass_enabled("composite", False)
+    assert graph.compile(320, 240).order == []
+
+    with software_renderer() as renderer:
+        pipeline = renderer.pipeline
+
+        scene = Scene()
+        box = GameObject("Box")
+        scene.add_game_object(box)
+        box.transform.set_position(0.0, 0.0, -4.0)
+        box.add_component(MeshRenderer())
+        eye = GameObject("Eye")
+        scene.add_game_object(eye)
+        camera = eye.add_component(Camera())
+        camera.set_aspect_ratio(64.0 / 48.0)
+
+        renderer.render_scene(scene, camera)
+        image = renderer.device.read_render_target()
+
+        # A bright pass and a combine pass sharing one transient target; an unused pass is culled
+        executed = []
+        record = lambda name, pass_info: executed.append((name, pipeline.get_render_target("bright")))
+        assert pipeline.add_render_target("bright", "RGBA8", 32, 24)
+        pipeline.add_render_pass("bright_pass", RenderPass.POST_PROCESS, reads=["color"],
+                                 writes=["bright"], execute=record)
+        pipeline.add_render_pass("combine", RenderPass.POST_PROCESS, clear_target=False,
+                                 reads=["bright"], writes=["color"], execute=record)
+        pipeline.add_render_pass("unused", RenderPass.POST_PROCESS, writes=["bright"], execute=record)
+
+        renderer.render_scene(scene, camera)
+        stats = pipeline.get_stats()["render_graph"]
+        assert [name for name, _ in executed] == ["bright_pass", "combine"]
+        assert executed[0][1] is not None and executed[0][1] == executed[1][1]
+        assert stats["culled_passes"] == 1 and stats["physical_targets"] == 1
+        assert np.array_equal(renderer.device.read_render_target(), image)
+
+    print(f"✅ {len(compiled.order)} passes ordered, 1 culled, 6 targets in {len(compiled.slots)} physical targets")
+
+
+def test_command_lists():
+    """Test chunked command recording and asynchronous submission."""
+    print("\n🧪 Testing command lists...")
+
+    with software_renderer() as renderer:
+        resources = renderer.resource_manager
+        colors = [(1.0, 0.2, 0.2, 1.0), (0.2, 1.0, 0.2, 1.0), (0.2, 0.2, 1.0, 1.0)]
+        for index, color in enumerate(colors):
+            resources.create_material(f"paint{index}", {"base_color": color})
+        resources.create_material("glass", {"base_color": (1.0, 1.0, 1.0, 0.4), "transparent": True})
+
+        scene = Scene()
+        rng = np.random.default_rng(11)
+        for index, (x, y, z) in enumerate(rng.uniform((-10.0, -5.0, -45.0), (10.0, 5.0, -6.0), size=(400, 3))):
+            box = GameObject(f"Box{index}")
+            scene.add_game_object(box)
+            box.transform.set_position(x, y, z)
+            box.transform.set_scale(0.5, 0.5, 0.5)
+            material = "glass" if index % 10 == 0 else f"paint{index % 3}"
+            box.add_component(MeshRenderer(material_path=material))
+
+        eye = GameObject("Eye")
+        scene.add_game_object(eye)
+        camera = eye.add_component(Camera())
+        camera.set_aspect_ratio(64.0 / 48.0)
+
+        scene_renderer = renderer.scene_renderer
+        renderer.render_scene(scene, camera)
+        image = renderer.device.read_render_target()
+        draws = renderer.pipeline.get_stats()["draw_calls"]
+
+        # Many small chunks on worker threads submit the same draws
+        scene_renderer.recorder.shutdown()
+        scene_renderer.recorder = CommandRecorder(threads=2, chunk_size=16)
+        renderer.render_scene(scene, camera)
+        recording = scene_renderer.recorder.get_stats()
+        assert recording["recorded_chunks"] > 4
+        assert renderer.pipeline.get_stats()["draw_calls"] == draws
+        assert np.array_equal(renderer.device.read_render_target(), image)
+
+        # Asynchronous submission returns before rasterizing; waiting yields the same frame
+        scene_renderer.set_async_submission(True)
+        renderer.begin_frame()
+        renderer.render_scene(scene, camera)
+        renderer.end_frame()
+        scene_renderer.wait_for_frame()
+        assert np.array_equal(renderer.device.read_render_target(), image)
+        assert scene_renderer.get_stats().draw_calls == draws
+
+    print(f"✅ {draws} draws recorded in {recording['recorded_chunks']} chunks, same image in all modes")
+
+
+def test_mesh_lods():
+    """Test mesh simplification and screen-size LOD selection."""
+    print("\n🧪 Testing mesh LODs...")
+
+    sphere = create_icosphere(1.0, 4)
+    lods = generate_lods(sphere)
+    triangles = [sphere.index_count // 3] + [lod.index_count // 3 for lod, _ in lods]
+    assert len(lods) == 3
+    assert all(coarse <= fine // 2 for fine, coarse in zip(triangles, triangles[1:]))
+    assert all(error > 0.0 for _, error in lods)
+    for lod, _ in lods:
+        # Collapses keep existing vertices, so every level stays on the sphere
+        assert np.allclose(np.linalg.norm(lod.positions, axis=1), 1.0, atol=1e-5)
+        assert np.allclose(lod.get_bounds()[1], sphere.get_bounds()[1], atol=0.1)
+
+    with software_renderer() as renderer:
+
+        # Detail levels survive the compiled mesh format
+        write_nxmesh("sphere.nxmesh", sphere, lods=lods)
+        assert renderer.resource_manager.load_mesh("sphere", "sphere.nxmesh")
+        assert renderer.resource_manager.get_mesh("sphere").lod_count == 4
+
+        # Levels generated by the asset pipeline reach meshes loaded from source
+        faces = sphere.indices.reshape(-1, 3) + 1
+        Path("ball.obj").write_text("".join(
+            [f"v {x} {y} {z}\n" for x, y, z in sphere.positions.tolist()]
+            + [f"f {a} {b} {c}\n" for a, b, c in faces.tolist()]
+        ))
+        pipeline = AssetPipeline()
+        assert pipeline.initialize()
+        assert pipeline.process_asset(AssetInfo("ball", "ball.obj", AssetType.MESH))
+        assert renderer.resource_manager.load_mesh("ball", "ball.obj")
+        assert renderer.resource_manager.get_mesh("ball").lod_count == 4
+
+        scene = Scene()
+        ball = GameObject("Ball")
+        scene.add_game_object(ball)
+        ball.add_component(MeshRenderer(mesh_path="sphere"))
+        eye = GameObject("Eye")
+        scene.add_game_object(eye)
+        camera = eye.add_component(Camera())
+        camera.set_aspect_ratio(64.0 / 48.0)
+
+        scene_renderer = renderer.scene_renderer
+        extractor = scene_renderer.extractor
+        selector = scene_renderer.lod_selector
+        scale = camera.get_projection_matrix()[1][1]
+
+        def render_at_size(size):
+            radius = float(extractor.bounds_radius[0]) if extractor.count else np.sqrt(3.0)
+            ball.transform.set_position(0.0, 0.0, -radius * scale / size)
+            renderer.render_scene(scene, camera)
+            return int(extractor.lod_levels[0])
+
+        assert render_at_size(1.0) == 0
+        full_triangles = scene_renderer.get_stats().triangles
+
+        # Inside the hysteresis margin of a threshold the level holds in both directions
+        assert render_at_size(0.5 * 0.95) == 0
+        assert render_at_size(0.5 * 0.85) == 1
+        assert render_at_size(0.5 * 1.05) == 1
+        assert render_at_size(0.5 * 1.15) == 0
+
+        # Far away objects draw the coarsest level
+        assert render_at_size(0.05) == 3
+        assert scene_renderer.get_stats().triangles == triangles[3] < full_triangles
+        assert selector.get_stats()["objects_per_level"][3] == 1
+
+        # Disabling selection restores full detail
+        scene_renderer.set_lod_enabled(False)
+        assert render_at_size(0.05) == 0
+        assert scene_renderer.get_stats().triangles == full_triangles
+
+    print(f"✅ LOD triangles {triangles}, switching with hysteresis")
+
+
+def test_occlusion_culling():
+    """Test Hi-Z occlusion culling behind a wall."""
+    print("\n🧪 Testing occlusion culling...")
+
+    # Each Hi-Z level keeps the farthest depth of the block below, empty padding never occludes
+    depth = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+    levels = build_hiz(depth)
+    assert [level.shape for level in levels] == [(2, 3), (1, 2), (1, 1)]
+    assert levels[1][0, 0] == 0.5 and np.isinf(levels[1][0, 1]) and np.isinf(levels[2][0, 0])
+
+    with software_renderer() as renderer:
+
+        # A wall covering the left half of the view, boxes behind it and to its right
+        scene = Scene()
+        wall = GameObject("Wall")
+        scene.add_game_object(wall)
+        wall.transform.set_position(-4.0, 0.0, -10.0)
+        wall.transform.set_scale(4.5, 6.0, 0.5)
+        wall.add_component(MeshRenderer())
+        rng = np.random.default_rng(3)
+        for index, (x, y, z) in enumerate(rng.uniform((-6.0, -3.0, -40.0), (8.0, 3.0, -15.0), size=(200, 3))):
+            box = GameObject(f"Box{index}")
+            scene.add_game_object(box)
+            box.transform.set_position(x, y, z)
+            box.transform.set_scale(0.4, 0.4, 0.4)
+            box.add_component(MeshRenderer())
+
+        eye = GameObject("Eye")
+        scene.add_game_object(eye)
+        camera = eye.add_component(Camera())
+        camera.set_aspect_ratio(64.0 / 48.0)
+
+        scene_renderer = renderer.scene_renderer
+        renderer.render_scene(scene, camera)
+        image = renderer.device.read_render_target()
+        triangles = scene_renderer.get_stats().triangles
+
+        # Hidden boxes are dropped before submission and the frame is unchanged
+        scene_renderer.set_occlusion_culling(True)
+        renderer.render_scene(scene, camera)
+        occluded = scene_renderer.get_stats().occluded_objects
+        assert scene_renderer.occlusion_culler.get_stats()["occluders"] == 1
+        assert occluded > 50
+        assert scene_renderer.get_stats().triangles == triangles - occluded * 12
+        assert np.array_equal(renderer.device.read_render_target(), image)
+
+        # With the wall gone nothing is occluded
+        wall.get_component(MeshRenderer).visible = False
+        renderer.render_scene(scene, camera)
+        assert scene_renderer.get_stats().occluded_objects == 0
+
+    print(f"✅ {occluded} of 200 boxes occluded, same image")
+
+
+def test_occlusion_edges():
+    """Test that occluder edges inside an occlusion texel hide nothing visible."""
+    print("\n🧪 Testing occlusion at occluder edges...")
+
+    with software_renderer(1024, 768) as renderer:
+
+        # The wall's right edge falls inside a texel of the smaller occlusion buffer;
+        # boxes smaller than a texel sit behind it, some hidden and some just past the edge
+        scene = Scene()
+        wall = GameObject("Wall")
+        scene.add_game_object(wall)
+        wall.transform.set_position(-3.97, 0.0, -10.0)
+        wall.transform.set_scale(4.5, 6.0, 0.5)
+        wall.add_component(MeshRenderer())
+        rng = np.random.default_rng(5)
+        for index, (slope, y, depth) in enumerate(rng.uniform((0.035, -2.0, 11.0), (0.06, 2.0, 20.0), size=(80, 3))):
+            box = GameObject(f"Box{index}")
+            scene.add_game_object(box)
+            box.transform.set_position(slope * depth, y, -depth)
+            box.transform.set_scale(0.03, 0.03, 0.03)
+            box.add_component(MeshRenderer())
+
+        eye = GameObject("Eye")
+        scene.add_game_object(eye)
+        camera = eye.add_component(Camera())
+        camera.set_aspect_ratio(1024.0 / 768.0)
+
+        scene_renderer = renderer.scene_renderer
+        renderer.render_scene(scene, camera)
+        image = renderer.device.read_render_target()
+
+        scene_renderer.set_occlusion_culling(True)
+        renderer.render_scene(scene, camera)
+        occluded = scene_renderer.get_stats().occluded_objects
+        assert occluded > 0
+        assert np.array_equal(renderer.device.read_render_target(), image)
+
+    print(f"✅ {occluded} of 80 boxes occluded, same image at 1024x768")
+
+
+def test_clustered_lights():
+    """Test clustered light assignment and shading."""
+    print("\n🧪 Testing clustered lights...")
+
+    with software_renderer() as renderer:
+        renderer.resource_manager.add_mesh("floor", create_plane(40.0, 40.0))
+
+        scene = Scene()
+        floor = GameObject("Floor")
+        scene.add_game_object(floor)
+        floor.transform.set_position(0.0, -2.0, -20.0)
+        floor.add_component(MeshRenderer(mesh_path="floor"))
+        eye = GameObject("Eye")
+        scene.add_game_object(eye)
+        camera = eye.add_component(Camera())
+        camera.set_aspect_ratio(64.0 / 48.0)
+
+        renderer.render_scene(scene, camera)
+        unlit = renderer.device.read_render_target()
+
+        # Hundreds of small point lights over the floor, and a spot light pointing down at it
+        rng = np.random.default_rng(5)
+        for index, (x, z) in enumerate(rng.uniform((-15.0, -35.0), (15.0, -8.0), size=(300, 2))):
+            lamp = GameObject(f"Lamp{index}")
+            scene.add_game_object(lamp)
+            lamp.transform.set_position(x, -1.5, z)
+            light = lamp.add_component(Light("Point", [0.2, 0.3, 1.0], 1.0))
+            light.set_range(1.5)
+        spot = GameObject("Spot")
+        scene.add_game_object(spot)
+        spot.transform.set_position(-3.0, 2.0, -12.0)
+        spot.transform.set_rotation(-90.0, 0.0, 0.0)
+        spot_light = spot.add_component(Light("Spot", [1.0, 0.3, 0.2], 2.0))
+        spot_light.set_range(8.0)
+        spot_light.set_spot_angle(40.0)
+
+        scene_renderer = renderer.scene_renderer
+        renderer.render_scene(scene, camera)
+        clustered = renderer.device.read_render_target()
+        stats = scene_renderer.light_clusterer.get_stats()
+        assert stats["clustered_lights"] == 301
+        assert stats["assigned_pairs"] < stats["clusters"] * stats["clustered_lights"] // 100
+        assert not np.array_equal(clustered, unlit)
+
+        # A single cluster lists every light everywhere; the image must not change
+        scene_renderer.light_clusterer = LightClusterer(1, 1, 1)
+        renderer.render_scene(scene, camera)
+        assert np.array_equal(renderer.device.read_render_target(), clustered)
+
+    print(f"✅ {stats['assigned_pairs']} light assignments over {stats['occupied_clusters']} clusters, "
+          f"same image as unculled lights")
+
+
+def main():
+    """Run all tests."""
+    print("🚀 Testing Nexlify Scene Rendering")
+    print("=" * 50)
+
+    try:
+        test_scene_extraction()
+        test_frustum_culling()
+        test_software_rasterizer()
+        test_batching()
+        test_render_queue()
+        test_render_graph()
+        test_command_lists()
+        test_mesh_lods()
+        test_occlusion_culling()
+        test_occlusion_edges()
+        test_clustered_lights()
+
+        print("\n" + "=" * 50)
+        print("✅ All tests completed successfully!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)